@@ -0,0 +1,208 @@
+"""
+lod_ai.board.arrays
+===================
+
+Optional array-backed board view (needs NumPy).
+
+Piece data stays where it is, in ``state["spaces"][sid]`` tag dicts;
+`BoardArrays` mirrors it as a ``(space x piece tag)`` int matrix, with
+support and population vectors alongside, so board-wide questions are a
+few matrix reductions instead of nested dict scans:
+
+    view = arrays.attach(state)
+    view.tallies()         # (S, 3) Rebellion / British / Indian pieces
+    view.control()         # {sid: "REBELLION" | "BRITISH" | None}
+    view.board_totals()    # victory._summarize_board's dict
+    view.faction_totals()  # pieces on map per faction
+    view.census()          # piece families on map + in the boxes
+
+The view stays current the same way Control does: `board.pieces` re-
+tallies every space it touches and `normalize_state` the spaces an
+engine commit wrote (`board.control.refresh_space` / `refresh_control`),
+and both re-read those rows of an attached view.  After editing space
+dicts directly, call `BoardArrays.refresh`.
+
+While a view is attached, `victory._summarize_board`,
+`tools.invariants.piece_census` and `batch_smoke._count_pieces_on_map`
+use it; they look it up with `board.control.array_view`, which does not
+import this module.  batch_smoke and soak attach one per game with
+``--arrays``.
+
+NumPy is imported by the first `BoardArrays`, not with this module, so
+games that never attach a view never load it.  Without NumPy `attach`
+raises RuntimeError and nothing else changes.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import weakref
+from typing import Any, Dict, Iterable, Tuple
+
+from lod_ai import rules_consts as C
+from lod_ai.board import control as _control
+from lod_ai.map.adjacency import population as _map_population
+from lod_ai.util.naval import effective_population as _effective_population
+
+HAVE_NUMPY = importlib.util.find_spec("numpy") is not None
+# NumPy, once a view needs it (`_numpy`).
+np: Any = None
+
+# Matrix columns: every piece that can stand in a map space.
+PIECE_TAGS: Tuple[str, ...] = (
+    C.REGULAR_BRI, C.TORY, C.FORT_BRI,
+    C.REGULAR_PAT, C.MILITIA_A, C.MILITIA_U, C.FORT_PAT,
+    C.REGULAR_FRE,
+    C.WARPARTY_A, C.WARPARTY_U, C.VILLAGE,
+)
+FACTION_TAGS: Dict[str, Tuple[str, ...]] = {
+    C.BRITISH:  (C.REGULAR_BRI, C.TORY, C.FORT_BRI),
+    C.PATRIOTS: (C.REGULAR_PAT, C.MILITIA_A, C.MILITIA_U, C.FORT_PAT),
+    C.FRENCH:   (C.REGULAR_FRE,),
+    C.INDIANS:  (C.WARPARTY_A, C.WARPARTY_U, C.VILLAGE),
+}
+_POOL_KEYS = ("available", "unavailable", "casualties", "out_of_play")
+
+
+def _numpy() -> Any:
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise RuntimeError(
+                "BoardArrays needs NumPy: pip install numpy") from None
+        np = numpy
+    return np
+
+
+class BoardArrays:
+    """Matrix mirror of one state's board (see module docstring)."""
+
+    def __init__(self, state: Dict[str, Any]) -> None:
+        np = _numpy()
+        self.state = state
+        self.space_ids: Tuple[str, ...] = tuple(state["spaces"])
+        self.row = {sid: i for i, sid in enumerate(self.space_ids)}
+        self.tags = PIECE_TAGS
+        self.col = {tag: j for j, tag in enumerate(self.tags)}
+        self.counts = np.zeros((len(self.space_ids), len(self.tags)),
+                               dtype=np.int64)
+        self.population = np.array(
+            [_map_population(sid) for sid in self.space_ids], dtype=np.int64)
+        # Tag -> control side (Rebellion, British, Indian), as board.control
+        # classifies it, and tag -> owning faction.
+        self._sides = np.zeros((len(self.tags), 3), dtype=np.int64)
+        for j, tag in enumerate(self.tags):
+            self._sides[j, _control._column(tag)] = 1
+        self._factions = {
+            faction: np.array([tag in tags for tag in self.tags])
+            for faction, tags in FACTION_TAGS.items()
+        }
+        self.refresh()
+
+    # -- sync ------------------------------------------------------------------
+    def refresh(self, sids: Iterable[str] | None = None) -> None:
+        """Re-read the rows of *sids* (every space if None)."""
+        spaces = self.state["spaces"]
+        for sid in (self.space_ids if sids is None else sids):
+            i = self.row.get(sid)
+            if i is None:
+                continue
+            sp = spaces.get(sid) or {}
+            self.counts[i] = [max(int(sp.get(tag, 0) or 0), 0)
+                              for tag in self.tags]
+
+    # -- vectors ---------------------------------------------------------------
+    def column(self, tag: str):
+        return self.counts[:, self.col[tag]]
+
+    def support(self):
+        levels = self.state.get("support", {})
+        return np.array([levels.get(sid, 0) for sid in self.space_ids],
+                        dtype=np.int64)
+
+    def effective_population(self):
+        """Population with §1.9 Blockaded Cities counting 0."""
+        return np.array([_effective_population(self.state, sid, int(pop))
+                         for sid, pop in zip(self.space_ids, self.population)],
+                        dtype=np.int64)
+
+    # -- reductions ------------------------------------------------------------
+    def tallies(self):
+        """``(S, 3)`` Rebellion / British / Indian piece counts."""
+        return self.counts @ self._sides
+
+    def control(self) -> Dict[str, str | None]:
+        tallies = self.tallies()
+        reb, bri = tallies[:, 0], tallies[:, 1]
+        royalist = bri + tallies[:, 2]
+        rebellion = reb > royalist
+        british = (royalist > reb) & (bri > 0)
+        return {sid: "REBELLION" if rebellion[i] else
+                     C.BRITISH if british[i] else None
+                for i, sid in enumerate(self.space_ids)}
+
+    def board_totals(self) -> Dict[str, Any]:
+        """Same dict as `victory._summarize_board`."""
+        weighted = self.support() * self.effective_population()
+        toa = self.state.get("toa_played",
+                             self.state.get("treaty_of_alliance", False))
+        return {
+            "support": int(weighted[weighted > 0].sum()),
+            "opposition": int(-weighted[weighted < 0].sum()),
+            "cbc": self.state.get("cbc", 0),
+            "crc": self.state.get("crc", 0),
+            "forts": {C.PATRIOTS: int(self.column(C.FORT_PAT).sum())},
+            "villages": int(self.column(C.VILLAGE).sum()),
+            "treaty_of_alliance": bool(toa),
+        }
+
+    def faction_totals(self) -> Dict[str, int]:
+        on_map = self.counts.sum(axis=0)
+        return {faction: int(on_map[mask].sum())
+                for faction, mask in self._factions.items()}
+
+    def census(self, families: Dict[str, Tuple[Tuple[str, ...], int]]
+               ) -> Dict[str, int]:
+        """Piece families (``{family: (tags, max)}``) on map + in boxes."""
+        on_map = self.counts.sum(axis=0)
+        out = {}
+        for family, (tags, _max) in families.items():
+            total = sum(int(on_map[self.col[t]]) for t in tags if t in self.col)
+            for pool_key in _POOL_KEYS:
+                pool = self.state.get(pool_key) or {}
+                total += sum(q for t in tags
+                             if isinstance(q := pool.get(t, 0), int) and q > 0)
+            out[family] = total
+        return out
+
+
+# --------------------------------------------------------------------------- #
+# Attachment
+# --------------------------------------------------------------------------- #
+def attach(state: Dict[str, Any]) -> BoardArrays:
+    """The view kept in sync with *state* (created on first call).
+
+    The registry holds the view weakly and the view holds the state, so
+    the state's id stays valid for as long as the view is reachable.
+    """
+    view = view_of(state)
+    if view is None:
+        view = BoardArrays(state)
+        key = id(state)
+
+        def _forget(ref, key=key):
+            if _control._ARRAY_VIEWS.get(key) is ref:
+                del _control._ARRAY_VIEWS[key]
+        _control._ARRAY_VIEWS[key] = weakref.ref(view, _forget)
+    return view
+
+
+def detach(state: Dict[str, Any]) -> None:
+    _control._ARRAY_VIEWS.pop(id(state), None)
+
+
+def view_of(state: Any) -> BoardArrays | None:
+    """The view attached to *state*, if any (`board.control.array_view`)."""
+    return _control.array_view(state)
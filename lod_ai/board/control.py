@@ -9,17 +9,69 @@ Control values:
 - "REBELLION" if Patriot+French pieces strictly exceed Royalist pieces.
 - "BRITISH" if Royalist pieces strictly exceed Rebellion pieces AND at least one British piece is present.
 - None otherwise (ties, or only Indians exceed Rebels).
+
+Control is kept current incrementally: `board.pieces` re-tallies each
+space it adds to or removes from (`refresh_space`), and inside an engine
+sandbox `refresh_control` only re-tallies the spaces whose contents
+differ from the parent state's.  On a plain state dict it still sweeps
+every space, since the state may have been edited directly.
+`tools/invariants` recomputes the full sweep independently to catch
+drift.  Reading control is always a lookup: ``state["control"][sid]`` /
+`controller`.
+
+The same re-tally points re-read those rows of a `board.arrays` view
+attached to the state, if any, and of the running victory totals
+(`board.totals`) of a tracked state.
+
+What-if queries (`control_after`, `what_if`) answer "who would control
+*sid*, and how would the victory margins move, after this piece delta /
+Support shift?" from the current tallies alone: they never copy or
+write the state, so planners can price hundreds of candidates.
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict, Mapping
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Mapping, Set, Tuple
+
+from lod_ai.board import totals as _totals
+from lod_ai.map.adjacency import population as _population
+from lod_ai.rules_consts import (
+    ACTIVE_OPPOSITION, ACTIVE_SUPPORT, BRITISH, FORT_PAT, FRENCH, INDIANS,
+    PATRIOTS, VILLAGE,
+)
+from lod_ai.util.naval import effective_population as _effective_population
+from lod_ai.state.sandbox import changed_spaces
 
 
 REB_PREFIXES: tuple[str, ...] = ("Patriot_", "French_")
 BRI_PREFIXES: tuple[str, ...] = ("British_",)
 IND_PREFIXES: tuple[str, ...] = ("Indian_",)
 
+# Tally column per piece tag, resolved once per tag: 0 Rebellion,
+# 1 British, 2 Indian, None not a piece.  Villages are Indian pieces
+# (§1.6.5).
+_COLUMN: Dict[str, int | None] = {"Village": 2}
+
+# id(state) -> weakref to its board.arrays.BoardArrays (see arrays.attach).
+_ARRAY_VIEWS: Dict[int, Any] = {}
+
+
+def _column(tag: str) -> int | None:
+    try:
+        return _COLUMN[tag]
+    except KeyError:
+        pass
+    col = None
+    if tag.startswith(REB_PREFIXES):
+        col = 0
+    elif tag.startswith(BRI_PREFIXES):
+        col = 1
+    elif tag.startswith(IND_PREFIXES):
+        col = 2
+    _COLUMN[tag] = col
+    return col
+
 
 def _tally(space: Mapping[str, Any], prefixes: tuple[str, ...]) -> int:
     total = 0
@@ -35,35 +87,257 @@ def _tally(space: Mapping[str, Any], prefixes: tuple[str, ...]) -> int:
     return total
 
 
-def refresh_control(state: Dict[str, Any]) -> None:
-    """Populate state['control'] with the controller for every space."""
-    ctrl_map: Dict[str, str | None] = {}
+def space_tallies(space: Mapping[str, Any]) -> Tuple[int, int, int]:
+    """``(rebellion, british, indian)`` piece counts in one space."""
+    counts = [0, 0, 0]
+    for tag, qty in space.items():
+        if not isinstance(qty, int) or qty <= 0 or not isinstance(tag, str):
+            continue
+        col = _column(tag)
+        if col is not None:
+            counts[col] += qty
+    return counts[0], counts[1], counts[2]
+
+
+def control_from_tallies(rebels: int, bri: int, ind: int) -> str | None:
+    royalist = bri + ind
+    if rebels > royalist:
+        return "REBELLION"
+    if royalist > rebels and bri > 0:
+        return "BRITISH"
+    return None
+
+
+def space_control(space: Mapping[str, Any]) -> str | None:
+    """Controller of one space dict, computed from its pieces."""
+    return control_from_tallies(*space_tallies(space))
+
+
+def controller(state: Dict[str, Any], sid: str) -> str | None:
+    """Current controller of *sid* (a lookup; control is kept current)."""
+    return (state.get("control") or {}).get(sid)
+
+
+# ---------------------------------------------------------------------------
+# What-if queries (pure: nothing is copied or written)
+# ---------------------------------------------------------------------------
+def _count(space: Mapping[str, Any], tag: str) -> int:
+    qty = space.get(tag, 0)
+    return qty if isinstance(qty, int) and qty > 0 else 0
+
+
+def _net_change(space: Mapping[str, Any], tag: str, n: int) -> int:
+    """How much *tag* really changes by: removals stop at zero."""
+    have = _count(space, tag)
+    return max(0, have + n) - have
+
+
+def tallies_after(space: Mapping[str, Any],
+                  delta: Mapping[str, int]) -> Tuple[int, int, int]:
+    """`space_tallies` of *space* after applying *delta* ({tag: ±n};
+    a removal never takes a count below zero)."""
+    counts = list(space_tallies(space))
+    for tag, n in delta.items():
+        col = _column(tag) if isinstance(tag, str) else None
+        if col is not None and n:
+            counts[col] += _net_change(space, tag, n)
+    return counts[0], counts[1], counts[2]
+
+
+def control_after(state: Dict[str, Any], sid: str,
+                  delta: Mapping[str, int]) -> str | None:
+    """Controller of *sid* if *delta* ({tag: ±n}) were applied to it."""
+    space = (state.get("spaces") or {}).get(sid) or {}
+    return control_from_tallies(*tallies_after(space, delta))
+
+
+def removal(pieces: Mapping[str, int]) -> Dict[str, int]:
+    """The delta that removes *pieces* ({tag: n})."""
+    return {tag: -n for tag, n in pieces.items()}
+
+
+@dataclass(frozen=True)
+class WhatIf:
+    """Result of `what_if`: Control of the space before/after, the
+    change in Total Support / Opposition (§1.6.2-1.6.3) and in each
+    faction's two victory margins (§7.2; casualties are not modelled)."""
+
+    sid: str
+    control_before: str | None
+    control_after: str | None
+    support: int
+    opposition: int
+    margins: Dict[str, Tuple[int, int]]
+
+    @property
+    def control_changed(self) -> bool:
+        return self.control_before != self.control_after
+
 
+def what_if(state: Dict[str, Any], sid: str,
+            delta: Mapping[str, int] | None = None, *,
+            shift: int = 0) -> WhatIf:
+    """Consequences of applying *delta* ({tag: ±n}) to *sid* and shifting
+    its Support level by *shift* (toward Active Support if positive,
+    clamped to the track), without touching *state*."""
+    delta = delta or {}
+    space = (state.get("spaces") or {}).get(sid) or {}
+    before = control_from_tallies(*space_tallies(space))
+    after = control_from_tallies(*tallies_after(space, delta))
+
+    level = (state.get("support") or {}).get(sid, 0)
+    new_level = max(ACTIVE_OPPOSITION, min(ACTIVE_SUPPORT, level + shift))
+    pop = _effective_population(state, sid, _population(sid))
+    s0, o0 = _totals._weighted(level, pop)
+    s1, o1 = _totals._weighted(new_level, pop)
+    d_sup, d_opp = s1 - s0, o1 - o0
+    d_forts = _net_change(space, FORT_PAT, delta.get(FORT_PAT, 0))
+    d_villages = _net_change(space, VILLAGE, delta.get(VILLAGE, 0))
+
+    margins = {
+        BRITISH: (d_sup - d_opp, 0),
+        PATRIOTS: (d_opp - d_sup, d_forts - d_villages),
+        FRENCH: (d_opp - d_sup, 0),
+        INDIANS: (d_sup - d_opp, d_villages - d_forts),
+    }
+    return WhatIf(sid, before, after, d_sup, d_opp, margins)
+
+
+def _store(state: Dict[str, Any], updates: Dict[str, str | None],
+           removed: Iterable[str] = ()) -> None:
+    """Write changed controllers into a fresh control map.
+
+    The map is replaced rather than edited in place, as a full sweep
+    always did: callers holding the previous map keep a snapshot.
+    """
+    ctrl_map = state.get("control")
+    if not isinstance(ctrl_map, dict):
+        ctrl_map = {}
+    removed = [sid for sid in removed if sid in ctrl_map]
+    changed = {sid: c for sid, c in updates.items()
+               if sid not in ctrl_map or ctrl_map[sid] != c}
+    if changed or removed:
+        ctrl_map = dict(ctrl_map)
+        ctrl_map.update(changed)
+        for sid in removed:
+            del ctrl_map[sid]
+        state["control"] = ctrl_map
+    if state.get("control_map") is not ctrl_map:
+        state["control_map"] = ctrl_map
+
+
+def _sandbox_drift(state: Dict[str, Any],
+                   spaces: Dict[str, Any]) -> Set[str] | None:
+    """Spaces of a sandbox state whose Control may differ from its
+    parent's: contents changed, or already re-tallied here.  None for a
+    plain state."""
+    drift = changed_spaces(spaces)
+    parent = getattr(state, "parent", None)
+    if drift is None or not isinstance(parent, dict):
+        return None
+    mine = dict.get(state, "control")
+    theirs = dict.get(parent, "control")
+    if mine is not theirs and isinstance(mine, dict) and \
+            isinstance(theirs, dict):
+        drift.update(sid for sid in set(mine) | set(theirs)
+                     if mine.get(sid) != theirs.get(sid))
+    return drift
+
+
+def array_view(state: Any) -> Any:
+    """The `board.arrays.BoardArrays` view attached to *state*, or None.
+
+    Callers that only use a view when one exists look it up here, so they
+    never import board.arrays (or NumPy).
+    """
+    if not _ARRAY_VIEWS:
+        return None
+    ref = _ARRAY_VIEWS.get(id(state))
+    view = ref() if ref is not None else None
+    return view if view is not None and view.state is state else None
+
+
+def _refresh_view(state: Dict[str, Any],
+                  sids: Iterable[str] | None) -> None:
+    view = array_view(state)
+    if view is not None:
+        view.refresh(sids)
+
+
+def refresh_space(state: Dict[str, Any], sid: str) -> None:
+    """Re-tally one space after its pieces changed.
+
+    The per-space ``sp["control"]`` mirror is only kept current where a
+    refresh already wrote one; `board.pieces` never adds keys to a space.
+    """
+    spaces = state.get("spaces")
+    if not isinstance(spaces, dict):
+        return
+    sp = spaces.get(sid)
+    if not isinstance(sp, dict):
+        return
+    control = space_control(sp)
+    if "control" in sp:
+        sp["control"] = control
+    _store(state, {str(sid): control})
+    if _totals.KEY in state:
+        _totals.refresh_rows(state, (sid,))
+    if _ARRAY_VIEWS:
+        _refresh_view(state, (sid,))
+
+
+def refresh_control(state: Dict[str, Any],
+                    sids: Iterable[str] | None = None) -> None:
+    """Bring state['control'] up to date.
+
+    *sids* limits the re-tally to spaces known to have changed since
+    control was last current.  Without it, a sandbox state re-tallies
+    the spaces that differ from its parent's and any other state gets a
+    full sweep.
+    """
     spaces = state.get("spaces", {})
     if not isinstance(spaces, dict):
         state["control"] = {}
         state["control_map"] = {}
         return
 
-    for sid, sp in spaces.items():
+    if sids is None:
+        sids = _sandbox_drift(state, spaces)
+    if sids is None or not isinstance(state.get("control"), dict):
+        _sweep(state, spaces)
+        return
+
+    updates: Dict[str, str | None] = {}
+    removed = []
+    for sid in sids:
+        sp = spaces.get(sid)
         if not isinstance(sp, dict):
+            removed.append(str(sid))
             continue
+        control = space_control(sp)
+        sp["control"] = control
+        updates[str(sid)] = control
+    _store(state, updates, removed)
+    if _totals.KEY in state:
+        _totals.refresh_rows(state, list(updates) + removed)
+    if _ARRAY_VIEWS:
+        _refresh_view(state, updates)
 
-        rebels = _tally(sp, REB_PREFIXES)
-        bri = _tally(sp, BRI_PREFIXES)
-        ind = _tally(sp, IND_PREFIXES) + sp.get("Village", 0)  # Villages are Indian pieces (§1.6.5)
-        royalist = bri + ind
-
-        control: str | None = None
-        if rebels > royalist:
-            control = "REBELLION"
-        elif royalist > rebels and bri > 0:
-            control = "BRITISH"
 
+def _sweep(state: Dict[str, Any], spaces: Dict[str, Any]) -> None:
+    """Recompute every space (plain states may have been edited directly)."""
+    ctrl_map: Dict[str, str | None] = {}
+    for sid, sp in spaces.items():
+        if not isinstance(sp, dict):
+            continue
+        control = space_control(sp)
         ctrl_map[str(sid)] = control
-
         # Also store per-space for callers that expect sp["control"]
         sp["control"] = control
 
     state["control"] = ctrl_map
     state["control_map"] = ctrl_map
+    if _totals.KEY in state:
+        _totals.track(state)
+    if _ARRAY_VIEWS:
+        _refresh_view(state, None)
@@ -8,6 +8,7 @@ undo-friendly way.
 
 from typing import Dict, Any
 from lod_ai.util.history import push_history
+from lod_ai.board.control import refresh_space
 from lod_ai import rules_consts as C
 from lod_ai.rules_consts import LEADERS, WEST_INDIES_ID, PROPAGANDA, RAID, BLOCKADE
 
@@ -93,6 +94,20 @@ def _space_dict(state: Dict[str, Any], loc: str) -> Dict[str, int]:
     raise ValueError(f"Unknown location '{loc}'")
 
 
+def _retally(state: Dict[str, Any], loc: str) -> None:
+    """Keep Control current for *loc* if it is a map space.
+
+    Rule 1.7 adjusts Control markers as pieces are placed, removed or
+    moved, so later steps of the same Command or phase (e.g. Patriot
+    Supply after British Supply, 6.2) must see the new Control.
+    """
+    if loc in ("available", "unavailable", "casualties"):
+        return
+    if loc not in state["spaces"]:
+        loc = WEST_INDIES_ID
+    refresh_space(state, loc)
+
+
 def _pool_tag(tag: str) -> str:
     """Return the Available-pool tag family for *tag* (Militia/WP share pools)."""
     return _POOL_FAMILY.get(tag, tag)
@@ -218,6 +233,7 @@ def flip_pieces(state: Dict[str, Any], from_tag: str, to_tag: str,
         if sp[from_tag] == 0:
             del sp[from_tag]
         sp[to_tag] = sp.get(to_tag, 0) + actual
+        _retally(state, loc)
         push_history(state, f"Flipped {actual}×{from_tag}→{to_tag} in {loc}")
     return actual
 
@@ -247,6 +263,8 @@ def move_piece(state: Dict[str, Any], tag: str, src: str, dst: str, qty: int = 1
         if src_dict[src_tag] == 0:
             del src_dict[src_tag]
         dst_dict[dst_tag] = dst_dict.get(dst_tag, 0) + moved
+        _retally(state, src)
+        _retally(state, dst)
         push_history(state, f"{moved}×{tag}  {src} → {dst}")
     return moved
 
@@ -0,0 +1,210 @@
+"""
+lod_ai.board.totals
+===================
+
+Running victory totals: total Support and Opposition (§1.6.2-1.6.3),
+Patriot Forts and Indian Villages on the map.  CBC / CRC already are
+running sums (`board.pieces.increment_casualties`).
+
+`track(state)` stores them under ``state["victory_totals"]``:
+
+    {"support": int, "opposition": int, "forts": int, "villages": int,
+     "rows": {sid: (support level, Patriot Forts, Villages)}}
+
+Support and Opposition are kept at full population; the §1.9 Blockade
+correction is applied when they are read (`current`), from the few
+Cities holding a Blockade, so moving a Blockade needs no bookkeeping.
+
+The sums stay current at the points Control does: `board.pieces` via
+`board.control.refresh_space`, engine commits via `refresh_control`
+(`normalize_state` also re-reads every Support level), and a full
+`refresh_control` sweep rebuilds them.  Support writers go through
+`set_support`.  After editing spaces or ``state["support"]`` directly,
+call `refresh_rows` / `sync_support`.
+
+`current(state)` is then a constant-time read; an untracked state (a
+hand-built test dict, say) gets the full scan `recompute`.  Set
+``AUDIT = True`` to cross-check every read against `recompute` (raises
+`TotalsDrift`); `tools.invariants.victory_drift` does the same check
+without raising.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Tuple
+
+from lod_ai.rules_consts import BLOCKADE, FORT_PAT, VILLAGE
+from lod_ai.map.adjacency import population as _map_population
+from lod_ai.util.naval import effective_population as _effective_population
+
+KEY = "victory_totals"
+FIELDS: Tuple[str, ...] = ("support", "opposition", "forts", "villages")
+
+# Cross-check every `current` read against the full recompute.
+AUDIT = False
+
+Totals = Tuple[int, int, int, int]     # support, opposition, forts, villages
+
+
+class TotalsDrift(AssertionError):
+    """Tracked victory totals differ from the full recompute."""
+
+
+class _Tracked(dict):
+    """``state["victory_totals"]``; a plain dict to everything else."""
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "_Tracked":
+        # Rows are tuples of ints: copying the two dicts is a deep copy.
+        twin = _Tracked(self)
+        twin["rows"] = dict(self["rows"])
+        memo[id(self)] = twin
+        return twin
+
+
+# Reads below use dict.get: a sandbox state need not take its own copy
+# of a value that is only looked at.
+def _row(state: Dict[str, Any], sid: str, sp: Any) -> Tuple[int, int, int]:
+    level = (dict.get(state, "support") or {}).get(sid, 0)
+    if not isinstance(sp, dict):
+        return level, 0, 0
+    return level, sp.get(FORT_PAT, 0), sp.get(VILLAGE, 0)
+
+
+def _weighted(level: int, pop: int) -> Tuple[int, int]:
+    if level > 0:
+        return level * pop, 0
+    if level < 0:
+        return 0, -level * pop
+    return 0, 0
+
+
+def track(state: Dict[str, Any]) -> Dict[str, Any]:
+    """(Re)build the running totals of *state* from scratch."""
+    rows = {}
+    sup = opp = forts = villages = 0
+    spaces = state.get("spaces") or {}
+    for sid in {**spaces, **(dict.get(state, "support") or {})}:
+        row = rows[sid] = _row(state, sid, spaces.get(sid))
+        s, o = _weighted(row[0], _map_population(sid))
+        sup += s
+        opp += o
+        forts += row[1]
+        villages += row[2]
+    tracked = _Tracked(support=sup, opposition=opp, forts=forts,
+                       villages=villages, rows=rows)
+    state[KEY] = tracked
+    return tracked
+
+
+def _update(tracked: Dict[str, Any], sid: str,
+            row: Tuple[int, int, int]) -> None:
+    old = tracked["rows"].get(sid, (0, 0, 0))
+    if old == row:
+        return
+    pop = _map_population(sid)
+    s0, o0 = _weighted(old[0], pop)
+    s1, o1 = _weighted(row[0], pop)
+    tracked["support"] += s1 - s0
+    tracked["opposition"] += o1 - o0
+    tracked["forts"] += row[1] - old[1]
+    tracked["villages"] += row[2] - old[2]
+    tracked["rows"][sid] = row
+
+
+def refresh_rows(state: Dict[str, Any],
+                 sids: Iterable[str] | None = None) -> None:
+    """Re-read the spaces *sids* (all of them if None) of a tracked state."""
+    if KEY not in state:
+        return
+    spaces = state.get("spaces") or {}
+    if sids is None:
+        track(state)
+        return
+    tracked = state[KEY]
+    for sid in sids:
+        _update(tracked, sid, _row(state, sid, spaces.get(sid)))
+
+
+def sync_support(state: Dict[str, Any]) -> None:
+    """Re-read every Support level of a tracked state."""
+    if KEY not in state:
+        return
+    tracked = state[KEY]
+    rows = tracked["rows"]
+    levels = dict.get(state, "support") or {}
+    for sid in [*rows, *(sid for sid in levels if sid not in rows)]:
+        row = rows.get(sid, (0, 0, 0))
+        level = levels.get(sid, 0)
+        if level != row[0]:
+            _update(tracked, sid, (level,) + row[1:])
+
+
+def set_support(state: Dict[str, Any], sid: str, level: int) -> None:
+    """Write *sid*'s Support level and update the running totals."""
+    state.setdefault("support", {})[sid] = level
+    if KEY in state:
+        tracked = state[KEY]
+        row = tracked["rows"].get(sid, (0, 0, 0))
+        if row[0] != level:
+            _update(tracked, sid, (level,) + row[1:])
+
+
+def _blockaded(state: Dict[str, Any]) -> Iterable[str]:
+    entry = (dict.get(state, "markers") or {}).get(BLOCKADE) or {}
+    return entry.get("on_map") or ()
+
+
+def recompute(state: Dict[str, Any]) -> Totals:
+    """Full scan of the board (what the tracker keeps current)."""
+    sup = opp = forts = villages = 0
+    for sid, level in (state.get("support") or {}).items():
+        # §1.9: a Blockaded City's population counts 0 for Support
+        # (Session 46, C1).
+        pop = _effective_population(state, sid, _map_population(sid))
+        s, o = _weighted(level, pop)
+        sup += s
+        opp += o
+    for sp in (state.get("spaces") or {}).values():
+        forts += sp.get(FORT_PAT, 0)
+        villages += sp.get(VILLAGE, 0)
+    return sup, opp, forts, villages
+
+
+def _read(state: Dict[str, Any], tracked: Dict[str, Any]) -> Totals:
+    sup, opp = tracked["support"], tracked["opposition"]
+    rows = tracked["rows"]
+    for sid in _blockaded(state):
+        row = rows.get(sid)
+        if row is not None and row[0]:
+            s, o = _weighted(row[0], _map_population(sid))
+            sup -= s
+            opp -= o
+    return sup, opp, tracked["forts"], tracked["villages"]
+
+
+def current(state: Dict[str, Any]) -> Totals:
+    """Support, Opposition, Patriot Forts and Villages on the map."""
+    tracked = dict.get(state, KEY) if isinstance(state, dict) else None
+    if tracked is None:
+        return recompute(state)
+    result = _read(state, tracked)
+    if AUDIT:
+        expected = recompute(state)
+        if result != expected:
+            raise TotalsDrift(_describe(result, expected))
+    return result
+
+
+def drift(state: Dict[str, Any]) -> Dict[str, Tuple[int, int]]:
+    """``{field: (tracked, recomputed)}`` for every total that differs
+    ({} when untracked or current)."""
+    tracked = dict.get(state, KEY)
+    if tracked is None:
+        return {}
+    got, want = _read(state, tracked), recompute(state)
+    return {name: (g, w) for name, g, w in zip(FIELDS, got, want) if g != w}
+
+
+def _describe(got: Totals, want: Totals) -> str:
+    return "victory totals drifted: " + ", ".join(
+        f"{name} {g} != {w}" for name, g, w in zip(FIELDS, got, want) if g != w)
@@ -5,8 +5,7 @@ from lod_ai.board import pieces
 from lod_ai.bots import event_instructions as EI
 from lod_ai import dispatcher
 from lod_ai.cards import CARD_HANDLERS
-from lod_ai.map.adjacency import population as _map_population
-from lod_ai.util.history import push_history
+from lod_ai.util.history import PASS, push_history
 from lod_ai.util import eligibility as elig
 
 class BaseBot:
@@ -63,7 +62,8 @@ class BaseBot:
         if (state["resources"][self.faction] <= 0
                 and self.faction != C.INDIANS):
             state['_pass_reason'] = 'resource_gate'
-            push_history(state, f"{self.faction} PASS (no Resources)")
+            push_history(state, f"{self.faction} PASS (no Resources)",
+                         kind=PASS, data={"faction": self.faction})
             return {
                 "action": "pass",
                 "used_special": bool(state.get("_turn_used_special")),
@@ -72,15 +72,10 @@ class BaseBot:
 
         self._follow_flowchart(state)   # implemented by subclass
         history = state.get("history") or []
-        last_entry = history[-1] if history else None
-        # History entries are dicts with a "msg" key; handle both formats
-        if isinstance(last_entry, dict):
-            last_text = (last_entry.get("msg", "") or "").upper()
-        elif isinstance(last_entry, str):
-            last_text = last_entry.upper()
-        else:
-            last_text = ""
-        action = "pass" if last_text.startswith(f"{self.faction} PASS") else "command"
+        last = history[-1] if history else None
+        passed = (isinstance(last, dict) and last.get("kind") == PASS
+                  and last["data"].get("faction") == self.faction)
+        action = "pass" if passed else "command"
         if action == "pass" and '_pass_reason' not in state:
             state['_pass_reason'] = 'no_valid_command'
         elif action != "pass":
@@ -112,17 +107,12 @@ class BaseBot:
 
         Total Support    = sum(level × population) for spaces with level > 0
         Total Opposition = sum(|level| × population) for spaces with level < 0
+
+        §1.9: Blockaded-City pop counts 0 for Support (Session 46, C1).
+        Read from the running totals (`board.totals`).
         """
-        from lod_ai.util.naval import effective_population
-        sup = 0
-        opp = 0
-        for sid, lvl in state.get("support", {}).items():
-            # §1.9: Blockaded-City pop counts 0 for Support (Session 46, C1)
-            pop = effective_population(state, sid, _map_population(sid))
-            if lvl > 0:
-                sup += lvl * pop
-            elif lvl < 0:
-                opp += (-lvl) * pop
+        from lod_ai.board import totals
+        sup, opp, _forts, _villages = totals.current(state)
         return sup, opp
 
     #  NEW: look-up table for musket-underline directives
@@ -354,8 +344,8 @@ class BaseBot:
 
     # Side piece tags for the §8.3.3 friendly-removal clause. Space-count
     # pieces only: Blockades/Squadrons live in the markers dict, so any
-    # change to them fails the reconstruction equality below and correctly
-    # blocks an "only friendly removal" verdict.
+    # change to them is an "other" effect and correctly blocks an "only
+    # friendly removal" verdict.
     _SIDE_PIECES = {
         C.BRITISH:  (C.REGULAR_BRI, C.TORY, C.FORT_BRI,
                      C.WARPARTY_A, C.WARPARTY_U, C.VILLAGE),
@@ -366,102 +356,105 @@ class BaseBot:
         C.FRENCH:   (C.REGULAR_PAT, C.MILITIA_A, C.MILITIA_U,
                      C.FORT_PAT, C.REGULAR_FRE),
     }
-
-    def _only_removes_friendly_pieces(self, before: Dict, after: Dict) -> bool:
+    # Piece boxes a removed friendly piece may land in.
+    _PIECE_POOLS = ("available", "casualties", "unavailable", "out_of_play")
+    # Not effects: the log, and dice (rolling is not an effect).
+    # Log, dice, and Control (derived from the pieces; §1.7) are never
+    # an Event's effect in their own right.
+    _NON_EFFECT_KEYS = frozenset({"history", "rng", "rng_log",
+                                  "control", "control_map",
+                                  "victory_totals"})
+
+    def _only_removes_friendly_pieces(self, changes, effects) -> bool:
         """§8.3.3 clause 2: True when the Event's ONLY effect is to remove
         one or more friendly pieces from the map without replacing them
         with other friendly pieces. "Friendly" spans the executing
         faction's Side (Glossary "Enemy" mirror; §1.5.2, §8.3.5 "remove
         the other Faction's pieces" treats the ally's pieces as friendly).
 
-        Method: exact reconstruction. Take *after*, put every removed
-        friendly piece back (per space, per tag) and restore the pool
-        entries (available/casualties/unavailable/out_of_play) for those
-        tags. If the result equals *before*, nothing else happened. Any
-        friendly placement anywhere, or any other change (support,
-        resources, markers, enemy pieces, eligibility), makes the
-        reconstruction differ → not Ineffective by this clause."""
-        from copy import deepcopy
+        Judged from the trial's change set (*changes*, a
+        `StateChanges`; *effects*, its semantically relevant keys):
+        every changed space entry must be a friendly tag that went DOWN,
+        every changed pool entry a friendly tag, and nothing else may
+        have changed. Any friendly placement anywhere, or any other
+        change (support, resources, markers, enemy pieces, eligibility)
+        → not Ineffective by this clause."""
+        from lod_ai.state.sandbox import ABSENT
         tags = self._SIDE_PIECES[self.faction]
-        b_spaces = before.get("spaces", {})
-        test = deepcopy(after)
-        t_spaces = test.get("spaces", {})
-        if set(t_spaces) != set(b_spaces):
+        if changes.spaces_membership:
+            return False
+        if effects - {"spaces", *self._PIECE_POOLS}:
             return False
         removed_any = False
-        for sid, sp_b in b_spaces.items():
-            sp_t = t_spaces[sid]
-            for tag in tags:
-                b, a = sp_b.get(tag, 0), sp_t.get(tag, 0)
-                if a > b:
-                    return False        # friendly pieces placed → replaced
-                if a < b:
-                    removed_any = True
-                    sp_t[tag] = b       # put them back
-                    if b == 0:
-                        sp_t.pop(tag, None)
+        for diff in changes.spaces.values():
+            for tag, (b, a) in diff.items():
+                if tag == "control":
+                    continue            # derived Control mirror
+                if tag not in tags:
+                    return False
+                b = 0 if b is ABSENT else b
+                a = 0 if a is ABSENT else a
+                if a >= b:
+                    return False        # placed (replaced), or no real move
+                removed_any = True
         if not removed_any:
             return False
-        for pool in ("available", "casualties", "unavailable", "out_of_play"):
-            pb, pt = before.get(pool), test.get(pool)
-            if isinstance(pb, dict) and isinstance(pt, dict):
-                for tag in tags:
-                    if tag in pb:
-                        pt[tag] = pb[tag]
-                    else:
-                        pt.pop(tag, None)
-        b_cmp = deepcopy(before)
-        for st_ in (test, b_cmp):
-            for k in ("history", "rng", "rng_log"):
-                st_.pop(k, None)
-        return test == b_cmp
+        for pool in self._PIECE_POOLS:
+            if pool not in effects:
+                continue
+            diff = changes.dict_diff(pool)
+            if diff is None or any(tag not in tags for tag in diff):
+                return False
+        return True
 
     def _is_ineffective_event(self, card: Dict, state: Dict) -> bool:
         """Return True if executing *card* would be Ineffective per §8.3.3:
         it would have no effect at all, its only effect would be to remove
         friendly pieces without replacing them, or it would shift the
         difference between Support and Opposition in favor of the enemy
-        side."""
+        side.
+
+        The handler runs on a copy-on-write trial of *state*
+        (lod_ai.state.sandbox), which records what the Event touched;
+        all three clauses are answered from that change set."""
         handler = CARD_HANDLERS.get(card["id"])
         if not handler:
             return True
-        from copy import deepcopy
-        before = deepcopy(state)
-        after = deepcopy(state)
+        from lod_ai.state.sandbox import SandboxState
+        trial = SandboxState(state)
         # Handlers read state["active"] for §8.3.6 side selection; mirror
-        # _execute_event. Set on BOTH copies so the equality test below is
-        # unaffected by the key itself.
-        before["active"] = self.faction
-        after["active"] = self.faction
+        # _execute_event (setting it is not itself an effect).
+        trial["active"] = self.faction
         shaded = card.get("dual") and self.faction in {C.PATRIOTS, C.FRENCH}
         try:
-            handler(after, shaded=shaded)
+            handler(trial, shaded=shaded)
         except Exception:
             return True  # treat as ineffective if handler crashes
+        changes = trial.changes()
+        effects = set(changes.keys) - self._NON_EFFECT_KEYS
+        if trial.get("active") == self.faction:
+            effects.discard("active")
         # §8.3.3 net-shift clause. Total Support − Total Opposition per
         # §1.6.2/§1.6.3 with §1.9 blockade-zeroed population (C1
         # precedent, Session 46; effective-pop here Session 67): a level
         # shift on a Blockaded City moves the tracked difference by 0,
         # and an Event that Blockades/un-Blockades a City moves it even
-        # with no level change.
-        def _support_diff(st):
-            sup, opp = self._support_opposition_totals(st)
-            return sup - opp
-        d_before, d_after = _support_diff(before), _support_diff(after)
-        if self.faction in (C.BRITISH, C.INDIANS) and d_after < d_before:
-            return True
-        if self.faction in (C.PATRIOTS, C.FRENCH) and d_after > d_before:
-            return True
+        # with no level change.  Only Support levels and markers feed it.
+        if effects & {"support", "markers"}:
+            if "support" in effects:
+                # Handlers may write levels straight into state["support"].
+                from lod_ai.board import totals
+                totals.refresh_rows(trial, changes.dict_diff("support") or ())
+            sup_b, opp_b = self._support_opposition_totals(state)
+            sup_a, opp_a = self._support_opposition_totals(trial)
+            d_before, d_after = sup_b - opp_b, sup_a - opp_a
+            if self.faction in (C.BRITISH, C.INDIANS) and d_after < d_before:
+                return True
+            if self.faction in (C.PATRIOTS, C.FRENCH) and d_after > d_before:
+                return True
         # §8.3.3: "where the only effect would be to remove one or more
         # friendly pieces without replacing them with other friendly pieces"
-        if self._only_removes_friendly_pieces(before, after):
+        if self._only_removes_friendly_pieces(changes, effects):
             return True
-        # No-effect comparison. Drop non-semantic keys: two deepcopies of a
-        # random.Random NEVER compare equal (identity-based __eq__), which
-        # silently disabled this clause in any state carrying the seeded
-        # rng; rng_log grows on any die roll, and rolling dice is not an
-        # effect.
-        for st_ in (before, after):
-            for k in ("history", "rng", "rng_log"):
-                st_.pop(k, None)
-        return before == after
+        # No-effect clause: nothing but the log and the dice changed.
+        return not effects
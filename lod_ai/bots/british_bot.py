@@ -14,8 +14,6 @@ Author: gizmo‑assistant – 2025‑06‑14
 
 from __future__ import annotations
 from typing import Dict, List, Tuple
-from pathlib import Path
-import json
 
 from lod_ai.bots.base_bot import BaseBot
 from lod_ai.bots.event_eval import CARD_EFFECTS
@@ -23,20 +21,19 @@ from lod_ai import rules_consts as C
 from lod_ai.board.control import refresh_control
 from lod_ai.commands import garrison, muster, march, battle
 from lod_ai.special_activities import naval_pressure, skirmish, common_cause
-from lod_ai.util.history import push_history
+from lod_ai.util.history import PASS, push_history
 from lod_ai.leaders import leader_location
 from lod_ai.bots.random_spaces import pick_by_priority
 from lod_ai.util.target_order import harm_target_order
 from lod_ai.economy.resources import can_afford, spend
 from lod_ai.map import adjacency as map_adj
+from lod_ai.state.map_loader import load_map
 from lod_ai.util.naval import has_blockade
 
 # ---------------------------------------------------------------------------
 #  Shared geography helpers
 # ---------------------------------------------------------------------------
-_MAP_DATA = json.load(
-    open(Path(__file__).resolve().parents[1] / "map" / "data" / "map.json")
-)
+_MAP_DATA = load_map()
 CITIES: List[str] = [n for n, d in _MAP_DATA.items() if d.get("type") == "City"]
 WEST_INDIES = C.WEST_INDIES_ID
 
@@ -396,7 +393,8 @@ class BritishBot(BaseBot):
         # --- B3  : Resources > 0? -----------------------------------------
         if state.get("resources", {}).get(C.BRITISH, 0) <= 0:
             state['_pass_reason'] = 'resource_gate'
-            push_history(state, "BRITISH PASS (no Resources)")
+            push_history(state, "BRITISH PASS (no Resources)", kind=PASS,
+                         data={"faction": C.BRITISH})
             return
 
         # Track which commands have been tried to implement mutual fallbacks
@@ -440,7 +438,8 @@ class BritishBot(BaseBot):
 
         # --- Otherwise PASS ------------------------------------------------
         state['_pass_reason'] = 'no_valid_command'
-        push_history(state, "BRITISH PASS")
+        push_history(state, "BRITISH PASS", kind=PASS,
+                     data={"faction": C.BRITISH})
 
     # =======================================================================
     #  SPECIAL‑ACTIVITY HELPER LOOPS  (B11 ⇄ B7)
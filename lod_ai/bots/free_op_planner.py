@@ -41,17 +41,14 @@ decline, never a planner gap.
 
 from __future__ import annotations
 
-import json
-from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 from lod_ai import rules_consts as C
 from lod_ai.map import adjacency as map_adj
+from lod_ai.state.map_loader import load_map
 from lod_ai.board.control import refresh_control
 
-_MAP_DATA = json.load(
-    open(Path(__file__).resolve().parents[1] / "map" / "data" / "map.json")
-)
+_MAP_DATA = load_map()
 
 # Tag groups (control-style tallies; Villages are Indian pieces, §1.6.5)
 _REBEL_TAGS = (C.REGULAR_PAT, C.REGULAR_FRE, C.MILITIA_A, C.MILITIA_U,
@@ -14,9 +14,7 @@ Reference: “french bot flowchart and reference.txt”
 """
 
 from __future__ import annotations
-from pathlib import Path
 from typing import Dict, List, Tuple
-import json
 
 from lod_ai.bots.base_bot import BaseBot
 from lod_ai.bots.event_eval import CARD_EFFECTS
@@ -35,8 +33,8 @@ try:
 except ImportError:  # pragma: no cover
     plg = None
 
-from lod_ai.util.history import push_history
-from lod_ai.board.control import refresh_control
+from lod_ai.util.history import PASS, push_history
+from lod_ai.board.control import control_after, refresh_control, removal
 from lod_ai.util.naval import (
     move_blockades_to_west_indies, unavailable_blockades,
     west_indies_blockades,
@@ -44,14 +42,13 @@ from lod_ai.util.naval import (
 from lod_ai.leaders import leader_location
 from lod_ai.bots.random_spaces import pick_by_priority, choose_random_space
 from lod_ai.map import adjacency as map_adj
+from lod_ai.state.map_loader import load_map
 from collections import defaultdict
 
 # ---------------------------------------------------------------------------
 #  Static data
 # ---------------------------------------------------------------------------
-_MAP_DATA = json.load(
-    open(Path(__file__).resolve().parents[1] / "map" / "data" / "map.json")
-)
+_MAP_DATA = load_map()
 WEST_INDIES = C.WEST_INDIES_ID
 _VALID_PROVINCES: List[str] = ["Quebec", "New_York", "New_Hampshire", "Massachusetts"]
 
@@ -185,7 +182,8 @@ class FrenchBot(BaseBot):
         # F3: French Resources > 0?
         if state.get("resources", {}).get(C.FRENCH, 0) <= 0:
             state['_pass_reason'] = 'resource_gate'
-            push_history(state, "FRENCH PASS (no Resources)")
+            push_history(state, "FRENCH PASS (no Resources)", kind=PASS,
+                         data={"faction": C.FRENCH})
             return
 
         treaty = state.get("toa_played", False)
@@ -195,14 +193,16 @@ class FrenchBot(BaseBot):
             if self._before_treaty(state):
                 return
             state['_pass_reason'] = 'no_valid_command'
-            push_history(state, "FRENCH PASS")
+            push_history(state, "FRENCH PASS", kind=PASS,
+                         data={"faction": C.FRENCH})
             return
 
         # -------- POST-TREATY BRANCH (F9-F17) --------------------------------
         if self._after_treaty(state):
             return
         state['_pass_reason'] = 'no_valid_command'
-        push_history(state, "FRENCH PASS")
+        push_history(state, "FRENCH PASS", kind=PASS,
+                     data={"faction": C.FRENCH})
 
     # -------------------------------------------------------------------
     #  PRE‑TREATY implementation (F5 → F8)
@@ -546,10 +546,7 @@ class FrenchBot(BaseBot):
         ctrl = state.get("control", {})
         if ctrl.get(src) != "REBELLION":
             return False
-        sp = state["spaces"][src]
-        rebel = self._rebel_pieces_in(sp) - sum(pieces_removed.values())
-        royalist = self._royalist_pieces_in(sp)
-        return rebel <= royalist
+        return control_after(state, src, removal(pieces_removed)) != "REBELLION"
 
     def _march(self, state: Dict) -> bool:
         """F14 / §8.6.5 French March (Manual wording governs).
@@ -21,8 +21,6 @@ existing command / special‑activity modules under ``lod_ai``.
 from __future__ import annotations
 
 from typing import Dict, List, Tuple
-from pathlib import Path
-import json
 
 from lod_ai.bots.base_bot import BaseBot
 from lod_ai.bots.event_eval import CARD_EFFECTS
@@ -33,17 +31,16 @@ from lod_ai.board.control import refresh_control
 from lod_ai.leaders import leader_location
 from lod_ai.bots.random_spaces import (pick_by_priority, choose_random_space,
                                        pick_random_spaces)
-from lod_ai.util.history import push_history
+from lod_ai.util.history import PASS, push_history
 from lod_ai.map import adjacency as map_adj
 from lod_ai.map.adjacency import shortest_path
+from lod_ai.state.map_loader import load_map
 from lod_ai.economy.resources import can_afford
 
 # ----------------------------------------------------------------------
 #  MAP helpers
 # ----------------------------------------------------------------------
-_MAP_DATA = json.load(
-    open(Path(__file__).resolve().parents[1] / "map" / "data" / "map.json")
-)
+_MAP_DATA = load_map()
 
 def _adjacent(space: str) -> List[str]:
     """Return adjacent spaces (bidirectional)."""
@@ -228,7 +225,8 @@ class IndianBot(BaseBot):
 
         # If nothing executed, Pass
         state['_pass_reason'] = 'no_valid_command'
-        push_history(state, "INDIANS PASS")
+        push_history(state, "INDIANS PASS", kind=PASS,
+                     data={"faction": C.INDIANS})
 
     # ==================================================================
     #  COMMAND + SA SEQUENCES  (each returns True if something executed)
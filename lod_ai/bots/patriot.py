@@ -20,8 +20,6 @@ OPS Summary: Supply, Redeploy, Desertion, BS trigger, Leader Movement.
 from __future__ import annotations
 from typing import Dict, List, Tuple, Set
 from collections import defaultdict
-import json
-from pathlib import Path
 
 from lod_ai.bots.base_bot import BaseBot
 from lod_ai.bots import event_instructions as EI
@@ -29,19 +27,18 @@ from lod_ai.bots.event_eval import CARD_EFFECTS
 from lod_ai import rules_consts as C
 from lod_ai.commands import rally, march, battle, rabble_rousing
 from lod_ai.special_activities import partisans, skirmish, persuasion
-from lod_ai.board.control import refresh_control
-from lod_ai.util.history import push_history
+from lod_ai.board.control import control_after, refresh_control, removal
+from lod_ai.util.history import PASS, push_history
 from lod_ai.leaders import leader_location
 from lod_ai.bots.random_spaces import (pick_by_priority, choose_random_space,
                                        pick_random_spaces)
 from lod_ai.map import adjacency as map_adj
+from lod_ai.state.map_loader import load_map
 
 # ---------------------------------------------------------------------------
 #  Helper constants
 # ---------------------------------------------------------------------------
-_MAP_DATA = json.load(
-    open(Path(__file__).resolve().parents[1] / "map" / "data" / "map.json")
-)
+_MAP_DATA = load_map()
 CITIES = [n for n, d in _MAP_DATA.items() if d.get("type") == "City"]
 
 # Rebel piece tags for control simulation
@@ -79,14 +76,7 @@ class PatriotBot(BaseBot):
         ctrl = state.get("control", {}).get(sid)
         if ctrl != "REBELLION":
             return False  # nothing to lose
-        sp = state["spaces"][sid]
-        rebels_after = 0
-        royalist = 0
-        for tag in _REBEL_TAGS:
-            rebels_after += max(0, sp.get(tag, 0) - to_remove.get(tag, 0))
-        for tag in _ROYALIST_TAGS:
-            royalist += sp.get(tag, 0)
-        return rebels_after <= royalist
+        return self._control_after_remove(state, sid, to_remove) != "REBELLION"
 
     def _would_gain_rebel_control(self, state: Dict, sid: str,
                                    to_add: int = 0) -> bool:
@@ -95,41 +85,19 @@ class PatriotBot(BaseBot):
         ctrl = state.get("control", {}).get(sid)
         if ctrl == "REBELLION":
             return False  # already controlled
-        sp = state["spaces"][sid]
-        rebels = self._rebel_pieces_in(sp) + to_add
-        royalist = self._royalist_pieces_in(sp)
-        return rebels > royalist
+        return self._control_after_add(state, sid, to_add) == "REBELLION"
 
     def _control_after_add(self, state: Dict, sid: str,
                            to_add: int = 1) -> str | None:
         """Control value (§1.7 semantics as in board.control) after
         adding *to_add* Rebellion pieces to *sid*."""
-        sp = state["spaces"][sid]
-        rebels = self._rebel_pieces_in(sp) + to_add
-        royalist = self._royalist_pieces_in(sp)
-        bri = (sp.get(C.REGULAR_BRI, 0) + sp.get(C.TORY, 0)
-               + sp.get(C.FORT_BRI, 0))
-        if rebels > royalist:
-            return "REBELLION"
-        if royalist > rebels and bri > 0:
-            return "BRITISH"
-        return None
+        return control_after(state, sid, {C.REGULAR_PAT: to_add})
 
     def _control_after_remove(self, state: Dict, sid: str,
                               to_remove: Dict[str, int]) -> str | None:
         """Control value (§1.7) after removing *to_remove* Rebellion
         pieces from *sid*."""
-        sp = state["spaces"][sid]
-        rebels = sum(max(0, sp.get(t, 0) - to_remove.get(t, 0))
-                     for t in _REBEL_TAGS)
-        royalist = self._royalist_pieces_in(sp)
-        bri = (sp.get(C.REGULAR_BRI, 0) + sp.get(C.TORY, 0)
-               + sp.get(C.FORT_BRI, 0))
-        if rebels > royalist:
-            return "REBELLION"
-        if royalist > rebels and bri > 0:
-            return "BRITISH"
-        return None
+        return control_after(state, sid, removal(to_remove))
 
     # ===================================================================
     #  MOVABLE PIECES HELPER (for March leave-behind rules)
@@ -262,7 +230,8 @@ class PatriotBot(BaseBot):
         # Node P3
         if state["resources"][self.faction] == 0:
             state['_pass_reason'] = 'resource_gate'
-            push_history(state, "PATRIOTS PASS (no Resources)")
+            push_history(state, "PATRIOTS PASS (no Resources)", kind=PASS,
+                         data={"faction": C.PATRIOTS})
             return
 
         # Node P6
@@ -283,7 +252,8 @@ class PatriotBot(BaseBot):
                     return
 
         state['_pass_reason'] = 'no_valid_command'
-        push_history(state, "PATRIOTS PASS")
+        push_history(state, "PATRIOTS PASS", kind=PASS,
+                     data={"faction": C.PATRIOTS})
 
     # ===================================================================
     #  EXECUTION CHAINS (with recursion guard for Rally/Rabble loop)
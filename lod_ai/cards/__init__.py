@@ -5,22 +5,136 @@ Event registry & helpers for the card system.
 Exports
 -------
 - CARD_HANDLERS : dict[int, Callable]
+- CARD_REGISTRY : dict[int, dict] -- card data (``data.json``), parsed once
 - register(card_id) -> decorator to register a handler
 - determine_eligible_factions(state, card) -> (first, second)
 
-This module also auto-imports the per-era handler modules so their
-@register decorators run at import time.
+The per-era handler modules are imported lazily: the first lookup of a
+card's handler imports the one module that registers it (the card-id ->
+module table comes from scanning the modules' ``@register(N)`` lines,
+without importing them).  Iterating or sizing CARD_HANDLERS imports all
+of them.
 """
 
 from __future__ import annotations
+from functools import lru_cache
+from pathlib import Path
 from typing import Callable, Dict, Iterable, Optional, Tuple
 import importlib
+import json
+import re
 from lod_ai import rules_consts as C
 
+_HANDLER_MODULES: Tuple[str, ...] = (
+    "lod_ai.cards.effects.early_war",
+    "lod_ai.cards.effects.middle_war",
+    "lod_ai.cards.effects.late_war",
+    "lod_ai.cards.effects.winter_quarters",
+    "lod_ai.cards.effects.brilliant_stroke",
+)
+_REGISTER_LINE = re.compile(r"^@register\((\d+)\)", re.MULTILINE)
+
+
+@lru_cache(maxsize=None)
+def handler_modules() -> Dict[int, str]:
+    """Card id -> the effect module that registers its handler."""
+    table: Dict[int, str] = {}
+    effects = Path(__file__).resolve().parent / "effects"
+    for mod in _HANDLER_MODULES:
+        path = effects / (mod.rsplit(".", 1)[1] + ".py")
+        if not path.is_file():
+            continue        # some scenarios may omit certain eras
+        for match in _REGISTER_LINE.finditer(path.read_text(encoding="utf-8")):
+            table[int(match.group(1))] = mod
+    return table
+
+
+def _import_handler_module(mod: str) -> None:
+    try:
+        importlib.import_module(mod)
+    except ModuleNotFoundError as exc:
+        # Do NOT mask missing dependencies inside an existing module.
+        if getattr(exc, "name", None) != mod:
+            raise
+
+
+class _HandlerTable(dict):
+    """card-id -> handler, filled in as the effect modules are imported."""
+
+    def _load(self, card_id) -> None:
+        if not dict.__contains__(self, card_id):
+            mod = handler_modules().get(card_id)
+            if mod is not None:
+                _import_handler_module(mod)
+
+    def _load_all(self) -> None:
+        for mod in _HANDLER_MODULES:
+            _import_handler_module(mod)
+
+    def __getitem__(self, card_id):
+        self._load(card_id)
+        return dict.__getitem__(self, card_id)
+
+    def __contains__(self, card_id) -> bool:
+        self._load(card_id)
+        return dict.__contains__(self, card_id)
+
+    def get(self, card_id, default=None):
+        self._load(card_id)
+        return dict.get(self, card_id, default)
+
+    def __setitem__(self, card_id, handler) -> None:
+        self._load(card_id)     # a later import must not clobber an override
+        dict.__setitem__(self, card_id, handler)
+
+    def setdefault(self, card_id, default=None):
+        self._load(card_id)
+        return dict.setdefault(self, card_id, default)
+
+    def pop(self, card_id, *default):
+        self._load(card_id)
+        return dict.pop(self, card_id, *default)
+
+    def __delitem__(self, card_id) -> None:
+        self._load(card_id)
+        dict.__delitem__(self, card_id)
+
+    def __iter__(self):
+        self._load_all()
+        return dict.__iter__(self)
+
+    def __len__(self) -> int:
+        self._load_all()
+        return dict.__len__(self)
+
+    def keys(self):
+        self._load_all()
+        return dict.keys(self)
+
+    def values(self):
+        self._load_all()
+        return dict.values(self)
+
+    def items(self):
+        self._load_all()
+        return dict.items(self)
+
+    def copy(self) -> Dict[int, Callable]:
+        self._load_all()
+        return dict(dict.items(self))
+
+
 # ---------------------------------------------------------------------------
 # Global registry of card-id -> handler(state, shaded=False)
 # ---------------------------------------------------------------------------
-CARD_HANDLERS: Dict[int, Callable] = {}
+CARD_HANDLERS: Dict[int, Callable] = _HandlerTable()
+
+# Card data, parsed once and shared (setup_state builds decks from it).
+CARD_REGISTRY: Dict[int, dict] = {
+    int(c["id"]): c
+    for c in json.loads((Path(__file__).resolve().parent / "data.json")
+                        .read_text(encoding="utf-8"))
+}
 
 
 def register(card_id: int) -> Callable[[Callable], Callable]:
@@ -34,9 +148,9 @@ def register(card_id: int) -> Callable[[Callable], Callable]:
     If a handler for the same id already exists, raise ValueError.
     """
     def _decorator(func: Callable) -> Callable:
-        if card_id in CARD_HANDLERS:
+        if dict.__contains__(CARD_HANDLERS, card_id):
             raise ValueError(f"Card {card_id} already has a registered handler")
-        CARD_HANDLERS[card_id] = func
+        dict.__setitem__(CARD_HANDLERS, card_id, func)
         return func
     return _decorator
 
@@ -91,36 +205,8 @@ def determine_eligible_factions(state: dict, card: dict) -> Tuple[Optional[str],
     return first, second
 
 
-# ---------------------------------------------------------------------------
-# Ensure handlers are imported so @register calls execute
-# ---------------------------------------------------------------------------
-def _ensure_handlers_imported() -> None:
-    """
-    Import handler modules (safe if absent). This causes their @register
-    decorators to run and populate CARD_HANDLERS.
-    """
-    modules: Iterable[str] = (
-        "lod_ai.cards.effects.early_war",
-        "lod_ai.cards.effects.middle_war",
-        "lod_ai.cards.effects.late_war",
-        "lod_ai.cards.effects.winter_quarters",
-        "lod_ai.cards.effects.brilliant_stroke",
-    )
-    for mod in modules:
-        try:
-            importlib.import_module(mod)
-        except ModuleNotFoundError as exc:
-            # Some scenarios may omit certain eras; that's fine.
-            # But do NOT mask missing dependencies inside an existing module.
-            if getattr(exc, "name", None) == mod:
-                continue
-            raise
-
-
-# Import at module load so registry is ready for bots/engine.
-_ensure_handlers_imported()
-
-__all__ = ["CARD_HANDLERS", "register", "determine_eligible_factions", "get_faction_order"]
+__all__ = ["CARD_HANDLERS", "CARD_REGISTRY", "register", "determine_eligible_factions",
+           "get_faction_order", "handler_modules"]
 
 
 # ---------------------------------------------------------------------------
@@ -9,7 +9,7 @@ brilliant_stroke.py  –  cards 105-109
 """
 
 from lod_ai.cards import register
-from lod_ai.util.history import push_history
+from lod_ai.util.history import TREATY, push_history
 from lod_ai.util.free_ops import queue_free_op
 from lod_ai.cards.effects.shared import adjust_fni
 from lod_ai.board.pieces import move_piece, place_piece
@@ -327,4 +327,4 @@ def evt_109_treaty_of_alliance(state, shaded=False):
             C.BRITISH: True, C.PATRIOTS: True,
             C.FRENCH: True, C.INDIANS: True,
         }
-        push_history(state, "Treaty of Alliance played")
+        push_history(state, "Treaty of Alliance played", kind=TREATY)
@@ -70,6 +70,7 @@ from lod_ai.rules_consts import (
     FRENCH,
     BRITISH,
     INDIANS,
+    ACTIVE_SUPPORT,
 )
 from lod_ai.util.history import push_history
 from lod_ai.util.free_ops import queue_free_op
@@ -16,6 +16,7 @@ from lod_ai.board.pieces import (
     move_piece, place_piece, remove_piece, place_with_caps, place_marker,
     flip_pieces,
 )
+from lod_ai.board.totals import set_support
 from lod_ai.rules_consts import MAX_FNI, MIN_RESOURCES, MAX_RESOURCES, BRITISH, PATRIOTS, FRENCH, INDIANS
 from lod_ai.util.loss_mod import queue_loss_mod
 from lod_ai.map import adjacency as _madj
@@ -73,7 +74,7 @@ def shift_support(state, space_id: str, delta: int) -> None:
     cur0 = state.get("support", {}).get(space_id, 0)
     new = max(MIN_SUPPORT, min(MAX_SUPPORT, cur0 + delta))
     if new != cur0:
-        state.setdefault("support", {})[space_id] = new
+        set_support(state, space_id, new)
         push_history(state, f"Support shift in {space_id}: {cur0:+d} → {new:+d}")
 
 # --------------------------------------------------------------------------- #
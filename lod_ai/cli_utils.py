@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import io
 import sys
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Iterable, List, Tuple, TypeVar
+from typing import Iterable, Iterator, List, Tuple, TypeVar
 
 T = TypeVar("T")
 
@@ -18,17 +22,22 @@ class UndoException(Exception):
 
 
 # ---------------------------------------------------------------------------
-# Global state reference for meta-commands (set by interactive_cli.main)
+# Game reference for meta-commands (set by interactive_cli.main).  These and
+# the input provider below are context variables, so every thread and asyncio
+# task that drives its own game sees only its own (see `game_session`).
 # ---------------------------------------------------------------------------
-_game_state = None
-_engine_ref = None  # optional Engine reference for bug reports
-_undo_checkpoint = None
+_GAME_STATE: ContextVar = ContextVar("lod_game_state", default=None)
+_ENGINE: ContextVar = ContextVar("lod_engine", default=None)  # for bug reports
+_UNDO_CHECKPOINT: ContextVar = ContextVar("lod_undo_checkpoint", default=None)
+# state.journal.Journal driving multi-level undo/redo
+_UNDO_JOURNAL: ContextVar = ContextVar("lod_undo_journal", default=None)
 
 # ---------------------------------------------------------------------------
 # Pluggable input provider (lets a non-stdin driver -- e.g. an LLM harness --
 # answer the menu prompts).  Default behaviour is unchanged: read from stdin.
 # ---------------------------------------------------------------------------
-_last_menu = None  # structured description of the most recently shown prompt
+# structured description of the most recently shown prompt
+_LAST_MENU: ContextVar = ContextVar("lod_last_menu", default=None)
 
 
 class StdinInputProvider:
@@ -38,7 +47,20 @@ class StdinInputProvider:
         return input(label)
 
 
-_input_provider = StdinInputProvider()
+class NoInputProvider:
+    """Provider for zero-player runs: any prompt raises EOFError instead of
+    blocking on stdin.  ``interactive = False`` tells the engine no human
+    can answer (`Engine._interactive_input`)."""
+
+    interactive = False
+
+    def prompt(self, label: str, menu) -> str:
+        raise EOFError(f"No input available for prompt {label!r}")
+
+
+_STDIN_PROVIDER = StdinInputProvider()
+_INPUT_PROVIDER: ContextVar = ContextVar("lod_input_provider",
+                                         default=_STDIN_PROVIDER)
 
 
 def set_input_provider(provider) -> None:
@@ -47,41 +69,141 @@ def set_input_provider(provider) -> None:
     A provider must expose ``prompt(label: str, menu: dict | None) -> str`` and
     return the raw text a human would have typed (e.g. ``"3"`` to pick option 3,
     or a number for a count prompt).  ``menu`` carries structured context about
-    the choice being made (see ``_last_menu``)."""
-    global _input_provider
-    _input_provider = provider if provider is not None else StdinInputProvider()
+    the choice being made (see ``get_last_menu``).  The provider applies to
+    the current thread / asyncio task only."""
+    _INPUT_PROVIDER.set(provider if provider is not None else _STDIN_PROVIDER)
 
 
 def get_input_provider():
-    return _input_provider
+    return _INPUT_PROVIDER.get()
 
 
 def get_last_menu():
-    return _last_menu
-
+    return _LAST_MENU.get()
 
 
 def set_game_state(state, engine=None) -> None:
     """Register the live game state so meta-commands can access it."""
-    global _game_state, _engine_ref
-    _game_state = state
-    _engine_ref = engine
+    _GAME_STATE.set(state)
+    _ENGINE.set(engine)
+
+
+@contextmanager
+def game_session(provider=None, *, state=None, engine=None) -> Iterator[None]:
+    """Install *provider* and the live game (as `set_input_provider` and
+    `set_game_state`) for the duration of the block, then restore what was
+    there before.  Like those setters it only affects the current thread or
+    asyncio task, so concurrent games each keep their own prompts."""
+    tokens = [
+        (_INPUT_PROVIDER, _INPUT_PROVIDER.set(
+            provider if provider is not None else _STDIN_PROVIDER)),
+        (_GAME_STATE, _GAME_STATE.set(state)),
+        (_ENGINE, _ENGINE.set(engine)),
+        (_LAST_MENU, _LAST_MENU.set(None)),
+    ]
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+# Where the current thread / asyncio task's prints go (None: the real stdout).
+_STDOUT: ContextVar = ContextVar("lod_stdout", default=None)
+
+
+class _RoutedStdout:
+    """``sys.stdout`` stand-in that writes to the current context's target
+    (see `quiet_output`) and otherwise to the stream it replaced."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def _target(self):
+        target = _STDOUT.get()
+        return self.stream if target is None else target
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        return self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._target(), name)
+
+
+# The installed `_RoutedStdout` and how many quiet blocks are open.
+_ROUTING_LOCK = threading.Lock()
+_ROUTED: _RoutedStdout | None = None
+_QUIET_BLOCKS = 0
+
+
+@contextmanager
+def quiet_output() -> Iterator[None]:
+    """Discard what the current thread / asyncio task prints in the block.
+    Unlike ``contextlib.redirect_stdout`` this leaves every other thread's
+    output alone, so concurrent games can each be quiet or not.
+
+    ``sys.stdout`` is routed while any quiet block is open, and the stream
+    it replaced is put back when the last one closes.
+    """
+    global _ROUTED, _QUIET_BLOCKS
+    with _ROUTING_LOCK:
+        if _QUIET_BLOCKS == 0:
+            _ROUTED = _RoutedStdout(sys.stdout)
+            sys.stdout = _ROUTED
+        _QUIET_BLOCKS += 1
+    token = _STDOUT.set(io.StringIO())
+    try:
+        yield
+    finally:
+        _STDOUT.reset(token)
+        with _ROUTING_LOCK:
+            _QUIET_BLOCKS -= 1
+            if _QUIET_BLOCKS == 0:
+                # Unless someone replaced it meanwhile.
+                if _ROUTED is not None and sys.stdout is _ROUTED:
+                    sys.stdout = _ROUTED.stream
+                _ROUTED = None
 
 
 def set_undo_checkpoint(state_copy) -> None:
     """Store a deep copy of the game state as an undo checkpoint."""
-    global _undo_checkpoint
-    _undo_checkpoint = state_copy
+    _UNDO_CHECKPOINT.set(state_copy)
 
 
 def get_undo_checkpoint():
     """Return the current undo checkpoint (or None)."""
-    return _undo_checkpoint
+    return _UNDO_CHECKPOINT.get()
+
+
+def set_undo_journal(journal) -> None:
+    """Register the game's `lod_ai.state.journal.Journal` (or None).
+
+    With a journal, ``undo [N]`` / ``redo [N]`` step through its marks
+    (one per card); otherwise ``undo`` restores the checkpoint."""
+    _UNDO_JOURNAL.set(journal)
+
+
+def get_undo_journal():
+    """Return the registered undo journal (or None)."""
+    return _UNDO_JOURNAL.get()
+
+
+def _step_count(words: List[str]) -> int | None:
+    """N from ``undo N`` / ``redo N`` (1 when omitted; None if malformed)."""
+    if len(words) == 1:
+        return 1
+    if len(words) == 2 and words[1].isdigit() and int(words[1]) > 0:
+        return int(words[1])
+    return None
 
 
 def _save_bug_report() -> None:
     """Prompt for description and save a bug report snapshot."""
-    if _game_state is None:
+    game_state, engine = _GAME_STATE.get(), _ENGINE.get()
+    if game_state is None:
         print("(No game state available yet.)")
         return
 
@@ -95,19 +217,19 @@ def _save_bug_report() -> None:
     seed = None
     scenario = None
     setup_method = None
-    if _engine_ref is not None:
-        human_factions = getattr(_engine_ref, "human_factions", None)
-    seed = _game_state.get("_seed")
-    scenario = _game_state.get("_scenario")
-    setup_method = _game_state.get("_setup_method")
+    if engine is not None:
+        human_factions = getattr(engine, "human_factions", None)
+    seed = game_state.get("_seed")
+    scenario = game_state.get("_scenario")
+    setup_method = game_state.get("_setup_method")
 
     # Gather diagnostic logs from state
-    wizard_log = _game_state.get("_cli_wizard_log")
-    sa_log = _game_state.get("_cli_sa_log")
-    rejection_log = _game_state.get("_cli_rejection_log")
+    wizard_log = game_state.get("_cli_wizard_log")
+    sa_log = game_state.get("_cli_sa_log")
+    rejection_log = game_state.get("_cli_rejection_log")
 
     report = build_bug_report(
-        _game_state,
+        game_state,
         description,
         human_factions=human_factions,
         seed=seed,
@@ -126,46 +248,51 @@ def _save_bug_report() -> None:
 
 def _handle_meta_command(raw: str) -> bool:
     """Check for status/history/victory/bug/help/quit meta-commands. Returns True if handled."""
+    game_state, engine = _GAME_STATE.get(), _ENGINE.get()
     cmd = raw.strip().lower()
+    words = cmd.split()
+    if words and words[0] in ("undo", "u", "redo") and \
+            _step_count(words) is not None:
+        return _undo_redo(words[0] == "redo", _step_count(words))
     if cmd in ("status", "s"):
-        if _game_state is not None:
+        if game_state is not None:
             from lod_ai.cli_display import display_board_state
-            display_board_state(_game_state)
+            display_board_state(game_state)
         else:
             print("(No game state available yet.)")
         return True
     if cmd in ("history", "h"):
-        if _game_state is not None:
+        if game_state is not None:
             from lod_ai.cli_display import display_history
-            display_history(_game_state)
+            display_history(game_state)
         else:
             print("(No game state available yet.)")
         return True
     if cmd in ("victory", "v"):
-        if _game_state is not None:
+        if game_state is not None:
             from lod_ai.cli_display import display_victory_margins
             from lod_ai.rules_consts import FORT_PAT, VILLAGE
             print("\n  --- Victory Margins ---")
-            display_victory_margins(_game_state)
+            display_victory_margins(game_state)
 
             # Show raw numbers that feed into the margins
             sup_total = 0
             opp_total = 0
-            for sid, lvl in _game_state.get("support", {}).items():
+            for sid, lvl in game_state.get("support", {}).items():
                 if lvl > 0:
                     sup_total += lvl
                 elif lvl < 0:
                     opp_total += abs(lvl)
-            cbc = _game_state.get("cbc", 0)
-            crc = _game_state.get("crc", 0)
+            cbc = game_state.get("cbc", 0)
+            crc = game_state.get("crc", 0)
 
             forts = sum(
                 sp.get(FORT_PAT, 0)
-                for sp in _game_state.get("spaces", {}).values()
+                for sp in game_state.get("spaces", {}).values()
             )
             villages = sum(
                 sp.get(VILLAGE, 0)
-                for sp in _game_state.get("spaces", {}).values()
+                for sp in game_state.get("spaces", {}).values()
             )
 
             print(f"\n  Support Total: {sup_total}  |  Opposition Total: {opp_total}")
@@ -176,9 +303,9 @@ def _handle_meta_command(raw: str) -> bool:
             print("(No game state available yet.)")
         return True
     if cmd in ("deck", "d"):
-        if _game_state is not None:
-            deck = _game_state.get("deck", [])
-            played = _game_state.get("played_cards", [])
+        if game_state is not None:
+            deck = game_state.get("deck", [])
+            played = game_state.get("played_cards", [])
 
             # Find next Winter Quarters card
             wq_distance = None
@@ -196,7 +323,7 @@ def _handle_meta_command(raw: str) -> bool:
             print(f"\n  --- Deck ---")
             print(f"  Cards played: {len(played)}")
             print(f"  Cards remaining: {len(deck)}")
-            mode = _game_state.get("_deck_display_mode", "exact")
+            mode = game_state.get("_deck_display_mode", "exact")
             if wq_distance is not None:
                 if mode == "fuzzy":
                     if wq_distance <= 4:
@@ -212,24 +339,13 @@ def _handle_meta_command(raw: str) -> bool:
         else:
             print("(No game state available yet.)")
         return True
-    if cmd in ("undo", "u"):
-        if _undo_checkpoint is not None and _engine_ref is not None:
-            import copy
-            restored = copy.deepcopy(_undo_checkpoint)
-            _engine_ref.state.clear()
-            _engine_ref.state.update(restored)
-            print("  Undone! Replaying current card...")
-            raise UndoException()
-        else:
-            print("(No undo checkpoint available.)")
-        return True
     if cmd in ("bug", "b"):
         _save_bug_report()
         return True
     if cmd in ("save", "w"):
-        if _engine_ref is not None:
+        if engine is not None:
             from lod_ai.save_game import save_game
-            filepath = save_game(_engine_ref.state, _engine_ref.human_factions)
+            filepath = save_game(engine.state, engine.human_factions)
             print(f"  Game saved to: {filepath}")
         else:
             print("(No game in progress to save.)")
@@ -241,6 +357,8 @@ def _handle_meta_command(raw: str) -> bool:
         print("    deck    / d  — Show cards played/remaining and next Winter Quarters")
         print("    history / h  — Show game log")
         print("    undo    / u  — Revert to start of current card")
+        print("    undo N       — ... and of the N-1 cards before it")
+        print("    redo [N]     — Re-play N undone cards")
         print("    bug     / b  — File a bug report")
         print("    save    / w  — Save game to file")
         print("    help    / ?  — Show this help")
@@ -253,10 +371,43 @@ def _handle_meta_command(raw: str) -> bool:
     return False
 
 
+def _undo_redo(redo: bool, steps: int) -> bool:
+    """Meta-command ``undo [N]`` / ``redo [N]``; raises UndoException so
+    the game loop restarts from the restored card boundary."""
+    journal, engine = _UNDO_JOURNAL.get(), _ENGINE.get()
+    checkpoint = _UNDO_CHECKPOINT.get()
+    if journal is not None and (engine is None
+                                or journal.state is engine.state):
+        if redo:
+            if not journal.can_redo:
+                print("(Nothing to redo.)")
+                return True
+            done = journal.redo(steps)
+            print(f"  Redone {done} card{'s' if done != 1 else ''}! "
+                  f"Resuming...")
+        else:
+            done = journal.undo(steps - 1)
+            print("  Undone! Replaying current card..." if not done else
+                  f"  Undone! Replaying from {done + 1} cards back...")
+        raise UndoException()
+    if redo:
+        print("(No undo journal available.)")
+        return True
+    if checkpoint is not None and engine is not None:
+        import copy
+        restored = copy.deepcopy(checkpoint)
+        engine.state.clear()
+        engine.state.update(restored)
+        print("  Undone! Replaying current card...")
+        raise UndoException()
+    print("(No undo checkpoint available.)")
+    return True
+
+
 def _prompt_input(label: str = "Select: ") -> str:
     """Read input via the active provider, handling meta-commands transparently."""
     while True:
-        raw = _input_provider.prompt(label, _last_menu).strip()
+        raw = _INPUT_PROVIDER.get().prompt(label, _LAST_MENU.get()).strip()
         if _handle_meta_command(raw):
             continue
         return raw
@@ -264,7 +415,6 @@ def _prompt_input(label: str = "Select: ") -> str:
 
 def _print_menu(prompt: str, options: List[Tuple[str, T]], *, allow_back: bool,
                  back_label: str = "Back") -> None:
-    global _last_menu
     print(prompt)
     labels = []
     for idx, (label, _) in enumerate(options, 1):
@@ -272,13 +422,13 @@ def _print_menu(prompt: str, options: List[Tuple[str, T]], *, allow_back: bool,
         labels.append(str(label))
     if allow_back:
         print(f"  0. {back_label}")
-    _last_menu = {
+    _LAST_MENU.set({
         "kind": "select",
         "prompt": prompt,
         "options": labels,
         "allow_back": allow_back,
         "back_label": back_label,
-    }
+    })
 
 
 def choose_one(prompt: str, options: Iterable[Tuple[str, T]], *, allow_back: bool = False) -> T | None:
@@ -350,7 +500,6 @@ def choose_multiple(
 
 
 def choose_count(prompt: str, *, min_val: int = 0, max_val: int = 10, default: int | None = None) -> int:
-    global _last_menu
     if max_val < min_val:
         # Impossible range (e.g. a wizard asking for >=1 of a piece that has 0
         # available) would otherwise loop forever on any input.
@@ -360,13 +509,13 @@ def choose_count(prompt: str, *, min_val: int = 0, max_val: int = 10, default: i
     default_hint = f" (default {default})" if default is not None else ""
     while True:
         print(f"{prompt}{default_hint} [{min_val}-{max_val}]")
-        _last_menu = {
+        _LAST_MENU.set({
             "kind": "count",
             "prompt": prompt,
             "min": min_val,
             "max": max_val,
             "default": default,
-        }
+        })
         raw = _prompt_input()
         if raw == "" and default is not None:
             return default
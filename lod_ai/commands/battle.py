@@ -27,7 +27,12 @@ Win the Day (§3.6.8) includes:
 """
 
 from __future__ import annotations
-from typing import Dict, List, Optional
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 from lod_ai.rules_consts import (
     # Pieces
@@ -46,11 +51,12 @@ from lod_ai.rules_consts import (
 )
 from lod_ai.leaders        import leader_location
 from lod_ai.util.piece_kinds import is_cube, loss_value
-from lod_ai.util.history   import push_history
+from lod_ai.util.history   import BATTLE, BATTLE_RESULT, push_history
 from lod_ai.util.caps      import refresh_control, enforce_global_caps
 from lod_ai.board.pieces   import remove_piece, add_piece, increment_casualties
+from lod_ai.board.totals   import set_support
 from lod_ai.economy.resources import spend, can_afford
-from lod_ai.util.loss_mod  import pop_loss_mod
+from lod_ai.util.loss_mod  import pop_loss_mod, peek_loss_mod
 from lod_ai.util.naval     import has_blockade, move_blockade_city_to_city
 from lod_ai.map             import adjacency as map_adj
 
@@ -88,6 +94,9 @@ def execute(
         raise ValueError("French cannot Battle before Treaty of Alliance")
     if not spaces:
         raise ValueError("Need >= 1 battle space")
+    observer = _BATTLE_OBSERVER.get()
+    if observer is not None:
+        observer(state, faction, ctx, spaces, free)
 
     state["_turn_command"] = COMMAND_NAME
     state.setdefault("_turn_affected_spaces", set()).update(spaces)
@@ -136,7 +145,8 @@ def execute(
         if pay > 0:
             spend(state, PATRIOTS, pay)
 
-    push_history(state, f"{faction} BATTLE in {', '.join(spaces)}")
+    push_history(state, f"{faction} BATTLE in {', '.join(spaces)}",
+                 kind=BATTLE, data={"faction": faction, "spaces": list(spaces)})
 
     attacker_bonus = (choices or {}).get("force_bonus", 0)
 
@@ -240,21 +250,46 @@ def _rebellion_attacker_leader_present(state, sid, attacker_faction, ally_involv
 # §3.6.3 defender Underground-activation hook.  The interactive CLI registers a
 # function so a HUMAN defending side can choose how many of its own Underground
 # units to Activate; bot-only games (and tests) leave it None and use the
-# flowchart heuristics below.
-_DEFENDER_ACTIVATION_HOOK = None
+# flowchart heuristics below.  A context variable, so the hook registered by
+# one thread / asyncio task's game does not answer for another's.
+_DEFENDER_ACTIVATION_HOOK: ContextVar = ContextVar(
+    "lod_defender_activation_hook", default=None)
+
+# Observer called as ``fn(state, faction, ctx, spaces, free)`` at the start of
+# every Battle Command (tools such as battle_benchmark measure the bots'
+# selections with it).  Context-local like the hook above.
+_BATTLE_OBSERVER: ContextVar = ContextVar("lod_battle_observer", default=None)
 
 
 def set_defender_activation_hook(fn) -> None:
-    """Register (or clear with None) the human defender-activation prompt."""
-    global _DEFENDER_ACTIVATION_HOOK
-    _DEFENDER_ACTIVATION_HOOK = fn
+    """Register (or clear with None) the human defender-activation prompt
+    for the current thread / asyncio task."""
+    _DEFENDER_ACTIVATION_HOOK.set(fn)
+
+
+def get_defender_activation_hook():
+    """Return the registered defender-activation prompt (or None)."""
+    return _DEFENDER_ACTIVATION_HOOK.get()
+
 
+@contextmanager
+def observe_battles(fn: Callable[..., None]) -> Iterator[None]:
+    """Call *fn* before each Battle Command executed in this block (in the
+    current thread / asyncio task)."""
+    token = _BATTLE_OBSERVER.set(fn)
+    try:
+        yield
+    finally:
+        _BATTLE_OBSERVER.reset(token)
 
-def _resolve_defender_activation(state, sp, sid, def_side) -> None:
+
+def _resolve_defender_activation(state, sp, sid, def_side,
+                                 ask_human: bool = True) -> None:
     """§3.6.3: the DEFENDING side may Activate its own Underground units to add
     half of them to its defending Force Level.  Royalist defenders' Underground
     units are War Parties (the Indians' decision, §8.7.9); Rebellion defenders'
-    are Militia (the Patriots' decision, §3.6.1)."""
+    are Militia (the Patriots' decision, §3.6.1).  With *ask_human* False a
+    human owner is not prompted and Activates none."""
     if def_side == "ROYALIST":
         ug_tag, act_tag, owner = WARPARTY_U, WARPARTY_A, INDIANS
     else:
@@ -264,8 +299,9 @@ def _resolve_defender_activation(state, sp, sid, def_side) -> None:
         return
 
     humans = state.get("human_factions", set())
-    if owner in humans and _DEFENDER_ACTIVATION_HOOK is not None:
-        count = _DEFENDER_ACTIVATION_HOOK(state, sid, def_side, owner, n_ug, ug_tag)
+    hook = _DEFENDER_ACTIVATION_HOOK.get()
+    if owner in humans and ask_human and hook is not None:
+        count = hook(state, sid, def_side, owner, n_ug, ug_tag)
         count = max(0, min(int(count or 0), n_ug))
     elif def_side == "ROYALIST" and owner not in humans:
         # §8.7.9 Indian bot: Activate all but 1 Underground WP if a Village is
@@ -281,6 +317,25 @@ def _resolve_defender_activation(state, sp, sid, def_side) -> None:
         sp[act_tag] = sp.get(act_tag, 0) + count
 
 
+def _activate_attacker(sp, attacker_faction, count, ally_involved) -> None:
+    """§3.6.3: Activate up to *count* of the attacker's Underground units."""
+    if count <= 0:
+        return
+    if attacker_faction in (PATRIOTS, FRENCH):
+        # Militia may be Activated only "if Patriots paid": always for a
+        # Patriot Battle; for a French Battle only where Patriots are paid.
+        if attacker_faction == PATRIOTS or ally_involved:
+            _flip = min(count, sp.get(MILITIA_U, 0))
+            if _flip > 0:
+                sp[MILITIA_U] -= _flip
+                sp[MILITIA_A] = sp.get(MILITIA_A, 0) + _flip
+    elif attacker_faction == BRITISH:
+        _flip = min(count, sp.get(WARPARTY_U, 0))
+        if _flip > 0:
+            sp[WARPARTY_U] -= _flip
+            sp[WARPARTY_A] = sp.get(WARPARTY_A, 0) + _flip
+
+
 # -------- Internal helpers --------
 def _roll_d3(state: Dict) -> int:
     val = state["rng"].randint(1, 3)
@@ -677,14 +732,135 @@ def _apply_shifts_to(
     for i in range(remaining):
         cur = state.get("support", {}).get(space_id, NEUTRAL)
         if winner == "ROYALIST" and cur < ACTIVE_SUPPORT:
-            state.setdefault("support", {})[space_id] = cur + 1
+            set_support(state, space_id, cur + 1)
         elif winner == "REBELLION" and cur > ACTIVE_OPPOSITION:
-            state.setdefault("support", {})[space_id] = cur - 1
+            set_support(state, space_id, cur - 1)
         else:
             return remaining - i
     return 0
 
 
+# -------- Casualties and winner (S3.6.7-3.6.8) --------
+# Pieces that absorb losses or keep a side in the space (Underground
+# pieces do neither).
+_LOSS_TAGS = {
+    "ROYALIST": (REGULAR_BRI, TORY, WARPARTY_A, VILLAGE, FORT_BRI),
+    "REBELLION": (REGULAR_FRE, REGULAR_PAT, MILITIA_A, FORT_PAT),
+}
+
+
+def _casualty_plan(counts, side: str, loss: int, *, is_defending: bool,
+                   cc_wp: int = 0) -> List[str]:
+    """S3.6.7: the pieces *side* removes to cover *loss*, in removal order.
+
+    Alternates Regulars/Tories (Royalist) or French Regulars/Continentals/
+    Active Militia (Rebellion), then Active War Parties; a defender then
+    loses Villages and Forts.  *counts* maps tag -> pieces present and is
+    not modified.
+
+    Q19 (resolved by reference, S55): Common-Cause War Parties are
+    utilized "as if they were Tories" (§4.2.1) and the Playbook is
+    explicit — "if the Common Cause Special Activity was used — as
+    a Tory adding to Force Level AND ABSORBING LOSSES" (Playbook
+    p.~850, Indian War Parties in Battle).  So up to cc_wp Active
+    War Parties fill the TORY slot of the Regulars/Tories
+    alternation.  Within the slot the loaned WP absorbs before the
+    British's own Tories (§8.1.2 spirit: "if possible without
+    removing the last Tory"; a WP routes to Available and counts
+    toward no casualties track — War Parties are not cubes, §3.6.7
+    "Other removed pieces to Available").
+    """
+    plan: List[str] = []
+    if loss <= 0:
+        return plan
+    left = {tag: counts.get(tag, 0) for tag in _LOSS_TAGS[side]}
+    remaining = loss
+
+    def _take_one(tag: str) -> bool:
+        nonlocal remaining
+        if left[tag] <= 0 or remaining <= 0:
+            return False
+        left[tag] -= 1
+        plan.append(tag)
+        remaining -= loss_value(tag)
+        return True
+
+    if side == "ROYALIST":
+        cc_left = cc_wp
+
+        def _take_tory_slot() -> bool:
+            """One removal from the Tory slot: CC War Parties first
+            (Q19 — they absorb "as a Tory"), then real Tories."""
+            nonlocal cc_left
+            if cc_left > 0 and left[WARPARTY_A] > 0:
+                cc_left -= 1
+                return _take_one(WARPARTY_A)
+            return _take_one(TORY)
+
+        # Phase 1: Alternate Regulars and Tories (CC WP in Tory slot)
+        while remaining > 0:
+            took_reg = _take_one(REGULAR_BRI)
+            if remaining > 0:
+                took_tory = _take_tory_slot()
+            else:
+                break
+            if not took_reg and not took_tory:
+                break
+        # Phase 2: Active War Parties (to Available)
+        while _take_one(WARPARTY_A):
+            pass
+        # Phase 3: If Defending only -- Villages then Forts
+        # (§3.6.7: "Forts also count as Casualties but return to
+        # Available immediately.")
+        if is_defending:
+            while _take_one(VILLAGE):
+                pass
+            while _take_one(FORT_BRI):
+                pass
+    else:
+        # Phase 1: Alternate French Regulars, Continentals, Active Militia
+        while remaining > 0:
+            took_fre = _take_one(REGULAR_FRE)
+            took_pat = _take_one(REGULAR_PAT)
+            took_mil = _take_one(MILITIA_A)
+            if not took_fre and not took_pat and not took_mil:
+                break
+        # Phase 2: If Defending only -- Forts
+        if is_defending:
+            while _take_one(FORT_PAT):
+                pass
+    return plan
+
+
+def _lost_cube_or_fort(plan: List[str]) -> bool:
+    return any(is_cube(tag) or tag in (FORT_BRI, FORT_PAT) for tag in plan)
+
+
+def _side_alive(counts, side: str) -> bool:
+    """§3.6.8 elimination check (Underground pieces do not count)."""
+    return any(counts.get(tag, 0) > 0 for tag in _LOSS_TAGS[side])
+
+
+def _battle_winner(att_side: str, def_side: str, counts,
+                   att_lost: int, def_lost: int) -> str | None:
+    """§3.6.8 winner from the pieces left (*counts*) and pieces lost."""
+    att_alive = _side_alive(counts, att_side)
+    def_alive = _side_alive(counts, def_side)
+    if not att_alive and not def_alive:
+        # §3.6.8: "If both sides are eliminated … there is no winner or loser."
+        return None
+    if not att_alive:
+        return def_side
+    if not def_alive:
+        return att_side
+    if att_lost < def_lost:
+        # Attacker lost fewer → attacker wins
+        return att_side
+    # Defender lost fewer → defender wins; §3.6.8: "Defender is the
+    # winner if equal."
+    return def_side
+
+
 # -------- Single-space battle --------
 def _resolve_space(
     state: Dict,
@@ -709,20 +885,7 @@ def _resolve_space(
     # §3.6.3: the attacking side may Activate its own Underground units to add
     # half of them to its Force Level.  Caller-chosen (humans via the CLI; the
     # bots follow their flowcharts and pass nothing).
-    if attacker_activate > 0:
-        if attacker_faction in (PATRIOTS, FRENCH):
-            # Militia may be Activated only "if Patriots paid": always for a
-            # Patriot Battle; for a French Battle only where Patriots are paid.
-            if attacker_faction == PATRIOTS or ally_involved:
-                _flip = min(attacker_activate, sp.get(MILITIA_U, 0))
-                if _flip > 0:
-                    sp[MILITIA_U] -= _flip
-                    sp[MILITIA_A] = sp.get(MILITIA_A, 0) + _flip
-        elif attacker_faction == BRITISH:
-            _flip = min(attacker_activate, sp.get(WARPARTY_U, 0))
-            if _flip > 0:
-                sp[WARPARTY_U] -= _flip
-                sp[WARPARTY_A] = sp.get(WARPARTY_A, 0) + _flip
+    _activate_attacker(sp, attacker_faction, attacker_activate, ally_involved)
 
     def _force(side: str, is_defending: bool) -> int:
         """S3.6.2-3.6.3: delegate to the shared module-level force_level()."""
@@ -758,105 +921,17 @@ def _resolve_space(
 
     # -- Casualty removal (S3.6.7) --
     def _remove(side: str, loss: int) -> tuple[int, bool]:
-        """Alternate removal per S3.6.7. Underground pieces ignored.
-
-        Q19 (resolved by reference, S55): Common-Cause War Parties are
-        utilized "as if they were Tories" (§4.2.1) and the Playbook is
-        explicit — "if the Common Cause Special Activity was used — as
-        a Tory adding to Force Level AND ABSORBING LOSSES" (Playbook
-        p.~850, Indian War Parties in Battle).  So up to cc_wp Active
-        War Parties fill the TORY slot of the Regulars/Tories
-        alternation.  Within the slot the loaned WP absorbs before the
-        British's own Tories (§8.1.2 spirit: "if possible without
-        removing the last Tory"; a WP routes to Available and counts
-        toward no casualties track — War Parties are not cubes, §3.6.7
-        "Other removed pieces to Available").
-        """
-        if loss <= 0:
-            return 0, False
-
-        is_defending = (side == def_side)
-        removed = 0
-        removed_cube_or_fort = False
-        remaining_loss = loss
-        cc_left = cc_wp if side == "ROYALIST" else 0
-
-        def _take_one(tag: str) -> bool:
-            nonlocal removed, remaining_loss, removed_cube_or_fort
-            if sp.get(tag, 0) <= 0 or remaining_loss <= 0:
-                return False
-            # Cubes to Casualties; guerrillas/villages to Available
+        plan = _casualty_plan(sp, side, loss, is_defending=(side == def_side),
+                              cc_wp=cc_wp)
+        for tag in plan:
+            # Cubes to Casualties; guerrillas/villages/forts to Available
             dest = "casualties" if is_cube(tag) else "available"
             remove_piece(state, tag, sid, 1, to=dest)
-            removed += 1
-            remaining_loss -= loss_value(tag)
-            if is_cube(tag) or tag in (FORT_BRI, FORT_PAT):
-                removed_cube_or_fort = True
-            return True
-
-        def _take_tory_slot() -> bool:
-            """One removal from the Tory slot: CC War Parties first
-            (Q19 — they absorb "as a Tory"), then real Tories."""
-            nonlocal removed, remaining_loss, cc_left
-            if cc_left > 0 and sp.get(WARPARTY_A, 0) > 0:
-                remove_piece(state, WARPARTY_A, sid, 1, to="available")
-                removed += 1
-                remaining_loss -= loss_value(WARPARTY_A)
-                cc_left -= 1
-                return True
-            return _take_one(TORY)
-
-        if side == "ROYALIST":
-            # Phase 1: Alternate Regulars and Tories (CC WP in Tory slot)
-            while remaining_loss > 0:
-                took_reg = _take_one(REGULAR_BRI)
-                if remaining_loss > 0:
-                    took_tory = _take_tory_slot()
-                else:
-                    break
-                if not took_reg and not took_tory:
-                    break
-            # Phase 2: Active War Parties (to Available)
-            while remaining_loss > 0 and sp.get(WARPARTY_A, 0) > 0:
-                _take_one(WARPARTY_A)
-            # Phase 3: If Defending only -- Villages then Forts
-            if is_defending:
-                while remaining_loss > 0 and sp.get(VILLAGE, 0) > 0:
-                    remove_piece(state, VILLAGE, sid, 1, to="available")
-                    removed += 1
-                    remaining_loss -= 1
-                while remaining_loss > 0 and sp.get(FORT_BRI, 0) > 0:
-                    # §3.6.7: "Forts also count as Casualties but return to
-                    # Available immediately."
-                    remove_piece(state, FORT_BRI, sid, 1, to="available")
-                    # §1.6.4: Forts count toward CBC even though they
-                    # return to Available, not the Casualties box.
-                    increment_casualties(state, FORT_BRI, 1)
-                    removed += 1
-                    remaining_loss -= loss_value(FORT_BRI)
-                    removed_cube_or_fort = True
-        else:
-            # Phase 1: Alternate French Regulars, Continentals, Active Militia
-            while remaining_loss > 0:
-                took_fre = _take_one(REGULAR_FRE)
-                took_pat = _take_one(REGULAR_PAT) if remaining_loss > 0 else False
-                took_mil = _take_one(MILITIA_A) if remaining_loss > 0 else False
-                if not took_fre and not took_pat and not took_mil:
-                    break
-            # Phase 2: If Defending only -- Forts
-            if is_defending:
-                while remaining_loss > 0 and sp.get(FORT_PAT, 0) > 0:
-                    # §3.6.7: "Forts also count as Casualties but return to
-                    # Available immediately."
-                    remove_piece(state, FORT_PAT, sid, 1, to="available")
-                    # §1.6.4: Forts count toward CRC even though they
-                    # return to Available, not the Casualties box.
-                    increment_casualties(state, FORT_PAT, 1)
-                    removed += 1
-                    remaining_loss -= loss_value(FORT_PAT)
-                    removed_cube_or_fort = True
-
-        return removed, removed_cube_or_fort
+            if tag in (FORT_BRI, FORT_PAT):
+                # §1.6.4: Forts count toward CBC/CRC even though they
+                # return to Available, not the Casualties box.
+                increment_casualties(state, tag, 1)
+        return len(plan), _lost_cube_or_fort(plan)
 
     pieces_def_lost, def_lost_cube_or_fort = _remove(def_side, defender_loss)
     pieces_att_lost, att_lost_cube_or_fort = _remove(att_side, attacker_loss)
@@ -895,36 +970,8 @@ def _resolve_space(
                 remaining = _apply_shifts_to(state, adj_sid, winner, remaining)
 
     # §3.6.8 Winner determination.
-    # Check for elimination (excluding Underground pieces).
-    def _side_alive(side: str) -> bool:
-        if side == "ROYALIST":
-            return (sp.get(REGULAR_BRI, 0) + sp.get(TORY, 0)
-                    + sp.get(WARPARTY_A, 0) + sp.get(VILLAGE, 0)
-                    + sp.get(FORT_BRI, 0)) > 0
-        else:
-            return (sp.get(REGULAR_PAT, 0) + sp.get(REGULAR_FRE, 0)
-                    + sp.get(MILITIA_A, 0) + sp.get(FORT_PAT, 0)) > 0
-
-    att_alive = _side_alive(att_side)
-    def_alive = _side_alive(def_side)
-
-    winner = None
-    if not att_alive and not def_alive:
-        # §3.6.8: "If both sides are eliminated … there is no winner or loser."
-        winner = None
-    elif not att_alive:
-        winner = def_side
-    elif not def_alive:
-        winner = att_side
-    elif pieces_att_lost < pieces_def_lost:
-        # Attacker lost fewer → attacker wins
-        winner = att_side
-    elif pieces_def_lost < pieces_att_lost:
-        # Defender lost fewer → defender wins
-        winner = def_side
-    else:
-        # §3.6.8: "Defender is the winner if equal."
-        winner = def_side
+    winner = _battle_winner(att_side, def_side, sp,
+                            pieces_att_lost, pieces_def_lost)
 
     if winner:
         loser_removed = pieces_def_lost if winner == att_side else pieces_att_lost
@@ -938,5 +985,164 @@ def _resolve_space(
         f"{def_side}-loss={pieces_def_lost}, "
         f"winner={winner or 'NONE'}"
     )
-    push_history(state, msg)
+    push_history(state, msg, kind=BATTLE_RESULT, data={
+        "space": sid,
+        "losses": {att_side: pieces_att_lost, def_side: pieces_def_lost},
+        "winner": winner,
+    })
     return winner
+
+
+# -------- Battle odds (S3.6.4-3.6.8 without rolling) --------
+@dataclass(frozen=True)
+class BattleForces:
+    """Everything a Battle's outcome depends on besides the dice.
+
+    *pieces*: ``(tag, count)`` pairs for the pieces that absorb losses or
+    keep a side in the space (Underground units only matter through the
+    Force Levels and modifiers).  Leaders, Forts, terrain, Blockades and
+    queued Event modifiers are already folded into the Force Levels and
+    the S3.6.5/3.6.6 Loss-Level modifiers.  Build one with
+    `battle_forces`; equal summaries share one `battle_odds` result.
+    """
+
+    att_side: str
+    pieces: Tuple[Tuple[str, int], ...]
+    att_force: int
+    def_force: int
+    def_loss_mods: int
+    att_loss_mods: int
+    def_loss_extra: int = 0      # loss_mod queue, added after the floor
+    att_loss_extra: int = 0
+    cc_wp: int = 0
+
+    @property
+    def def_side(self) -> str:
+        return "REBELLION" if self.att_side == "ROYALIST" else "ROYALIST"
+
+
+@dataclass(frozen=True)
+class BattleOdds:
+    """Exact outcome distribution of one Battle.
+
+    *outcomes*: ``((winner, attacker_pieces_lost, defender_pieces_lost),
+    weight)`` pairs; each weight counts equally likely dice results out
+    of *total*.  Winner is "ROYALIST", "REBELLION" or None (both sides
+    eliminated).
+    """
+
+    att_side: str
+    outcomes: Tuple[Tuple[Tuple[Optional[str], int, int], int], ...]
+    total: int
+
+    def p_win(self, side: str) -> float:
+        """Probability that *side* ("ROYALIST"/"REBELLION") wins."""
+        return sum(w for (winner, _, _), w in self.outcomes
+                   if winner == side) / self.total
+
+    @property
+    def p_attacker_wins(self) -> float:
+        return self.p_win(self.att_side)
+
+    @property
+    def expected_losses(self) -> Tuple[float, float]:
+        """Mean pieces lost: (attacker, defender)."""
+        att = sum(a * w for (_, a, _), w in self.outcomes)
+        dfd = sum(d * w for (_, _, d), w in self.outcomes)
+        return att / self.total, dfd / self.total
+
+
+def _dice_sums(force: int) -> Counter:
+    """S3.6.4: distribution of the roll for *force* (Force / 3 D3s, max 3)."""
+    sums = Counter({0: 1})
+    for _ in range(min(3, force // 3)):
+        nxt: Counter = Counter()
+        for total, ways in sums.items():
+            for face in (1, 2, 3):
+                nxt[total + face] += ways
+        sums = nxt
+    return sums
+
+
+def battle_forces(state: Dict, attacker_faction: str, sid: str, *,
+                  cc_wp: int = 0, attacker_bonus: int = 0,
+                  ally_involved: bool = True,
+                  attacker_activate: int = 0) -> BattleForces:
+    """Summarize the Battle *attacker_faction* would fight in *sid* now.
+
+    Applies the same S3.6.3 Activations and the same Force-Level and
+    modifier functions as `_resolve_space`, on a copy of the one space
+    dict; the state is not modified.  A human defender is assumed to
+    Activate nothing (the CLI prompt is not shown).
+    """
+    attacker_faction = attacker_faction.upper()
+    sp = dict(state["spaces"][sid])
+    att_side = "ROYALIST" if attacker_faction == BRITISH else "REBELLION"
+    def_side = "REBELLION" if att_side == "ROYALIST" else "ROYALIST"
+    _resolve_defender_activation(state, sp, sid, def_side, ask_human=False)
+    _activate_attacker(sp, attacker_faction, attacker_activate, ally_involved)
+    att_extra, def_extra = peek_loss_mod(state, sid)
+    return BattleForces(
+        att_side=att_side,
+        pieces=tuple((tag, sp[tag]) for side in (att_side, def_side)
+                     for tag in _LOSS_TAGS[side] if sp.get(tag, 0) > 0),
+        att_force=force_level(sp, att_side, False, cc_wp=cc_wp,
+                              attacker_faction=attacker_faction,
+                              ally_involved=ally_involved) + attacker_bonus,
+        def_force=force_level(sp, def_side, True, cc_wp=cc_wp,
+                              attacker_faction=attacker_faction,
+                              ally_involved=ally_involved),
+        def_loss_mods=_defender_loss_mods(
+            state, sp, sid, att_side, def_side, cc_wp,
+            attacker_faction=attacker_faction, ally_involved=ally_involved),
+        att_loss_mods=_attacker_loss_mods(state, sp, sid, att_side, def_side,
+                                          cc_wp),
+        def_loss_extra=def_extra,
+        att_loss_extra=att_extra,
+        cc_wp=cc_wp,
+    )
+
+
+@lru_cache(maxsize=4096)
+def battle_odds(forces: BattleForces) -> BattleOdds:
+    """Exact win/loss distribution for *forces* (memoized per summary).
+
+    At most three D3 per side, so every dice result is enumerated; the
+    removal order and winner rules are the resolver's own.
+    """
+    counts = dict(forces.pieces)
+    att_side, def_side = forces.att_side, forces.def_side
+
+    def _plans(side: str, rolls: Counter, mods: int, extra: int,
+               defending: bool) -> Dict[int, List[str]]:
+        return {roll: _casualty_plan(counts, side, max(0, roll + mods) + extra,
+                                     is_defending=defending,
+                                     cc_wp=forces.cc_wp)
+                for roll in rolls}
+
+    att_rolls = _dice_sums(forces.att_force)      # sets the defender's loss
+    def_rolls = _dice_sums(forces.def_force)      # sets the attacker's loss
+    def_plans = _plans(def_side, att_rolls, forces.def_loss_mods,
+                       forces.def_loss_extra, True)
+    att_plans = _plans(att_side, def_rolls, forces.att_loss_mods,
+                       forces.att_loss_extra, False)
+
+    tally: Counter = Counter()
+    for a_roll, a_ways in att_rolls.items():
+        def_plan = def_plans[a_roll]
+        for d_roll, d_ways in def_rolls.items():
+            att_plan = att_plans[d_roll]
+            left = dict(counts)
+            for tag in def_plan + att_plan:
+                left[tag] -= 1
+            winner = _battle_winner(att_side, def_side, left,
+                                    len(att_plan), len(def_plan))
+            tally[(winner, len(att_plan), len(def_plan))] += a_ways * d_ways
+    total = sum(att_rolls.values()) * sum(def_rolls.values())
+    return BattleOdds(att_side, tuple(sorted(tally.items(), key=repr)), total)
+
+
+def space_battle_odds(state: Dict, attacker_faction: str, sid: str,
+                      **kwargs) -> BattleOdds:
+    """`battle_odds` of the Battle in *sid* (keywords as `battle_forces`)."""
+    return battle_odds(battle_forces(state, attacker_faction, sid, **kwargs))
@@ -47,6 +47,7 @@ from lod_ai.rules_consts import (
     BRITISH, PATRIOTS, FRENCH,
 )
 from lod_ai.board.pieces      import add_piece, remove_piece
+from lod_ai.board.totals      import set_support
 from lod_ai.economy.resources import spend, can_afford
 
 COMMAND_NAME = "MUSTER"
@@ -68,7 +69,7 @@ def _support_value(state: Dict, sid: str) -> int:
 def _set_support(state: Dict, sid: str, val: int) -> None:
     """Write *val* back clamped to the enum range."""
     lo, hi = SUPPORT_ENUM[0], SUPPORT_ENUM[-1]
-    state.setdefault("support", {})[sid] = max(min(val, hi), lo)
+    set_support(state, sid, max(min(val, hi), lo))
 
 
 # ---------------------------------------------------------------------------
@@ -39,6 +39,7 @@ from lod_ai.map.adjacency  import space_type as _space_type
 from lod_ai.util.caps      import refresh_control, enforce_global_caps
 from lod_ai.util.adjacency import is_adjacent  # potentially used by callers
 from lod_ai.board.pieces      import remove_piece, add_piece, flip_pieces
+from lod_ai.board.totals      import set_support
 from lod_ai.economy.resources import spend
 
 COMMAND_NAME = "RABBLE_ROUSING"  # auto‑registered by commands/__init__.py
@@ -69,7 +70,7 @@ def _shift_toward_active_opposition(state: Dict, space_id: str):
     except ValueError:
         idx = 2  # treat unknown as NEUTRAL
     if idx < len(_SUPPORT_ORDER) - 1:
-        state.setdefault("support", {})[space_id] = _SUPPORT_ORDER[idx + 1]
+        set_support(state, space_id, _SUPPORT_ORDER[idx + 1])
 
 
 def _has_patriot_piece(sp: Dict) -> bool:
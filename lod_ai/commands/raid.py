@@ -39,6 +39,7 @@ from lod_ai.util.caps      import refresh_control, enforce_global_caps
 from lod_ai.util.adjacency import is_adjacent
 from lod_ai.map.adjacency import shortest_path
 from lod_ai.board.pieces      import remove_piece, add_piece, flip_pieces  # NEW
+from lod_ai.board.totals      import set_support
 from lod_ai.economy.resources import spend                       # NEW
 
 COMMAND_NAME = "RAID"      # auto-registered by commands/__init__.py
@@ -52,7 +53,7 @@ def _shift_one_toward_neutral(state: Dict, space_id: str) -> None:
     """Increase support value by +1, but never above Neutral (0)."""
     cur = state.get("support", {}).get(space_id, NEUTRAL)
     if cur < NEUTRAL:
-        state.setdefault("support", {})[space_id] = cur + 1
+        set_support(state, space_id, cur + 1)
 
 
 def _move_one_wp(state: Dict, src: Dict, dst: Dict, src_id: str, dst_id: str) -> None:
@@ -8,7 +8,9 @@ from __future__ import annotations
 
 from contextlib import contextmanager
 from copy import deepcopy
+import hashlib
 import inspect
+import random
 import traceback as _tb_module
 from typing import Any, Callable, Dict, Iterable, List, Tuple
 
@@ -16,12 +18,14 @@ from lod_ai.dispatcher import Dispatcher
 from lod_ai.util.free_ops import pop_free_ops
 from lod_ai.cards import CARD_HANDLERS, determine_eligible_factions, get_faction_order
 from lod_ai.util.year_end import resolve as resolve_year_end
-from lod_ai.util.history import push_history
+from lod_ai.util.history import PASS, TREATY, push_history
 from lod_ai import rules_consts as C
 from lod_ai.util.normalize_state import normalize_state
+from lod_ai.board.control import refresh_control
 from lod_ai.util import eligibility as elig
 from lod_ai.cards.effects import brilliant_stroke as bs
 from lod_ai.state.setup_state import build_state
+from lod_ai.state.sandbox import SandboxState, detached_copy
 from lod_ai.economy import resources
 
 # Command / SA implementations
@@ -33,6 +37,13 @@ from lod_ai.bots.french import FrenchBot
 from lod_ai.bots.indians import IndianBot
 
 
+def _derived_rng(rng: Any, seed: int) -> random.Random:
+    """A new RNG determined by *rng*'s position and *seed* (see fork)."""
+    position = repr(rng.getstate()) if isinstance(rng, random.Random) else ""
+    digest = hashlib.sha256(position.encode()).hexdigest()
+    return random.Random(f"{digest}:{seed}")
+
+
 def _event_instruction(faction, card_id):
     """T8/§8.3.1: the Brown-Bess Event Instruction (if any) for *faction*
     on *card_id* — the reverse-of-Random-Spaces-sheet directive that
@@ -51,9 +62,14 @@ class Engine:
         self.state = initial_state or build_state()
         normalize_state(self.state)
         self.ctx: dict = {}          # scratch context per action
-        self.dispatcher = Dispatcher(self)
         self.use_cli = use_cli
         self.human_factions: set[str] = set()
+        self.agent_factions: set[str] = set()
+        self._wire()
+
+    def _wire(self) -> None:
+        """Build the per-engine dispatcher and bot instances."""
+        self.dispatcher = Dispatcher(self)
 
         # ── core Command registrations ──────────────────────────────────
         self.dispatcher.register_cmd("march",  self._wrap_march())
@@ -146,11 +162,70 @@ class Engine:
         normalize_state(self.state)
         self.ctx = {}
 
+    def fork(self, seed: int | None = None) -> "Engine":
+        """An independent engine at this engine's current position.
+
+        Card registry, map and bot tables are module data and shared; the
+        game state is copied with `sandbox.detached_copy` (no deepcopy of
+        the log) and not re-normalized.  The fork's dispatcher and bots
+        are its own, and it starts unprofiled.
+
+        With *seed* None the fork's RNG is a copy of this engine's, so it
+        rolls the same dice this game would (what-if runs).  A *seed*
+        gives a fresh stream derived from the current RNG position and the
+        seed, without advancing this engine's RNG: ``fork(seed=i)`` for
+        i in range(n) is n reproducible, distinct rollouts.
+        """
+        state = detached_copy(self.state)
+        if seed is not None:
+            state["rng"] = _derived_rng(self.state.get("rng"), seed)
+        return Engine.adopt(state, ctx=deepcopy(self.ctx),
+                            last_action=self.dispatcher._last_action,
+                            use_cli=self.use_cli,
+                            human_factions=self.human_factions,
+                            agent_factions=self.agent_factions)
+
+    @classmethod
+    def adopt(cls, state: dict, *, ctx: dict | None = None,
+              last_action: dict | None = None, use_cli: bool = False,
+              human_factions=(), agent_factions=()) -> "Engine":
+        """An engine over *state*, a position taken from a live engine
+        (`fork`, or one sent to a worker process) with its *ctx* and the
+        dispatcher's *last_action*.  Unlike the constructor it does not
+        re-normalize the state.
+        """
+        eng = cls.__new__(cls)
+        eng.state = state
+        eng.ctx = ctx if ctx is not None else {}
+        eng.use_cli = use_cli
+        eng.human_factions = set()
+        eng.agent_factions = set(agent_factions)
+        eng._wire()
+        eng.set_human_factions(human_factions)
+        eng.dispatcher._last_action = dict(last_action or {})
+        return eng
+
+    def enable_profiling(self, profiler=None):
+        """Record per-phase timings for this engine (lod_ai.tools.profiling).
+
+        Returns the `PhaseProfiler`.  Engines that never call this run
+        uninstrumented.
+        """
+        from lod_ai.tools.profiling import PhaseProfiler
+        return (profiler or PhaseProfiler()).attach(self)
+
     def set_human_factions(self, factions) -> None:
         """Register which factions are controlled by humans."""
         self.human_factions = set(factions)
         self.dispatcher.set_human_factions(factions)
 
+    def set_agent_factions(self, factions) -> None:
+        """Register factions whose card turns an outside agent chooses
+        through `iter_card`.  Everything else such a seat decides
+        (Brilliant Strokes, Winter Quarters, event-granted free ops) is
+        left to its bot."""
+        self.agent_factions = set(factions)
+
     def is_human_faction(self, faction: str) -> bool:
         """Return True if the given faction is human-controlled."""
         return faction in self.human_factions
@@ -654,7 +729,8 @@ class Engine:
         Event-granted free LimComs are unaffected — they run through the
         free-op path, which caps them at one space per §8.1."""
         allowed = self._options_for_slot(first_action)
-        if allowed.get("limited_only") and not self.is_human_faction(faction):
+        if (allowed.get("limited_only") and not self.is_human_faction(faction)
+                and faction not in self.agent_factions):
             allowed = dict(allowed)
             allowed["limited_only"] = False
             allowed["special_allowed"] = True
@@ -714,7 +790,9 @@ class Engine:
         allowed: Dict[str, Any],
         runner: Callable[[dict, dict], Any],
     ) -> Tuple[dict, bool, dict, dict]:
-        sandbox_state = deepcopy(self.state)
+        # Copy-on-write: the sandbox shares the live state and copies a
+        # container only when the trial touches it (lod_ai.state.sandbox).
+        sandbox_state = SandboxState(self.state)
         sandbox_ctx = deepcopy(self.ctx)
         self._reset_trace_on(sandbox_state)
 
@@ -729,10 +807,19 @@ class Engine:
         return result, legal, sandbox_state, sandbox_ctx
 
     def _commit_state(self, sandbox_state: dict, sandbox_ctx: dict) -> None:
-        self.state.clear()
-        self.state.update(sandbox_state)
+        touched = None
+        if isinstance(sandbox_state, SandboxState) and \
+                sandbox_state.parent is self.state:
+            # Merge only what the trial touched.  The sandbox's Control
+            # is brought current first, so afterwards only the spaces
+            # the commit changed need re-sanitizing and a re-tally.
+            refresh_control(sandbox_state)
+            touched = sandbox_state.commit_into(self.state)
+        else:
+            self.state.clear()
+            self.state.update(sandbox_state)
         self.ctx = sandbox_ctx
-        normalize_state(self.state)
+        normalize_state(self.state, touched)
 
     def _record_played_card(self, card_id: int) -> None:
         self.state.setdefault("played_cards", []).append(card_id)
@@ -794,13 +881,15 @@ class Engine:
     @staticmethod
     def _interactive_input() -> bool:
         """True when a human can actually answer prompts: a custom input
-        provider is installed (harness/LLM), or stdin is interactive.
-        Headless callers are never blocked on input()."""
+        provider is installed (harness/LLM) that does not declare
+        ``interactive = False``, or stdin is interactive.  Headless callers
+        are never blocked on input()."""
         import sys
         from lod_ai.cli_utils import get_input_provider, StdinInputProvider
         provider = get_input_provider()
-        return not isinstance(provider, StdinInputProvider) or (
-            hasattr(sys.stdin, "isatty") and sys.stdin.isatty())
+        if not isinstance(provider, StdinInputProvider):
+            return getattr(provider, "interactive", True)
+        return hasattr(sys.stdin, "isatty") and sys.stdin.isatty()
 
     # ---- Human BS plan builder (§2.3.8 card text) ---------------------
     # "Execute two free Limited Commands and one Special Activity in any
@@ -815,14 +904,14 @@ class Engine:
         involved in at least one of the Limited Commands.").
 
         Each step is built by the normal CLI wizard, dry-run in a sandbox,
-        then committed. A whole-sequence checkpoint enforces the Leader
-        requirement: if no executed Limited Command involved the Leader's
+        then committed. A `Journal` opened on the live state enforces the
+        Leader requirement: if no executed Limited Command involved the Leader's
         space, the entire BS is rolled back and the card returns to its
         owner. Returns True if the BS executed.
         """
-        from copy import deepcopy
         from lod_ai import interactive_cli as cli
         from lod_ai.cli_utils import choose_one, BackException
+        from lod_ai.state.journal import Journal
 
         leader_space = None
         for lid, loc in self.state.get("leaders", {}).items():
@@ -836,7 +925,7 @@ class Engine:
             return False
 
         self._bind_provider_faction(faction)
-        checkpoint = deepcopy(self.state)
+        journal = Journal(self.state)
         checkpoint_ctx = deepcopy(self.ctx)
         remaining = ["command", "command", "special"]
         leader_used = False
@@ -904,8 +993,7 @@ class Engine:
                     break
 
             if commands_done == 0 or not leader_used:
-                self.state.clear()
-                self.state.update(checkpoint)
+                journal.rollback()
                 self.ctx = checkpoint_ctx
                 push_history(self.state,
                              f"{faction} BS aborted — Leader was not involved "
@@ -1276,7 +1364,7 @@ class Engine:
             # Drain free ops queued by ToA (e.g. free Muster) immediately
             self._drain_free_ops(self.state)
             bs.mark_bs_played(self.state, current["key"], True)
-            push_history(self.state, "Treaty of Alliance played")
+            push_history(self.state, "Treaty of Alliance played", kind=TREATY)
         else:
             # Execute the BS actions
             winner = current["faction"]
@@ -1340,7 +1428,8 @@ class Engine:
     def _award_pass(self, faction: str) -> None:
         gain = 2 if faction in (C.BRITISH, C.FRENCH) else 1
         resources.add(self.state, faction, gain)
-        push_history(self.state, f"{faction} PASS (+{gain} resources)")
+        push_history(self.state, f"{faction} PASS (+{gain} resources)",
+                     kind=PASS, data={"faction": faction})
         self.state.setdefault("eligible_next", set()).add(faction)
         self.state.setdefault("ineligible_next", set()).discard(faction)
         self.state.setdefault("eligible", {}).update({faction: False})
@@ -1420,7 +1509,8 @@ class Engine:
         # event instructions (e.g., Card 8: "if French is a human player").
         self.state["human_factions"] = self.human_factions
 
-        if faction in self.human_factions and human_decider:
+        if human_decider and (faction in self.human_factions
+                              or faction in self.agent_factions):
             result, legal, sandbox_state, sandbox_ctx = human_decider(faction, card, allowed, self)
             if not legal:
                 self._award_pass(faction)
@@ -1499,6 +1589,9 @@ class Engine:
     # -------------------------------------------------------------------
     # Main card resolution
     # -------------------------------------------------------------------
+    def _resolve_year_end(self) -> None:
+        resolve_year_end(self.state, bots=self.bots, human_factions=self.human_factions)
+
     def play_card(self, card: dict, human_decider: Callable[..., Tuple[dict, bool, dict, dict]] | None = None, post_turn_callback: Callable[..., None] | None = None) -> List[Tuple[str, dict]]:
         """Execute all eligible turns for *card* (bot- and human-aware).
 
@@ -1506,6 +1599,27 @@ class Engine:
         turn resolves (and the log entry is recorded) but before the next
         faction acts.  Signature: ``callback(faction, result, card)``.
         This lets the CLI display bot summaries *before* a human is prompted.
+
+        Agent seats (`set_agent_factions`) are played by their bots here;
+        `iter_card` hands their turns to the caller.
+        """
+        steps = self.iter_card(card, human_decider, post_turn_callback)
+        try:
+            next(steps)
+            while True:
+                steps.send(None)
+        except StopIteration as done:
+            return done.value
+
+    def iter_card(self, card: dict, human_decider: Callable[..., Tuple[dict, bool, dict, dict]] | None = None, post_turn_callback: Callable[..., None] | None = None):
+        """`play_card` as a generator that stops at each agent seat's turn.
+
+        Before an agent faction acts it yields ``(faction, allowed)``; the
+        caller resumes it with ``send(runner)``, where *runner* is a
+        ``runner(state, ctx)`` as for `simulate_action`.  The runner is
+        tried in a sandbox and committed if legal; an illegal one is a
+        Pass, as for a human seat.  Sending None lets the faction's bot
+        take the turn.  The generator's return value is `play_card`'s.
         """
         queue = self._prepare_card(card)
         self.state['_card_turn_log'] = []
@@ -1521,7 +1635,7 @@ class Engine:
             upcoming_is_wq = bool(upcoming and upcoming.get("winter_quarters"))
             if not remaining_wq_in_deck and not upcoming_is_wq:
                 self.state["final_winter_round"] = True
-            resolve_year_end(self.state, bots=self.bots, human_factions=self.human_factions)
+            self._resolve_year_end()
             if card.get("id"):
                 self._record_played_card(card["id"])
             return []
@@ -1536,9 +1650,15 @@ class Engine:
             faction = queue.pop(0)
             eligible_position += 1
             allowed = self._allowed_for_faction(faction, first_action)
+            decider = human_decider
+            if faction in self.agent_factions:
+                runner = yield faction, allowed
+                decider = None if runner is None else (
+                    lambda f, c, a, eng, _run=runner:
+                        eng._simulate_action(f, c, a, _run))
             sig = inspect.signature(self.play_turn)
             if "allowed" in sig.parameters:
-                result = self.play_turn(faction, card=card, allowed=allowed, human_decider=human_decider)
+                result = self.play_turn(faction, card=card, allowed=allowed, human_decider=decider)
             else:
                 result = self.play_turn(faction, card=card)
             if not result:
@@ -1574,7 +1694,7 @@ class Engine:
                 first_action = result
 
         if card.get("winter_quarters"):
-            resolve_year_end(self.state, bots=self.bots, human_factions=self.human_factions)
+            self._resolve_year_end()
 
         if card.get("id"):
             self._record_played_card(card["id"])
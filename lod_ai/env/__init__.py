@@ -0,0 +1,17 @@
+"""Reset/step environments for training and evaluating agents.
+
+    from lod_ai.env import LodEnv, EnvSpec, VectorEnv, SubprocVectorEnv
+
+`LodEnv` is one game with agent seats (`lod_ai.env.core`); the action
+catalogue and the plans behind each action are in `lod_ai.env.actions`;
+`VectorEnv` / `SubprocVectorEnv` step many games in lockstep
+(`lod_ai.env.vector`).
+"""
+from .actions import HEADS, SPACE_IDS, TARGETS, runner_for
+from .core import LodEnv, observe
+from .vector import EnvSpec, SubprocVectorEnv, VectorEnv
+
+__all__ = [
+    "LodEnv", "observe", "HEADS", "SPACE_IDS", "TARGETS", "runner_for",
+    "EnvSpec", "VectorEnv", "SubprocVectorEnv",
+]
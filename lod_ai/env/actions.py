@@ -0,0 +1,289 @@
+"""The environment's fixed action catalogue and the plans it executes.
+
+An agent's action names a *head* -- Pass, an Event side, or a Command
+with or without one Special Activity -- plus the spaces to perform the
+Command in and one Special Activity target.  `HEADS` lists every head
+any faction can ever have, in a fixed order, so a policy's output layer
+and the action masks keep the same shape for every seat and position;
+`TARGETS` does the same for Special Activity targets.
+
+`runner_for` turns a chosen action into a ``runner(state, ctx)`` for
+`Engine.simulate_action`.  Where a Command needs more than its spaces
+(which pieces March, how many Regulars Muster, which Skirmish option)
+the plan is a fixed, simple default:
+
+* March moves every lead piece of the best-stocked origin into each
+  destination; Garrison moves half the Regulars of the best-stocked
+  City; Scout moves every War Party and one Regular.
+* British Muster puts up to six Regulars in the first chosen space that
+  takes Regulars and two Tories everywhere else the rules allow.
+* Rally, Gather, Rabble-Rousing, French Muster and Agent Mobilization
+  use their Command's own defaults; Hortelez pays one Resource.
+* Skirmish, Partisans and War Path use the first option (1, 2, 3) that
+  is legal in the target space; Trade asks for no British Resources.
+"""
+
+from __future__ import annotations
+
+from copy import deepcopy
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from lod_ai import legal_actions as LA
+from lod_ai import rules_consts as C
+from lod_ai.commands import (
+    battle, french_agent_mobilization, garrison, gather, hortelez, march,
+    muster, rabble_rousing, raid, rally, scout,
+)
+from lod_ai.special_activities import (
+    common_cause, naval_pressure, partisans, persuasion, plunder, preparer,
+    skirmish, trade, war_path,
+)
+from lod_ai.state.sandbox import SandboxState
+
+Head = Tuple[str, Optional[str], Optional[str]]     # (kind, name, special)
+
+SPACE_IDS: Tuple[str, ...] = LA._SPACE_IDS
+PREPARER_OPTIONS = ("BLOCKADE", "REGULARS", "RESOURCES")
+TARGETS: Tuple[str, ...] = SPACE_IDS + PREPARER_OPTIONS
+
+_FACTIONS = (C.BRITISH, C.PATRIOTS, C.INDIANS, C.FRENCH)
+# Every Command a faction can have (the French set changes at the ToA).
+_ALL_COMMANDS = {
+    C.BRITISH: (muster.COMMAND_NAME, garrison.COMMAND_NAME,
+                march.COMMAND_NAME, battle.COMMAND_NAME),
+    C.PATRIOTS: (rally.COMMAND_NAME, march.COMMAND_NAME, battle.COMMAND_NAME,
+                 rabble_rousing.COMMAND_NAME),
+    C.INDIANS: (gather.COMMAND_NAME, march.COMMAND_NAME, scout.COMMAND_NAME,
+                raid.COMMAND_NAME),
+    C.FRENCH: (french_agent_mobilization.COMMAND_NAME, hortelez.COMMAND_NAME,
+               muster.COMMAND_NAME, march.COMMAND_NAME, battle.COMMAND_NAME),
+}
+
+
+def _catalogue() -> Tuple[Head, ...]:
+    heads: List[Head] = [(LA.PASS, None, None), (LA.EVENT, LA.UNSHADED, None),
+                         (LA.EVENT, LA.SHADED, None)]
+    for faction in _FACTIONS:
+        for cmd in _ALL_COMMANDS[faction]:
+            for sa in (None,) + LA.specials_for(faction):
+                head = (LA.COMMAND, cmd, sa)
+                if head not in heads and (sa is None
+                                          or LA.special_pairs_with(sa, cmd)):
+                    heads.append(head)
+    return tuple(heads)
+
+
+HEADS: Tuple[Head, ...] = _catalogue()
+HEAD_INDEX: Dict[Head, int] = {h: i for i, h in enumerate(HEADS)}
+SPACE_INDEX: Dict[str, int] = {s: i for i, s in enumerate(SPACE_IDS)}
+TARGET_INDEX: Dict[str, int] = {t: i for i, t in enumerate(TARGETS)}
+
+
+def head_of(action: LA.Action) -> Head:
+    """The catalogue entry of a `legal_actions.Action`."""
+    return (action.kind, action.name, action.special)
+
+
+# --------------------------------------------------------------------------- #
+# Command plans                                                               #
+# --------------------------------------------------------------------------- #
+_LEAD_TAGS = {
+    C.BRITISH: (C.REGULAR_BRI,),
+    C.PATRIOTS: (C.REGULAR_PAT, C.MILITIA_U, C.MILITIA_A),
+    C.INDIANS: (C.WARPARTY_U, C.WARPARTY_A),
+    C.FRENCH: (C.REGULAR_FRE,),
+}
+
+
+def _march(s, faction, ctx, spaces, limited):
+    left = {}
+    plan = []
+    for dst in spaces:
+        best, best_n = None, 0
+        for src in LA.march_origins(s, faction, dst):
+            pieces = left.setdefault(src, {t: s["spaces"][src].get(t, 0)
+                                           for t in _LEAD_TAGS[faction]})
+            n = sum(pieces.values())
+            if n > best_n:
+                best, best_n = src, n
+        if best is None:
+            continue
+        moving = {t: n for t, n in left[best].items() if n}
+        left[best] = dict.fromkeys(moving, 0)
+        plan.append({"src": best, "dst": dst, "pieces": moving})
+    if not plan:
+        raise ValueError("No pieces can March into the chosen spaces.")
+    sources = list(dict.fromkeys(p["src"] for p in plan))
+    return march.execute(s, faction, ctx, sources, [p["dst"] for p in plan],
+                         limited=limited, move_plan=plan)
+
+
+def _british_muster(s, faction, ctx, spaces, limited):
+    dest = next((sid for sid in spaces
+                 if muster._is_legal_regular_dest(s, sid)), None)
+    return muster.execute(
+        s, faction, ctx, list(spaces),
+        regular_plan={"space": dest, "n": 6} if dest else None,
+        tory_plan={sid: 2 for sid in spaces if sid != dest} or None)
+
+
+def _garrison(s, faction, ctx, spaces, limited):
+    left = {sid: sp.get(C.REGULAR_BRI, 0) for sid, sp in s["spaces"].items()
+            if sid not in spaces and sp.get(C.REGULAR_BRI, 0)
+            and not garrison._is_blockaded(sid, s)}
+    move_map: Dict[str, Dict[str, int]] = {}
+    for dst in spaces:
+        if not left:
+            break
+        src = max(sorted(left), key=left.get)
+        n = (left.pop(src) + 1) // 2
+        move_map.setdefault(src, {})[dst] = n
+    return garrison.execute(s, faction, ctx, move_map, limited=limited)
+
+
+def _scout(s, faction, ctx, spaces, limited):
+    dst = spaces[0]
+    origins = LA.scout_origins(s, dst)
+    if not origins:
+        raise ValueError(f"No War Parties and Regulars can Scout into {dst}.")
+
+    def wps(sid):
+        sp = s["spaces"][sid]
+        return sp.get(C.WARPARTY_U, 0) + sp.get(C.WARPARTY_A, 0)
+
+    src = max(origins, key=wps)
+    return scout.execute(s, faction, ctx, src, dst, n_warparties=wps(src),
+                         n_regulars=1)
+
+
+def _raid(s, faction, ctx, spaces, limited):
+    moves = []
+    used = set()
+    for dst in spaces[:3]:
+        if s["spaces"][dst].get(C.WARPARTY_U, 0):
+            continue
+        src = next((x for x in LA.raid_sources(s, dst) if x not in used), None)
+        if src is not None:
+            used.add(src)
+            moves.append((src, dst))
+    result = raid.execute(s, faction, ctx, list(spaces[:3]),
+                          move_plan=moves or None)
+    ctx["raid_active"] = True
+    return result
+
+
+_COMMANDS: Dict[str, Callable] = {
+    battle.COMMAND_NAME: lambda s, f, ctx, spaces, lim:
+        battle.execute(s, f, ctx, list(spaces)),
+    march.COMMAND_NAME: _march,
+    garrison.COMMAND_NAME: _garrison,
+    rally.COMMAND_NAME: lambda s, f, ctx, spaces, lim:
+        rally.execute(s, f, ctx, list(spaces), limited=lim),
+    rabble_rousing.COMMAND_NAME: lambda s, f, ctx, spaces, lim:
+        rabble_rousing.execute(s, f, ctx, list(spaces), limited=lim),
+    gather.COMMAND_NAME: lambda s, f, ctx, spaces, lim:
+        gather.execute(s, f, ctx, list(spaces), limited=lim),
+    scout.COMMAND_NAME: _scout,
+    raid.COMMAND_NAME: _raid,
+    french_agent_mobilization.COMMAND_NAME: lambda s, f, ctx, spaces, lim:
+        french_agent_mobilization.execute(s, f, ctx, spaces[0]),
+    hortelez.COMMAND_NAME: lambda s, f, ctx, spaces, lim:
+        hortelez.execute(s, f, ctx, 1),
+}
+
+
+def _command(s, faction, ctx, name, spaces, limited):
+    if name == muster.COMMAND_NAME:
+        if faction == C.BRITISH:
+            return _british_muster(s, faction, ctx, spaces, limited)
+        return muster.execute(s, faction, ctx, list(spaces))
+    return _COMMANDS[name](s, faction, ctx, spaces, limited)
+
+
+# --------------------------------------------------------------------------- #
+# Special Activity plans                                                      #
+# --------------------------------------------------------------------------- #
+def _first_option(run, s, ctx):
+    """Run ``run(state, ctx, option)`` with the first option of 1-3 that
+    a sandboxed trial accepts."""
+    for option in (1, 2, 3):
+        try:
+            run(SandboxState(s), deepcopy(ctx), option)
+        except ValueError:
+            continue
+        return run(s, ctx, option)
+    raise ValueError("No option of this Special Activity is legal there.")
+
+
+def _special(s, faction, ctx, special, target, command):
+    if special == skirmish.SA_NAME:
+        return _first_option(lambda st, c, o: skirmish.execute(
+            st, faction, c, target, option=o), s, ctx)
+    if special == partisans.SA_NAME:
+        return _first_option(lambda st, c, o: partisans.execute(
+            st, faction, c, target, option=o), s, ctx)
+    if special == war_path.SA_NAME:
+        return _first_option(lambda st, c, o: war_path.execute(
+            st, faction, c, target, option=o), s, ctx)
+    if special == persuasion.SA_NAME:
+        return persuasion.execute(s, faction, ctx, spaces=[target])
+    if special == common_cause.SA_NAME:
+        mode = "BATTLE" if command == battle.COMMAND_NAME else "MARCH"
+        return common_cause.execute(s, faction, ctx, [target], mode=mode)
+    if special == trade.SA_NAME:
+        return trade.execute(s, faction, ctx, target, transfer=0)
+    if special == plunder.SA_NAME:
+        return plunder.execute(s, faction, ctx, target)
+    if special == naval_pressure.SA_NAME:
+        if target is not None or faction == C.BRITISH:
+            return naval_pressure.execute(s, faction, ctx, city_choice=target)
+        on_map = s["markers"][C.BLOCKADE].get("on_map", ())
+        return naval_pressure.execute(s, faction, ctx,
+                                      rearrange_map=dict.fromkeys(on_map, 1))
+    if special == preparer.SA_NAME:
+        return preparer.execute(s, faction, ctx, choice=target)
+    raise ValueError(f"Unknown Special Activity {special!r}")
+
+
+# --------------------------------------------------------------------------- #
+# Runner                                                                      #
+# --------------------------------------------------------------------------- #
+def runner_for(faction: str, head: Head, spaces: Sequence[str] = (),
+               target: Optional[str] = None, *, limited: bool = False,
+               card: Optional[dict] = None, engine=None
+               ) -> Callable[[dict, dict], dict]:
+    """A ``runner(state, ctx)`` performing *head* for *faction*.
+
+    Events run through *engine*'s ``handle_event`` for *card*.  An Event
+    or plan that fails -- the modules refuse it, or the Event cannot
+    resolve in this position -- becomes a Command that affected no
+    space, which the engine judges illegal and turns into a Pass (the
+    bots' failed turns are Passes too).
+    """
+    kind, name, special = head
+    spaces = tuple(spaces)
+
+    def run(s: dict, ctx: dict) -> dict:
+        if kind == LA.PASS:
+            return {"action": "pass", "used_special": False}
+        try:
+            if kind == LA.EVENT:
+                return engine.handle_event(faction, card, state=s,
+                                           shaded=(name == LA.SHADED))
+            _command(s, faction, ctx, name, spaces, limited)
+            if special is not None:
+                _special(s, faction, ctx, special, target, name)
+        except Exception as exc:  # noqa: BLE001
+            s["_turn_affected_spaces"] = set()
+            s.pop("_turn_command", None)
+            return {"action": "command",
+                    "notes": f"failed: {type(exc).__name__}: {exc}"}
+        return {"action": "command",
+                "used_special": bool(s.get("_turn_used_special"))}
+
+    return run
+
+
+def legal_heads(actions: Iterable[LA.Action]) -> Dict[Head, LA.Action]:
+    """*actions* (from `legal_actions`) keyed by catalogue head."""
+    return {head_of(a): a for a in actions}
@@ -0,0 +1,318 @@
+"""A reset/step environment over `Engine` for agent training.
+
+`LodEnv` seats an agent at one or more factions and lets the bots play
+the rest.  It drives `Engine.iter_card` directly -- no CLI menus, no
+input provider, no redirected stdout -- so any number of environments
+can live in one process.  Each `step` plays one of the agent's card
+turns and runs the game on to the agent's next turn:
+
+    from lod_ai.env import LodEnv
+
+    env = LodEnv("1778", seats=["PATRIOTS"], seed=3)
+    obs, info = env.reset()
+    while True:
+        head = obs["action_mask"].index(True)        # any legal head
+        obs, reward, terminated, truncated, info = env.step(head)
+        if terminated or truncated:
+            break
+
+An action is a head index into `actions.HEADS`, optionally with the
+spaces and the Special Activity target: ``head``, ``(head, spaces)`` or
+``(head, spaces, target)``.  *spaces* are space ids or indices into
+`actions.SPACE_IDS`, or a 0/1 mask over them; *target* is a target id or
+an index into `actions.TARGETS`.  Left out, the spaces default to the
+first legal space and the target to the first legal target.  A
+`legal_actions.Action` is accepted as well.  An action outside the
+masks is an illegal action, which the engine turns into a Pass
+(``info["illegal"]``).
+
+Observations are dicts of ints and tuples (picklable, NumPy-free):
+per-space piece counts in `board.arrays.PIECE_TAGS` order, Support,
+Control and markers, the tracks, and the masks ``action_mask`` (per
+head), ``space_mask`` and ``target_mask`` (per head, per space/target).
+The reward is +1 when an agent seat wins, -1 when another faction wins,
+else 0; a game stopped by *max_cards* is truncated.
+"""
+
+from __future__ import annotations
+
+import operator
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from lod_ai import legal_actions as LA
+from lod_ai import rules_consts as C
+from lod_ai.board.arrays import PIECE_TAGS
+from lod_ai.board.pieces import marker_count
+from lod_ai.engine import Engine
+from lod_ai.state.setup_state import build_state
+from lod_ai.victory import check_game_over
+
+from .actions import (
+    HEADS, HEAD_INDEX, SPACE_IDS, SPACE_INDEX, TARGETS, TARGET_INDEX, Head,
+    head_of, legal_heads, runner_for,
+)
+
+FACTIONS = (C.BRITISH, C.PATRIOTS, C.INDIANS, C.FRENCH)
+_MARKERS = (C.BLOCKADE, C.PROPAGANDA, C.RAID)
+_CONTROL = {"REBELLION": 1, C.BRITISH: -1}
+_NO_SPACES = (False,) * len(SPACE_IDS)
+_NO_TARGETS = (False,) * len(TARGETS)
+
+
+def _index(value) -> Optional[int]:
+    """*value* as an int if it is integer-like (an int, numpy.int64, ...),
+    else None."""
+    try:
+        return operator.index(value)
+    except TypeError:
+        return None
+
+
+def _margins(state: dict) -> Tuple[Tuple[int, int], ...]:
+    from lod_ai import victory
+    t = victory._summarize_board(state)
+    return (victory._british_margin(t), victory._patriot_margin(t),
+            victory._indian_margin(t), victory._french_margin(t))
+
+
+def observe(state: dict, faction: Optional[str] = None,
+            allowed: Optional[dict] = None,
+            legal: Optional[Dict[Head, LA.Action]] = None) -> Dict[str, Any]:
+    """The observation of *state* for *faction*'s decision (masks empty
+    when no decision is pending)."""
+    spaces = state["spaces"]
+    support = state.get("support", {})
+    control = state.get("control", {})
+    card = state.get("current_card") or {}
+    upcoming = state.get("upcoming_card") or {}
+    pools = state.get("available", {})
+    eligible = state.get("eligible", {})
+    legal = legal or {}
+    allowed = allowed or {}
+
+    action_mask = [False] * len(HEADS)
+    space_mask = [_NO_SPACES] * len(HEADS)
+    target_mask = [_NO_TARGETS] * len(HEADS)
+    for head, act in legal.items():
+        i = HEAD_INDEX[head]
+        action_mask[i] = True
+        if act.spaces:
+            row = set(act.spaces)
+            space_mask[i] = tuple(sid in row for sid in SPACE_IDS)
+        if act.targets:
+            row = set(act.targets)
+            target_mask[i] = tuple(t in row for t in TARGETS)
+
+    return {
+        "faction": faction,
+        "seat": FACTIONS.index(faction) if faction in FACTIONS else -1,
+        "card": card.get("id", 0),
+        "upcoming": upcoming.get("id", 0),
+        "limited": int(bool(allowed.get("limited_only"))),
+        "pieces": tuple(tuple(spaces.get(sid, {}).get(tag, 0)
+                              for tag in PIECE_TAGS) for sid in SPACE_IDS),
+        "support": tuple(support.get(sid, 0) for sid in SPACE_IDS),
+        "control": tuple(_CONTROL.get(control.get(sid), 0)
+                         for sid in SPACE_IDS),
+        "markers": tuple(tuple(marker_count(state, m, sid) for m in _MARKERS)
+                         for sid in SPACE_IDS),
+        "resources": tuple(state.get("resources", {}).get(f, 0)
+                           for f in FACTIONS),
+        "available": tuple(pools.get(tag, 0) for tag in PIECE_TAGS),
+        "eligible": tuple(int(bool(eligible.get(f))) for f in FACTIONS),
+        "margins": _margins(state),
+        "fni": state.get("fni_level", 0),
+        "toa": int(bool(state.get("toa_played"))),
+        "cbc": state.get("cbc", 0),
+        "crc": state.get("crc", 0),
+        "action_mask": tuple(action_mask),
+        "space_mask": tuple(space_mask),
+        "target_mask": tuple(target_mask),
+    }
+
+
+class LodEnv:
+    """One game with agent *seats* (see module docstring)."""
+
+    def __init__(self, scenario: str = "1775",
+                 seats: Iterable[str] = (C.PATRIOTS,), *, seed: int = 1,
+                 deck_method: str = "standard",
+                 max_cards: Optional[int] = None):
+        self.scenario = scenario
+        self.seats = tuple(f.upper() for f in seats)
+        for f in self.seats:
+            if f not in FACTIONS:
+                raise ValueError(f"Unknown faction {f!r}")
+        self.seed = seed
+        self.deck_method = deck_method
+        self.max_cards = max_cards
+        self.engine: Optional[Engine] = None
+        self.cards_played = 0
+        self.decisions = 0
+        self.winner: Optional[str] = None
+        self._steps = None
+        self._pending: Optional[Tuple[str, dict]] = None
+        self._legal: Dict[Head, LA.Action] = {}
+        self._truncated = False
+
+    # -- game flow -------------------------------------------------------------
+    def reset(self, seed: Optional[int] = None,
+              state: Optional[dict] = None) -> Tuple[dict, dict]:
+        """Start a game (from *state*, e.g. a checkpoint, when given) and
+        play to the agent's first turn."""
+        if seed is not None:
+            self.seed = seed
+        if state is None:
+            state = build_state(self.scenario, seed=self.seed,
+                                setup_method=self.deck_method)
+        self.engine = Engine(initial_state=state, use_cli=False)
+        self.engine.set_human_factions([])
+        self.engine.set_agent_factions(self.seats)
+        self.cards_played = 0
+        self.decisions = 0
+        self.winner = None
+        self._truncated = False
+        self._steps = None
+        self._advance(None)
+        return self._observation(), self._info()
+
+    def step(self, action) -> Tuple[dict, float, bool, bool, dict]:
+        if self._pending is None:
+            raise RuntimeError("The game is over; call reset().")
+        faction, allowed = self._pending
+        runner, illegal = self._runner(faction, allowed, action)
+        self.decisions += 1
+        turn = self._advance(runner)
+        info = self._info()
+        info.update(illegal=illegal or (turn or {}).get("pass_reason")
+                    == "illegal_action", turn=turn)
+        terminated = self.winner is not None
+        reward = 0.0
+        if terminated and self.winner in FACTIONS:
+            reward = 1.0 if self.winner in self.seats else -1.0
+        return (self._observation(), reward, terminated, self._truncated,
+                info)
+
+    @property
+    def done(self) -> bool:
+        return self._pending is None
+
+    def legal(self) -> List[LA.Action]:
+        """The pending decision's legal actions."""
+        return list(self._legal.values())
+
+    def _advance(self, runner) -> Optional[dict]:
+        """Resume the card with *runner* and play on to the next agent
+        turn; returns the turn log entry of the turn *runner* played."""
+        acting = self._pending[0] if self._pending else None
+        self._pending = None
+        self._legal = {}
+        turn = None
+        steps = self._steps
+        while True:
+            try:
+                if steps is None:
+                    card = self._draw()
+                    if card is None:
+                        return turn
+                    steps = self._steps = self.engine.iter_card(card)
+                    pending = next(steps)
+                else:
+                    pending = steps.send(runner)
+            except StopIteration:
+                pending = None
+            if acting is not None:
+                turn = next((e for e in reversed(
+                    self.engine.state.get("_card_turn_log", []))
+                    if e["faction"] == acting), None)
+                acting = runner = None
+            if pending is not None:
+                self._pending = pending
+                faction, allowed = pending
+                self._legal = legal_heads(LA.legal_actions(
+                    self.engine.state, faction, allowed))
+                return turn
+            steps = self._steps = None
+            self.cards_played += 1
+            if self._game_over():
+                return turn
+
+    def _draw(self) -> Optional[dict]:
+        if self.max_cards is not None and self.cards_played >= self.max_cards:
+            self._truncated = True
+            return None
+        card = self.engine.draw_card()
+        if card is None:
+            self.winner = (check_game_over(self.engine.state)
+                           or "deck_exhausted")
+        return card
+
+    def _game_over(self) -> bool:
+        self.winner = check_game_over(self.engine.state)
+        return self.winner is not None
+
+    # -- actions ---------------------------------------------------------------
+    def _runner(self, faction, allowed, action):
+        """``(runner, illegal)`` for the agent's *action*."""
+        try:
+            head, spaces, target = self._parse(action)
+        except (TypeError, ValueError, IndexError, KeyError):
+            return self._refused, True
+        legal = self._legal.get(head)
+        if legal is None:
+            return self._refused, True
+        if legal.spaces:
+            if spaces is None:
+                spaces = legal.spaces[:1]
+            if not spaces or not set(spaces) <= set(legal.spaces) or (
+                    legal.limited and len(spaces) != 1):
+                return self._refused, True
+        else:
+            spaces = ()
+        if legal.targets:
+            if target is None:
+                target = legal.targets[0]
+            elif target not in legal.targets:
+                return self._refused, True
+        else:
+            target = None
+        return runner_for(faction, head, spaces, target,
+                          limited=legal.limited,
+                          card=self.engine.state.get("current_card"),
+                          engine=self.engine), False
+
+    @staticmethod
+    def _refused(state, ctx) -> dict:
+        state["_turn_affected_spaces"] = set()
+        return {"action": "command", "notes": "illegal agent action"}
+
+    @staticmethod
+    def _parse(action) -> Tuple[Head, Optional[Tuple[str, ...]],
+                                Optional[str]]:
+        if isinstance(action, LA.Action):
+            return (head_of(action), action.spaces or None,
+                    action.targets[0] if action.targets else None)
+        if _index(action) is not None:
+            return HEADS[_index(action)], None, None
+        head, spaces, target = (tuple(action) + (None, None))[:3]
+        if spaces is not None:
+            spaces = list(spaces)
+            if len(spaces) == len(SPACE_IDS) and set(spaces) <= {0, 1}:
+                spaces = [sid for sid, on in zip(SPACE_IDS, spaces) if on]
+            spaces = tuple(SPACE_IDS[SPACE_INDEX[s]] if _index(s) is None
+                           else SPACE_IDS[_index(s)] for s in spaces)
+        if _index(target) is not None:
+            target = TARGETS[_index(target)]
+        elif target is not None and target not in TARGET_INDEX:
+            raise ValueError(f"Unknown target {target!r}")
+        return HEADS[operator.index(head)], spaces, target
+
+    # -- observations ----------------------------------------------------------
+    def _observation(self) -> dict:
+        faction, allowed = self._pending or (None, None)
+        return observe(self.engine.state, faction, allowed, self._legal)
+
+    def _info(self) -> dict:
+        return {"cards_played": self.cards_played,
+                "decisions": self.decisions, "winner": self.winner,
+                "legal": self.legal()}
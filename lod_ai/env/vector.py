@@ -0,0 +1,191 @@
+"""Many `LodEnv` games stepped in lockstep.
+
+`VectorEnv` holds N environments in this process; `SubprocVectorEnv`
+splits them across spawned worker processes (each running a
+`VectorEnv` over its share) and steps the workers in parallel.  Both
+take a list of `EnvSpec` and have the same interface:
+
+    from lod_ai.env import EnvSpec, SubprocVectorEnv
+
+    specs = [EnvSpec("1778", seats=("PATRIOTS",), seed=s) for s in range(8)]
+    with SubprocVectorEnv(specs, workers=4) as venv:
+        obs, infos = venv.reset()
+        for _ in range(1000):
+            actions = [o["action_mask"].index(True) for o in obs]
+            obs, rewards, terminated, truncated, infos = venv.step(actions)
+
+`step` returns lists in spec order.  A game that ends is reset at once
+with its seed advanced by N, so every slot always has a pending
+decision; the finished game's last observation and info are kept in
+``infos[i]["final_observation"]`` / ``["final_info"]``.  Workers are
+spawned with ``PYTHONHASHSEED=0``, like `tools.parallel`, so a seed
+plays the same game in a worker as in-process.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import traceback
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Tuple
+
+from .core import LodEnv
+
+
+@dataclass(frozen=True)
+class EnvSpec:
+    """One environment (the arguments of `LodEnv`)."""
+
+    scenario: str = "1775"
+    seats: Tuple[str, ...] = ("PATRIOTS",)
+    seed: int = 1
+    deck_method: str = "standard"
+    max_cards: Optional[int] = None
+
+    def make(self) -> LodEnv:
+        return LodEnv(self.scenario, self.seats, seed=self.seed,
+                      deck_method=self.deck_method, max_cards=self.max_cards)
+
+
+class VectorEnv:
+    """N environments in this process (see module docstring).  A
+    finished game's seed advances by *seed_stride* (default N)."""
+
+    def __init__(self, specs: Sequence[EnvSpec], *,
+                 seed_stride: Optional[int] = None):
+        self.specs = list(specs)
+        self.envs = [spec.make() for spec in self.specs]
+        self.num_envs = len(self.envs)
+        self.seed_stride = seed_stride or self.num_envs
+
+    def reset(self) -> Tuple[List[dict], List[dict]]:
+        out = [env.reset(seed=spec.seed)
+               for env, spec in zip(self.envs, self.specs)]
+        return [o for o, _ in out], [i for _, i in out]
+
+    def step(self, actions: Sequence[Any]):
+        if len(actions) != self.num_envs:
+            raise ValueError(f"Expected {self.num_envs} actions, "
+                             f"got {len(actions)}")
+        obs, rewards, terminated, truncated, infos = [], [], [], [], []
+        for env, action in zip(self.envs, actions):
+            o, r, term, trunc, info = env.step(action)
+            if term or trunc:
+                info = dict(info, final_observation=o, final_info=info)
+                o, reset_info = env.reset(seed=env.seed + self.seed_stride)
+                info.update(reset_info)
+            obs.append(o)
+            rewards.append(r)
+            terminated.append(term)
+            truncated.append(trunc)
+            infos.append(info)
+        return obs, rewards, terminated, truncated, infos
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "VectorEnv":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _worker(specs: List[EnvSpec], stride: int, conn) -> None:
+    venv = VectorEnv(specs, seed_stride=stride)
+    try:
+        while True:
+            cmd, arg = conn.recv()
+            if cmd == "reset":
+                conn.send(("ok", venv.reset()))
+            elif cmd == "step":
+                conn.send(("ok", venv.step(arg)))
+            else:
+                break
+    except EOFError:
+        pass
+    except BaseException:
+        conn.send(("error", traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+class SubprocVectorEnv:
+    """N environments split over *workers* spawned processes (default:
+    one per CPU, at most one per environment).  Call `close` when done,
+    or use it as a context manager."""
+
+    def __init__(self, specs: Sequence[EnvSpec], *,
+                 workers: Optional[int] = None):
+        from lod_ai.tools.parallel import pinned_hashseed
+
+        self.specs = list(specs)
+        self.num_envs = len(self.specs)
+        workers = max(1, min(workers or multiprocessing.cpu_count(),
+                             self.num_envs))
+        # Contiguous shares, so results concatenate back in spec order.
+        bounds = [self.num_envs * w // workers for w in range(workers + 1)]
+        self._shares = [(bounds[w], bounds[w + 1]) for w in range(workers)]
+        ctx = multiprocessing.get_context("spawn")
+        self._conns = []
+        self._procs = []
+        with pinned_hashseed():
+            for lo, hi in self._shares:
+                parent, child = ctx.Pipe()
+                proc = ctx.Process(target=_worker,
+                                   args=(self.specs[lo:hi], self.num_envs,
+                                         child),
+                                   daemon=True)
+                proc.start()
+                child.close()
+                self._conns.append(parent)
+                self._procs.append(proc)
+
+    def _gather(self) -> list:
+        out = []
+        for conn in self._conns:
+            status, payload = conn.recv()
+            if status != "ok":
+                raise RuntimeError(f"Environment worker failed:\n{payload}")
+            out.append(payload)
+        return out
+
+    def reset(self) -> Tuple[List[dict], List[dict]]:
+        for conn in self._conns:
+            conn.send(("reset", None))
+        obs, infos = [], []
+        for o, i in self._gather():
+            obs.extend(o)
+            infos.extend(i)
+        return obs, infos
+
+    def step(self, actions: Sequence[Any]):
+        if len(actions) != self.num_envs:
+            raise ValueError(f"Expected {self.num_envs} actions, "
+                             f"got {len(actions)}")
+        for conn, (lo, hi) in zip(self._conns, self._shares):
+            conn.send(("step", list(actions[lo:hi])))
+        out: Tuple[list, ...] = ([], [], [], [], [])
+        for part in self._gather():
+            for acc, values in zip(out, part):
+                acc.extend(values)
+        return out
+
+    def close(self) -> None:
+        for conn in self._conns:
+            try:
+                conn.send(("close", None))
+            except (OSError, BrokenPipeError):
+                pass
+            conn.close()
+        for proc in self._procs:
+            proc.join(5)
+            if proc.is_alive():
+                proc.terminate()
+        self._conns, self._procs = [], []
+
+    def __enter__(self) -> "SubprocVectorEnv":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -18,7 +18,7 @@ from datetime import datetime
 from typing import Any, Callable, Dict, List, Tuple
 
 from lod_ai import rules_consts as RC
-from lod_ai.cli_utils import BackException, UndoException, choose_count, choose_multiple, choose_one, choose_one_or_back, set_game_state, set_undo_checkpoint
+from lod_ai.cli_utils import BackException, UndoException, choose_count, choose_multiple, choose_one, choose_one_or_back, set_game_state, set_undo_checkpoint, set_undo_journal
 from lod_ai.cli_display import (
     display_board_state,
     display_card,
@@ -37,6 +37,7 @@ from lod_ai.cli_display import (
 )
 from lod_ai.engine import Engine
 from lod_ai.event_choices import collect_event_choices
+from lod_ai import legal_actions
 from lod_ai.map import adjacency as map_adj
 from lod_ai.state.setup_state import build_state
 from lod_ai.leaders import leader_location
@@ -172,38 +173,9 @@ def _space_options(state: Dict[str, Any], filter_fn: Callable[[str, Dict[str, in
     return options
 
 
-def _friendly_tags(faction: str) -> set[str]:
-    return {
-        RC.BRITISH: {RC.REGULAR_BRI, RC.TORY, RC.FORT_BRI},
-        RC.PATRIOTS: {RC.REGULAR_PAT, RC.MILITIA_A, RC.MILITIA_U, RC.FORT_PAT, RC.REGULAR_FRE},
-        RC.FRENCH: {RC.REGULAR_FRE},
-        RC.INDIANS: {RC.WARPARTY_A, RC.WARPARTY_U, RC.VILLAGE},
-    }.get(faction, set())
-
-
-_CROWN_TAGS = {RC.REGULAR_BRI, RC.TORY, RC.FORT_BRI,
-               RC.WARPARTY_A, RC.WARPARTY_U, RC.VILLAGE}
-_REBEL_TAGS = {RC.REGULAR_PAT, RC.MILITIA_A, RC.MILITIA_U,
-               RC.FORT_PAT, RC.REGULAR_FRE}
-
-
-def _enemy_tags(faction: str) -> set[str]:
-    """Side-aware enemy piece tags: Crown factions (British, Indians)
-    fight Rebellion pieces and vice versa -- an allied Indian Village must
-    not make a space look like a British Battle target."""
-    return _REBEL_TAGS if faction in (RC.BRITISH, RC.INDIANS) else _CROWN_TAGS
-
-
 def _battle_candidates(state: Dict[str, Any], faction: str) -> List[str]:
-    friendly = _friendly_tags(faction)
-    enemy = _enemy_tags(faction)
-    candidates = []
-    for sid, sp in state.get("spaces", {}).items():
-        friendly_count = sum(v for k, v in sp.items() if k in friendly)
-        enemy_count = sum(v for k, v in sp.items() if k in enemy)
-        if friendly_count > 0 and enemy_count > 0:
-            candidates.append(sid)
-    return sorted(candidates)
+    """Side-aware Battle spaces (shared with `lod_ai.legal_actions`)."""
+    return list(legal_actions.battle_spaces(state, faction))
 
 
 def _movable_sources(state: Dict[str, Any], faction: str, bring_escorts: bool = False) -> Dict[str, Dict[str, int]]:
@@ -1210,17 +1182,28 @@ def _human_decider(faction: str, card: dict, allowed: Dict[str, Any], engine: En
 # ---------------------------------------------------------------------------
 
 def _do_autosave(state: Dict[str, Any], seed: int, scenario: str, deck_method: str,
-                 human_factions: set) -> None:
-    """Overwrite autosave.json with current state."""
-    try:
+                 human_factions: set, writer=None) -> None:
+    """Overwrite autosave.json with current state.
+
+    With a `save_game.BackgroundWriter`, only a detached copy of the state
+    is taken here; the report is built and written on its thread."""
+    def _write(snap: Dict[str, Any]) -> None:
         report = build_autosave(
-            state,
+            snap,
             seed=seed,
             scenario=scenario,
             setup_method=deck_method,
             human_factions=human_factions,
         )
         save_report(report, "lod_ai/reports/autosave.json")
+
+    try:
+        if writer is None:
+            _write(state)
+        else:
+            from lod_ai.state.sandbox import detached_copy
+            snap = detached_copy(state)
+            writer.submit("autosave.json", lambda: _write(snap))
     except Exception:  # noqa: BLE001
         pass  # autosave failure is non-fatal
 
@@ -1288,22 +1271,44 @@ def _choose_seed() -> int:
 # ---------------------------------------------------------------------------
 
 def _game_loop(engine: Engine, game_stats: Dict[str, Any]) -> None:
-    """Main card-play loop shared by new game and load game paths."""
-    from lod_ai.save_game import save_game as _save_game
+    """Main card-play loop shared by new game and load game paths.
+
+    Autosaves go through a background writer, so the prompt never waits
+    on the disk; it is flushed and stopped when the game ends or crashes.
+    """
+    from lod_ai.save_game import BackgroundWriter
+
+    writer = BackgroundWriter()
+    try:
+        _play_game(engine, game_stats, writer)
+    finally:
+        writer.close()
+
+
+def _play_game(engine: Engine, game_stats: Dict[str, Any], writer) -> None:
+    from lod_ai.save_game import Autosave
+    from lod_ai.state.journal import Journal
 
     seed = engine.state.get("_seed", engine.state.get("seed", 0))
     scenario = engine.state.get("_scenario", engine.state.get("scenario", "unknown"))
     deck_method = engine.state.get("_setup_method", engine.state.get("setup_method", "standard"))
 
     game_ended = False
+    autosave = Autosave(engine.human_factions, background=writer)
+    # One undo step per card: "undo [N]" / "redo [N]" (cli_utils) move
+    # through the journal, then the loop restarts from the card boundary.
+    journal = Journal(engine.state)
+    set_undo_journal(journal)
+    set_undo_checkpoint(None)
 
     while not game_ended:
         # Auto-save between cards so we can resume from the last card
         try:
-            _save_game(engine.state, engine.human_factions, filename="autosave")
+            autosave.save(engine.state)
         except Exception:  # noqa: BLE001
             pass  # auto-save failure is non-fatal
 
+        journal.mark(len(engine.state.get("played_cards", [])))
         card = engine.draw_card()
         if not card:
             print("No more cards in deck.")
@@ -1312,9 +1317,6 @@ def _game_loop(engine: Engine, game_stats: Dict[str, Any]) -> None:
             game_ended = True
             break
 
-        # Save undo checkpoint (full deep copy before any actions on this card)
-        set_undo_checkpoint(deepcopy(engine.state))
-
         # Display the card
         display_card(
             card,
@@ -1333,10 +1335,8 @@ def _game_loop(engine: Engine, game_stats: Dict[str, Any]) -> None:
             try:
                 raw = pause_for_player()
             except UndoException:
-                # Undo at the Winter Quarters pause: revert to the start of
-                # this card and replay it (state already restored).
-                engine.state.setdefault("deck", []).insert(0, card)
-                engine.state.pop("current_card", None)
+                # Undo at the Winter Quarters pause: the journal has put
+                # the state back before a card draw; replay from there.
                 continue
             if raw in ("status", "s"):
                 display_board_state(engine.state)
@@ -1346,10 +1346,7 @@ def _game_loop(engine: Engine, game_stats: Dict[str, Any]) -> None:
             try:
                 engine.play_card(card, human_decider=_human_decider)
             except UndoException:
-                # Undo during Winter Quarters: state already restored,
-                # re-push card so draw_card() gets it again
-                engine.state.setdefault("deck", []).insert(0, card)
-                engine.state.pop("current_card", None)
+                # Undo during Winter Quarters: state already restored.
                 continue
             except Exception as exc:
                 tb_str = traceback.format_exc()
@@ -1376,15 +1373,14 @@ def _game_loop(engine: Engine, game_stats: Dict[str, Any]) -> None:
                 raw = pause_for_player()
             except UndoException:
                 # Undo after WQ resolution rewinds the whole Winter Quarters
-                # card to its start (checkpoint already restored).
-                engine.state.setdefault("deck", []).insert(0, card)
-                engine.state.pop("current_card", None)
+                # card to its start (journal already rolled back).
                 continue
             if raw in ("status", "s"):
                 display_board_state(engine.state)
 
             # Autosave after WQ
-            _do_autosave(engine.state, seed, scenario, deck_method, engine.human_factions)
+            _do_autosave(engine.state, seed, scenario, deck_method,
+                         engine.human_factions, writer)
 
             # Check if game ended
             history = engine.state.get("history", [])
@@ -1420,10 +1416,8 @@ def _game_loop(engine: Engine, game_stats: Dict[str, Any]) -> None:
         try:
             actions = engine.play_card(card, human_decider=_human_decider, post_turn_callback=_post_turn_cb)
         except UndoException:
-            # State already restored by the meta-command handler.
-            # Re-push the card so draw_card() gets it again next iteration.
-            engine.state.setdefault("deck", []).insert(0, card)
-            engine.state.pop("current_card", None)
+            # State already restored by the meta-command handler, back
+            # before this (or an earlier) card was drawn.
             continue
         except Exception as exc:
             tb_str = traceback.format_exc()
@@ -1446,7 +1440,8 @@ def _game_loop(engine: Engine, game_stats: Dict[str, Any]) -> None:
         engine.state.pop("_first_action_this_card", None)
 
         # Autosave after every card
-        _do_autosave(engine.state, seed, scenario, deck_method, engine.human_factions)
+        _do_autosave(engine.state, seed, scenario, deck_method,
+                     engine.human_factions, writer)
 
     # --- End of game: generate and save game report ---
     if game_stats.get("winner") is None:
@@ -0,0 +1,529 @@
+"""Legal top-level actions for a faction, as compact tuples.
+
+The CLI wizards, the bots' ``_can_*`` predicates and the free-op planner
+each decide where a Command or Special Activity may go.  This module
+answers the same question once, from the state alone, for search
+policies, RL agents and tools that need to enumerate moves without
+walking menus:
+
+    from lod_ai.legal_actions import legal_actions
+    for act in legal_actions(state, "PATRIOTS"):
+        print(act)
+    # Action(kind='pass', name=None, spaces=(), special=None, targets=(), limited=False)
+    # Action(kind='command', name='RALLY', spaces=('Boston', ...), special=None, ...)
+    # Action(kind='command', name='RALLY', spaces=(...), special='PERSUASION',
+    #        targets=('Massachusetts', ...), limited=False)
+
+A command action lists every space where the Command may be performed on
+its own (one Resource's worth, affordability included); the player picks
+any non-empty subset it can pay for, or exactly one when ``limited``.
+``targets`` are the spaces (or, for Préparer la Guerre, the options) the
+paired Special Activity may use, judged on the board *before* the
+Command: the Command can still change them -- Skirmish and Partisans may
+not use this turn's Battle spaces, Plunder follows the Raid.
+
+The predicates mirror the validation in ``lod_ai.commands`` and
+``lod_ai.special_activities`` (``tests/test_legal_actions.py`` executes
+every enumerated space to keep them in step), read only a few keys per
+space and never copy the state, so a full enumeration costs well under
+a millisecond.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from lod_ai import rules_consts as C
+from lod_ai.commands import (
+    battle, french_agent_mobilization, garrison, gather, hortelez, march,
+    muster, rabble_rousing, raid, rally, scout,
+)
+from lod_ai.economy.resources import can_afford
+from lod_ai.leaders import leader_location
+from lod_ai.map import adjacency as map_adj
+from lod_ai.special_activities import (
+    common_cause, naval_pressure, partisans, persuasion, plunder, preparer,
+    skirmish, trade, war_path,
+)
+from lod_ai.util.naval import has_blockade, unavailable_blockades
+
+PASS = "pass"
+EVENT = "event"
+COMMAND = "command"
+
+UNSHADED = "UNSHADED"
+SHADED = "SHADED"
+
+
+class Action(NamedTuple):
+    """One legal top-level action.
+
+    *kind* is ``"pass"``, ``"event"`` or ``"command"`` (the engine's
+    ``result["action"]`` values).  *name* is the Command's
+    ``COMMAND_NAME`` or, for an Event, ``"UNSHADED"`` / ``"SHADED"``.
+    """
+
+    kind: str
+    name: Optional[str] = None
+    spaces: Tuple[str, ...] = ()
+    special: Optional[str] = None
+    targets: Tuple[str, ...] = ()
+    limited: bool = False
+
+
+# The slot options of a first Eligible faction (Engine._options_for_slot).
+FIRST_ELIGIBLE = {
+    "actions": {PASS, EVENT, COMMAND},
+    "limited_only": False,
+    "special_allowed": True,
+    "event_allowed": True,
+}
+
+_SA_BY_FACTION = {
+    C.BRITISH: (common_cause.SA_NAME, naval_pressure.SA_NAME,
+                skirmish.SA_NAME),
+    C.PATRIOTS: (partisans.SA_NAME, persuasion.SA_NAME, skirmish.SA_NAME),
+    C.INDIANS: (plunder.SA_NAME, trade.SA_NAME, war_path.SA_NAME),
+    C.FRENCH: (naval_pressure.SA_NAME, preparer.SA_NAME, skirmish.SA_NAME),
+}
+
+# Special Activities that may only accompany particular Commands.
+_SA_COMMANDS = {
+    common_cause.SA_NAME: {march.COMMAND_NAME, battle.COMMAND_NAME},   # §4.2.1
+    plunder.SA_NAME: {raid.COMMAND_NAME},                               # §4.4.3
+}
+
+_SPACE_IDS = tuple(sorted(map_adj.all_space_ids()))
+_REBEL_PIECES = (C.REGULAR_PAT, C.REGULAR_FRE, C.MILITIA_A, C.MILITIA_U,
+                 C.FORT_PAT)
+_ROYAL_PIECES = (C.REGULAR_BRI, C.TORY, C.FORT_BRI, C.WARPARTY_A,
+                 C.WARPARTY_U, C.VILLAGE)
+
+
+# --------------------------------------------------------------------------- #
+# Small helpers                                                               #
+# --------------------------------------------------------------------------- #
+def _n(sp: Dict, *tags: str) -> int:
+    return sum(sp.get(t, 0) for t in tags)
+
+
+def _is_province(sid: str) -> bool:
+    return map_adj.space_type(sid) in ("Colony", "Reserve")
+
+
+def _support(state: Dict, sid: str) -> int:
+    return state.get("support", {}).get(sid, C.NEUTRAL)
+
+
+def _control(state: Dict, sid: str):
+    return state.get("control", {}).get(sid)
+
+
+def _spaces_where(state: Dict, pred) -> Tuple[str, ...]:
+    spaces = state["spaces"]
+    return tuple(sid for sid in _SPACE_IDS if sid in spaces
+                 and pred(sid, spaces[sid]))
+
+
+# --------------------------------------------------------------------------- #
+# Commands                                                                    #
+# --------------------------------------------------------------------------- #
+def commands_for(state: Dict, faction: str) -> Tuple[str, ...]:
+    """The Commands *faction* has, in menu order (the French set changes
+    at the Treaty of Alliance)."""
+    if faction == C.BRITISH:
+        return (muster.COMMAND_NAME, garrison.COMMAND_NAME,
+                march.COMMAND_NAME, battle.COMMAND_NAME)
+    if faction == C.PATRIOTS:
+        return (rally.COMMAND_NAME, march.COMMAND_NAME, battle.COMMAND_NAME,
+                rabble_rousing.COMMAND_NAME)
+    if faction == C.INDIANS:
+        return (gather.COMMAND_NAME, march.COMMAND_NAME, scout.COMMAND_NAME,
+                raid.COMMAND_NAME)
+    if faction == C.FRENCH:
+        if not state.get("toa_played"):
+            return (french_agent_mobilization.COMMAND_NAME,
+                    hortelez.COMMAND_NAME)
+        return (hortelez.COMMAND_NAME, muster.COMMAND_NAME,
+                march.COMMAND_NAME, battle.COMMAND_NAME)
+    raise ValueError(f"Unknown faction {faction!r}")
+
+
+def battle_spaces(state: Dict, faction: str) -> Tuple[str, ...]:
+    """Spaces holding both *faction*'s pieces and the other side's (§3.6;
+    an allied Indian Village is not a British target).  Affordability is
+    not checked."""
+    if faction == C.BRITISH:
+        own, enemy = (C.REGULAR_BRI, C.TORY, C.FORT_BRI), _REBEL_PIECES
+    elif faction == C.PATRIOTS:
+        own, enemy = _REBEL_PIECES, _ROYAL_PIECES
+    elif faction == C.FRENCH:
+        own, enemy = (C.REGULAR_FRE,), _ROYAL_PIECES
+    else:
+        return ()
+    return _spaces_where(state, lambda sid, sp: _n(sp, *own) and _n(sp, *enemy))
+
+
+def march_sources(state: Dict, faction: str) -> Tuple[str, ...]:
+    """Spaces with pieces that may lead a March (escorts need these)."""
+    tags = {
+        C.BRITISH: (C.REGULAR_BRI,),
+        C.PATRIOTS: (C.REGULAR_PAT, C.MILITIA_U, C.MILITIA_A),
+        C.INDIANS: (C.WARPARTY_U, C.WARPARTY_A),
+        C.FRENCH: (C.REGULAR_FRE,),
+    }[faction]
+    return _spaces_where(state, lambda sid, sp: _n(sp, *tags) > 0)
+
+
+def march_origins(state: Dict, faction: str, dst: str) -> Tuple[str, ...]:
+    """March sources that may reach *dst*: adjacent, or through the City
+    network for British and French Regulars (§3.2.3 / §3.5.4)."""
+    if faction == C.INDIANS and map_adj.is_city(dst):
+        return ()
+    return tuple(
+        src for src in march_sources(state, faction)
+        if src != dst and (map_adj.is_adjacent(src, dst)
+                           or march._city_network_legal(state, faction,
+                                                        src, dst)))
+
+
+def _march_spaces(state: Dict, faction: str) -> Tuple[str, ...]:
+    if faction == C.FRENCH and not state.get("toa_played"):
+        return ()
+    sources = march_sources(state, faction)
+    if not sources:
+        return ()
+    network = faction in (C.BRITISH, C.FRENCH)
+
+    def reachable(dst, _sp):
+        if faction == C.INDIANS and map_adj.is_city(dst):
+            return False
+        mask = map_adj.neighbor_mask(dst)
+        for src in sources:
+            if src == dst:
+                continue
+            if mask >> map_adj.space_index(src) & 1:
+                return True
+            if network and march._city_network_legal(state, faction, src, dst):
+                return True
+        return False
+
+    return _spaces_where(state, reachable)
+
+
+def _british_muster_ok(state: Dict, sid: str, sp: Dict) -> bool:
+    if muster._is_legal_regular_dest(state, sid):
+        return True
+    # Tory placement (§3.2.1): a City or Colony not at Active Opposition,
+    # in or adjacent to a space with British Regulars or a Fort.
+    return (map_adj.space_type(sid) in ("City", "Colony")
+            and _support(state, sid) != C.ACTIVE_OPPOSITION
+            and muster._is_adjacent_to_brit_power(state, sid))
+
+
+def _garrison_spaces(state: Dict) -> Tuple[str, ...]:
+    if state.get("fni_level", 0) == 3:
+        return ()
+    sources = _spaces_where(
+        state, lambda sid, sp: sp.get(C.REGULAR_BRI, 0) > 0
+        and not garrison._is_blockaded(sid, state))
+    if not sources:
+        return ()
+    return _spaces_where(
+        state, lambda sid, sp: map_adj.is_city(sid)
+        and not garrison._is_blockaded(sid, state)
+        and any(src != sid for src in sources))
+
+
+def raid_sources(state: Dict, dst: str) -> Tuple[str, ...]:
+    """Spaces an Underground War Party may Raid into *dst* from: adjacent,
+    or within two spaces of Dragging Canoe (§3.4.4)."""
+    dc = leader_location(state, "LEADER_DRAGGING_CANOE")
+    out = []
+    for src in _SPACE_IDS:
+        if src == dst or state["spaces"].get(src, {}).get(C.WARPARTY_U, 0) == 0:
+            continue
+        d = map_adj.distance(src, dst)
+        if d == 1 or (src == dc and d is not None and d <= 2):
+            out.append(src)
+    return tuple(out)
+
+
+def _raid_ok(state: Dict, sid: str, sp: Dict) -> bool:
+    if not _is_province(sid) or _support(state, sid) not in raid.OPPOSITION_ONLY:
+        return False
+    return sp.get(C.WARPARTY_U, 0) > 0 or bool(raid_sources(state, sid))
+
+
+def scout_origins(state: Dict, dst: str) -> Tuple[str, ...]:
+    """Provinces adjacent to *dst* holding War Parties and a British
+    Regular to Scout with (§3.4.3)."""
+    if not _is_province(dst):
+        return ()
+    return tuple(
+        src for src in map_adj.adjacent_spaces(dst)
+        if _is_province(src) and src in state["spaces"]
+        and _n(state["spaces"][src], C.WARPARTY_U, C.WARPARTY_A)
+        and state["spaces"][src].get(C.REGULAR_BRI, 0))
+
+
+def _rabble_ok(state: Dict, sid: str, sp: Dict) -> bool:
+    if map_adj.space_type(sid) not in ("City", "Colony"):
+        return False
+    if sp.get(C.MILITIA_U, 0):
+        return True
+    return (_control(state, sid) == "REBELLION"
+            and rabble_rousing._has_patriot_piece(sp))
+
+
+def _cost_ok(state: Dict, faction: str, command: str, sid: str) -> bool:
+    """Can *faction* pay for *command* in *sid* alone?"""
+    if command == garrison.COMMAND_NAME:
+        return can_afford(state, faction, 2)
+    if command == muster.COMMAND_NAME and faction == C.FRENCH:
+        return can_afford(state, faction, 2)
+    if command == scout.COMMAND_NAME:
+        return (can_afford(state, C.INDIANS, 1)
+                and can_afford(state, C.BRITISH, 1))
+    if command == gather.COMMAND_NAME and map_adj.space_type(sid) == "Reserve":
+        return True                                 # first Reserve is free
+    return can_afford(state, faction, 1)
+
+
+def command_spaces(state: Dict, faction: str, command: str) -> Tuple[str, ...]:
+    """Spaces where *faction* may perform *command* on its own (sorted).
+
+    Hortelez has no spaces: ``()`` whether or not it is affordable
+    (see `legal_actions`)."""
+    if command == battle.COMMAND_NAME:
+        if faction == C.FRENCH and not state.get("toa_played"):
+            return ()
+        spaces = battle_spaces(state, faction)
+    elif command == march.COMMAND_NAME:
+        spaces = _march_spaces(state, faction)
+    elif command == muster.COMMAND_NAME:
+        if faction == C.BRITISH:
+            spaces = _spaces_where(
+                state, lambda sid, sp: _british_muster_ok(state, sid, sp))
+        elif faction == C.FRENCH and state.get("toa_played"):
+            # §3.5.3: a Colony or City with Rebellion Control, or the WI.
+            spaces = _spaces_where(
+                state, lambda sid, sp: sid == C.WEST_INDIES_ID
+                or (map_adj.space_type(sid) in ("City", "Colony")
+                    and _control(state, sid) == "REBELLION"))
+        else:
+            spaces = ()
+    elif command == garrison.COMMAND_NAME:
+        spaces = _garrison_spaces(state) if faction == C.BRITISH else ()
+    elif command == rally.COMMAND_NAME and faction == C.PATRIOTS:
+        spaces = _spaces_where(
+            state, lambda sid, sp: _support(state, sid) != C.ACTIVE_SUPPORT
+            and map_adj.space_type(sid) in ("City", "Colony"))
+    elif command == rabble_rousing.COMMAND_NAME and faction == C.PATRIOTS:
+        spaces = _spaces_where(state, lambda sid, sp: _rabble_ok(state, sid, sp))
+    elif command == gather.COMMAND_NAME and faction == C.INDIANS:
+        spaces = _spaces_where(
+            state, lambda sid, sp: _is_province(sid)
+            and _support(state, sid) in gather.SUPPORT_OK)
+    elif command == scout.COMMAND_NAME and faction == C.INDIANS:
+        spaces = _spaces_where(
+            state, lambda sid, sp: bool(scout_origins(state, sid)))
+    elif command == raid.COMMAND_NAME and faction == C.INDIANS:
+        spaces = _spaces_where(state, lambda sid, sp: _raid_ok(state, sid, sp))
+    elif (command == french_agent_mobilization.COMMAND_NAME
+          and faction == C.FRENCH and not state.get("toa_played")):
+        spaces = _spaces_where(
+            state, lambda sid, sp:
+            sid in french_agent_mobilization._VALID_PROVINCES
+            and _support(state, sid) != C.ACTIVE_SUPPORT)
+    else:
+        spaces = ()
+    return tuple(sid for sid in spaces
+                 if _cost_ok(state, faction, command, sid))
+
+
+# --------------------------------------------------------------------------- #
+# Special Activities                                                          #
+# --------------------------------------------------------------------------- #
+def specials_for(faction: str) -> Tuple[str, ...]:
+    """The Special Activities *faction* has (``SA_NAME`` values)."""
+    return _SA_BY_FACTION.get(faction, ())
+
+
+def special_pairs_with(special: str, command: str) -> bool:
+    """May *special* accompany *command*?  Common Cause needs a March or
+    Battle, Plunder a Raid; the rest go with any Command."""
+    allowed = _SA_COMMANDS.get(special)
+    return allowed is None or command in allowed
+
+
+def _skirmish_ok(state: Dict, faction: str, sid: str, sp: Dict) -> bool:
+    if faction == C.PATRIOTS and sid == C.WEST_INDIES_ID:
+        return False
+    if faction == C.BRITISH:
+        own, cubes, fort = C.REGULAR_BRI, (C.REGULAR_PAT, C.REGULAR_FRE,
+                                           C.MILITIA_A), C.FORT_PAT
+    else:
+        own = C.REGULAR_PAT if faction == C.PATRIOTS else C.REGULAR_FRE
+        cubes, fort = (C.REGULAR_BRI, C.TORY), C.FORT_BRI
+    return bool(sp.get(own, 0) and (_n(sp, *cubes) or sp.get(fort, 0)))
+
+
+def _partisans_ok(sp: Dict) -> bool:
+    mil_u = sp.get(C.MILITIA_U, 0)
+    if not mil_u:
+        return False
+    if _n(sp, *partisans._UNIT_TAGS):                       # options 1/2
+        return True
+    return (mil_u >= 2 and sp.get(C.VILLAGE, 0) > 0         # option 3
+            and not _n(sp, C.WARPARTY_U, C.WARPARTY_A))
+
+
+def _war_path_ok(sp: Dict) -> bool:
+    wp_u = sp.get(C.WARPARTY_U, 0)
+    if not wp_u:
+        return False
+    if _n(sp, *war_path.REB_CUBE_TAGS):                     # options 1/2
+        return True
+    return wp_u >= 2 and sp.get(C.FORT_PAT, 0) > 0          # option 3
+
+
+def special_targets(state: Dict, faction: str,
+                    special: str) -> Optional[Tuple[str, ...]]:
+    """Where *faction* may use *special* now: a tuple of spaces (or of
+    Préparer la Guerre options), ``()`` when the activity is legal but
+    takes no target, or None when it is not available at all."""
+    if special not in specials_for(faction):
+        return None
+    spaces = state["spaces"]
+
+    if special == skirmish.SA_NAME:
+        if faction == C.FRENCH and not state.get("toa_played"):
+            return None
+        found = _spaces_where(
+            state, lambda sid, sp: _skirmish_ok(state, faction, sid, sp))
+    elif special == partisans.SA_NAME:
+        found = _spaces_where(
+            state, lambda sid, sp: _partisans_ok(sp)
+            and _n(sp, *partisans.ROYALIST_TAGS) > 0)
+    elif special == persuasion.SA_NAME:
+        found = _spaces_where(
+            state, lambda sid, sp: sp.get(C.MILITIA_U, 0) > 0
+            and _control(state, sid) == "REBELLION"
+            and map_adj.space_type(sid) in ("Colony", "City"))
+    elif special == common_cause.SA_NAME:
+        found = _spaces_where(
+            state, lambda sid, sp: _n(sp, C.REGULAR_BRI, C.TORY, C.FORT_BRI)
+            and _n(sp, C.WARPARTY_U, C.WARPARTY_A))
+    elif special == trade.SA_NAME:
+        found = _spaces_where(
+            state, lambda sid, sp: _is_province(sid)
+            and sp.get(C.WARPARTY_U, 0) > 0 and sp.get(C.VILLAGE, 0) > 0)
+    elif special == war_path.SA_NAME:
+        found = _spaces_where(state, lambda sid, sp: _war_path_ok(sp))
+    elif special == plunder.SA_NAME:
+        found = _spaces_where(
+            state, lambda sid, sp: map_adj.population(sid) > 0
+            and _n(sp, C.WARPARTY_U, C.WARPARTY_A)
+            > _n(sp, *plunder.REB_TAGS))
+    elif special == naval_pressure.SA_NAME:
+        return _naval_targets(state, faction)
+    elif special == preparer.SA_NAME:
+        return _preparer_targets(state)
+    else:
+        return None
+    return found or None
+
+
+def _naval_targets(state: Dict, faction: str) -> Optional[Tuple[str, ...]]:
+    cities = tuple(sid for sid in _SPACE_IDS if map_adj.is_city(sid))
+    if faction == C.BRITISH:
+        # §4.2.3: Resources before the Treaty or at FNI 0, otherwise lower
+        # the FNI and pull a Blockade off a City.
+        if not state.get("toa_played") or state.get("fni_level", 0) == 0:
+            return ()
+        return tuple(c for c in cities if has_blockade(state, c)) or None
+    if not state.get("toa_played"):
+        return None
+    bloc = state.get("markers", {}).get(C.BLOCKADE, {})
+    pool = bloc.get("pool", 0)
+    on_map = bloc.get("on_map", ())
+    if state.get("fni_level", 0) + 1 > pool + len(on_map):
+        return None
+    if pool:
+        return tuple(c for c in cities if c not in on_map) or None
+    return ()                                   # rearrange the City markers
+
+
+def _preparer_targets(state: Dict) -> Tuple[str, ...]:
+    options = []
+    pool = state.get("markers", {}).get(C.BLOCKADE, {}).get("pool", 0)
+    if unavailable_blockades(state) > 0 and pool < C.MAX_WI_SQUADRONS:
+        options.append("BLOCKADE")
+    if state.get("unavailable", {}).get(C.REGULAR_FRE, 0) > 0:
+        options.append("REGULARS")
+    options.append("RESOURCES")
+    return tuple(options)
+
+
+# --------------------------------------------------------------------------- #
+# Top-level enumeration                                                       #
+# --------------------------------------------------------------------------- #
+def event_sides(card: Optional[Dict]) -> Tuple[str, ...]:
+    """The Event sides *card* offers (``UNSHADED`` / ``SHADED``)."""
+    if not card:
+        return ()
+    sides = []
+    if card.get("unshaded_event"):
+        sides.append(UNSHADED)
+    if card.get("dual") and card.get("shaded_event"):
+        sides.append(SHADED)
+    return tuple(sides)
+
+
+def legal_actions(state: Dict, faction: str, allowed: Optional[Dict] = None,
+                  card: Optional[Dict] = None) -> List[Action]:
+    """Every legal top-level action for *faction*.
+
+    *allowed* is the engine's slot options (``Engine._allowed_for_faction``);
+    the default is a first Eligible faction's.  *card* defaults to
+    ``state["current_card"]``.  Commands with no legal space are left out,
+    and so is each Special Activity with nowhere to go.
+    """
+    allowed = FIRST_ELIGIBLE if allowed is None else allowed
+    card = state.get("current_card") if card is None else card
+    kinds = allowed.get("actions", ())
+    limited = bool(allowed.get("limited_only"))
+    with_special = not limited and allowed.get("special_allowed", True)
+
+    actions: List[Action] = []
+    if PASS in kinds:
+        actions.append(Action(PASS))
+    if EVENT in kinds and allowed.get("event_allowed", False):
+        actions.extend(Action(EVENT, side) for side in event_sides(card))
+    if COMMAND not in kinds:
+        return actions
+
+    specials: List[Tuple[str, Tuple[str, ...]]] = []
+    if with_special:
+        for sa in specials_for(faction):
+            targets = special_targets(state, faction, sa)
+            if targets is not None:
+                specials.append((sa, targets))
+
+    for cmd in commands_for(state, faction):
+        if cmd == hortelez.COMMAND_NAME:
+            if not can_afford(state, faction, 1):
+                continue
+            spaces: Tuple[str, ...] = ()
+        else:
+            spaces = command_spaces(state, faction, cmd)
+            if not spaces:
+                continue
+        actions.append(Action(COMMAND, cmd, spaces, None, (), limited))
+        for sa, targets in specials:
+            if special_pairs_with(sa, cmd):
+                actions.append(Action(COMMAND, cmd, spaces, sa, targets,
+                                      limited))
+    return actions
+
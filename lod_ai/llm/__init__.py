@@ -11,16 +11,26 @@ Quick start:
 
     # Real LLM play (needs ANTHROPIC_API_KEY):
     result = run_game("1775", llm_factions=["PATRIOTS"], policy=AnthropicPolicy())
+
+Many model-seated games at once: `lod_ai.llm.batch`.
 """
 from .harness import run_game
 from .policy import (
     Policy, RandomPolicy, ScriptedPolicy, FirstChoicePolicy,
     AnthropicPolicy, make_policy,
 )
-from .observation import serialize_state
+from .search import RolloutPolicy
+from .batch import AsyncPolicy, GameSpec, ResponseCache, SyncPolicy, run_games
+from .transport import HTTPTransport, StandInServer, Transport
+from .observation import (
+    Observation, SpaceObs, build_observation, serialize_state,
+)
 
 __all__ = [
-    "run_game", "serialize_state",
+    "run_game", "serialize_state", "build_observation",
+    "Observation", "SpaceObs",
     "Policy", "RandomPolicy", "ScriptedPolicy", "FirstChoicePolicy",
-    "AnthropicPolicy", "make_policy",
+    "AnthropicPolicy", "RolloutPolicy", "make_policy",
+    "AsyncPolicy", "SyncPolicy", "ResponseCache", "GameSpec", "run_games",
+    "Transport", "HTTPTransport", "StandInServer",
 ]
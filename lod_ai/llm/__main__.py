@@ -10,11 +10,27 @@ Watch an LLM play (needs ANTHROPIC_API_KEY):
 
     python -m lod_ai.llm --scenario 1775 --factions PATRIOTS \
         --policy anthropic --model claude-sonnet-4-5 --verbose
+
+Many LLM games at once, 8 model requests in flight, answers cached on disk:
+
+    python -m lod_ai.llm --scenario 1778 --factions PATRIOTS \
+        --policy anthropic --games 16 --concurrency 8 --response-cache .lod_cache/llm
+
+The same against a local stand-in server (no API key; 0.3 s per reply):
+
+    python -m lod_ai.llm --policy anthropic --games 8 --standin 0.3
+
+Rollout search (rule-bot lookahead, no API key needed):
+
+    python -m lod_ai.llm --scenario 1778 --factions BRITISH \
+        --policy rollout --rollouts 8 --horizon 3 --workers 4
 """
 from __future__ import annotations
 
 import argparse
+import contextlib
 import sys
+import time
 
 from .harness import run_game
 from .policy import make_policy
@@ -33,27 +49,60 @@ def main(argv=None) -> int:
                    help="Comma-separated factions the LLM controls "
                         "(BRITISH,PATRIOTS,FRENCH,INDIANS).")
     p.add_argument("--policy", default="random",
-                   choices=["random", "first", "anthropic"])
+                   choices=["random", "first", "rollout", "anthropic"])
     p.add_argument("--model", default="claude-sonnet-4-5")
+    p.add_argument("--rollouts", type=int, default=8,
+                   help="rollout policy: rollouts per action option")
+    p.add_argument("--horizon", type=int, default=2,
+                   help="rollout policy: cards played after the action")
+    p.add_argument("--workers", type=int, default=1,
+                   help="rollout policy: worker processes")
+    p.add_argument("--time-budget", type=float, default=None,
+                   help="rollout policy: seconds per decision")
     p.add_argument("--max-cards", type=int, default=None)
+    p.add_argument("--games", type=int, default=1,
+                   help="anthropic policy: games to play (seeds seed, seed+1, ...)")
+    p.add_argument("--concurrency", type=int, default=8,
+                   help="anthropic policy: model requests (and games) in flight")
+    p.add_argument("--base-url", default=None,
+                   help="anthropic policy: Messages endpoint to post to")
+    p.add_argument("--standin", type=float, default=None, metavar="LATENCY",
+                   help="anthropic policy: answer from a local stand-in "
+                        "server replying after LATENCY seconds")
+    p.add_argument("--response-cache", default=None, metavar="DIR",
+                   help="anthropic policy: keep model answers under DIR")
     p.add_argument("--verbose", action="store_true",
                    help="Stream each decision (and don't suppress board output).")
     args = p.parse_args(argv)
 
     factions = [f.strip().upper() for f in args.factions.split(",") if f.strip()]
+    batched = (args.games > 1 or args.base_url or args.standin is not None
+               or args.response_cache)
+    if batched:
+        if args.policy != "anthropic":
+            p.error("--games/--base-url/--standin/--response-cache need "
+                    "--policy anthropic")
+        return _run_batch(args, factions)
     policy = make_policy(args.policy, model=args.model, verbose=args.verbose,
-                         seed=args.seed)
+                         seed=args.seed, rollouts=args.rollouts,
+                         horizon=args.horizon, workers=args.workers,
+                         time_budget=args.time_budget)
 
     print(f"Liberty or Death -- LLM harness")
     print(f"  scenario={args.scenario} seed={args.seed} deck={args.deck_method}")
     print(f"  LLM plays: {', '.join(factions)}   policy={args.policy}")
     print("  (other factions played by the rule-based bots)\n")
 
-    result = run_game(
-        args.scenario, seed=args.seed, deck_method=args.deck_method,
-        llm_factions=factions, policy=policy, max_cards=args.max_cards,
-        verbose=args.verbose, quiet=not args.verbose,
-    )
+    try:
+        result = run_game(
+            args.scenario, seed=args.seed, deck_method=args.deck_method,
+            llm_factions=factions, policy=policy, max_cards=args.max_cards,
+            verbose=args.verbose, quiet=not args.verbose,
+        )
+    finally:
+        close = getattr(policy, "close", None)
+        if callable(close):
+            close()
 
     print("\n=== RESULT ===")
     print(f"  Winner:        {result['winner']}")
@@ -63,5 +112,40 @@ def main(argv=None) -> int:
     return 0
 
 
+def _run_batch(args, factions) -> int:
+    from .batch import AsyncPolicy, GameSpec, ResponseCache, run_games
+    from .transport import API_URL, HTTPTransport, StandInServer
+
+    specs = [GameSpec(args.scenario, seed=args.seed + i,
+                      llm_factions=tuple(factions),
+                      deck_method=args.deck_method, max_cards=args.max_cards)
+             for i in range(max(1, args.games))]
+    with contextlib.ExitStack() as stack:
+        if args.standin is not None:
+            url = stack.enter_context(StandInServer(latency=args.standin)).url
+        else:
+            url = args.base_url or API_URL
+        policy = AsyncPolicy(HTTPTransport(url), model=args.model,
+                             concurrency=args.concurrency,
+                             cache=ResponseCache(args.response_cache),
+                             verbose=args.verbose)
+        print(f"Liberty or Death -- LLM harness, {len(specs)} game(s), "
+              f"{policy.concurrency} at a time ({url})")
+        start = time.perf_counter()
+        results = run_games(specs, policy)
+        elapsed = time.perf_counter() - start
+
+    decisions = 0
+    for r in results:
+        decisions += r.get("decisions") or 0
+        outcome = r.get("error", "").strip().splitlines()[-1:] or [r["winner"]]
+        print(f"  [{r['scenario']} seed={r['seed']}] {outcome[0]}  "
+              f"cards={r.get('cards_played', '-')} "
+              f"decisions={r.get('decisions', '-')}")
+    print(f"\n{decisions} decision(s) in {elapsed:.1f}s "
+          f"({decisions / elapsed if elapsed else 0:.1f}/s); {policy.summary()}")
+    return 1 if any("error" in r for r in results) else 0
+
+
 if __name__ == "__main__":
     sys.exit(main())
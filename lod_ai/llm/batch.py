@@ -0,0 +1,318 @@
+"""Many LLM-seated games at once, sharing one asynchronous model client.
+
+A model-backed seat spends nearly all its wall time waiting on the
+network, so `AnthropicPolicy` playing one game after another is bound
+by request latency.  Here:
+
+* `AsyncPolicy` answers decisions as coroutines over a pluggable
+  `transport.Transport`.  At most *concurrency* requests are in flight;
+  identical concurrent prompts share one request, and answers are kept
+  in a `ResponseCache` keyed by a hash of (observation, prompt, menu,
+  faction, model).
+* `play_games` / `run_games` host each game in a spawned worker process
+  (the rule engine is CPU-bound Python, so processes let games run in
+  parallel), and every worker's prompts come back to the one
+  `AsyncPolicy` in the parent.  With *W*
+  games running, up to *W* decisions wait on the model at once, so
+  throughput grows with the concurrency limit, not with latency.
+* `SyncPolicy` wraps an `AsyncPolicy` as an ordinary `Policy` for a
+  single `run_game`.
+
+    from lod_ai.llm.batch import AsyncPolicy, GameSpec, run_games
+    from lod_ai.llm.transport import StandInServer, HTTPTransport
+
+    with StandInServer(latency=0.2) as server:          # no API key needed
+        policy = AsyncPolicy(HTTPTransport(server.url), concurrency=8)
+        results = run_games([GameSpec("1778", seed=s) for s in range(8)],
+                            policy)
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .policy import (
+    Policy, _fallback, parse_answer, render_prompt, response_text,
+    system_prompt,
+)
+from .transport import HTTPTransport, Transport, TransportError
+
+
+class ResponseCache:
+    """Model answers by request hash: in memory, and one small JSON file
+    per entry under *root* when given (written through a rename, so
+    concurrent runs can share a directory)."""
+
+    def __init__(self, root: str | os.PathLike | None = None):
+        self.root = Path(root) if root is not None else None
+        self.hits = 0
+        self.misses = 0
+        self._mem: Dict[str, str] = {}
+
+    @staticmethod
+    def key(observation, label: str, menu: Optional[dict],
+            faction: Optional[str], model: str) -> str:
+        blob = json.dumps([str(observation), label, menu, faction, model],
+                          sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        ans = self._mem.get(key)
+        if ans is None and self.root is not None:
+            try:
+                ans = json.loads(self._path(key).read_text("utf-8"))["answer"]
+            except (OSError, ValueError, KeyError, TypeError):
+                ans = None
+            if ans is not None:
+                self._mem[key] = ans
+        if ans is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return ans
+
+    def put(self, key: str, answer: str) -> None:
+        self._mem[key] = answer
+        if self.root is None:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"answer": answer}), "utf-8")
+        os.replace(tmp, path)
+
+
+class AsyncPolicy:
+    """Model decisions as coroutines (see module docstring).
+
+    A failed request answers with the first legal choice and is not
+    cached.  Counters: ``requests`` sent, ``errors``, ``shared``
+    (answered by another caller's in-flight request) and
+    ``max_in_flight``.
+    """
+
+    def __init__(self, transport: Optional[Transport] = None, *,
+                 model: str = "claude-sonnet-4-5", max_tokens: int = 16,
+                 temperature: float = 0.2, concurrency: int = 8,
+                 cache: Optional[ResponseCache] = None,
+                 verbose: bool = False):
+        self.transport = transport or HTTPTransport()
+        self.model = model
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.concurrency = max(1, concurrency)
+        self.cache = cache if cache is not None else ResponseCache()
+        self.verbose = verbose
+        self.requests = 0
+        self.errors = 0
+        self.shared = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._limit: Optional[asyncio.Semaphore] = None
+        self._limit_loop = None
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    def request_body(self, observation, label: str, menu: Optional[dict],
+                     faction: Optional[str]) -> dict:
+        return {"model": self.model, "max_tokens": self.max_tokens,
+                "temperature": self.temperature,
+                "system": system_prompt(faction),
+                "messages": [{"role": "user",
+                              "content": render_prompt(observation, label,
+                                                       menu)}]}
+
+    async def achoose(self, observation, label: str, menu: Optional[dict],
+                      faction: Optional[str]) -> str:
+        key = self.cache.key(observation, label, menu, faction, self.model)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.shared += 1
+            return await asyncio.shield(pending)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            ans, ok = await self._ask(observation, label, menu, faction)
+            if ok:
+                self.cache.put(key, ans)
+            future.set_result(ans)
+            return ans
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()      # retrieved: no "never retrieved" noise
+            raise
+        finally:
+            del self._pending[key]
+
+    async def _ask(self, observation, label, menu,
+                   faction) -> Tuple[str, bool]:
+        loop = asyncio.get_running_loop()
+        if self._limit is None or self._limit_loop is not loop:
+            self._limit, self._limit_loop = asyncio.Semaphore(self.concurrency), loop
+        body = self.request_body(observation, label, menu, faction)
+        async with self._limit:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+            self.requests += 1
+            try:
+                reply = await self.transport.send(body)
+            except TransportError as exc:
+                self.errors += 1
+                if self.verbose:
+                    print(f"[AsyncPolicy] {exc}; using fallback")
+                return _fallback(menu), False
+            finally:
+                self._in_flight -= 1
+        ans = parse_answer(response_text(reply), menu)
+        if self.verbose:
+            print(f"[AsyncPolicy] {faction} -> {ans}")
+        return ans, True
+
+    def summary(self) -> str:
+        return (f"{self.requests} request(s), {self.cache.hits} cache hit(s), "
+                f"{self.shared} shared, {self.errors} error(s), "
+                f"peak {self.max_in_flight} in flight")
+
+
+class SyncPolicy(Policy):
+    """An `AsyncPolicy` as a blocking `Policy`: the coroutines run on a
+    private event-loop thread.  Call `close` when done."""
+
+    def __init__(self, policy: AsyncPolicy):
+        self.policy = policy
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        name="lod-llm-loop", daemon=True)
+        self._thread.start()
+
+    def choose(self, observation, label, menu, faction):
+        return asyncio.run_coroutine_threadsafe(
+            self.policy.achoose(observation, label, menu, faction),
+            self._loop).result()
+
+    def close(self) -> None:
+        if self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(
+                self.policy.transport.aclose(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+
+# --------------------------------------------------------------------------- #
+# Game hosting                                                                #
+# --------------------------------------------------------------------------- #
+@dataclass(frozen=True)
+class GameSpec:
+    """One harness game (the arguments of `harness.run_game`)."""
+
+    scenario: str = "1775"
+    seed: int = 1
+    llm_factions: Tuple[str, ...] = ("PATRIOTS",)
+    deck_method: str = "standard"
+    max_cards: Optional[int] = None
+
+
+class _PipePolicy(Policy):
+    """Worker side: forward each decision to the parent and wait."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def choose(self, observation, label, menu, faction):
+        self.conn.send(("choose", str(observation), label, menu, faction))
+        return self.conn.recv()
+
+
+def _game_worker(spec: GameSpec, conn) -> None:
+    from .harness import run_game
+
+    try:
+        result = run_game(spec.scenario, seed=spec.seed,
+                          deck_method=spec.deck_method,
+                          llm_factions=spec.llm_factions,
+                          policy=_PipePolicy(conn), max_cards=spec.max_cards)
+        conn.send(("done", {k: v for k, v in result.items()
+                            if k != "state"}))
+    except BaseException:
+        conn.send(("error", traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+def _recv(conn):
+    try:
+        return conn.recv()
+    except (EOFError, OSError):
+        return None
+
+
+async def play_games(specs: Iterable[GameSpec], policy: AsyncPolicy, *,
+                     workers: Optional[int] = None) -> List[dict]:
+    """Play *specs* with *workers* games at a time (default: the
+    policy's concurrency).  Results come back in *specs* order, each
+    `run_game`'s summary without the final state plus ``scenario`` and
+    ``seed``; a game that crashed has ``winner`` None and an ``error``."""
+    specs = list(specs)
+    workers = max(1, workers or policy.concurrency)
+    loop = asyncio.get_running_loop()
+    ctx = multiprocessing.get_context("spawn")
+    gate = asyncio.Semaphore(workers)
+
+    async def one(spec: GameSpec, readers: ThreadPoolExecutor) -> dict:
+        tag = {"scenario": spec.scenario, "seed": spec.seed}
+        async with gate:
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_game_worker, args=(spec, child),
+                               daemon=True)
+            proc.start()
+            child.close()
+            try:
+                while True:
+                    msg = await loop.run_in_executor(readers, _recv, parent)
+                    if msg is None:
+                        return dict(tag, winner=None,
+                                    error=f"worker exited ({proc.exitcode})")
+                    if msg[0] == "choose":
+                        parent.send(await policy.achoose(*msg[1:]))
+                    elif msg[0] == "done":
+                        return dict(msg[1], **tag)
+                    else:
+                        return dict(tag, winner=None, error=msg[1])
+            finally:
+                parent.close()
+                await loop.run_in_executor(readers, proc.join, 5)
+                if proc.is_alive():
+                    proc.terminate()
+
+    with ThreadPoolExecutor(max_workers=workers,
+                            thread_name_prefix="lod-game") as readers:
+        return list(await asyncio.gather(*(one(s, readers) for s in specs)))
+
+
+def run_games(specs: Iterable[GameSpec], policy: AsyncPolicy, *,
+              workers: Optional[int] = None) -> List[dict]:
+    """Blocking `play_games`."""
+    async def main():
+        try:
+            return await play_games(specs, policy, workers=workers)
+        finally:
+            await policy.transport.aclose()
+    return asyncio.run(main())
@@ -8,36 +8,35 @@ exact same legality-checked decision tree a human would.
 from __future__ import annotations
 
 import contextlib
-import io
 from typing import Iterable, Optional
 
-from .observation import serialize_state
+from lod_ai.util.history import VICTORY, WINNER, last_event
+
+from .observation import build_observation
 
 
 def _detect_winner(state: dict) -> Optional[str]:
-    """Scan recent history for a victory/end-of-game declaration."""
-    history = state.get("history", [])
-    for entry in reversed(history[-40:]):
-        msg = entry.get("msg", "") if isinstance(entry, dict) else str(entry)
-        if "Winner:" in msg:
-            # e.g. "Winner: PATRIOTS (Rule 7.3)"
-            after = msg.split("Winner:", 1)[1].strip()
-            return after.split()[0] if after else "unknown"
-        if "Victory achieved" in msg:
-            # Mid-game Winter-Quarters victory (6.1) doesn't name the faction;
-            # recompute it from the victory margins (same logic as batch_smoke).
-            try:
-                from lod_ai.tools.batch_smoke import _determine_winner_from_margins
-                return _determine_winner_from_margins(state)
-            except Exception:
-                return msg
-    return None
+    """The faction named by a recent Winner / Victory history event."""
+    entry = last_event(state.get("history", []), WINNER, VICTORY, within=40)
+    if entry is None:
+        return None
+    if entry["kind"] == WINNER:
+        # Final Scoring (7.3): "Winner: PATRIOTS (Rule 7.3)"
+        return entry["data"].get("faction") or "unknown"
+    # Mid-game Winter-Quarters victory (6.1) doesn't name the faction;
+    # recompute it from the victory margins.
+    try:
+        from lod_ai.victory import winner_from_margins
+        return winner_from_margins(state)
+    except Exception:
+        return entry["msg"]
 
 
 @contextlib.contextmanager
 def _maybe_quiet(quiet: bool):
     if quiet:
-        with contextlib.redirect_stdout(io.StringIO()):
+        from lod_ai.cli_utils import quiet_output
+        with quiet_output():
             yield
     else:
         yield
@@ -98,7 +97,7 @@ def run_game(
             "min": 0, "max": n_ug, "default": 0,
         }
         try:
-            obs = serialize_state(st, owner)
+            obs = build_observation(st, owner)
             pol = policies.get(owner.upper(), policy) if policies else policy
             return int(pol.choose(obs, "Activate count:", menu, owner) or 0)
         except Exception:
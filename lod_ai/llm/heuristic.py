@@ -12,8 +12,9 @@ Usage:
 from __future__ import annotations
 
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Mapping, Optional, Tuple
 
+from .observation import Observation, SpaceObs
 from .policy import Policy, _valid_choices
 from lod_ai.map import adjacency as MAP
 
@@ -24,10 +25,11 @@ _SUPPORT_NUM = {
     "Active Support": 2, "Passive Support": 1, "Neutral": 0,
     "Passive Opposition": -1, "Active Opposition": -2,
 }
+_CONTROL_TXT = {"British Control": "BRITISH", "Rebellion Control": "REBELLION"}
 _BOARD_RE = re.compile(
     r"^\s{2}(\S+)\s{2,}(Active Support|Passive Support|Neutral|"
     r"Passive Opposition|Active Opposition|\S+)\s{2,}"
-    r"(British Control|Rebellion Control|no Control)\s{2,}(.*)$"
+    r"(British Control|Rebellion Control|no Control)\s+(.*)$"
 )
 _PIECE_RE = re.compile(r"(\d+)\s+([A-Za-z()]+)")
 
@@ -36,7 +38,11 @@ _CROWN = ("BritReg", "Tory", "BritFort", "WarParty", "Village")
 
 
 def parse_board(observation: str) -> Dict[str, dict]:
-    """Extract per-space support/control/pieces from the rendered observation."""
+    """Extract per-space support/control/pieces from a rendered observation.
+
+    Only needed for text observations; an `Observation` already carries
+    the board as `SpaceObs` records.
+    """
     spaces: Dict[str, dict] = {}
     for line in observation.splitlines():
         m = _BOARD_RE.match(line)
@@ -58,6 +64,22 @@ def parse_board(observation: str) -> Dict[str, dict]:
     return spaces
 
 
+def _board(observation) -> Mapping[str, SpaceObs]:
+    """Per-space records from an `Observation`, or parsed from text."""
+    if isinstance(observation, Observation):
+        return observation.spaces
+    return {sid: SpaceObs(sid, support=d["support"],
+                          control=_CONTROL_TXT.get(d["control"]),
+                          pieces=d["pieces"])
+            for sid, d in parse_board(str(observation)).items()}
+
+
+def _toa_played(observation) -> bool:
+    if isinstance(observation, Observation):
+        return observation.toa_played
+    return "Treaty of Alliance=played" in str(observation)
+
+
 def _pop(sid: str) -> int:
     try:
         return MAP.population(sid)
@@ -74,60 +96,60 @@ def _is_city(sid: str) -> bool:
 
 # --------------------------------------------------------------------------- #
 # Space scorers.  Each returns a number; <= 0 means "don't pick this space".
-# Signature: (sid, info_or_None, side) where side is "REBEL" or "CROWN".
+# Signature: (sid, info, side): info is the space's SpaceObs (an empty one
+# for spaces not on the board) and side is "REBEL" or "CROWN".
 # --------------------------------------------------------------------------- #
 def _info(board, sid):
-    return board.get(sid, {"support": 0, "control": "no Control",
-                           "pieces": {}, "rebel": 0, "crown": 0})
+    return board.get(sid) or SpaceObs(sid)
 
 
 def score_rabble_rouse(sid, info, _):
-    if info["support"] <= -2:          # already Active Opposition
+    if info.support <= -2:          # already Active Opposition
         return 0
-    return _pop(sid) * 10 + info["support"] + 3
+    return _pop(sid) * 10 + info.support + 3
 
 
 def score_reward_loyalty(sid, info, _):
-    if info["support"] >= 2:           # already Active Support
+    if info.support >= 2:           # already Active Support
         return 0
-    return _pop(sid) * 10 + (5 if _is_city(sid) else 0) - info["support"]
+    return _pop(sid) * 10 + (5 if _is_city(sid) else 0) - info.support
 
 
 def score_muster(sid, info, _):
-    return _pop(sid) * 5 + (10 if _is_city(sid) else 0) + info["crown"]
+    return _pop(sid) * 5 + (10 if _is_city(sid) else 0) + info.crown
 
 
 def score_rally(sid, info, _):
-    bonus = 10 if "PatFort" in info["pieces"] else 0
-    return _pop(sid) * 5 + bonus + info["rebel"]
+    bonus = 10 if "PatFort" in info.pieces else 0
+    return _pop(sid) * 5 + bonus + info.rebel
 
 
 def score_battle_rebel(sid, info, _):
     # Only attack with a clear force edge and no enemy fort.
-    if "BritFort" in info["pieces"]:
+    if "BritFort" in info.pieces:
         return 0
-    edge = info["rebel"] - 2 * info["crown"]
+    edge = info.rebel - 2 * info.crown
     return edge * 10 if edge > 0 else 0
 
 
 def score_battle_crown(sid, info, _):
-    if "PatFort" in info["pieces"]:
+    if "PatFort" in info.pieces:
         return 0
-    edge = info["crown"] - 2 * info["rebel"]
+    edge = info.crown - 2 * info.rebel
     return edge * 10 if edge > 0 else 0
 
 
 def score_gather(sid, info, _):
-    wp = sum(v for k, v in info["pieces"].items() if "WarParty" in k)
+    wp = sum(v for k, v in info.pieces.items() if "WarParty" in k)
     reserve = 10 if _pop(sid) == 0 and not _is_city(sid) else 0
     return wp * 10 + reserve + 1
 
 
 def score_raid(sid, info, _):
     # Raid shifts toward Neutral: target Opposition provinces.
-    if info["support"] >= 0:
+    if info.support >= 0:
         return 0
-    return -info["support"] * 10 + _pop(sid)
+    return -info.support * 10 + _pop(sid)
 
 
 def score_persuasion(sid, info, _):
@@ -135,8 +157,8 @@ def score_persuasion(sid, info, _):
 
 
 def score_march_dest(sid, info, side):
-    own = info["rebel"] if side == "REBEL" else info["crown"]
-    enemy = info["crown"] if side == "REBEL" else info["rebel"]
+    own = info.rebel if side == "REBEL" else info.crown
+    enemy = info.crown if side == "REBEL" else info.rebel
     return _pop(sid) * 2 + own - enemy + 1
 
 
@@ -334,7 +356,7 @@ class HeuristicPolicy(Policy):
             i = self._pick_by_pref(options, order)
             return str(i + 1) if i is not None else valid[0]
 
-        post_toa = "Treaty of Alliance=played" in observation
+        post_toa = _toa_played(observation)
 
         if prompt.startswith("Select Command"):
             prefs = list((self.p.get("commands_post_toa") if post_toa else None)
@@ -381,8 +403,8 @@ class HeuristicPolicy(Policy):
             i = self._pick_by_pref(options, ["No"])
             return str(i + 1) if i is not None else valid[0]
 
-        # Space-selection menus: score options against the parsed board.
-        board = parse_board(observation)
+        # Space-selection menus: score options against the board.
+        board = _board(observation)
         space_opts = [o for o in options if o in board or _pop(o) or
                       MAP.space_type(o) is not None]
         if space_opts:
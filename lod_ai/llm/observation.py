@@ -1,7 +1,18 @@
-"""Render a Liberty or Death game state into compact text for an LLM player."""
+"""Game observations for LLM harness policies.
+
+`build_observation` reads a Liberty or Death game state into a typed
+`Observation`: per-space support/control/pieces, resources, naval and
+casualty tracks, and victory margins, with no text round trip.  Policies
+that reason over the board (e.g. `HeuristicPolicy`) read its fields
+directly; policies that need a prompt call ``str(observation)`` (or
+``observation.text``), which renders the compact board text once, on
+first use.  `serialize_state` is that rendering, straight from a state.
+"""
 from __future__ import annotations
 
-from typing import Dict, Optional
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Dict, Mapping, Optional, Tuple
 
 from lod_ai import rules_consts as C
 
@@ -20,6 +31,10 @@ _PIECE_LABELS = [
     (C.VILLAGE, "Village"),
 ]
 
+# Labels of Rebellion pieces; every other label is a Crown piece.
+REBEL_LABELS = frozenset({"Continental", "Militia(U)", "Militia(A)",
+                          "PatFort", "FrenchReg"})
+
 _SUPPORT_NAMES = {
     C.ACTIVE_SUPPORT: "Active Support",
     C.PASSIVE_SUPPORT: "Passive Support",
@@ -39,6 +54,70 @@ _FACTION_GOALS = {
                 "(keep colonists loyal-ish and your villages standing)."),
 }
 
+_FACTIONS = (C.BRITISH, C.PATRIOTS, C.FRENCH, C.INDIANS)
+
+
+@dataclass(frozen=True)
+class SpaceObs:
+    """One board space as a policy sees it.
+
+    *control* is ``"BRITISH"``, ``"REBELLION"`` or None; *pieces* maps
+    piece labels (``"BritReg"``, ``"Militia(U)"`` …) to counts, zeros
+    omitted.
+    """
+
+    sid: str
+    support: int = 0
+    control: Optional[str] = None
+    pieces: Mapping[str, int] = field(default_factory=dict)
+    leaders: Tuple[str, ...] = ()
+    blockade: bool = False
+
+    @property
+    def rebel(self) -> int:
+        return sum(n for lbl, n in self.pieces.items() if lbl in REBEL_LABELS)
+
+    @property
+    def crown(self) -> int:
+        return sum(n for lbl, n in self.pieces.items()
+                   if lbl not in REBEL_LABELS)
+
+
+@dataclass(frozen=True)
+class Observation:
+    """Snapshot of a game state for one deciding faction.
+
+    *spaces* holds every space; `occupied` those with pieces, leaders or
+    a Blockade (the ones the text board lists).  *margins* maps faction
+    to its two victory-condition margins, or is None if they could not
+    be computed.
+    """
+
+    faction: Optional[str]
+    current_card: Optional[dict]
+    upcoming_card: Optional[dict]
+    eligible: Mapping[str, bool]
+    resources: Mapping[str, int]
+    fni: int
+    cbc: int
+    crc: int
+    toa_played: bool
+    spaces: Mapping[str, SpaceObs]
+    margins: Optional[Mapping[str, Tuple[int, int]]]
+
+    @property
+    def occupied(self) -> Dict[str, SpaceObs]:
+        return {sid: sp for sid, sp in self.spaces.items()
+                if sp.pieces or sp.leaders or sp.blockade}
+
+    @cached_property
+    def text(self) -> str:
+        """The human-readable board summary (rendered on first use)."""
+        return _render(self)
+
+    def __str__(self) -> str:
+        return self.text
+
 
 def _card_line(card: Optional[dict]) -> str:
     if not card:
@@ -51,97 +130,132 @@ def _card_line(card: Optional[dict]) -> str:
     return f"#{cid} {title}" + (f"  [order {order}]" if order else "")
 
 
-def _faction_summary(state: dict) -> str:
-    res = state.get("resources", {})
+def _margins(state: dict) -> Optional[Dict[str, Tuple[int, int]]]:
+    try:
+        from lod_ai import victory
+        t = victory._summarize_board(state)
+        return {
+            C.BRITISH: victory._british_margin(t),
+            C.PATRIOTS: victory._patriot_margin(t),
+            C.FRENCH: victory._french_margin(t),
+            C.INDIANS: victory._indian_margin(t),
+        }
+    except Exception:
+        return None
+
+
+def _space_obs(state: dict, sid: str, sp: dict,
+               leaders: Dict[str, list], blockaded) -> SpaceObs:
+    pieces = {}
+    for tag, label in _PIECE_LABELS:
+        n = sp.get(tag, 0)
+        if n:
+            pieces[label] = n
+    ctrl = state.get("control", {}).get(sid)
+    return SpaceObs(
+        sid=sid,
+        support=state.get("support", {}).get(sid, 0),
+        control=ctrl if ctrl in ("BRITISH", "REBELLION") else None,
+        pieces=pieces,
+        leaders=tuple(leaders.get(sid, ())),
+        blockade=sid in blockaded,
+    )
+
+
+def build_observation(state: dict,
+                      faction: Optional[str] = None) -> Observation:
+    """Read *state* into an `Observation` for *faction*."""
+    leaders: Dict[str, list] = {}
+    for lid, loc in state.get("leaders", {}).items():
+        leaders.setdefault(loc, []).append(lid.replace("LEADER_", "").title())
+    blk = state.get("markers", {}).get(C.BLOCKADE, {})
+    blockaded = blk.get("on_map", set()) if isinstance(blk, dict) else set()
+    spaces = state.get("spaces", {})
+    return Observation(
+        faction=faction,
+        current_card=state.get("current_card"),
+        upcoming_card=state.get("upcoming_card"),
+        eligible=dict(state.get("eligible", {})),
+        resources=dict(state.get("resources", {})),
+        fni=state.get("fni_level", state.get("fni", 0)),
+        cbc=state.get("cbc", 0),
+        crc=state.get("crc", 0),
+        toa_played=bool(state.get("toa_played",
+                                  state.get("treaty_of_alliance", False))),
+        spaces={sid: _space_obs(state, sid, spaces[sid], leaders, blockaded)
+                for sid in sorted(spaces)},
+        margins=_margins(state),
+    )
+
+
+# --------------------------------------------------------------------------- #
+# Text rendering
+# --------------------------------------------------------------------------- #
+def _faction_summary(obs: Observation) -> str:
     lines = ["Resources:  " + "  ".join(
-        f"{f}={res.get(f, 0)}" for f in (C.BRITISH, C.PATRIOTS, C.FRENCH, C.INDIANS)
+        f"{f}={obs.resources.get(f, 0)}" for f in _FACTIONS
     )]
-    fni = state.get("fni_level", state.get("fni", 0))
-    cbc = state.get("cbc", 0)
-    crc = state.get("crc", 0)
-    toa = bool(state.get("toa_played", state.get("treaty_of_alliance", False)))
-    lines.append(f"French Navy Index={fni}   CBC={cbc}   CRC={crc}   "
-                 f"Treaty of Alliance={'played' if toa else 'NOT played'}")
+    lines.append(f"French Navy Index={obs.fni}   CBC={obs.cbc}   CRC={obs.crc}   "
+                 f"Treaty of Alliance={'played' if obs.toa_played else 'NOT played'}")
     return "\n".join(lines)
 
 
-def _victory_summary(state: dict) -> str:
-    try:
-        from lod_ai import victory
-        t = victory._summarize_board(state)
-        rows = [
-            ("BRITISH", victory._british_margin(t)),
-            ("PATRIOTS", victory._patriot_margin(t)),
-            ("FRENCH", victory._french_margin(t)),
-            ("INDIANS", victory._indian_margin(t)),
-        ]
-        out = ["Victory margins (both must be > 0 to win at a check):"]
-        for name, (m1, m2) in rows:
-            out.append(f"  {name:<9} cond1={m1:+d}  cond2={m2:+d}")
-        return "\n".join(out)
-    except Exception:
+def _victory_summary(obs: Observation) -> str:
+    if obs.margins is None:
         return "(victory margins unavailable)"
+    out = ["Victory margins (both must be > 0 to win at a check):"]
+    for name in _FACTIONS:
+        m1, m2 = obs.margins[name]
+        out.append(f"  {name:<9} cond1={m1:+d}  cond2={m2:+d}")
+    return "\n".join(out)
 
 
-def _control_of(state: dict, sid: str) -> str:
-    ctrl = state.get("control", {}).get(sid)
-    if ctrl == "BRITISH":
+def _control_of(sp: SpaceObs) -> str:
+    if sp.control == "BRITISH":
         return "British Control"
-    if ctrl == "REBELLION":
+    if sp.control == "REBELLION":
         return "Rebellion Control"
     return "no Control"
 
 
-def _space_line(state: dict, sid: str, sp: dict) -> Optional[str]:
-    pieces = []
-    for tag, label in _PIECE_LABELS:
-        n = sp.get(tag, 0)
-        if n:
-            pieces.append(f"{n} {label}")
-    # Leaders located here
-    leaders = [lid.replace("LEADER_", "").title()
-               for lid, loc in state.get("leaders", {}).items() if loc == sid]
-    # Blockade marker
-    markers = state.get("markers", {})
-    blk = markers.get(C.BLOCKADE, {})
-    if isinstance(blk, dict) and sid in blk.get("on_map", set()):
+def _space_line(sp: SpaceObs) -> str:
+    pieces = [f"{n} {label}" for label, n in sp.pieces.items()]
+    if sp.blockade:
         pieces.append("BLOCKADE")
-    if not pieces and not leaders:
-        return None
-    sup = state.get("support", {}).get(sid, 0)
-    sup_txt = _SUPPORT_NAMES.get(sup, str(sup))
+    sup_txt = _SUPPORT_NAMES.get(sp.support, str(sp.support))
     bits = ", ".join(pieces) if pieces else "-"
-    if leaders:
-        bits += f"  | Leaders: {', '.join(leaders)}"
-    return f"  {sid:<22} {sup_txt:<18} {_control_of(state, sid):<17} {bits}"
+    if sp.leaders:
+        bits += f"  | Leaders: {', '.join(sp.leaders)}"
+    return f"  {sp.sid:<22} {sup_txt:<18} {_control_of(sp):<17} {bits}"
 
 
-def serialize_state(state: dict, faction: Optional[str] = None) -> str:
-    """Return a human-readable board summary for the LLM."""
+def _render(obs: Observation) -> str:
     lines = []
     lines.append("=" * 70)
-    lines.append(f"CURRENT CARD : {_card_line(state.get('current_card'))}")
-    lines.append(f"UPCOMING CARD: {_card_line(state.get('upcoming_card'))}")
-    elig = state.get("eligible", {})
-    if elig:
+    lines.append(f"CURRENT CARD : {_card_line(obs.current_card)}")
+    lines.append(f"UPCOMING CARD: {_card_line(obs.upcoming_card)}")
+    if obs.eligible:
         elig_txt = ", ".join(f"{k}:{'elig' if v else 'inelig'}"
-                             for k, v in elig.items())
+                             for k, v in obs.eligible.items())
         lines.append(f"Eligibility  : {elig_txt}")
     lines.append("-" * 70)
-    lines.append(_faction_summary(state))
-    lines.append(_victory_summary(state))
+    lines.append(_faction_summary(obs))
+    lines.append(_victory_summary(obs))
     lines.append("-" * 70)
     lines.append("BOARD (only non-empty spaces):")
     lines.append(f"  {'Space':<22} {'Support/Opp':<18} {'Control':<17} Pieces")
-    for sid in sorted(state.get("spaces", {})):
-        line = _space_line(state, sid, state["spaces"][sid])
-        if line:
-            lines.append(line)
-    if faction:
+    for sp in obs.occupied.values():
+        lines.append(_space_line(sp))
+    if obs.faction:
         lines.append("-" * 70)
-        lines.append(f"YOU ARE PLAYING: {faction}")
-        goal = _FACTION_GOALS.get(faction)
+        lines.append(f"YOU ARE PLAYING: {obs.faction}")
+        goal = _FACTION_GOALS.get(obs.faction)
         if goal:
             lines.append(f"Your victory objective: {goal}")
     lines.append("=" * 70)
     return "\n".join(lines)
+
+
+def serialize_state(state: dict, faction: Optional[str] = None) -> str:
+    """Return a human-readable board summary for the LLM."""
+    return build_observation(state, faction).text
@@ -1,22 +1,26 @@
 """Decision policies for the LLM harness.
 
-A policy answers one menu prompt at a time.  ``choose`` receives the rendered
-board observation plus the structured menu, and returns the raw string a human
-would have typed (an option number, or a count).
+A policy answers one menu prompt at a time.  ``choose`` receives the board
+observation plus the structured menu, and returns the raw string a human would
+have typed (an option number, or a count).  The observation is an
+`observation.Observation`: read its fields directly, or ``str(observation)``
+for the rendered board text (built only when first asked for).
 """
 from __future__ import annotations
 
 import os
 import random
 import re
-from typing import List, Optional
+from typing import List, Optional, Union
+
+from .observation import Observation
 
 
 class Policy:
     """Base policy interface."""
 
-    def choose(self, observation: str, label: str, menu: Optional[dict],
-               faction: Optional[str]) -> str:
+    def choose(self, observation: Union[Observation, str], label: str,
+               menu: Optional[dict], faction: Optional[str]) -> str:
         raise NotImplementedError
 
 
@@ -89,12 +93,64 @@ Respond with ONLY the number of your chosen option (for a count prompt, respond
 with the number you want).  No explanation, just the number."""
 
 
+def system_prompt(faction: Optional[str]) -> str:
+    return _SYSTEM_PROMPT.format(faction=faction or "your")
+
+
+def render_prompt(observation, label: str, menu: Optional[dict]) -> str:
+    """The user message for one decision: board text, then the menu."""
+    user = str(observation) + "\n\nDECISION: " + (menu or {}).get("prompt", label) + "\n"
+    if menu and menu.get("kind") == "select":
+        for i, opt in enumerate(menu.get("options", []), 1):
+            user += f"  {i}. {opt}\n"
+        if menu.get("allow_back"):
+            user += f"  0. {menu.get('back_label', 'Back/Done')}\n"
+        user += "Reply with the option number."
+    elif menu and menu.get("kind") == "count":
+        user += f"Reply with an integer from {menu.get('min')} to {menu.get('max')}."
+    else:
+        user += "Reply with your choice."
+    return user
+
+
+def _fallback(menu: Optional[dict]) -> str:
+    choices = _valid_choices(menu)
+    return choices[0] if choices else ""
+
+
+def parse_answer(text: str, menu: Optional[dict]) -> str:
+    """Read a model reply as a single number and clamp it to a legal
+    choice, falling back to the first legal one."""
+    m = re.search(r"-?\d+", text or "")
+    if not m:
+        return _fallback(menu)
+    ans = m.group(0)
+    valid = _valid_choices(menu)
+    if valid and ans not in valid:
+        if menu and menu.get("kind") == "count":
+            return str(max(menu["min"], min(menu["max"], int(ans))))
+        return _fallback(menu)
+    return ans
+
+
+def response_text(message) -> str:
+    """Concatenated text blocks of a Messages-API response (an SDK
+    object or its decoded JSON)."""
+    content = (message.get("content") if isinstance(message, dict)
+               else getattr(message, "content", None)) or []
+    return "".join(
+        (b.get("text", "") if isinstance(b, dict) else getattr(b, "text", ""))
+        for b in content
+        if (b.get("type") if isinstance(b, dict) else getattr(b, "type", "")) == "text")
+
+
 class AnthropicPolicy(Policy):
     """Query an Anthropic model for each decision.
 
     Requires the ``anthropic`` package and an API key (``ANTHROPIC_API_KEY`` by
     default).  The response is parsed to a single number and clamped to a legal
-    choice, with a safe fallback if parsing fails.
+    choice, with a safe fallback if parsing fails.  For many games at once
+    see `lod_ai.llm.batch`.
     """
 
     def __init__(self, model: str = "claude-sonnet-4-5", api_key: Optional[str] = None,
@@ -115,59 +171,44 @@ class AnthropicPolicy(Policy):
         self.verbose = verbose
 
     def _fallback(self, menu):
-        choices = _valid_choices(menu)
-        return choices[0] if choices else ""
+        return _fallback(menu)
 
     def choose(self, observation, label, menu, faction):
-        valid = _valid_choices(menu)
-        user = observation + "\n\nDECISION: " + (menu or {}).get("prompt", label) + "\n"
-        if menu and menu.get("kind") == "select":
-            for i, opt in enumerate(menu.get("options", []), 1):
-                user += f"  {i}. {opt}\n"
-            if menu.get("allow_back"):
-                user += f"  0. {menu.get('back_label', 'Back/Done')}\n"
-            user += "Reply with the option number."
-        elif menu and menu.get("kind") == "count":
-            user += f"Reply with an integer from {menu.get('min')} to {menu.get('max')}."
-        else:
-            user += "Reply with your choice."
-
         try:
             msg = self._client.messages.create(
                 model=self.model,
                 max_tokens=self.max_tokens,
                 temperature=self.temperature,
-                system=_SYSTEM_PROMPT.format(faction=faction or "your"),
-                messages=[{"role": "user", "content": user}],
-            )
-            text = "".join(
-                b.text for b in msg.content if getattr(b, "type", "") == "text"
+                system=system_prompt(faction),
+                messages=[{"role": "user",
+                           "content": render_prompt(observation, label, menu)}],
             )
+            text = response_text(msg)
         except Exception as exc:  # pragma: no cover
             if self.verbose:
                 print(f"[AnthropicPolicy] API error: {exc}; using fallback")
             return self._fallback(menu)
 
-        m = re.search(r"-?\d+", text)
-        if not m:
-            return self._fallback(menu)
-        ans = m.group(0)
-        if valid and ans not in valid:
-            if menu and menu.get("kind") == "count":
-                return str(max(menu["min"], min(menu["max"], int(ans))))
-            return self._fallback(menu)
+        ans = parse_answer(text, menu)
         if self.verbose:
             print(f"[AnthropicPolicy] {faction} -> {ans}")
         return ans
 
 
 def make_policy(name: str, **kwargs) -> Policy:
-    """Factory: 'random', 'first', or 'anthropic'."""
+    """Factory: 'random', 'first', 'rollout', or 'anthropic'."""
     name = (name or "random").lower()
     if name == "random":
         return RandomPolicy(seed=kwargs.get("seed", 0))
     if name == "first":
         return FirstChoicePolicy()
+    if name in ("rollout", "search"):
+        from .search import RolloutPolicy
+        return RolloutPolicy(seed=kwargs.get("seed", 0),
+                             rollouts=kwargs.get("rollouts", 8),
+                             horizon=kwargs.get("horizon", 2),
+                             time_budget=kwargs.get("time_budget"),
+                             workers=kwargs.get("workers", 1))
     if name in ("anthropic", "claude", "llm"):
         return AnthropicPolicy(model=kwargs.get("model", "claude-sonnet-4-5"),
                                verbose=kwargs.get("verbose", False))
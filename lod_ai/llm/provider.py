@@ -3,16 +3,20 @@ from __future__ import annotations
 
 from typing import Optional
 
-from .observation import serialize_state
+from .observation import build_observation
 
 
 class LLMInputProvider:
     """Bridges the CLI's menu prompts to a decision Policy.
 
     Installed via ``cli_utils.set_input_provider``.  During an LLM faction's
-    turn the existing wizards call ``prompt`` for each sub-decision; we render
-    the board for the acting faction and ask the policy to pick.  A retry guard
-    prevents an ill-behaved policy from looping forever on one prompt.
+    turn the existing wizards call ``prompt`` for each sub-decision; we build
+    the acting faction's observation of the board and ask the policy to pick.  A retry guard
+    prevents an ill-behaved policy from looping forever on one prompt, and
+    a deterministic one (or a cached one) from replaying the same answers
+    each time a wizard restarts the turn: once a prompt has come up more
+    than ``max_retries`` times in one turn, its legal choices are taken in
+    turn instead.
     """
 
     def __init__(self, policy, engine, llm_factions, *, verbose: bool = False,
@@ -26,7 +30,13 @@ class LLMInputProvider:
         self.current_faction: Optional[str] = None
         self._last_sig = None
         self._repeat = 0
+        self._seen: dict = {}
         self.decisions = 0
+        # Let search policies look ahead from the live engine (optional hook).
+        for pol in {id(p): p for p in (policy, *self.policies.values())}.values():
+            hook = getattr(pol, "bind_engine", None)
+            if callable(hook):
+                hook(engine)
 
     def policy_for(self, faction: Optional[str]):
         """Per-faction policy when a mapping was provided, else the shared one."""
@@ -38,8 +48,9 @@ class LLMInputProvider:
         self.current_faction = faction
         self._last_sig = None
         self._repeat = 0
+        self._seen = {}
         # Let stateful policies reset per-turn bookkeeping (optional hook).
-        hook = getattr(self.policy, "begin_turn", None)
+        hook = getattr(self.policy_for(faction), "begin_turn", None)
         if callable(hook):
             hook(faction, card, allowed)
 
@@ -54,8 +65,13 @@ class LLMInputProvider:
             from .policy import _valid_choices
             choices = _valid_choices(menu)
             return choices[0] if choices else ""
+        seen = self._seen[sig] = self._seen.get(sig, 0) + 1
+        if seen > self.max_retries:
+            from .policy import _valid_choices
+            choices = _valid_choices(menu)
+            return choices[seen % len(choices)] if choices else ""
 
-        obs = serialize_state(self.engine.state, self.current_faction)
+        obs = build_observation(self.engine.state, self.current_faction)
         pol = self.policy_for(self.current_faction)
         try:
             ans = pol.choose(obs, label, menu, self.current_faction)
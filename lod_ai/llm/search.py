@@ -0,0 +1,291 @@
+"""Rollout search policy for the LLM harness.
+
+`HeuristicPolicy` and `tools.policy_seat.Strategist` score the top-level
+action menu with static one-ply rules.  `RolloutPolicy` looks ahead
+instead: for every option of the "Choose action" menu it forks the live
+engine (`Engine.fork`), plays that action for the seat, lets the rule
+bots play the next ``horizon`` cards, and scores the final board with
+the faction's two `victory` margins.  The option with the best mean
+score over the rollouts wins.  Every other prompt (Command, spaces,
+counts) goes to a base policy.
+
+Usage:
+    from lod_ai.llm.search import RolloutPolicy
+    run_game("1778", llm_factions=["BRITISH"],
+             policy=RolloutPolicy(rollouts=8, horizon=3, workers=4))
+
+Approximations, all in favour of speed:
+
+* the seat's own action is played by its rule bot, held to the chosen
+  action kind (Pass, Event, Command with or without a Special Activity),
+  not by the wizard path the base policy will then take;
+* the rest of the current card (the other Eligible faction) is skipped;
+* inside a rollout every faction, the seat included, is a rule bot.
+
+Rollouts of each option share seeds (common random numbers), so the
+comparison between options is not swamped by dice noise.  With
+``workers > 1`` rollouts run in a spawned process pool (same
+``PYTHONHASHSEED`` pinning as `tools.parallel`); ``time_budget`` caps
+the seconds spent per decision, cutting the remaining rollouts.  Without
+a time budget the choice is deterministic for a given position and
+seed, whatever the worker count.
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import pickle
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from lod_ai import rules_consts as C
+
+from .policy import FirstChoicePolicy, Policy
+
+# "Choose action" labels (interactive_cli._human_decider) -> action kind.
+ACTION_KINDS: Dict[str, str] = {
+    "Pass": "pass",
+    "Event": "event",
+    "Command (Limited)": "command_limited",
+    "Command + Special Activity": "command_special",
+    "Command Only": "command_only",
+    "Command": "command",
+}
+
+_ACTION_PROMPT = "turn. Choose action"
+
+
+def score(state: dict, faction: str) -> int:
+    """Sum of *faction*'s two victory margins (§7.2) on *state*."""
+    from lod_ai import victory
+
+    t = victory._summarize_board(state)
+    margin = {
+        C.BRITISH: victory._british_margin,
+        C.PATRIOTS: victory._patriot_margin,
+        C.FRENCH: victory._french_margin,
+        C.INDIANS: victory._indian_margin,
+    }[faction](t)
+    return sum(margin)
+
+
+class _ForcedTurn:
+    """Stands in for the seat's bot for one turn, held to one action kind."""
+
+    def __init__(self, bot, engine, faction: str, kind: str):
+        self.bot = bot
+        self.engine = engine
+        self.faction = faction
+        self.kind = kind
+
+    def take_turn(self, state, card, *, notes=None, allowed=None):
+        if self.kind == "pass":
+            return {"action": "pass", "used_special": False, "notes": "rollout"}
+        if self.kind == "event":
+            return self.engine.handle_event(self.faction, card, state=state)
+        slot = dict(allowed or {}, event_allowed=False)
+        if self.kind == "command_limited":
+            slot.update(limited_only=True, special_allowed=False)
+        elif self.kind == "command_only":
+            slot["special_allowed"] = False
+        return self.bot.take_turn(state, card, notes=notes, allowed=slot)
+
+
+def rollout(engine, faction: str, card: dict, allowed: dict, kind: str,
+            seed: int, horizon: int) -> int:
+    """Play *kind* for *faction* on a fork of *engine*, then ``horizon``
+    bot cards; return `score` of the result.  *engine* is not touched."""
+    from lod_ai.victory import check_game_over
+
+    eng = engine.fork(seed=seed)
+    eng.set_human_factions(set())
+    bot = eng.bots[faction]
+    eng.bots[faction] = _ForcedTurn(bot, eng, faction, kind)
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            eng.play_turn(faction, card, allowed=allowed)
+        finally:
+            eng.bots[faction] = bot
+        for _ in range(horizon):
+            if check_game_over(eng.state) is not None:
+                break
+            nxt = eng.draw_card()
+            if nxt is None:
+                break
+            eng.play_card(nxt)
+    return score(eng.state, faction)
+
+
+# --------------------------------------------------------------------------- #
+# Worker side: one Engine per position, forked for every rollout.
+# --------------------------------------------------------------------------- #
+_worker_engine: Tuple[Optional[int], Any] = (None, None)
+
+
+def _position(engine) -> bytes:
+    """What a worker needs to rebuild *engine* the way `Engine.fork` does."""
+    return pickle.dumps((engine.state, engine.ctx,
+                         dict(engine.dispatcher._last_action),
+                         engine.use_cli, set(engine.agent_factions)))
+
+
+def _worker_rollout(job: tuple) -> int:
+    global _worker_engine
+    key, blob, faction, card, allowed, kind, seed, horizon = job
+    if _worker_engine[0] != key:
+        from lod_ai.engine import Engine
+
+        state, ctx, last_action, use_cli, agents = pickle.loads(blob)
+        eng = Engine.adopt(state, ctx=ctx, last_action=last_action,
+                           use_cli=use_cli, agent_factions=agents)
+        _worker_engine = (key, eng)
+    return rollout(_worker_engine[1], faction, card, allowed, kind, seed, horizon)
+
+
+def _default_base(faction: Optional[str]) -> Policy:
+    from .heuristic import HeuristicPolicy, PROFILES
+
+    for profile in PROFILES.values():
+        if profile["faction"] == faction:
+            return HeuristicPolicy(profile)
+    return FirstChoicePolicy()
+
+
+class RolloutPolicy(Policy):
+    """Pick the top-level action by Monte Carlo rollouts of the rule bots.
+
+    *base* answers every other prompt (default: the first `heuristic`
+    profile of the seat's faction).  The harness hands the policy its
+    engine through ``bind_engine``; without one (or outside the action
+    menu) the base policy decides.
+    """
+
+    def __init__(self, base: Optional[Policy] = None, *, rollouts: int = 8,
+                 horizon: int = 2, time_budget: Optional[float] = None,
+                 workers: int = 1, seed: int = 0):
+        self.base = base
+        self._bases: Dict[str, Policy] = {}
+        self.rollouts = max(1, rollouts)
+        self.horizon = max(0, horizon)
+        self.time_budget = time_budget
+        self.workers = max(1, workers)
+        self.seed = seed
+        self.engine = None
+        self.last_scores: Dict[str, float] = {}
+        self._turn: Optional[Tuple[str, dict, dict]] = None
+        self._ranking: List[str] = []
+        self._attempt = 0
+        self._pool = None
+
+    # ---- harness hooks ---------------------------------------------------
+    def bind_engine(self, engine) -> None:
+        self.engine = engine
+
+    def begin_turn(self, faction, card, allowed) -> None:
+        self._turn = (faction, card, allowed)
+        self._ranking = []
+        self._attempt = 0
+        hook = getattr(self._base_for(faction), "begin_turn", None)
+        if callable(hook):
+            hook(faction, card, allowed)
+
+    def close(self) -> None:
+        """Shut down the worker pool (if one was started)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    # ---- decisions -------------------------------------------------------
+    def choose(self, observation, label, menu, faction):
+        base = self._base_for(faction)
+        prompt = (menu or {}).get("prompt", label)
+        if (_ACTION_PROMPT not in prompt or self.engine is None
+                or self._turn is None or self._turn[0] != faction):
+            return base.choose(observation, label, menu, faction)
+        # Let the base policy see the menu too: it keeps per-turn state.
+        fallback = base.choose(observation, label, menu, faction)
+        options = list(menu.get("options", []))
+        if not self._ranking:
+            self._ranking = self.rank(options)
+        # The menu again within one turn means the last plan failed:
+        # fall back to the next-best option.
+        self._attempt += 1
+        if self._attempt > len(self._ranking):
+            return fallback
+        return str(options.index(self._ranking[self._attempt - 1]) + 1)
+
+    def rank(self, options: List[str]) -> List[str]:
+        """Order the searchable *options* (labels) best-first."""
+        faction, card, allowed = self._turn
+        labels = [o for o in options if o in ACTION_KINDS]
+        if len(labels) <= 1:
+            self.last_scores = {}
+            return labels
+        jobs = [(label, self.seed + i)
+                for i in range(self.rollouts) for label in labels]
+        deadline = (time.monotonic() + self.time_budget
+                    if self.time_budget is not None else None)
+        if self.workers > 1:
+            results = self._run_pool(jobs, faction, card, allowed, deadline)
+        else:
+            results = self._run_serial(jobs, faction, card, allowed, deadline)
+        totals: Dict[str, List[int]] = {label: [] for label in labels}
+        for label, value in results:
+            totals[label].append(value)
+        self.last_scores = {label: sum(v) / len(v)
+                            for label, v in totals.items() if v}
+        # Unscored options go last; ties keep menu order.
+        return sorted(labels, key=lambda lab: (lab not in self.last_scores,
+                                               -self.last_scores.get(lab, 0)))
+
+    def _run_serial(self, jobs, faction, card, allowed, deadline):
+        results = []
+        for n, (label, seed) in enumerate(jobs):
+            # Always finish the first round so every option gets a score.
+            if deadline is not None and n >= len(jobs) // self.rollouts \
+                    and time.monotonic() >= deadline:
+                break
+            value = rollout(self.engine, faction, card, allowed,
+                            ACTION_KINDS[label], seed, self.horizon)
+            results.append((label, value))
+        return results
+
+    def _run_pool(self, jobs, faction, card, allowed, deadline):
+        from concurrent.futures import wait
+        from lod_ai.tools.parallel import pinned_hashseed
+
+        blob = _position(self.engine)
+        key = hash(blob)
+        pool = self._get_pool()
+        # The executor spawns its workers on demand, during submit.
+        with pinned_hashseed():
+            futures = {
+                pool.submit(_worker_rollout, (key, blob, faction, card,
+                                              allowed, ACTION_KINDS[label],
+                                              seed, self.horizon)): label
+                for label, seed in jobs
+            }
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        done, pending = wait(futures, timeout=timeout)
+        for fut in pending:
+            fut.cancel()
+        # Submission order, so the means do not depend on finishing order.
+        return [(futures[f], f.result()) for f in futures if f in done]
+
+    def _get_pool(self):
+        if self._pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def _base_for(self, faction: Optional[str]) -> Policy:
+        if self.base is not None:
+            return self.base
+        key = faction or ""
+        if key not in self._bases:
+            self._bases[key] = _default_base(faction)
+        return self._bases[key]
@@ -0,0 +1,178 @@
+"""How model requests reach a server, and a local stand-in for the API.
+
+A transport takes one Messages-API request body (a dict) and returns the
+decoded JSON response.  `HTTPTransport` posts it to the Anthropic API,
+or to any URL speaking the same protocol, such as a `StandInServer` on
+localhost.  Tests and offline benchmarks use the stand-in, so they
+exercise the same HTTP path as real play without a key or network.
+
+    with StandInServer(latency=0.05) as server:
+        transport = HTTPTransport(server.url, api_key="test")
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+API_URL = "https://api.anthropic.com/v1/messages"
+API_VERSION = "2023-06-01"
+
+
+class TransportError(RuntimeError):
+    """The server could not be reached or answered with an error."""
+
+
+class Transport:
+    """Base transport interface."""
+
+    async def send(self, body: dict) -> dict:
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        pass
+
+
+class HTTPTransport(Transport):
+    """POST each request as JSON to *url* (the Messages endpoint).
+
+    The standard library's blocking client runs on a worker thread per
+    request, so requests in flight are bounded only by the caller's
+    concurrency limit.
+    """
+
+    def __init__(self, url: str = API_URL, *, api_key: Optional[str] = None,
+                 timeout: float = 60.0):
+        self.url = url
+        self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY", "")
+        self.timeout = timeout
+
+    def _post(self, body: dict) -> dict:
+        req = urllib.request.Request(
+            self.url, data=json.dumps(body).encode("utf-8"), method="POST",
+            headers={"content-type": "application/json",
+                     "x-api-key": self.api_key,
+                     "anthropic-version": API_VERSION})
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                return json.loads(resp.read().decode("utf-8"))
+        except urllib.error.HTTPError as exc:
+            detail = exc.read().decode("utf-8", "replace")[:200]
+            raise TransportError(f"HTTP {exc.code} from {self.url}: "
+                                 f"{detail}") from exc
+        except (urllib.error.URLError, OSError, ValueError) as exc:
+            raise TransportError(f"{self.url}: {exc}") from exc
+
+    async def send(self, body: dict) -> dict:
+        return await asyncio.to_thread(self._post, body)
+
+
+# --------------------------------------------------------------------------- #
+# Local stand-in server                                                       #
+# --------------------------------------------------------------------------- #
+_OPTION_LINE = re.compile(r"^\s+(\d+)\. ", re.MULTILINE)
+_COUNT_RANGE = re.compile(r"integer from (-?\d+) to (-?\d+)")
+
+
+def standin_answer(prompt: str) -> str:
+    """The stand-in's reply: a legal-looking number picked from the
+    prompt's option list (or count range) by hashing the prompt, so the
+    same prompt always gets the same answer."""
+    pick = int.from_bytes(hashlib.sha256(prompt.encode("utf-8")).digest()[:4],
+                          "big")
+    options = _OPTION_LINE.findall(prompt)
+    if options:
+        return options[pick % len(options)]
+    m = _COUNT_RANGE.search(prompt)
+    if m:
+        lo, hi = int(m.group(1)), int(m.group(2))
+        return str(lo + pick % (hi - lo + 1)) if hi >= lo else str(lo)
+    return "1"
+
+
+class StandInServer:
+    """A local HTTP server answering Messages-API requests with
+    `standin_answer`, after *latency* seconds (to model network time).
+
+    Runs on a daemon thread; use it as a context manager or call
+    `start` / `stop`.  `requests` counts the requests served.
+    """
+
+    def __init__(self, *, latency: float = 0.0, host: str = "127.0.0.1",
+                 port: int = 0):
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1/messages"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):  # noqa: N802
+                length = int(self.headers.get("content-length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                    prompt = "".join(
+                        m.get("content", "") if isinstance(m.get("content"), str)
+                        else "".join(b.get("text", "") for b in m["content"])
+                        for m in body.get("messages", []))
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    self.send_error(400, "malformed request")
+                    return
+                if server.latency:
+                    time.sleep(server.latency)
+                with server._lock:
+                    server.requests += 1
+                reply = json.dumps({
+                    "type": "message", "role": "assistant",
+                    "model": body.get("model", "stand-in"),
+                    "content": [{"type": "text",
+                                 "text": standin_answer(prompt)}],
+                    "stop_reason": "end_turn",
+                }).encode("utf-8")
+                self.send_response(200)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(reply)))
+                self.end_headers()
+                self.wfile.write(reply)
+
+            def log_message(self, format, *args):  # quiet
+                pass
+
+        return Handler
+
+    def start(self) -> "StandInServer":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever,
+                                            name="lod-standin", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -7,18 +7,17 @@ JSON file path (relative to this module):
     lod_ai/map/data/map.json
 """
 
-import json
 from collections import deque
-from pathlib import Path
-from typing import Dict, Iterable, List, Set
+from typing import Dict, Iterable, List, Set, Tuple
+
+from lod_ai.state.map_loader import load_map
 
 
 # ----------------------------------------------------------------------
 # 1. Load the JSON exactly once
 # ----------------------------------------------------------------------
-_MAP_FILE = Path(__file__).parent / "data" / "map.json"
-with _MAP_FILE.open("r", encoding="utf-8") as fh:
-    _RAW_MAP: Dict = json.load(fh)                                  
+# (parsed by the shared, cached loader the bots use too)
+_RAW_MAP: Dict = load_map()
 
 # Build helpers
 _ADJ: Dict[str, Set[str]] = {}
@@ -33,11 +32,65 @@ for space_id, info in _RAW_MAP.items():
 
 
 # ----------------------------------------------------------------------
-# 2. Public helpers
+# 2. Precomputed index (built once at import)
+# ----------------------------------------------------------------------
+# map.json lists each edge from one side only, so the symmetric neighbor
+# table folds in the reverse edges here instead of on every lookup.
+# Every space (and every adjacency token) gets a stable integer index in
+# sorted-id order, a bitset of its neighbors, and a row in the all-pairs
+# hop-distance matrix.  Nothing here depends on the hash seed.
+SPACE_IDS: Tuple[str, ...] = tuple(sorted(
+    set(_ADJ).union(*_ADJ.values()) if _ADJ else ()))
+SPACE_INDEX: Dict[str, int] = {sid: i for i, sid in enumerate(SPACE_IDS)}
+
+_SYM: Dict[str, Set[str]] = {sid: set() for sid in SPACE_IDS}
+for _sid, _adj_set in _ADJ.items():
+    for _nbr in _adj_set:
+        _SYM[_sid].add(_nbr)
+        _SYM[_nbr].add(_sid)
+
+_NEIGHBORS: Dict[str, Tuple[str, ...]] = {
+    sid: tuple(sorted(nbrs)) for sid, nbrs in _SYM.items()}
+_NEIGHBOR_MASK: Tuple[int, ...] = tuple(
+    sum(1 << SPACE_INDEX[n] for n in _NEIGHBORS[sid]) for sid in SPACE_IDS)
+
+
+def _bfs_tree(start: str) -> Tuple[Tuple[int, ...], Dict[str, str]]:
+    """Hop distances from *start* (-1 = unreachable) and the BFS parent
+    of every reached space, visiting neighbors in sorted order."""
+    dist = [-1] * len(SPACE_IDS)
+    dist[SPACE_INDEX[start]] = 0
+    parent: Dict[str, str] = {}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for nbr in _NEIGHBORS[node]:
+            i = SPACE_INDEX[nbr]
+            if dist[i] >= 0:
+                continue
+            dist[i] = dist[SPACE_INDEX[node]] + 1
+            parent[nbr] = node
+            queue.append(nbr)
+    return tuple(dist), parent
+
+
+_TREES = {sid: _bfs_tree(sid) for sid in SPACE_IDS}
+DISTANCE: Tuple[Tuple[int, ...], ...] = tuple(
+    _TREES[sid][0] for sid in SPACE_IDS)
+_PARENT: Dict[str, Dict[str, str]] = {
+    sid: tree[1] for sid, tree in _TREES.items()}
+del _TREES
+
+
+# ----------------------------------------------------------------------
+# 3. Public helpers
 # ----------------------------------------------------------------------
 def is_adjacent(a: str, b: str) -> bool:
     """Return True if spaces *a* and *b* share an adjacency edge (bidirectional)."""
-    return b in _ADJ.get(a, set()) or a in _ADJ.get(b, set())
+    i = SPACE_INDEX.get(b)
+    if i is None or a not in SPACE_INDEX:
+        return False
+    return bool(_NEIGHBOR_MASK[SPACE_INDEX[a]] >> i & 1)
 
 
 def adjacent_spaces(space_id: str) -> tuple:
@@ -48,12 +101,26 @@ def adjacent_spaces(space_id: str) -> tuple:
     per-process hash seed (set iteration order did, making game outcomes
     PYTHONHASHSEED-sensitive -- external audit recommendation 7).
     """
-    result = set(_ADJ.get(space_id, set()))
-    # Include reverse edges from other spaces that list this one
-    for sid, adj_set in _ADJ.items():
-        if space_id in adj_set:
-            result.add(sid)
-    return tuple(sorted(result))
+    return _NEIGHBORS.get(space_id, ())
+
+
+def space_index(space_id: str) -> int | None:
+    """Stable integer index of *space_id* (sorted-id order), or None."""
+    return SPACE_INDEX.get(space_id)
+
+
+def neighbor_mask(space_id: str) -> int:
+    """Bitset of *space_id*'s neighbors (bit ``space_index(n)`` per neighbor)."""
+    i = SPACE_INDEX.get(space_id)
+    return _NEIGHBOR_MASK[i] if i is not None else 0
+
+
+def distance(a: str, b: str) -> int | None:
+    """Hop distance between *a* and *b*; None if unknown or unreachable."""
+    i, j = SPACE_INDEX.get(a), SPACE_INDEX.get(b)
+    if i is None or j is None or DISTANCE[i][j] < 0:
+        return None
+    return DISTANCE[i][j]
 
 
 def space_type(space_id: str) -> str | None:
@@ -86,23 +153,19 @@ def shortest_path(start: str, goal: str) -> List[str]:
     """
     Return the shortest path (as a list of space ids) between *start* and *goal*.
     Returns an empty list if no path exists or either space is unknown.
+
+    Read off the precomputed BFS tree of *start* (neighbors visited in
+    sorted order), so ties resolve exactly as a fresh BFS would.
     """
     if start == goal:
         return [start]
     if start not in _ADJ or goal not in _ADJ:
         return []
-
-    visited = {start}
-    queue: deque[tuple[str, List[str]]] = deque([(start, [start])])
-
-    while queue:
-        node, path = queue.popleft()
-        for nbr in adjacent_spaces(node):
-            if nbr in visited:
-                continue
-            next_path = path + [nbr]
-            if nbr == goal:
-                return next_path
-            visited.add(nbr)
-            queue.append((nbr, next_path))
-    return []
+    parent = _PARENT[start]
+    if goal not in parent:
+        return []
+    path = [goal]
+    while path[-1] != start:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path
@@ -1,20 +1,41 @@
 """
 lod_ai.save_game
 =================
-Save and load game state to/from JSON files.
+Save and load game state.
+
+Two on-disk formats:
+
+* ``.json`` -- readable, diffable export (the default for `save_game`);
+* ``.lods`` -- the compact binary snapshot format of
+  `lod_ai.state.snapshot`.  `Autosave` keeps one ``.lods`` file per game
+  and appends a delta per save instead of rewriting the whole state.
+  Given a `BackgroundWriter`, it only takes a cheap detached copy on
+  the caller's thread and leaves the encoding and the write to the
+  writer's thread.
+
+`load_game` and `list_saves` accept either.
 """
 
 from __future__ import annotations
 
+import atexit
 import json
 import os
 import random
+import threading
 from copy import deepcopy
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List
+
+from lod_ai.board import totals
+from lod_ai.state import snapshot
+from lod_ai.util.history import as_history_log
+from lod_ai.util.rng_log import RngLog, as_rng_log
 
 
 SAVE_DIR = "saves"
+JSON_EXT = ".json"
+BINARY_EXT = ".lods"
 
 
 def _ensure_save_dir() -> None:
@@ -51,18 +72,25 @@ def _serialize_state(state: Dict[str, Any], human_factions: set) -> dict:
         # getstate() returns (version, tuple_of_625_ints, gauss_next)
         data["_rng_state"] = (rng_state[0], list(rng_state[1]), rng_state[2])
 
+    # The roll log keeps its count and checksum (see util.rng_log)
+    rolls = data.get("rng_log")
+    if isinstance(rolls, RngLog):
+        data["rng_log"] = rolls.summary()
+
     # Convert all sets to sorted lists
     data = _convert_sets(data)
 
-    # Save metadata
-    data["_save_meta"] = {
+    data["_save_meta"] = _save_meta(human_factions)
+    return data
+
+
+def _save_meta(human_factions: set) -> dict:
+    return {
         "human_factions": sorted(human_factions),
         "save_time": datetime.now().isoformat(),
         "version": 1,
     }
 
-    return data
-
 
 def _deserialize_state(data: dict) -> tuple[dict, set]:
     """Convert loaded JSON data back to a live game state.
@@ -99,6 +127,13 @@ def _deserialize_state(data: dict) -> tuple[dict, set]:
         elif isinstance(om, list):
             entry["on_map"] = set(om)
 
+    data["history"] = as_history_log(data.get("history"))
+    data["rng_log"] = as_rng_log(data.get("rng_log"))
+    # Victory totals are derived from the board, and JSON turned their
+    # row tuples into lists: rebuild them (board.totals).
+    if totals.KEY in data:
+        totals.track(data)
+
     # Restore sets for eligibility tracking fields
     for key in ("eligible_next", "ineligible_next", "remain_eligible",
                 "ineligible_through_next"):
@@ -108,20 +143,32 @@ def _deserialize_state(data: dict) -> tuple[dict, set]:
     return data, human_factions
 
 
+def _save_path(filename: str, ext: str) -> str:
+    if not filename.endswith(ext):
+        filename += ext
+    return os.path.join(SAVE_DIR, filename)
+
+
 def save_game(state: Dict[str, Any], human_factions: set,
-              filename: str | None = None) -> str:
-    """Save current game to a JSON file. Returns the filepath."""
+              filename: str | None = None, *, binary: bool = False) -> str:
+    """Save current game to a file. Returns the filepath.
+
+    JSON unless *binary* is set or *filename* ends in ``.lods``.
+    """
     _ensure_save_dir()
 
+    binary = binary or bool(filename and filename.endswith(BINARY_EXT))
+    ext = BINARY_EXT if binary else JSON_EXT
     if not filename:
         seed = state.get("seed", state.get("_seed", 0))
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"lod_save_{seed}_{timestamp}.json"
+        filename = f"lod_save_{seed}_{timestamp}{ext}"
+    filepath = _save_path(filename, ext)
 
-    if not filename.endswith(".json"):
-        filename += ".json"
+    if binary:
+        snapshot.SnapshotWriter(filepath).write(state, _save_meta(human_factions))
+        return filepath
 
-    filepath = os.path.join(SAVE_DIR, filename)
     data = _serialize_state(state, human_factions)
 
     with open(filepath, "w") as f:
@@ -130,15 +177,132 @@ def save_game(state: Dict[str, Any], human_factions: set,
     return filepath
 
 
+class BackgroundWriter:
+    """One daemon thread running save jobs off the caller's thread.
+
+    `submit` queues a no-argument *job* under a *key*; a job still waiting
+    under the same key is replaced, so saves that arrive faster than the
+    disk coalesce into the latest one.  `flush` waits until the queue has
+    drained; `close` flushes and stops the thread, and also runs at
+    interpreter exit, so an unhandled crash still writes what was queued.
+    A failing job is recorded in `errors` and never raised: autosave
+    failure is non-fatal.
+    """
+
+    def __init__(self, name: str = "autosave") -> None:
+        self.errors: List[BaseException] = []
+        self.written = 0
+        self.coalesced = 0
+        self._cond = threading.Condition()
+        self._pending: Dict[str, Callable[[], Any]] = {}
+        self._busy = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name,
+                                        daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, key: str, job: Callable[[], Any]) -> None:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BackgroundWriter is closed")
+            if self._pending.pop(key, None) is not None:
+                self.coalesced += 1
+            self._pending[key] = job
+            self._cond.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait for every queued job; False if *timeout* ran out first."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._busy, timeout)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                job = self._pending.pop(next(iter(self._pending)))
+                self._busy = True
+            try:
+                job()
+                self.written += 1
+            except Exception as exc:  # noqa: BLE001
+                self.errors.append(exc)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+
+class Autosave:
+    """Binary autosave for one game: the first `save` writes a full
+    snapshot, later ones append only what changed since the last
+    (re-basing every *rebase_every* saves).
+
+    With a *background* writer, `save` returns as soon as it has taken a
+    `detached_copy` of the state; snapshots skipped by coalescing are
+    simply never written (the next delta is against the last one that
+    was).
+    """
+
+    def __init__(self, human_factions: set, filename: str = "autosave", *,
+                 rebase_every: int = 64,
+                 background: BackgroundWriter | None = None) -> None:
+        self.human_factions = set(human_factions)
+        self.filepath = _save_path(filename, BINARY_EXT)
+        self.background = background
+        self._writer = snapshot.SnapshotWriter(self.filepath,
+                                               rebase_every=rebase_every)
+
+    def save(self, state: Dict[str, Any]) -> str:
+        meta = _save_meta(self.human_factions)
+        if self.background is None:
+            self._write(state, meta)
+        else:
+            from lod_ai.state.sandbox import detached_copy
+            snap = detached_copy(state)
+            self.background.submit(self.filepath,
+                                   lambda: self._write(snap, meta))
+        return self.filepath
+
+    def _write(self, state: Dict[str, Any], meta: Dict[str, Any]) -> None:
+        _ensure_save_dir()
+        self._writer.write(state, meta)
+
+
 def load_game(filepath: str) -> tuple[dict, set]:
-    """Load a game from a JSON file.
+    """Load a game from a JSON or binary save file.
 
-    Returns (state, human_factions).
+    Returns (state, human_factions).  A binary file with deltas yields
+    its latest snapshot.
     """
-    with open(filepath, "r") as f:
-        data = json.load(f)
+    with open(filepath, "rb") as f:
+        raw = f.read()
+    if snapshot.is_snapshot(raw):
+        state, meta = snapshot.loads(raw)
+        return state, set(meta.get("human_factions", []))
+
+    return _deserialize_state(json.loads(raw))
+
 
-    return _deserialize_state(data)
+def _read_save_info(filepath: str) -> tuple[dict, dict]:
+    """(meta, state-or-data) of a save file, for `list_saves`."""
+    with open(filepath, "rb") as f:
+        raw = f.read()
+    if snapshot.is_snapshot(raw):
+        state, meta = snapshot.loads(raw)
+        return meta, state
+    data = json.loads(raw)
+    return data.get("_save_meta", {}), data
 
 
 def list_saves() -> list[dict]:
@@ -146,13 +310,11 @@ def list_saves() -> list[dict]:
     _ensure_save_dir()
     saves = []
     for fname in sorted(os.listdir(SAVE_DIR), reverse=True):
-        if not fname.endswith(".json"):
+        if not fname.endswith((JSON_EXT, BINARY_EXT)):
             continue
         filepath = os.path.join(SAVE_DIR, fname)
         try:
-            with open(filepath, "r") as f:
-                data = json.load(f)
-            meta = data.get("_save_meta", {})
+            meta, data = _read_save_info(filepath)
             saves.append({
                 "filename": fname,
                 "filepath": filepath,
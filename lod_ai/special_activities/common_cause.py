@@ -22,7 +22,7 @@ from lod_ai.rules_consts import (
     BRITISH,
 )
 from lod_ai.map.adjacency import is_city as _is_city
-from lod_ai.util.history import push_history
+from lod_ai.util.history import SPECIAL_ACTIVITY, push_history
 
 SA_NAME = "COMMON_CAUSE"      # auto-registered by special_activities/__init__.py
 
@@ -43,7 +43,9 @@ def execute(
 
     state["_turn_used_special"] = True
     state["_turn_special_type"] = "COMMON_CAUSE"  # coverage (Piece 5, S67)
-    push_history(state, f"BRITISH COMMON_CAUSE in {', '.join(spaces)}")
+    push_history(state, f"BRITISH COMMON_CAUSE in {', '.join(spaces)}",
+                 kind=SPECIAL_ACTIVITY,
+                 data={"faction": BRITISH, "activity": "COMMON_CAUSE"})
     wp_counts = wp_counts or {}
 
     ctx.setdefault("common_cause", {})
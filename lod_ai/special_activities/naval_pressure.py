@@ -18,7 +18,7 @@ If your schema differs, adapt the helper functions at the top.
 
 from __future__ import annotations
 from typing import Dict
-from lod_ai.util.history import push_history
+from lod_ai.util.history import SPECIAL_ACTIVITY, push_history
 from lod_ai.util.caps    import enforce_global_caps, refresh_control
 from lod_ai.economy.resources import add as add_res      # NEW
 from lod_ai.rules_consts import BLOCKADE, WEST_INDIES_ID, BRITISH, FRENCH
@@ -112,7 +112,9 @@ def execute(
 # ---------------------------------------------------------------------------
 
 def _exec_british(state: Dict, ctx: Dict, city_choice: str | None) -> None:
-    push_history(state, "BRITISH NAVAL_PRESSURE")
+    push_history(state, "BRITISH NAVAL_PRESSURE",
+                 kind=SPECIAL_ACTIVITY,
+                 data={"faction": BRITISH, "activity": "NAVAL_PRESSURE"})
 
     if not state.get("toa_played"):
         gain = _roll_d3(state)
@@ -155,7 +157,9 @@ def _exec_french(
     if not state.get("toa_played"):
         raise ValueError("French Naval Pressure requires Treaty of Alliance.")
 
-    push_history(state, "FRENCH NAVAL_PRESSURE")
+    push_history(state, "FRENCH NAVAL_PRESSURE",
+                 kind=SPECIAL_ACTIVITY,
+                 data={"faction": FRENCH, "activity": "NAVAL_PRESSURE"})
     bloc = state.setdefault("markers", {}).setdefault(BLOCKADE, {"pool": 0, "on_map": set()})
     bloc.setdefault("on_map", set())
 
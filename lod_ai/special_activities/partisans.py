@@ -29,7 +29,7 @@ from lod_ai.rules_consts import (
     VILLAGE, MILITIA_U, MILITIA_A, FORT_BRI,
     PATRIOTS,
 )
-from lod_ai.util.history   import push_history
+from lod_ai.util.history   import SPECIAL_ACTIVITY, push_history
 from lod_ai.util.caps      import refresh_control, enforce_global_caps
 from lod_ai.board.pieces      import remove_piece, add_piece, flip_pieces
 
@@ -112,7 +112,9 @@ def execute(
     if option == 3 and wp_present:
         raise ValueError("Option 3 only if no War Parties are present.")
 
-    push_history(state, f"PATRIOTS PARTISANS begins in {space_id} (opt {option})")
+    push_history(state, f"PATRIOTS PARTISANS begins in {space_id} (opt {option})",
+                 kind=SPECIAL_ACTIVITY,
+                 data={"faction": PATRIOTS, "activity": "PARTISANS"})
 
     # ---- Perform chosen option ---------------------------------------------
     if option == 1:
@@ -24,7 +24,7 @@ from lod_ai.rules_consts import (
     PROPAGANDA, MAX_PROPAGANDA,
     PATRIOTS,
 )
-from lod_ai.util.history   import push_history
+from lod_ai.util.history   import SPECIAL_ACTIVITY, push_history
 from lod_ai.util.caps      import refresh_control, enforce_global_caps
 from lod_ai.board.pieces      import remove_piece, add_piece, flip_pieces
 from lod_ai.economy.resources import add as add_res
@@ -56,7 +56,9 @@ def execute(
 
     state["_turn_used_special"] = True
     state["_turn_special_type"] = "PERSUASION"  # coverage (Piece 5, S67)
-    push_history(state, f"PATRIOTS PERSUASION {spaces}")
+    push_history(state, f"PATRIOTS PERSUASION {spaces}",
+                 kind=SPECIAL_ACTIVITY,
+                 data={"faction": PATRIOTS, "activity": "PERSUASION"})
 
     from lod_ai.board.pieces import place_marker
     added_resources = 0
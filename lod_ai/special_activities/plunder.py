@@ -23,7 +23,7 @@ from lod_ai.rules_consts import (
     REGULAR_PAT, REGULAR_FRE, MILITIA_A, MILITIA_U, FORT_PAT,
     INDIANS, PATRIOTS,
 )
-from lod_ai.util.history   import push_history
+from lod_ai.util.history   import SPECIAL_ACTIVITY, push_history
 from lod_ai.util.caps      import refresh_control, enforce_global_caps
 from lod_ai.board.pieces      import remove_piece, add_piece
 from lod_ai.economy.resources import spend, add as add_res
@@ -72,7 +72,9 @@ def execute(
     if pop <= 0:
         raise ValueError("Province has no population to plunder.")
 
-    push_history(state, f"INDIANS PLUNDER begins in {province} (pop={pop})")
+    push_history(state, f"INDIANS PLUNDER begins in {province} (pop={pop})",
+                 kind=SPECIAL_ACTIVITY,
+                 data={"faction": INDIANS, "activity": "PLUNDER"})
 
     # Resource transfer
     stolen = min(pop, state["resources"][PATRIOTS])
@@ -25,7 +25,7 @@ from __future__ import annotations
 from typing import Dict
 
 from lod_ai.rules_consts import REGULAR_FRE, FRENCH_UNAVAIL, BLOCKADE, WEST_INDIES_ID, FRENCH
-from lod_ai.util.history  import push_history
+from lod_ai.util.history  import SPECIAL_ACTIVITY, push_history
 from lod_ai.util.caps     import refresh_control, enforce_global_caps
 from lod_ai.board.pieces      import remove_piece
 from lod_ai.economy.resources import add as add_res
@@ -73,7 +73,9 @@ def execute(
 
     state["_turn_used_special"] = True
     state["_turn_special_type"] = "PREPARER"  # coverage (Piece 5, S67)
-    push_history(state, f"FRENCH PREPARER choice={choice}")
+    push_history(state, f"FRENCH PREPARER choice={choice}",
+                 kind=SPECIAL_ACTIVITY,
+                 data={"faction": FRENCH, "activity": "PREPARER"})
 
     if choice == "BLOCKADE":
         if unavailable_blockades(state) <= 0:
@@ -33,7 +33,7 @@ from lod_ai.rules_consts import (
     BRITISH, PATRIOTS, FRENCH,
     WEST_INDIES_ID,
 )
-from lod_ai.util.history   import push_history
+from lod_ai.util.history   import SPECIAL_ACTIVITY, push_history
 from lod_ai.util.caps      import enforce_global_caps, refresh_control
 from lod_ai.board.pieces      import remove_piece, add_piece
 from lod_ai.leaders          import leader_location
@@ -122,7 +122,9 @@ def execute(
             raise ValueError("Option 3 requires an enemy Fort present.")
 
     # -----------------------------------------------------------------
-    push_history(state, f"{faction} SKIRMISH begins in {space_id} (option {option})")
+    push_history(state, f"{faction} SKIRMISH begins in {space_id} (option {option})",
+                 kind=SPECIAL_ACTIVITY,
+                 data={"faction": faction, "activity": "SKIRMISH"})
 
     # Execute chosen option ------------------------------------------
     def _remove_one() -> None:
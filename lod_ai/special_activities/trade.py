@@ -23,7 +23,7 @@ from __future__ import annotations
 from typing import Dict
 
 from lod_ai.rules_consts import WARPARTY_U, WARPARTY_A, VILLAGE, MAX_RESOURCES, INDIANS, BRITISH
-from lod_ai.util.history   import push_history
+from lod_ai.util.history   import SPECIAL_ACTIVITY, push_history
 from lod_ai.util.caps      import refresh_control, enforce_global_caps
 from lod_ai.board.pieces      import remove_piece, add_piece, flip_pieces
 from lod_ai.economy.resources import spend, add as add_res
@@ -76,7 +76,9 @@ def execute(
     if transfer > state["resources"][BRITISH]:
         raise ValueError("BRITISH lack Resources to transfer.")
 
-    push_history(state, f"INDIANS TRADE in {space_id} (transfer={transfer})")
+    push_history(state, f"INDIANS TRADE in {space_id} (transfer={transfer})",
+                 kind=SPECIAL_ACTIVITY,
+                 data={"faction": INDIANS, "activity": "TRADE"})
 
     # Resource transfer
     if transfer > 0:
@@ -30,7 +30,7 @@ from lod_ai.rules_consts import (
     # factions
     INDIANS,
 )
-from lod_ai.util.history   import push_history
+from lod_ai.util.history   import SPECIAL_ACTIVITY, push_history
 from lod_ai.util.caps      import refresh_control, enforce_global_caps
 from lod_ai.board.pieces      import remove_piece, add_piece, flip_pieces
 from lod_ai.leaders          import leader_location
@@ -83,7 +83,9 @@ def execute(
     if option == 3 and sp.get(FORT_PAT, 0) == 0:
         raise ValueError("Option 3 requires a Patriot Fort present.")
 
-    push_history(state, f"INDIANS WAR_PATH begins in {space_id} (opt {option})")
+    push_history(state, f"INDIANS WAR_PATH begins in {space_id} (opt {option})",
+                 kind=SPECIAL_ACTIVITY,
+                 data={"faction": INDIANS, "activity": "WAR_PATH"})
 
     # ---- execute chosen option ---------------------------------------------
     if option == 1:
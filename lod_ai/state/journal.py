@@ -0,0 +1,265 @@
+"""
+lod_ai.state.journal
+====================
+
+Reversible action journal: multi-level undo / redo for a live state.
+
+Undo used to keep a full ``deepcopy`` of the state per card (and the
+human Brilliant Stroke flow another one), which both costs a copy of the
+whole, ever-growing state and allows a single level.  A `Journal` keeps
+one private *image* of the state and, at each `mark`, records a step
+holding only what changed since the previous mark:
+
+* a changed space: its old and new contents (flat dicts of counts);
+* a record list that only grew (``history``, ``played_cards`` …): its
+  old length and the new tail (entries are shared, never copied);
+* any other changed top-level key: its old and new value;
+* ``rng``: its old and new internal state.
+
+So memory grows with what actually changed, however the change was made
+— the piece, resource, Support and marker helpers, card handlers
+writing ``state`` directly, or an engine sandbox commit.  Each step's
+inverse is applied in place (``state`` keeps its identity, so every
+holder of it sees the restored game):
+
+    journal = Journal(engine.state)
+    journal.mark("card 12")        # start of a card
+    ...                            # play it
+    journal.rollback()             # back to the start of card 12
+    journal.undo()                 # ... and of the card before it
+    journal.redo()                 # forward again
+
+`mark` with nothing changed records no step.  Recording a new step
+drops the redo steps (the game took another branch).  Restored states
+are re-normalized for the spaces they touched, as after an engine
+commit, so Control, the victory totals and any `board.arrays` view
+follow.
+"""
+
+from __future__ import annotations
+
+import random
+from copy import deepcopy
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from lod_ai.util.rng_log import RngLog
+
+ABSENT: Any = object()   # "key not present" in a step
+
+# Lists whose entries are written once and only ever appended to; a
+# step keeps their new tail.  (``deck`` is consumed from the front and
+# the roll log is bounded: both are stored whole, spine-only.)
+APPEND_ONLY = frozenset({
+    "history", "log", "played_cards",
+    "event_choice_audit", "_illegal_action_log", "_bot_error_log",
+})
+SPINE_ONLY = frozenset({"deck"})
+
+_SCALARS = (str, int, float, bool, type(None), tuple, frozenset)
+
+
+@dataclass
+class Step:
+    """What changed between two marks (see module docstring)."""
+
+    label: Any = None
+    keys: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    spaces: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    tails: Dict[str, Tuple[int, list]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.keys or self.spaces or self.tails)
+
+
+def _image(key: str, value: Any) -> Any:
+    """A private copy of *value* for comparing and restoring later."""
+    if isinstance(value, _SCALARS):
+        return value
+    if key == "rng" and isinstance(value, random.Random):
+        return value.getstate()
+    if key in APPEND_ONLY | SPINE_ONLY and isinstance(value, list):
+        return list(value)
+    return deepcopy(value)
+
+
+def _thaw(key: str, image: Any, live: Any) -> Any:
+    """A live value from *image* (*live*: the value being replaced; the
+    RNG and record lists are restored in place, keeping their identity)."""
+    if key == "rng" and isinstance(image, tuple):
+        rng = live if isinstance(live, random.Random) else random.Random()
+        rng.setstate(image)
+        return rng
+    if isinstance(image, _SCALARS):
+        return image
+    if key in APPEND_ONLY | SPINE_ONLY and isinstance(image, list):
+        if isinstance(live, list):
+            list.__setitem__(live, slice(None), image)
+            return live
+        return list(image)
+    return deepcopy(image)
+
+
+def _same(key: str, value: Any, image: Any) -> bool:
+    if key == "rng" and isinstance(value, random.Random):
+        return value.getstate() == image
+    if isinstance(value, RngLog):
+        return isinstance(image, RngLog) and value == image and \
+            (value.count, value.checksum) == (image.count, image.checksum)
+    if key in SPINE_ONLY and isinstance(value, list) and \
+            isinstance(image, list):
+        return len(value) == len(image) and \
+            all(a is b for a, b in zip(value, image))
+    try:
+        return bool(value == image)
+    except Exception:                      # noqa: BLE001 -- exotic values
+        return False
+
+
+class Journal:
+    """Undo/redo history of *state* (see module docstring).
+
+    *limit* caps the number of undo steps kept (oldest dropped first).
+    """
+
+    def __init__(self, state: Dict[str, Any], *,
+                 limit: Optional[int] = None) -> None:
+        self.state = state
+        self.limit = limit
+        self._undo: List[Step] = []
+        self._redo: List[Step] = []
+        self._keys: Dict[str, Any] = {}
+        self._spaces: Dict[str, Dict[str, Any]] = {}
+        self._retake()
+
+    # -- image -------------------------------------------------------------
+    def _retake(self) -> None:
+        self._keys = {key: _image(key, value)
+                      for key, value in self.state.items() if key != "spaces"}
+        spaces = self.state.get("spaces")
+        self._spaces = {sid: dict(sp) for sid, sp in spaces.items()} \
+            if isinstance(spaces, dict) else {}
+
+    def _diff(self, label: Any = None) -> Step:
+        """Changes since the image, as a step; the image moves forward."""
+        step = Step(label)
+        state, keys = self.state, self._keys
+        spaces = state.get("spaces")
+        if isinstance(spaces, dict):
+            img = self._spaces
+            for sid, sp in spaces.items():
+                old = img.get(sid, ABSENT)
+                if old is ABSENT or old != sp:
+                    new = dict(sp)
+                    step.spaces[sid] = (old, new)
+                    img[sid] = new
+            for sid in [sid for sid in img if sid not in spaces]:
+                step.spaces[sid] = (img.pop(sid), ABSENT)
+        for key, value in state.items():
+            if key == "spaces":
+                continue
+            old = keys.get(key, ABSENT)
+            if old is not ABSENT and _same(key, value, old):
+                continue
+            if key in APPEND_ONLY and isinstance(value, list) and \
+                    isinstance(old, list) and len(value) > len(old) and \
+                    (not old or value[len(old) - 1] is old[-1]):
+                tail = list(value[len(old):])
+                step.tails[key] = (len(old), tail)
+                keys[key] = old + tail      # images are never edited:
+                continue                    # steps may hold them
+            new = _image(key, value)
+            step.keys[key] = (old, new)
+            keys[key] = new
+        for key in [key for key in keys if key not in state and key != "spaces"]:
+            step.keys[key] = (keys.pop(key), ABSENT)
+        return step
+
+    # -- recording -----------------------------------------------------------
+    def mark(self, label: Any = None) -> bool:
+        """Close a step at the current state; False if nothing changed."""
+        step = self._diff(label)
+        if not step:
+            return False
+        self._undo.append(step)
+        self._redo.clear()
+        if self.limit is not None and len(self._undo) > self.limit:
+            del self._undo[0]
+        return True
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def labels(self) -> List[Any]:
+        """Labels of the undo steps, oldest first."""
+        return [step.label for step in self._undo]
+
+    # -- moving --------------------------------------------------------------
+    def rollback(self) -> bool:
+        """Discard every change since the last mark; False if none."""
+        step = self._diff()
+        if not step:
+            return False
+        self._apply(step, backward=True)
+        return True
+
+    def undo(self, steps: int = 1) -> int:
+        """Roll back, then step back *steps* marks; returns how many."""
+        self.rollback()
+        done = 0
+        while done < steps and self._undo:
+            step = self._undo.pop()
+            self._apply(step, backward=True)
+            self._redo.append(step)
+            done += 1
+        return done
+
+    def redo(self, steps: int = 1) -> int:
+        """Roll back, then re-apply *steps* undone steps; returns how many."""
+        self.rollback()
+        done = 0
+        while done < steps and self._redo:
+            step = self._redo.pop()
+            self._apply(step, backward=False)
+            self._undo.append(step)
+            done += 1
+        return done
+
+    def _apply(self, step: Step, *, backward: bool) -> None:
+        from lod_ai.util.normalize_state import normalize_state
+
+        state, keys = self.state, self._keys
+        pick = 0 if backward else 1
+        for key, pair in step.keys.items():
+            image = pair[pick]
+            if image is ABSENT:
+                state.pop(key, None)
+                keys.pop(key, None)
+            else:
+                state[key] = _thaw(key, image, state.get(key))
+                keys[key] = image
+        for key, (n, tail) in step.tails.items():
+            live = state.get(key)
+            if isinstance(live, list):
+                if backward:
+                    list.__delitem__(live, slice(n, None))
+                elif len(live) == n:
+                    list.extend(live, tail)
+            img = keys.get(key)
+            if isinstance(img, list):
+                keys[key] = img[:n] if backward else img[:n] + tail
+        spaces = state.setdefault("spaces", {})
+        for sid, pair in step.spaces.items():
+            image = pair[pick]
+            if image is ABSENT:
+                spaces.pop(sid, None)
+                self._spaces.pop(sid, None)
+            else:
+                spaces[sid] = dict(image)
+                self._spaces[sid] = image
+        normalize_state(state, list(step.spaces))
@@ -0,0 +1,397 @@
+"""
+lod_ai.state.sandbox
+====================
+
+Copy-on-write game state for engine sandboxes.
+
+`Engine._simulate_action` runs every bot and human turn against a trial
+copy of the live state and commits it only when the action is legal.  A
+full ``deepcopy`` of the state grows with the game (``history``,
+``rng_log``, ``played_cards`` …), so every turn cost more than the last.
+
+`SandboxState(parent)` is a ``dict`` that starts out sharing every value
+with *parent*.  A mutable value is copied the first time it is handed
+out (``state["spaces"]``, ``state.setdefault("rng_log", [])`` …); the
+``spaces`` table is itself copy-on-write per space, the history log is
+forked (the sandbox holds only the log's length plus its own new
+entries, see `lod_ai.util.history`), and the other append-only record
+lists are copied spine-only (their entries are never edited after they
+are appended).  Scalars are written straight into the sandbox.
+
+`commit_into(parent)` merges back only the keys the sandbox touched and,
+inside ``spaces``, only the spaces whose contents actually changed.
+`changes()` reports the same information as a `StateChanges` diff, so a
+trial run (e.g. the §8.3.3 Ineffective-Event test) can be judged from
+what it touched instead of whole-state comparisons.
+
+Contract: the parent must not be mutated while a sandbox forked from it
+is still in use — the engine's sandbox flow already guarantees this
+(`Engine._using_state` swaps the sandbox in for the whole trial).
+"""
+
+from __future__ import annotations
+
+import random
+from copy import deepcopy
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Set, Tuple
+
+from lod_ai.util.history import HistoryFork, HistoryLog
+from lod_ai.util.rng_log import RngLog
+
+# Values that can be shared freely: they cannot be mutated in place.
+_SCALARS = (str, int, float, bool, type(None), tuple, frozenset)
+
+# Append-only record logs.  Their entries are written once and never
+# edited, so a sandbox only needs its own list spine.
+RECORD_LISTS = frozenset({
+    "history", "rng_log", "played_cards", "deck",
+    "event_choice_audit", "_illegal_action_log", "_bot_error_log",
+})
+
+
+ABSENT: Any = object()   # "key not present" in StateChanges diffs
+
+
+@dataclass(frozen=True)
+class StateChanges:
+    """What a sandbox changed relative to its parent.
+
+    *keys*: top-level keys whose value differs (added and removed keys
+    included; ``"spaces"`` is listed when any space changed).
+    *spaces*: ``{sid: {tag: (before, after)}}`` for spaces present on
+    both sides; *spaces_membership*: space ids added or removed.
+    Missing entries read as `ABSENT` in the ``(before, after)`` pairs.
+    """
+
+    keys: Set[str] = field(default_factory=set)
+    spaces: Dict[str, Dict[Any, Tuple[Any, Any]]] = field(default_factory=dict)
+    spaces_membership: Set[str] = field(default_factory=set)
+    _before: Dict[str, Any] = field(default_factory=dict, repr=False)
+    _after: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    def dict_diff(self, key: str) -> Dict[Any, Tuple[Any, Any]] | None:
+        """``{subkey: (before, after)}`` for a changed dict-valued
+        top-level key (a pool, ``support``, ``resources`` …); ``{}`` if
+        *key* is unchanged, None if either side is not a dict."""
+        if key not in self.keys:
+            return {}
+        before = self._before.get(key, ABSENT)
+        after = self._after.get(key, ABSENT)
+        if not isinstance(before, dict) or not isinstance(after, dict):
+            return None
+        return _diff_flat(before, after)
+
+
+def _diff_flat(before: Dict[Any, Any],
+               after: Dict[Any, Any]) -> Dict[Any, Tuple[Any, Any]]:
+    out = {}
+    for k in set(before) | set(after):
+        b = dict.get(before, k, ABSENT)
+        a = dict.get(after, k, ABSENT)
+        if b is ABSENT or a is ABSENT or b != a:
+            out[k] = (b, a)
+    return out
+
+
+def _spine_copy(records: list) -> list:
+    # The roll log carries its count and checksum along.
+    return records.copy() if isinstance(records, RngLog) else list(records)
+
+
+def _copy_rng(rng: Any) -> Any:
+    if type(rng) is random.Random:
+        twin = random.Random()
+        twin.setstate(rng.getstate())
+        return twin
+    return deepcopy(rng)
+
+
+class _CowDict(dict):
+    """``dict`` whose mutable values are copied on first access.
+
+    The underlying storage always holds a valid view of the current
+    values (shared with the parent until owned), so equality, ``len``,
+    ``in`` and key iteration need no overrides.  Everything that hands
+    a value to the caller goes through `_own`.
+    """
+
+    __slots__ = ("_owned", "_removed")
+
+    def __init__(self, base: Dict[Any, Any]) -> None:
+        dict.__init__(self, dict.items(base))
+        self._owned: Set[Any] = set()
+        self._removed: Set[Any] = set()
+
+    # -- copy policy -----------------------------------------------------
+    def _copy_child(self, key: Any, value: Any) -> Any:
+        return deepcopy(value)
+
+    def _own(self, key: Any, value: Any) -> Any:
+        if key in self._owned or isinstance(value, _SCALARS):
+            return value
+        value = self._copy_child(key, value)
+        dict.__setitem__(self, key, value)
+        self._owned.add(key)
+        return value
+
+    # -- reads that hand out values ---------------------------------------
+    def __getitem__(self, key: Any) -> Any:
+        return self._own(key, dict.__getitem__(self, key))
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if dict.__contains__(self, key):
+            return self._own(key, dict.__getitem__(self, key))
+        return default
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if dict.__contains__(self, key):
+            return self._own(key, dict.__getitem__(self, key))
+        self[key] = default
+        return default
+
+    def values(self):  # type: ignore[override]
+        self._own_all()
+        return dict.values(self)
+
+    def items(self):  # type: ignore[override]
+        self._own_all()
+        return dict.items(self)
+
+    def __iter__(self) -> Iterator[Any]:
+        # Defining __iter__ makes dict(x) / {**x} go through __getitem__
+        # instead of CPython's raw-storage fast path, so a plain copy of
+        # a sandbox never aliases the parent's containers.
+        return dict.__iter__(self)
+
+    def _own_all(self) -> None:
+        for key in list(dict.keys(self)):
+            self._own(key, dict.__getitem__(self, key))
+
+    # -- writes -------------------------------------------------------------
+    def __setitem__(self, key: Any, value: Any) -> None:
+        dict.__setitem__(self, key, value)
+        self._owned.add(key)
+        self._removed.discard(key)
+
+    def __delitem__(self, key: Any) -> None:
+        dict.__delitem__(self, key)
+        self._owned.discard(key)
+        self._removed.add(key)
+
+    _MISSING = object()
+
+    def pop(self, key: Any, default: Any = _MISSING) -> Any:
+        if not dict.__contains__(self, key):
+            if default is _CowDict._MISSING:
+                raise KeyError(key)
+            return default
+        value = self._own(key, dict.__getitem__(self, key))
+        del self[key]
+        return value
+
+    def popitem(self):
+        key = next(reversed(dict.keys(self)))
+        return key, self.pop(key)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self) -> None:
+        self._removed.update(dict.keys(self))
+        self._owned.clear()
+        dict.clear(self)
+
+    # -- copies ---------------------------------------------------------------
+    def copy(self) -> Dict[Any, Any]:
+        return dict(self.items())
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[Any, Any]:
+        return deepcopy(dict(dict.items(self)), memo)
+
+    def __reduce_ex__(self, protocol: Any):
+        return (dict, (self.copy(),))
+
+    def to_dict(self) -> Dict[Any, Any]:
+        """Plain-``dict`` view: shares values, nested sandboxes flattened."""
+        out = {}
+        for key, value in dict.items(self):
+            if isinstance(value, _CowDict):
+                value = value.to_dict()
+            out[key] = value
+        return out
+
+
+class _CowSpaces(_CowDict):
+    """The ``spaces`` table: one small ``{tag: int}`` dict per space."""
+
+    __slots__ = ("_base",)
+
+    def __init__(self, base: Dict[str, Any]) -> None:
+        super().__init__(base)
+        self._base = base
+
+    def changed_ids(self) -> Set[str]:
+        """Spaces added, removed, or whose contents now differ from the
+        parent's (handing a space out alone does not count)."""
+        changed = {sid for sid in self._removed
+                   if dict.__contains__(self._base, sid)}
+        for sid in self._owned:
+            before = dict.get(self._base, sid, ABSENT)
+            if before is ABSENT or before != dict.__getitem__(self, sid):
+                changed.add(sid)
+        return changed
+
+    def _copy_child(self, key: Any, value: Any) -> Any:
+        if isinstance(value, dict):
+            return dict(dict.items(value))
+        return deepcopy(value)
+
+    def merge_into(self, live: Dict[str, Any]) -> Set[str]:
+        """Write changed spaces into *live*; return their ids."""
+        changed: Set[str] = set()
+        for sid in self._removed:
+            if sid in live:
+                del live[sid]
+                changed.add(sid)
+        for sid in self._owned:
+            value = dict.__getitem__(self, sid)
+            if sid not in live or live[sid] != value:
+                live[sid] = value
+                changed.add(sid)
+        return changed
+
+
+class SandboxState(_CowDict):
+    """Copy-on-write trial copy of a game state (see module docstring)."""
+
+    __slots__ = ("parent",)
+
+    def __init__(self, parent: Dict[str, Any]) -> None:
+        super().__init__(parent)
+        self.parent = parent
+
+    def _copy_child(self, key: Any, value: Any) -> Any:
+        if key == "spaces" and isinstance(value, dict):
+            return _CowSpaces(value)
+        if key == "history" and isinstance(value, (HistoryLog, HistoryFork)):
+            return value.fork()
+        if key in RECORD_LISTS and isinstance(value, list):
+            return _spine_copy(value)
+        if key == "rng":
+            return _copy_rng(value)
+        return deepcopy(value)
+
+    def changes(self) -> StateChanges:
+        """Diff the touched keys against the parent (read raw, so a
+        parent that is itself a sandbox is not forced to copy)."""
+        keys: Set[str] = set()
+        before: Dict[str, Any] = {}
+        after: Dict[str, Any] = {}
+        space_diff: Dict[str, Dict[Any, Tuple[Any, Any]]] = {}
+        membership: Set[str] = set()
+        for key in self._owned | self._removed:
+            b = dict.get(self.parent, key, ABSENT)
+            a = dict.get(self, key, ABSENT)
+            if key == "spaces" and isinstance(a, dict) and \
+                    isinstance(b, dict):
+                live = a._owned | a._removed if isinstance(a, _CowDict) \
+                    else set(a) | set(b)
+                for sid in live:
+                    sb = dict.get(b, sid, ABSENT)
+                    sa = dict.get(a, sid, ABSENT)
+                    if sb is ABSENT or sa is ABSENT:
+                        if sb is not sa:
+                            membership.add(sid)
+                    elif sb is not sa and sb != sa:
+                        space_diff[sid] = (_diff_flat(sb, sa)
+                                           if isinstance(sb, dict)
+                                           and isinstance(sa, dict)
+                                           else {None: (sb, sa)})
+                if space_diff or membership:
+                    keys.add(key)
+            elif b is not a and (b is ABSENT or a is ABSENT or b != a):
+                keys.add(key)
+            before[key], after[key] = b, a
+        return StateChanges(keys, space_diff, membership, before, after)
+
+    @property
+    def touched_keys(self) -> Set[str]:
+        """Top-level keys the sandbox copied, wrote or removed."""
+        return set(self._owned) | set(self._removed)
+
+    def commit_into(self, target: Dict[str, Any]) -> Set[str]:
+        """Merge the sandbox's changes into *target* (its parent).
+
+        Only touched top-level keys are written; ``spaces`` is merged
+        space by space.  Returns the ids of spaces whose contents changed
+        (every space, if the sandbox replaced or dropped the table).
+        """
+        changed: Set[str] = set()
+        for key in self._removed:
+            if key == "spaces":
+                changed |= set(target.get(key) or ())
+            target.pop(key, None)
+        for key in self._owned:
+            value = dict.__getitem__(self, key)
+            if isinstance(value, _CowSpaces) and \
+                    isinstance(target.get(key), dict):
+                changed |= value.merge_into(target[key])
+                continue
+            if isinstance(value, HistoryFork):
+                if value.parent is dict.get(target, key, None):
+                    value.commit_into(target[key])
+                else:
+                    target[key] = value.materialize()
+                continue
+            if key == "spaces":
+                changed |= set(target.get(key) or ()) | set(value or ())
+            if isinstance(value, _CowDict):
+                target[key] = value.to_dict()
+            else:
+                target[key] = value
+        return changed
+
+
+def changed_spaces(spaces: Any) -> Set[str] | None:
+    """Ids of the spaces a sandbox's ``spaces`` table has changed
+    relative to its parent's; None for a plain dict, where any space may
+    have been edited."""
+    if isinstance(spaces, _CowSpaces):
+        return spaces.changed_ids()
+    return None
+
+
+def fork_state(state: Dict[str, Any]) -> SandboxState:
+    """Return a copy-on-write sandbox of *state*."""
+    return SandboxState(state)
+
+
+def detached_copy(state: Dict[str, Any]) -> Dict[str, Any]:
+    """An independent copy of *state* (e.g. for `Engine.fork`).
+
+    Unlike a sandbox it stays valid while *state* moves on.  It is still
+    cheaper than a ``deepcopy``: spaces are copied one flat dict each, and
+    the history log and record lists are copied spine-only, sharing their
+    entries.  Everything else is deep-copied.
+    """
+    memo: Dict[int, Any] = {}
+    out: Dict[str, Any] = {}
+    for key, value in state.items():
+        if isinstance(value, _SCALARS):
+            out[key] = value
+        elif key == "spaces" and isinstance(value, dict):
+            out[key] = {sid: dict(sp) if isinstance(sp, dict)
+                        else deepcopy(sp, memo) for sid, sp in value.items()}
+        elif key == "history" and isinstance(value, (HistoryLog, HistoryFork)):
+            out[key] = HistoryLog(value)
+        elif key in RECORD_LISTS and isinstance(value, list):
+            out[key] = _spine_copy(value)
+        elif key == "rng":
+            out[key] = _copy_rng(value)
+        else:
+            out[key] = deepcopy(value, memo)
+    return out
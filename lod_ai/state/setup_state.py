@@ -15,6 +15,8 @@ from collections import Counter
 from pathlib import Path
 from typing import Dict, Any, Iterable, List, Tuple
 from lod_ai.util.normalize_state import normalize_state
+from lod_ai.util.history import HistoryLog
+from lod_ai.util.rng_log import RngLog
 
 # ── constants from rules_consts ──────────────────────────────────────────
 from lod_ai.rules_consts import (
@@ -411,8 +413,8 @@ def build_state(
         "cbc":       int(scen.get("british_casualties", 0)),   # CBC
         "crc":       int(scen.get("patriot_casualties", 0)),   # CRC
         "rng":       random.Random(seed),
-        "rng_log":   [],
-        "history":   [],
+        "rng_log":   RngLog(),
+        "history":   HistoryLog(),
         "log":       [],
         "setup_method": method,
         "seed": seed,
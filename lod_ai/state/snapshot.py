@@ -0,0 +1,481 @@
+"""
+lod_ai.state.snapshot
+=====================
+
+Compact binary save format with delta snapshots.
+
+`save_game` writes pretty JSON: a full ``deepcopy`` of the state, every
+set converted, the whole history and the 625-int RNG state spelled out
+as text.  That is fine for an export but slow for autosaves and for the
+per-card save/load check in ``tools/invariants``.  This module encodes
+the live state directly, type for type (sets, tuples, the history log
+and the ``random.Random`` state survive as themselves), and a
+`SnapshotWriter` appends only what changed since its previous snapshot.
+
+File layout::
+
+    b"LODS" version:u8  record*
+    record  = kind:u8 (B base | D delta)  length:varint  payload
+
+A base payload is the encoded ``{"state": …, "meta": …}``.  A delta
+payload is ``{"set": {key: value}, "del": [key], "spaces": {sid: space},
+"spaces_del": [sid], "trim": {key: n}, "append": {key: [entry]},
+"meta": …}``: changed top-level keys, changed spaces, the number of
+cards drawn off the front of the deck, and the new tail of each
+append-only record list.  `read_snapshots` replays base plus deltas.
+
+Values: ``None``/bools, ints (zig-zag varints), floats, str, bytes,
+list, tuple, set, frozenset, dict, `HistoryLog`, `RngLog`, ``random.Random`` and
+module-level `lod_ai` functions (by reference, e.g. a queued
+Winter-Quarters event).  Anything else is stored as ``str(value)``, as
+the JSON save does.  Decoding never reaches outside the `lod_ai`
+package: a function reference naming anything else raises ValueError.
+"""
+
+from __future__ import annotations
+
+import importlib
+import inspect
+import os
+import random
+import struct
+from typing import Any, Dict, Iterator, List, Tuple
+
+from lod_ai.util.history import HistoryFork, HistoryLog
+from lod_ai.util.rng_log import RngLog
+
+MAGIC = b"LODS"
+FORMAT_VERSION = 2          # 2: `RngLog` values
+
+BASE = b"B"
+DELTA = b"D"
+
+# Record lists that only ever grow at the end; deltas carry their tail.
+# (The roll log is bounded, so it drops entries at the front: it is sent
+# whole whenever it changed, like any other key.)
+APPEND_ONLY = frozenset({
+    "history", "log", "played_cards",
+    "event_choice_audit", "_illegal_action_log", "_bot_error_log",
+})
+# Lists consumed from the front (and occasionally added to at the end);
+# deltas carry how many entries were dropped plus any new tail.
+QUEUES = frozenset({"deck"})
+
+_PACK_DOUBLE = struct.Struct(">d")
+
+
+# --------------------------------------------------------------------------- #
+# Value codec
+# --------------------------------------------------------------------------- #
+def _varint(n: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _enc(value: Any, out: List[bytes]) -> None:
+    kind = type(value)
+    if kind is str:
+        raw = value.encode("utf-8")
+        out.append(b"s" + _varint(len(raw)) + raw)
+    elif kind is int:
+        if 0 <= value < 0x40:
+            out.append(b"i" + bytes((value << 1,)))
+        else:
+            out.append(b"i" + _varint(value << 1 if value >= 0
+                                      else ((-value) << 1) - 1))
+    elif kind is dict:
+        out.append(b"m" + _varint(len(value)))
+        for key, item in value.items():
+            _enc(key, out)
+            _enc(item, out)
+    elif value is None:
+        out.append(b"N")
+    elif value is True:
+        out.append(b"T")
+    elif value is False:
+        out.append(b"F")
+    elif kind in _SEQ_TAGS:
+        out.append(_SEQ_TAGS[kind] + _varint(len(value)))
+        for item in value:
+            _enc(item, out)
+    elif kind is float:
+        out.append(b"d" + _PACK_DOUBLE.pack(value))
+    elif isinstance(value, random.Random):
+        version, internal, gauss = value.getstate()
+        out.append(b"R")
+        _enc([version, list(internal), gauss], out)
+    elif isinstance(value, dict):
+        _enc(dict(value), out)
+    elif isinstance(value, (bytes, bytearray)):
+        out.append(b"b" + _varint(len(value)) + bytes(value))
+    elif isinstance(value, HistoryFork):
+        _enc(value.materialize(), out)
+    elif isinstance(value, RngLog):
+        out.append(b"G")
+        _enc([value.count, value.checksum, value.limit, list(value)], out)
+    elif callable(value) and _function_ref(value):
+        out.append(b"f")
+        _enc(_function_ref(value), out)
+    else:
+        for base in _SEQ_TAGS:
+            if isinstance(value, base):
+                _enc(base(value), out)
+                return
+        _enc(str(value), out)
+
+
+_SEQ_TAGS: Dict[type, bytes] = {list: b"l", tuple: b"t", set: b"S",
+                               frozenset: b"Z", HistoryLog: b"H"}
+
+
+def _function_ref(fn: Any) -> str | None:
+    """``module:qualname`` if *fn* can be re-imported as itself."""
+    ref = f"{getattr(fn, '__module__', None)}:{getattr(fn, '__qualname__', '')}"
+    try:
+        return ref if _resolve(ref) is fn else None
+    except ValueError:
+        return None
+
+
+def _resolve(ref: str) -> Any:
+    """The function a ``module:qualname`` reference names.
+
+    Only plain functions defined in a `lod_ai` module resolve; a file
+    naming anything else (``os:system``, a class, a bound method) is
+    rejected rather than imported.
+    """
+    module, _, qualname = ref.partition(":")
+    target: Any = None
+    if module == "lod_ai" or module.startswith("lod_ai."):
+        try:
+            target = importlib.import_module(module)
+            for part in qualname.split("."):
+                target = getattr(target, part)
+        except (ImportError, AttributeError):
+            target = None
+    if not (inspect.isfunction(target) and target.__module__ == module
+            and target.__qualname__ == qualname):
+        raise ValueError(f"snapshot function {ref!r} is not a lod_ai function")
+    return target
+
+
+def encode(value: Any) -> bytes:
+    """Encode one value (see module docstring for the supported types)."""
+    out: List[bytes] = []
+    _enc(value, out)
+    return b"".join(out)
+
+
+class _Reader:
+    __slots__ = ("data", "pos")
+
+    def __init__(self, data: bytes, pos: int = 0) -> None:
+        self.data = data
+        self.pos = pos
+
+    def varint(self) -> int:
+        data, pos = self.data, self.pos
+        shift = result = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                self.pos = pos
+                return result
+            shift += 7
+
+    def take(self, n: int) -> bytes:
+        start = self.pos
+        self.pos += n
+        return self.data[start:self.pos]
+
+    def value(self) -> Any:
+        tag = self.data[self.pos:self.pos + 1]
+        self.pos += 1
+        if tag == b"s":
+            return self.take(self.varint()).decode("utf-8")
+        if tag == b"i":
+            n = self.varint()
+            return -((n + 1) >> 1) if n & 1 else n >> 1
+        if tag == b"m":
+            return {self.value(): self.value() for _ in range(self.varint())}
+        if tag in _SEQ_TYPES:
+            return _SEQ_TYPES[tag](self.value() for _ in range(self.varint()))
+        if tag == b"N":
+            return None
+        if tag == b"T":
+            return True
+        if tag == b"F":
+            return False
+        if tag == b"d":
+            return _PACK_DOUBLE.unpack(self.take(8))[0]
+        if tag == b"R":
+            version, internal, gauss = self.value()
+            rng = random.Random()
+            rng.setstate((version, tuple(internal), gauss))
+            return rng
+        if tag == b"b":
+            return self.take(self.varint())
+        if tag == b"G":
+            count, checksum, limit, recent = self.value()
+            return RngLog(recent, count, checksum, limit)
+        if tag == b"f":
+            return _resolve(self.value())
+        raise ValueError(f"bad snapshot value tag {tag!r} at {self.pos - 1}")
+
+
+_SEQ_TYPES = {b"l": list, b"t": tuple, b"S": set, b"Z": frozenset,
+              b"H": HistoryLog}
+
+
+def decode(data: bytes) -> Any:
+    """Inverse of `encode`."""
+    return _Reader(data).value()
+
+
+def _map_of(encoded: Dict[str, bytes]) -> bytes:
+    """Encode a str-keyed map whose values are already encoded."""
+    parts = [b"m" + _varint(len(encoded))]
+    for key, raw in encoded.items():
+        parts.append(encode(key))
+        parts.append(raw)
+    return b"".join(parts)
+
+
+# --------------------------------------------------------------------------- #
+# Snapshot files
+# --------------------------------------------------------------------------- #
+class SnapshotWriter:
+    """Append base/delta snapshots of one game to *path*.
+
+    The first `write` (and every *rebase_every*-th after it) truncates
+    the file and writes a full base snapshot; the others append a delta
+    against the previous write.  Deltas are found by comparing encoded
+    bytes per top-level key and per space; an append-only record list
+    only ships its new tail, provided the entry it ended on last time is
+    unchanged.
+    """
+
+    def __init__(self, path: str, *, rebase_every: int = 64) -> None:
+        self.path = path
+        self.rebase_every = rebase_every
+        self._since_base: int | None = None
+        self._keys: Dict[str, bytes] = {}
+        self._lists: Dict[str, Tuple[int, bytes]] = {}
+        self._queues: Dict[str, List[bytes]] = {}
+        self._spaces: Dict[str, bytes] | None = None
+
+    def write(self, state: Dict[str, Any],
+              meta: Dict[str, Any] | None = None) -> int:
+        """Snapshot *state*; returns the number of bytes written."""
+        if self._since_base is None or self._since_base >= self.rebase_every:
+            return self._write_base(state, meta or {})
+        return self._write_delta(state, meta or {})
+
+    def _write_base(self, state: Dict[str, Any], meta: Dict[str, Any]) -> int:
+        keys: Dict[str, bytes] = {}
+        lists: Dict[str, Tuple[int, bytes]] = {}
+        queues: Dict[str, List[bytes]] = {}
+        spaces: Dict[str, bytes] | None = None
+        body: Dict[str, bytes] = {}
+        for key, value in state.items():
+            if key == "spaces" and type(value) is dict:
+                spaces = {sid: encode(sp) for sid, sp in value.items()}
+                body[key] = _map_of(spaces)
+                continue
+            if key in QUEUES and type(value) is list:
+                queues[key] = [encode(item) for item in value]
+                body[key] = _list_of(queues[key])
+                continue
+            raw = encode(value)
+            body[key] = raw
+            if key in APPEND_ONLY and isinstance(value, list):
+                lists[key] = _tail_mark(value)
+            else:
+                keys[key] = raw
+        payload = _map_of({"state": _map_of(body), "meta": encode(meta)})
+        record = MAGIC + bytes((FORMAT_VERSION,)) + _record(BASE, payload)
+        _atomic_write(self.path, record)
+        self._since_base = 0
+        self._keys, self._lists, self._spaces = keys, lists, spaces
+        self._queues = queues
+        return len(record)
+
+    def _write_delta(self, state: Dict[str, Any], meta: Dict[str, Any]) -> int:
+        keys: Dict[str, bytes] = {}
+        lists: Dict[str, Tuple[int, bytes]] = {}
+        queues: Dict[str, List[bytes]] = {}
+        spaces: Dict[str, bytes] | None = None
+        set_: Dict[str, bytes] = {}
+        trim: Dict[str, bytes] = {}
+        append: Dict[str, bytes] = {}
+        spaces_set: Dict[str, bytes] = {}
+        spaces_del: List[str] = []
+        for key, value in state.items():
+            if key == "spaces" and type(value) is dict:
+                spaces = {sid: encode(sp) for sid, sp in value.items()}
+                if self._spaces is None:
+                    set_[key] = _map_of(spaces)
+                    continue
+                spaces_set = {sid: raw for sid, raw in spaces.items()
+                              if self._spaces.get(sid) != raw}
+                spaces_del = [sid for sid in self._spaces if sid not in spaces]
+                continue
+            if key in QUEUES and type(value) is list:
+                items = queues[key] = [encode(item) for item in value]
+                drop = _dropped(self._queues.get(key), items)
+                if drop is None:
+                    set_[key] = _list_of(items)
+                else:
+                    kept = len(self._queues[key]) - drop
+                    if drop:
+                        trim[key] = encode(drop)
+                    if len(items) > kept:
+                        append[key] = _list_of(items[kept:])
+                continue
+            if key in APPEND_ONLY and isinstance(value, list):
+                lists[key] = _tail_mark(value)
+                n_prev, last_prev = self._lists.get(key, (-1, b""))
+                if 0 <= n_prev <= len(value) and (
+                        n_prev == 0 or encode(value[n_prev - 1]) == last_prev):
+                    if len(value) > n_prev:
+                        append[key] = encode(list(value[n_prev:]))
+                else:
+                    set_[key] = encode(value)
+                continue
+            raw = keys[key] = encode(value)
+            if self._keys.get(key) != raw:
+                set_[key] = raw
+        previous = set(self._keys) | set(self._lists) | set(self._queues)
+        if self._spaces is not None:
+            previous.add("spaces")
+        removed = [key for key in previous if key not in state]
+        payload = _map_of({
+            "set": _map_of(set_),
+            "del": encode(removed),
+            "spaces": _map_of(spaces_set),
+            "spaces_del": encode(spaces_del),
+            "trim": _map_of(trim),
+            "append": _map_of(append),
+            "meta": encode(meta),
+        })
+        record = _record(DELTA, payload)
+        with open(self.path, "ab") as fh:
+            fh.write(record)
+        self._since_base = (self._since_base or 0) + 1
+        self._keys, self._lists, self._spaces = keys, lists, spaces
+        self._queues = queues
+        return len(record)
+
+
+def _dropped(before: List[bytes] | None, after: List[bytes]) -> int | None:
+    """How many entries came off the front of *before* to leave a prefix
+    of *after* (None if *after* is not such a continuation)."""
+    if before is None:
+        return None
+    for drop in range(len(before) + 1):
+        kept = len(before) - drop
+        if before[drop:] == after[:kept]:
+            return drop
+    return None
+
+
+def _list_of(encoded: List[bytes]) -> bytes:
+    """Encode a list whose items are already encoded."""
+    return b"l" + _varint(len(encoded)) + b"".join(encoded)
+
+
+def _tail_mark(entries: List[Any]) -> Tuple[int, bytes]:
+    """Length of an append-only list and the encoding of its last entry."""
+    return len(entries), encode(entries[-1]) if entries else b""
+
+
+def _record(kind: bytes, payload: bytes) -> bytes:
+    return kind + _varint(len(payload)) + payload
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+
+
+def dumps(state: Dict[str, Any], meta: Dict[str, Any] | None = None) -> bytes:
+    """A one-record (base only) snapshot file's bytes."""
+    payload = encode({"state": state, "meta": meta or {}})
+    return MAGIC + bytes((FORMAT_VERSION,)) + _record(BASE, payload)
+
+
+def is_snapshot(data: bytes) -> bool:
+    return data[:len(MAGIC)] == MAGIC
+
+
+def iter_snapshots(data: bytes) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Replay a snapshot file's bytes: yields ``(state, meta)`` after the
+    base and after each delta.  The same state dict is updated in place.
+    A torn last record (a delta append cut short) is ignored."""
+    if not is_snapshot(data):
+        raise ValueError("not a LODS snapshot file")
+    if data[len(MAGIC)] > FORMAT_VERSION:
+        raise ValueError(f"snapshot format version {data[len(MAGIC)]} "
+                         f"is newer than this reader ({FORMAT_VERSION})")
+    reader = _Reader(data, len(MAGIC) + 1)
+    state: Dict[str, Any] | None = None
+    while reader.pos < len(data):
+        kind = reader.take(1)
+        try:
+            end = reader.varint() + reader.pos
+        except IndexError:
+            return
+        if end > len(data):
+            return
+        record = reader.value()
+        reader.pos = end
+        if kind == BASE:
+            state = record["state"]
+        elif kind == DELTA and state is not None:
+            _apply_delta(state, record)
+        else:
+            raise ValueError(f"bad snapshot record {kind!r}")
+        yield state, record["meta"]
+
+
+def _apply_delta(state: Dict[str, Any], delta: Dict[str, Any]) -> None:
+    for key in delta["del"]:
+        state.pop(key, None)
+    state.update(delta["set"])
+    if delta["spaces"] or delta["spaces_del"]:
+        spaces = state.setdefault("spaces", {})
+        for sid in delta["spaces_del"]:
+            spaces.pop(sid, None)
+        spaces.update(delta["spaces"])
+    for key, drop in delta["trim"].items():
+        del state[key][:drop]
+    for key, tail in delta["append"].items():
+        state.setdefault(key, []).extend(tail)
+
+
+def loads(data: bytes) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """The latest ``(state, meta)`` in a snapshot file's bytes."""
+    latest = None
+    for latest in iter_snapshots(data):
+        pass
+    if latest is None:
+        raise ValueError("empty snapshot file")
+    return latest
+
+
+def read_snapshots(path: str) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """`iter_snapshots` over the file at *path*."""
+    with open(path, "rb") as fh:
+        data = fh.read()
+    return iter_snapshots(data)
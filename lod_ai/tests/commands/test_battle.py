@@ -458,3 +458,66 @@ def test_human_defender_underground_activation_hook(monkeypatch):
     s_off = mk()
     battle.execute(s_off, C.BRITISH, {}, ["Boston"])
     assert _d3(s_off) == 1
+
+
+# --------------------------------------------------------------------------- #
+# Battle odds: exact distribution matches the resolver dice-for-dice
+# --------------------------------------------------------------------------- #
+def _odds_states():
+    base = {
+        "resources": {C.BRITISH: 5, C.PATRIOTS: 5, C.FRENCH: 5, C.INDIANS: 5},
+        "available": {}, "casualties": {}, "leader_locs": {},
+        "support": {}, "toa_played": True,
+    }
+    return [
+        # British attack with Common Cause War Parties vs Continentals + Fort
+        (C.BRITISH, "Boston", {"common_cause": {"Boston": 2}},
+         {C.REGULAR_BRI: 4, C.TORY: 2, C.WARPARTY_A: 3,
+          C.REGULAR_PAT: 3, C.MILITIA_A: 2, C.FORT_PAT: 1}, base),
+        # Patriots attack Indians defending a Village in a Reserve
+        (C.PATRIOTS, "Northwest", {},
+         {C.REGULAR_PAT: 5, C.MILITIA_A: 3, C.MILITIA_U: 1,
+          C.WARPARTY_A: 2, C.WARPARTY_U: 2, C.VILLAGE: 1, C.TORY: 1}, base),
+    ]
+
+
+def test_battle_odds_match_every_dice_sequence(monkeypatch):
+    import itertools
+    from copy import deepcopy
+    from lod_ai.util.history import BATTLE_RESULT, last_event
+
+    monkeypatch.setattr(battle, "refresh_control", lambda s: None)
+    for faction, sid, ctx, pieces, base in _odds_states():
+        state = deepcopy(base)
+        state["spaces"] = {sid: dict(pieces)}
+        odds = battle.space_battle_odds(state, faction, sid,
+                                        cc_wp=ctx.get("common_cause", {})
+                                        .get(sid, 0))
+        assert state["spaces"][sid] == pieces          # nothing mutated
+        forces = battle.battle_forces(state, faction, sid,
+                                      cc_wp=ctx.get("common_cause", {})
+                                      .get(sid, 0))
+        n_dice = min(3, forces.att_force // 3) + min(3, forces.def_force // 3)
+        tally = {}
+        for rolls in itertools.product((1, 2, 3), repeat=n_dice):
+            st = deepcopy(state)
+            seq = iter(rolls)
+            monkeypatch.setattr(battle, "_roll_d3", lambda s: next(seq))
+            winner = battle._resolve_space(st, deepcopy(ctx), faction, sid, 0)
+            losses = last_event(st["history"], BATTLE_RESULT)["data"]["losses"]
+            key = (winner, losses[forces.att_side], losses[forces.def_side])
+            tally[key] = tally.get(key, 0) + 1
+        assert odds.total == 3 ** n_dice
+        assert dict(odds.outcomes) == tally
+        assert 0.0 <= odds.p_attacker_wins <= 1.0
+
+
+def test_battle_odds_are_memoized_by_force_summary():
+    st = {"spaces": {"Boston": {C.REGULAR_BRI: 4, C.REGULAR_PAT: 2}},
+          "leader_locs": {}}
+    other = {"spaces": {"New_York": {C.REGULAR_BRI: 4, C.REGULAR_PAT: 2}},
+             "leader_locs": {}}
+    a = battle.space_battle_odds(st, C.BRITISH, "Boston")
+    b = battle.space_battle_odds(other, C.BRITISH, "New_York")
+    assert a is b
+    assert a.p_win("ROYALIST") + a.p_win("REBELLION") == pytest.approx(1.0)
@@ -0,0 +1,96 @@
+"""Optional NumPy board view (lod_ai.board.arrays)."""
+
+import contextlib
+import io
+import subprocess
+import sys
+
+import pytest
+
+from lod_ai import rules_consts as C
+from lod_ai.board import arrays
+from lod_ai.board.pieces import move_piece, place_piece
+from lod_ai.state.setup_state import build_state
+from lod_ai.tools.invariants import piece_census
+from lod_ai.util.normalize_state import normalize_state
+from lod_ai.victory import _summarize_board
+
+
+def _state():
+    st = build_state("1776", seed=4)
+    normalize_state(st)
+    return st
+
+
+def test_attach_without_numpy_raises(monkeypatch):
+    monkeypatch.setattr(arrays, "np", None)
+    monkeypatch.setitem(sys.modules, "numpy", None)     # import fails
+    st = _state()
+    with pytest.raises(RuntimeError):
+        arrays.attach(st)
+    assert arrays.view_of(st) is None
+
+
+def test_view_tracks_piece_helpers_and_matches_dict_scans():
+    np = pytest.importorskip("numpy")
+    st = _state()
+    view = arrays.attach(st)
+    assert arrays.attach(st) is view
+    place_piece(st, C.MILITIA_U, "Georgia", 2)
+    move_piece(st, C.REGULAR_BRI, "Boston", "New_York_City", 1)
+    fresh = arrays.BoardArrays(dict(st))
+    assert np.array_equal(view.counts, fresh.counts)
+    assert view.control() == st["control"]
+    plain = dict(st)                     # no view attached: dict scans
+    assert _summarize_board(st) == _summarize_board(plain)
+    assert piece_census(st) == piece_census(plain)
+
+    st["spaces"]["Georgia"][C.MILITIA_U] = 7     # direct edit
+    view.refresh(["Georgia"])
+    assert view.column(C.MILITIA_U)[view.row["Georgia"]] == 7
+    arrays.detach(st)
+    assert arrays.view_of(st) is None
+
+
+def test_view_follows_engine_commits():
+    np = pytest.importorskip("numpy")
+    from lod_ai.engine import Engine
+
+    eng = Engine(initial_state=build_state("1778", seed=2))
+    eng.set_human_factions(set())
+    view = arrays.attach(eng.state)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(12):
+            card = eng.draw_card()
+            if card is None:
+                break
+            eng.play_card(card)
+            assert np.array_equal(view.counts,
+                                  arrays.BoardArrays(dict(eng.state)).counts)
+            assert view.control() == eng.state["control"]
+
+
+def test_engine_import_does_not_load_numpy():
+    code = ("import sys, lod_ai.engine, lod_ai.tools.batch_smoke, lod_ai.env; "
+            "print('numpy' in sys.modules)")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                         text=True, check=True).stdout
+    assert out.strip() == "False"
+
+
+def test_run_one_game_opts_in_to_the_view(monkeypatch):
+    pytest.importorskip("numpy")
+    from lod_ai.tools import batch_smoke
+
+    used = []
+    census = arrays.BoardArrays.faction_totals
+
+    def spy(view):
+        used.append(view)
+        return census(view)
+
+    monkeypatch.setattr(arrays.BoardArrays, "faction_totals", spy)
+    plain = batch_smoke.run_one_game("1778", 3)
+    assert not used
+    viewed = batch_smoke.run_one_game("1778", 3, arrays=True)
+    assert used and viewed == plain
@@ -0,0 +1,64 @@
+"""Lazy card-handler table and the shared card/map data."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from lod_ai import cards
+from lod_ai.cards import CARD_HANDLERS, CARD_REGISTRY, handler_modules
+from lod_ai.map import adjacency
+from lod_ai.state import map_loader
+
+_REPO = Path(__file__).resolve().parents[2]
+
+
+def test_scanned_table_matches_registered_handlers():
+    table = handler_modules()
+    assert sorted(table) == sorted(CARD_HANDLERS)      # iterating loads all
+    for card_id, mod in table.items():
+        assert CARD_HANDLERS[card_id].__module__ == mod
+
+
+def test_every_card_in_data_has_a_handler():
+    assert set(CARD_REGISTRY) == set(handler_modules())
+
+
+def test_first_lookup_imports_only_the_owning_module():
+    probe = (
+        "import sys\n"
+        "from lod_ai.engine import Engine\n"
+        "from lod_ai.cards import CARD_HANDLERS\n"
+        "era = lambda: sorted(m for m in sys.modules if m.endswith('_war'))\n"
+        "assert era() == [], era()\n"
+        "assert CARD_HANDLERS.get(2) is not None\n"
+        "assert era() == ['lod_ai.cards.effects.early_war'], era()\n"
+        "assert 9999 not in CARD_HANDLERS\n"
+        "assert era() == ['lod_ai.cards.effects.early_war'], era()\n"
+    )
+    subprocess.run([sys.executable, "-c", probe], cwd=_REPO, check=True)
+
+
+def test_override_is_not_clobbered_by_a_later_import(monkeypatch):
+    sentinel = lambda state, shaded=False: None
+    monkeypatch.setitem(CARD_HANDLERS, 2, sentinel)
+    assert CARD_HANDLERS[2] is sentinel
+
+
+def test_duplicate_registration_rejected():
+    CARD_HANDLERS.get(2)
+    try:
+        cards.register(2)(lambda state, shaded=False: None)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("duplicate registration accepted")
+
+
+def test_bots_and_adjacency_share_one_map():
+    from lod_ai.bots import british_bot, french, indians, patriot
+    from lod_ai.bots import free_op_planner
+
+    shared = map_loader.load_map()
+    assert adjacency._RAW_MAP is shared
+    for mod in (british_bot, french, indians, patriot, free_op_planner):
+        assert mod._MAP_DATA is shared
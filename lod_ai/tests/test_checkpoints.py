@@ -0,0 +1,36 @@
+"""Mid-game checkpoints (lod_ai.tools.checkpoints)."""
+
+from lod_ai.engine import Engine
+from lod_ai.state.setup_state import build_state
+from lod_ai.tools import checkpoints as cp
+
+
+def _from_scratch(scenario, seed, cards):
+    eng = Engine(initial_state=build_state(scenario, seed=seed), use_cli=False)
+    eng.set_human_factions([])
+    cp.play_cards(eng, cards)
+    return eng
+
+
+def test_resumed_runs_match_the_full_run(tmp_path):
+    path = cp.record("1778", 4, every=4, cards=16, root=tmp_path)
+    assert cp.verify(path) == []
+    state, meta = cp.nearest(path, 14)
+    assert meta["card"] == 12 and meta["seed"] == 4
+    assert cp.nearest(path, 3) is None
+
+
+def test_engine_at_equals_playing_from_card_one(tmp_path):
+    eng = cp.engine_at("1776", 2, 13, every=5, root=tmp_path)
+    assert cp.checkpoint_path("1776", 2, root=tmp_path).exists()
+    again = cp.engine_at("1776", 2, 13, every=5, root=tmp_path)
+    expected = cp.fingerprint_of(_from_scratch("1776", 2, 13).state)
+    assert cp.fingerprint_of(eng.state) == expected
+    assert cp.fingerprint_of(again.state) == expected
+
+
+def test_checkpoints_from_another_engine_are_ignored(tmp_path, monkeypatch):
+    path = cp.record("1778", 4, every=3, cards=6, root=tmp_path)
+    monkeypatch.setattr(cp, "engine_fingerprint", lambda: "other")
+    assert cp.nearest(path, 6) is None
+    assert cp.verify(path) != []
@@ -0,0 +1,144 @@
+"""Input providers, hooks and quiet output are per thread / asyncio task,
+so several games can run in one process at once."""
+
+import asyncio
+import io
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import lod_ai.cli_utils as U
+from lod_ai.commands import battle as battle_cmd
+from lod_ai.engine import Engine
+from lod_ai.llm import run_game
+from lod_ai.llm.policy import RandomPolicy
+
+
+def _in_thread(fn):
+    out = []
+    t = threading.Thread(target=lambda: out.append(fn()))
+    t.start()
+    t.join()
+    return out[0]
+
+
+def _harness_game(seed):
+    r = run_game("1778", seed=seed, llm_factions=["PATRIOTS", "FRENCH"],
+                 policy=RandomPolicy(seed), max_cards=8, quiet=True)
+    return (r["winner"], r["cards_played"], r["decisions"],
+            [h["msg"] for h in r["state"]["history"]])
+
+
+def test_provider_and_game_are_local_to_a_thread():
+    class Provider:
+        def prompt(self, label, menu):
+            return "1"
+
+    mine = Provider()
+    U.set_input_provider(mine)
+    U.set_game_state({"spaces": {}})
+    try:
+        assert _in_thread(U.get_input_provider) is U._STDIN_PROVIDER
+        assert _in_thread(lambda: U._GAME_STATE.get()) is None
+        assert U.get_input_provider() is mine
+    finally:
+        U.set_input_provider(None)
+        U.set_game_state(None)
+
+
+def test_game_session_restores_what_was_there():
+    outer, inner = U.NoInputProvider(), U.NoInputProvider()
+    with U.game_session(outer, state={"outer": 1}):
+        with U.game_session(inner, state={"inner": 1}):
+            assert U.get_input_provider() is inner
+        assert U.get_input_provider() is outer
+        assert U._GAME_STATE.get() == {"outer": 1}
+    assert isinstance(U.get_input_provider(), U.StdinInputProvider)
+
+
+def test_no_input_provider_is_not_interactive():
+    with U.game_session(U.NoInputProvider()):
+        assert not Engine._interactive_input()
+        try:
+            U.choose_one("Pick", [("a", 1)])
+        except EOFError:
+            pass
+        else:
+            raise AssertionError("NoInputProvider answered a prompt")
+
+
+def test_batch_smoke_leaves_stdin_alone():
+    code = ("import sys; stdin = sys.stdin; import lod_ai.tools.batch_smoke; "
+            "assert sys.stdin is stdin")
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_defender_hook_and_battle_observer_are_local_to_a_thread():
+    seen = []
+    battle_cmd.set_defender_activation_hook(lambda *a: 0)
+    try:
+        assert _in_thread(battle_cmd.get_defender_activation_hook) is None
+    finally:
+        battle_cmd.set_defender_activation_hook(None)
+
+    with battle_cmd.observe_battles(lambda *a: seen.append(a)):
+        assert battle_cmd._BATTLE_OBSERVER.get() is not None
+        assert _in_thread(lambda: battle_cmd._BATTLE_OBSERVER.get()) is None
+    assert battle_cmd._BATTLE_OBSERVER.get() is None
+
+
+def test_quiet_output_silences_only_its_own_thread():
+    buf = io.StringIO()
+    real, sys.stdout = sys.stdout, buf
+    try:
+        with U.quiet_output():
+            print("hidden")
+            _in_thread(lambda: print("shown"))
+        print("after")
+    finally:
+        sys.stdout = real
+    assert buf.getvalue() == "shown\nafter\n"
+
+
+def test_quiet_output_restores_stdout_after_the_last_block():
+    real = sys.stdout
+    inside = threading.Event()
+    release = threading.Event()
+
+    def other():
+        with U.quiet_output():
+            inside.set()
+            release.wait(10)
+
+    t = threading.Thread(target=other)
+    t.start()
+    inside.wait(10)
+    with U.quiet_output():
+        assert sys.stdout is not real
+    assert sys.stdout is not real            # the other block is still open
+    release.set()
+    t.join()
+    assert sys.stdout is real
+
+
+def test_harness_games_in_a_thread_pool_match_sequential_runs():
+    seeds = [1, 2, 3]
+    expected = [_harness_game(s) for s in seeds]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)     # interleave the games as much as possible
+    try:
+        with ThreadPoolExecutor(len(seeds)) as pool:
+            got = list(pool.map(_harness_game, seeds))
+    finally:
+        sys.setswitchinterval(interval)
+    assert got == expected
+    assert isinstance(U.get_input_provider(), U.StdinInputProvider)
+
+
+def test_harness_games_as_asyncio_tasks():
+    async def main():
+        return await asyncio.gather(
+            *(asyncio.to_thread(_harness_game, s) for s in (4, 5)))
+
+    assert asyncio.run(main()) == [_harness_game(4), _harness_game(5)]
@@ -0,0 +1,86 @@
+"""Incremental Control tracking (board.control, board.pieces hooks)."""
+
+from lod_ai import rules_consts as C
+from lod_ai.board.control import refresh_control, space_control
+from lod_ai.board.pieces import move_piece, place_piece, remove_piece
+from lod_ai.state.sandbox import SandboxState
+from lod_ai.state.setup_state import build_state
+from lod_ai.tools.invariants import control_drift
+from lod_ai.util.normalize_state import normalize_state
+
+
+def _state():
+    st = build_state("1775", seed=1)
+    normalize_state(st)
+    return st
+
+
+def _flip_target(st):
+    """An empty-ish Province plus enough Available Militia to take it."""
+    sid = "Georgia"
+    for tag in list(st["spaces"][sid]):
+        if tag != "control":
+            st["spaces"][sid].pop(tag)
+    st["available"][C.MILITIA_U] = 5
+    refresh_control(st)
+    return sid
+
+
+def test_piece_helpers_update_control_immediately():
+    st = _state()
+    sid = _flip_target(st)
+    before = st["control"]
+    assert before[sid] is None
+    place_piece(st, C.MILITIA_U, sid, 2)
+    assert st["control"][sid] == "REBELLION"
+    assert st["control_map"] is st["control"]
+    assert before[sid] is None          # earlier map is left as a snapshot
+    remove_piece(st, C.MILITIA_U, sid, 2)
+    assert st["control"][sid] is None
+    assert control_drift(st) == []
+
+
+def test_sandbox_refresh_only_retallies_changed_spaces(monkeypatch):
+    import lod_ai.board.control as ctl
+
+    st = _state()
+    sb = SandboxState(st)
+    for sp in sb["spaces"].values():     # read every space
+        sp.get(C.TORY, 0)
+    sid = "Georgia"
+    sb["spaces"][sid][C.MILITIA_U] = 9   # direct edit, no helper
+    seen = []
+    real = ctl.space_control
+    monkeypatch.setattr(ctl, "space_control",
+                        lambda sp: seen.append(1) or real(sp))
+    refresh_control(sb)
+    assert len(seen) == 1
+    assert sb["control"][sid] == space_control(sb["spaces"][sid])
+    assert st["control"] is not sb["control"]
+
+
+def test_engine_commit_keeps_control_current():
+    import contextlib
+    import io
+    from lod_ai.engine import Engine
+
+    eng = Engine(initial_state=build_state("1778", seed=2))
+    eng.set_human_factions(set())
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(10):
+            card = eng.draw_card()
+            if card is None:
+                break
+            eng.play_card(card)
+            assert control_drift(eng.state) == []
+
+
+def test_direct_edit_on_plain_state_needs_full_sweep():
+    st = _state()
+    sid = _flip_target(st)
+    st["spaces"][sid][C.MILITIA_U] = 3
+    assert control_drift(st) == [sid]
+    refresh_control(st)
+    assert control_drift(st) == []
+    move_piece(st, C.MILITIA_U, sid, "available", 3)
+    assert st["control"][sid] is None
@@ -0,0 +1,106 @@
+"""What-if Control / margin queries (board.control.what_if)."""
+
+from copy import deepcopy
+
+from lod_ai import rules_consts as C
+from lod_ai import victory
+from lod_ai.board.control import (
+    control_after, refresh_control, removal, what_if,
+)
+from lod_ai.board import totals
+from lod_ai.state import snapshot
+from lod_ai.state.setup_state import build_state
+from lod_ai.util.normalize_state import normalize_state
+
+_MARGINS = {
+    C.BRITISH: victory._british_margin,
+    C.PATRIOTS: victory._patriot_margin,
+    C.FRENCH: victory._french_margin,
+    C.INDIANS: victory._indian_margin,
+}
+
+
+def _state():
+    st = build_state("1775", seed=3)
+    normalize_state(st)
+    return st
+
+
+def _margins(st):
+    tallies = victory._summarize_board(st)
+    return {fac: fn(tallies) for fac, fn in _MARGINS.items()}
+
+
+def _applied(st, sid, delta, shift):
+    """Ground truth: really apply the change to a copy."""
+    st2 = deepcopy(st)
+    sp = st2["spaces"][sid]
+    for tag, n in delta.items():
+        sp[tag] = max(0, sp.get(tag, 0) + n)
+    level = st2["support"].get(sid, 0)
+    st2["support"][sid] = max(C.ACTIVE_OPPOSITION,
+                              min(C.ACTIVE_SUPPORT, level + shift))
+    refresh_control(st2)
+    totals.track(st2)
+    return st2
+
+
+def _candidates(st):
+    for sid, sp in sorted(st["spaces"].items()):
+        yield sid, {}, 1
+        yield sid, {C.MILITIA_U: 2}, -1
+        yield sid, {C.VILLAGE: 1, C.WARPARTY_U: 1}, 0
+        pieces = {t: sp.get(t, 0) for t in (C.REGULAR_BRI, C.TORY,
+                                           C.REGULAR_PAT, C.FORT_PAT)
+                  if sp.get(t, 0)}
+        yield sid, removal(pieces), 2
+
+
+def test_matches_applying_the_change():
+    st = _state()
+    before = _margins(st)
+    for sid, delta, shift in _candidates(st):
+        got = what_if(st, sid, delta, shift=shift)
+        st2 = _applied(st, sid, delta, shift)
+        assert got.control_after == st2["control"][sid], (sid, delta)
+        assert got.control_before == st["control"][sid]
+        after = _margins(st2)
+        for fac in _MARGINS:
+            want = tuple(a - b for a, b in zip(after[fac], before[fac]))
+            if fac in (C.BRITISH, C.FRENCH):
+                want = (want[0], 0)     # casualties are not modelled
+            assert got.margins[fac] == want, (sid, delta, shift, fac)
+
+
+def test_queries_leave_state_untouched():
+    st = _state()
+    frozen = snapshot.encode(st)
+    control = st["control"]
+    for sid, delta, shift in _candidates(st):
+        what_if(st, sid, delta, shift=shift)
+        control_after(st, sid, delta)
+    assert snapshot.encode(st) == frozen
+    assert st["control"] is control
+
+
+def test_removal_never_goes_below_zero():
+    st = _state()
+    sid = "Georgia"
+    st["spaces"][sid] = {C.MILITIA_U: 1, C.TORY: 1, C.REGULAR_BRI: 1}
+    refresh_control(st)
+    assert st["control"][sid] == "BRITISH"
+    assert control_after(st, sid, {C.MILITIA_U: 3}) == "REBELLION"
+    assert control_after(st, sid, removal({C.TORY: 5})) is None
+    result = what_if(st, sid, removal({C.FORT_PAT: 1}))
+    assert result.margins[C.PATRIOTS][1] == 0
+    assert not result.control_changed
+
+
+def test_blockaded_city_support_shift_is_free():
+    st = _state()
+    city = "Boston"
+    st["support"][city] = 0
+    assert what_if(st, city, shift=1).support > 0
+    st.setdefault("markers", {}).setdefault(C.BLOCKADE, {})["on_map"] = {city}
+    result = what_if(st, city, shift=1)
+    assert (result.support, result.opposition) == (0, 0)
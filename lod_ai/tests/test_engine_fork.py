@@ -0,0 +1,56 @@
+"""Engine.fork(): independent mid-game copies for lookahead."""
+
+import contextlib
+import io
+
+from lod_ai.engine import Engine
+from lod_ai.state.setup_state import build_state
+
+
+def _play(eng, n):
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(n):
+            card = eng.draw_card()
+            if card is None:
+                break
+            eng.play_card(card)
+    return eng
+
+
+def _position(eng):
+    st = eng.state
+    return (repr(sorted(st["spaces"].items())), repr(sorted(st["support"].items())),
+            repr(st["resources"]), list(st["rng_log"]),
+            [h["msg"] for h in st["history"]], [c["id"] for c in st["deck"]])
+
+
+def _engine():
+    eng = Engine(initial_state=build_state("1775", seed=7))
+    eng.set_human_factions(set())
+    return _play(eng, 6)
+
+
+def test_fork_is_independent_of_parent():
+    eng = _engine()
+    before = _position(eng)
+    rng_state = eng.state["rng"].getstate()
+    twin = eng.fork(seed=1)
+    assert eng.state["rng"].getstate() == rng_state     # parent not advanced
+    assert twin.dispatcher is not eng.dispatcher
+    assert all(twin.bots[f] is not eng.bots[f] for f in eng.bots)
+    _play(twin, 5)
+    assert _position(eng) == before
+    assert len(twin.state["history"]) > len(eng.state["history"])
+
+
+def test_unseeded_fork_replays_the_parent_game():
+    eng = _engine()
+    twin = eng.fork()
+    assert _position(_play(twin, 5)) == _position(_play(eng, 5))
+
+
+def test_seeded_forks_are_reproducible():
+    eng = _engine()
+    a, b = eng.fork(seed=3), eng.fork(seed=3)
+    assert _position(_play(a, 5)) == _position(_play(b, 5))
+    assert a.state["rng"].getstate() != eng.fork(seed=4).state["rng"].getstate()
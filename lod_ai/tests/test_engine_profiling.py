@@ -0,0 +1,38 @@
+"""Per-phase Engine profiling (lod_ai.tools.profiling)."""
+
+from lod_ai.engine import Engine
+from lod_ai.state.setup_state import build_state
+from lod_ai.tools.batch_smoke import run_one_game
+from lod_ai.tools.profiling import PhaseProfiler, report
+
+
+def test_disabled_engine_is_not_instrumented():
+    eng = Engine(initial_state=build_state("1775", seed=1))
+    for attr in ("play_card", "_simulate_action", "_commit_state"):
+        assert attr not in vars(eng)
+    prof = eng.enable_profiling()
+    assert "_simulate_action" in vars(eng)
+    assert isinstance(prof, PhaseProfiler)
+
+
+def test_game_profile_covers_phases_and_merges():
+    result = run_one_game("1778", 2, profile=True)
+    prof = PhaseProfiler.from_json(result["profile"])
+    phases = prof.totals("phase")
+    for phase in ("card", "turn", "bot", "simulate", "legality", "commit",
+                  "free_ops", "year_end"):
+        assert phases[phase][0] > 0, phase
+    assert phases["card"][0] == result["cards_played"]
+    # Self times partition the play_card wall time.
+    own = sum(row[2] for row in phases.values())
+    assert abs(own - phases["card"][1]) < 1e-6
+    assert {f for (_p, f) in prof.totals("faction") if f} == \
+        {"BRITISH", "PATRIOTS", "FRENCH", "INDIANS"}
+
+    merged = PhaseProfiler()
+    merged.merge(prof)
+    merged.merge(PhaseProfiler.from_json(prof.to_json()))
+    assert merged.games == 2
+    assert merged.totals("phase")["card"][0] == 2 * phases["card"][0]
+    assert "commit" in report(merged)
+    assert "profile" not in run_one_game("1778", 2)
@@ -0,0 +1,238 @@
+"""Reset/step environment (lod_ai.env) and its vectorized wrappers."""
+
+import pytest
+
+from lod_ai import legal_actions as LA
+from lod_ai import rules_consts as C
+from lod_ai.engine import Engine
+from lod_ai.env import (
+    HEADS, SPACE_IDS, TARGETS, EnvSpec, LodEnv, SubprocVectorEnv, VectorEnv,
+)
+from lod_ai.env.actions import HEAD_INDEX, head_of
+from lod_ai.state.setup_state import build_state
+
+ALL = (C.BRITISH, C.PATRIOTS, C.INDIANS, C.FRENCH)
+
+
+def _position(state):
+    return (repr(sorted(state["spaces"].items())),
+            repr(sorted(state["support"].items())), repr(state["resources"]),
+            list(state["rng_log"]), [h["msg"] for h in state["history"]],
+            [c["id"] for c in state["deck"]])
+
+
+def _first_legal(obs):
+    return obs["action_mask"].index(True)
+
+
+def _trace(env, steps, pick=_first_legal):
+    obs, _ = env.reset()
+    out = []
+    for _ in range(steps):
+        obs, reward, term, trunc, info = env.step(pick(obs))
+        out.append((obs["card"], obs["faction"], reward, info["illegal"]))
+        if term or trunc:
+            break
+    return out, _position(env.engine.state)
+
+
+def test_reset_stops_at_an_agent_decision():
+    env = LodEnv("1778", seats=[C.PATRIOTS], seed=3)
+    obs, info = env.reset()
+    assert obs["faction"] == C.PATRIOTS and not env.done
+    assert len(obs["action_mask"]) == len(HEADS)
+    assert len(obs["pieces"]) == len(obs["support"]) == len(SPACE_IDS)
+    assert len(obs["target_mask"][0]) == len(TARGETS)
+    legal = {head_of(a) for a in info["legal"]}
+    assert {HEADS[i] for i, on in enumerate(obs["action_mask"]) if on} == legal
+    for a in info["legal"]:
+        row = obs["space_mask"][HEAD_INDEX[head_of(a)]]
+        assert {sid for sid, on in zip(SPACE_IDS, row) if on} == set(a.spaces)
+
+
+def test_full_game_with_every_seat_an_agent():
+    env = LodEnv("1778", seats=ALL, seed=5)
+    obs, _ = env.reset()
+    steps = 0
+    while True:
+        obs, reward, term, trunc, info = env.step(_first_legal(obs))
+        steps += 1
+        if term or trunc:
+            break
+    assert env.done and info["winner"] is not None
+    assert reward in (-1.0, 0.0, 1.0) and steps == info["decisions"]
+
+
+def test_illegal_action_is_a_pass():
+    env = LodEnv("1778", seats=[C.PATRIOTS], seed=3)
+    obs, _ = env.reset()
+    unavailable = obs["action_mask"].index(False)
+    resources = env.engine.state["resources"][C.PATRIOTS]
+    _, _, _, _, info = env.step(unavailable)
+    assert info["illegal"] and info["turn"]["action"] == "pass"
+    assert env.engine.state["resources"][C.PATRIOTS] >= resources
+
+    obs, _ = env.reset()
+    _, _, _, _, info = env.step((_first_legal(obs), ["NO_SUCH_SPACE"]))
+    assert info["illegal"]
+
+
+def test_action_formats_agree():
+    env = LodEnv("1778", seats=[C.PATRIOTS], seed=1)
+    obs, info = env.reset()
+    act = next(a for a in info["legal"] if a.kind == LA.COMMAND and a.special)
+    head = HEAD_INDEX[head_of(act)]
+    sid, target = act.spaces[0], act.targets[0]
+    mask = [int(s == sid) for s in SPACE_IDS]
+    results = []
+    for action in ((head, [sid], target),
+                   (head, [SPACE_IDS.index(sid)], TARGETS.index(target)),
+                   (head, mask, target),
+                   (head, None, None),
+                   act._replace(spaces=(sid,), targets=(target,))):
+        env.reset()
+        _, _, _, _, info = env.step(action)
+        results.append((info["illegal"], _position(env.engine.state)))
+    assert all(r == results[0] for r in results) and not results[0][0]
+
+
+class _Int64:
+    """An integer that is not an int, like numpy.int64."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __index__(self):
+        return self.value
+
+
+def test_integer_like_actions_are_accepted():
+    env = LodEnv("1778", seats=[C.PATRIOTS], seed=1)
+    obs, info = env.reset()
+    act = next(a for a in info["legal"] if a.kind == LA.COMMAND and a.special)
+    head = HEAD_INDEX[head_of(act)]
+    sid, target = act.spaces[0], act.targets[0]
+    results = []
+    for action in (head, _Int64(head),
+                   (head, [sid], target),
+                   (_Int64(head), [_Int64(SPACE_IDS.index(sid))],
+                    _Int64(TARGETS.index(target)))):
+        env.reset()
+        _, _, _, _, info = env.step(action)
+        results.append((info["illegal"], _position(env.engine.state)))
+    assert not results[0][0] and results[0] == results[1]
+    assert not results[2][0] and results[2] == results[3]
+
+
+def test_single_space_commands_run_their_default_plans():
+    env = LodEnv("1778", seats=ALL, seed=2)
+    obs, info = env.reset()
+    checked = 0
+    for _ in range(60):
+        plain = [a for a in info["legal"]
+                 if a.kind == LA.COMMAND and a.special is None]
+        if not plain:
+            obs, *_, info = env.step(_first_legal(obs))
+        else:
+            act = plain[checked % len(plain)]
+            obs, _, term, trunc, info = env.step(
+                (HEAD_INDEX[head_of(act)], act.spaces[:1]))
+            turn = info["turn"]
+            assert not info["illegal"], (act, turn)
+            assert turn["action"] == "command", (act, turn)
+            checked += 1
+            if term or trunc:
+                break
+    assert checked > 20
+
+
+def test_same_seed_same_game():
+    a = _trace(LodEnv("1776", seats=[C.BRITISH, C.INDIANS], seed=4), 40)
+    b = _trace(LodEnv("1776", seats=[C.BRITISH, C.INDIANS], seed=4), 40)
+    assert a == b
+
+
+def test_max_cards_truncates():
+    env = LodEnv("1778", seats=ALL, seed=1, max_cards=3)
+    obs, _ = env.reset()
+    while True:
+        obs, reward, term, trunc, info = env.step(0)
+        if term or trunc:
+            break
+    assert trunc and not term and reward == 0.0
+    assert info["cards_played"] == 3
+    with pytest.raises(RuntimeError):
+        env.step(0)
+
+
+def test_play_card_unchanged_without_agent_seats():
+    def run(step_by_step):
+        eng = Engine(initial_state=build_state("1775", seed=6), use_cli=False)
+        eng.set_human_factions([])
+        for _ in range(5):
+            card = eng.draw_card()
+            if step_by_step:
+                steps = eng.iter_card(card)
+                with pytest.raises(StopIteration):
+                    next(steps)
+            else:
+                eng.play_card(card)
+        return _position(eng.state)
+
+    assert run(True) == run(False)
+
+
+def test_bot_takes_an_agent_turn_sent_none():
+    def run(agent):
+        eng = Engine(initial_state=build_state("1778", seed=2), use_cli=False)
+        eng.set_human_factions([])
+        if agent:
+            eng.set_agent_factions([C.FRENCH])
+        yielded = []
+        for _ in range(4):
+            steps = eng.iter_card(eng.draw_card())
+            try:
+                yielded.append(next(steps))
+                while True:
+                    yielded.append(steps.send(None))
+            except StopIteration:
+                pass
+        return yielded, _position(eng.state)
+
+    yielded, agent_run = run(True)
+    assert yielded and all(f == C.FRENCH for f, _ in yielded)
+    assert run(False) == ([], agent_run)
+
+
+def test_vector_env_resets_finished_games():
+    specs = [EnvSpec("1778", seats=ALL, seed=s, max_cards=2) for s in (1, 2)]
+    with VectorEnv(specs) as venv:
+        obs, _ = venv.reset()
+        finished = []
+        for _ in range(40):
+            obs, rewards, term, trunc, infos = venv.step([0, 0])
+            for i, info in enumerate(infos):
+                if term[i] or trunc[i]:
+                    finished.append(i)
+                    assert "final_observation" in info
+                    assert info["final_info"]["cards_played"] == 2
+            assert all(any(o["action_mask"]) for o in obs)
+        assert {0, 1} <= set(finished)
+        assert {env.seed % 2 for env in venv.envs} == {1, 0}
+
+
+def test_subprocess_workers_match_in_process():
+    specs = [EnvSpec("1778", seats=ALL, seed=s, max_cards=4) for s in range(3)]
+
+    def trace(venv):
+        obs, _ = venv.reset()
+        out = []
+        for _ in range(25):
+            obs, *_ = venv.step([_first_legal(o) for o in obs])
+            out.append(tuple((o["card"], o["pieces"]) for o in obs))
+        return out
+
+    with VectorEnv(specs) as venv:
+        expected = trace(venv)
+    with SubprocVectorEnv(specs, workers=2) as venv:
+        assert trace(venv) == expected
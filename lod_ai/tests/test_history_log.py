@@ -0,0 +1,77 @@
+"""Append-only history log (lod_ai.util.history)."""
+
+import json
+from copy import deepcopy
+
+from lod_ai import rules_consts as C
+from lod_ai.state.sandbox import SandboxState
+from lod_ai.util.history import (
+    PASS, WINNER, HistoryFork, HistoryLog, events, last_event, push_history,
+)
+
+
+def _state():
+    st = {"history": HistoryLog()}
+    push_history(st, "start")
+    return st
+
+
+def test_sandbox_holds_an_offset_not_a_copy():
+    live = _state()
+    sb = SandboxState(live)
+    push_history(sb, "trial", kind=PASS, data={"faction": C.BRITISH})
+    fork = dict.__getitem__(sb, "history")
+    assert isinstance(fork, HistoryFork)
+    assert fork.base == 1 and len(fork.tail) == 1
+    assert [h["msg"] for h in sb["history"]] == ["start", "trial"]
+    assert sb["history"][-1]["seq"] == 2
+    assert len(live["history"]) == 1            # discarded: no trace
+
+
+def test_commit_appends_tail_and_notifies_subscribers():
+    live = _state()
+    seen, passes = [], []
+    live["history"].subscribe(seen.append)
+    live["history"].subscribe(passes.append, kinds={PASS})
+    outer = SandboxState(live)
+    inner = SandboxState(outer)
+    push_history(inner, "BRITISH PASS", kind=PASS,
+                 data={"faction": C.BRITISH})
+    inner.commit_into(outer)
+    assert seen == []                           # still provisional
+    push_history(outer, "note")
+    outer.commit_into(live)
+    assert type(live["history"]) is HistoryLog
+    assert [h["msg"] for h in seen] == ["BRITISH PASS", "note"]
+    assert [h["data"]["faction"] for h in passes] == [C.BRITISH]
+
+
+def test_cursor_events_and_jsonl_sink(tmp_path):
+    st = _state()
+    log = st["history"]
+    path = tmp_path / "game.jsonl"
+    log.open_sink(str(path))
+    mark = log.cursor
+    push_history(st, "Winner: PATRIOTS (Rule 7.3)", kind=WINNER,
+                 data={"faction": C.PATRIOTS})
+    push_history(st, "after")
+    log.close_sink()
+    assert [h["msg"] for h in log.since(mark)] == \
+        ["Winner: PATRIOTS (Rule 7.3)", "after"]
+    assert [h["kind"] for h in events(log, since=mark)] == [WINNER]
+    assert last_event(log, WINNER)["data"]["faction"] == C.PATRIOTS
+    assert last_event(log, WINNER, within=1) is None
+    lines = [json.loads(l) for l in path.read_text().splitlines()]
+    assert [l["seq"] for l in lines] == [2, 3]
+
+
+def test_copies_share_entries_but_not_consumers():
+    st = _state()
+    calls = []
+    st["history"].subscribe(calls.append)
+    clone = deepcopy(st)
+    assert type(clone["history"]) is HistoryLog
+    assert clone["history"][0] is st["history"][0]
+    push_history(clone, "copy only")
+    assert calls == [] and len(st["history"]) == 1
+    assert type(deepcopy(SandboxState(st))["history"]) is HistoryLog
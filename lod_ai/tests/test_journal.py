@@ -0,0 +1,85 @@
+"""Reversible action journal (lod_ai.state.journal)."""
+
+import contextlib
+import io
+
+import pytest
+
+from lod_ai import cli_utils
+from lod_ai.board.pieces import add_piece
+from lod_ai.cli_utils import UndoException
+from lod_ai.economy.resources import add as add_resources
+from lod_ai.state.journal import Journal
+from lod_ai.state.setup_state import build_state
+from lod_ai.util.history import push_history
+
+
+def test_undo_redo_across_marks_restores_in_place():
+    st = build_state("1776", seed=3)
+    spaces = st["spaces"]
+    journal = Journal(st)
+    before = (dict(spaces["Boston"]), st["resources"]["PATRIOTS"],
+              len(st["history"]))
+
+    add_piece(st, "Patriot_Militia_U", "Boston", 2)
+    add_resources(st, "PATRIOTS", 3)
+    push_history(st, "card one")
+    assert journal.mark("one")
+    after_one = (dict(spaces["Boston"]), st["resources"]["PATRIOTS"],
+                 len(st["history"]))
+    add_resources(st, "PATRIOTS", 1)
+    assert journal.mark("two")
+    assert not journal.mark("idle")
+    assert journal.labels() == ["one", "two"]
+    step = journal._undo[0]
+    assert set(step.spaces) == {"Boston"} and "history" in step.tails
+
+    assert journal.undo(2) == 2
+    assert st["spaces"] is spaces
+    assert (dict(spaces["Boston"]), st["resources"]["PATRIOTS"],
+            len(st["history"])) == before
+    assert journal.redo() == 1
+    assert (dict(spaces["Boston"]), st["resources"]["PATRIOTS"],
+            len(st["history"])) == after_one
+
+    add_resources(st, "PATRIOTS", 5)
+    assert journal.rollback()
+    assert st["resources"]["PATRIOTS"] == after_one[1]
+    assert journal.mark("branch") is False and journal.can_redo
+    add_resources(st, "PATRIOTS", 2)
+    journal.mark("branch")
+    assert not journal.can_redo
+
+
+def test_limit_drops_oldest_steps():
+    st = build_state("1776", seed=3)
+    journal = Journal(st, limit=2)
+    for n in range(4):
+        add_resources(st, "BRITISH", 1)
+        journal.mark(n)
+    assert journal.labels() == [2, 3]
+
+
+def test_undo_meta_command_steps_back_whole_cards():
+    from lod_ai.engine import Engine
+
+    eng = Engine(initial_state=build_state("1778", seed=4), use_cli=False)
+    eng.set_human_factions([])
+    journal = Journal(eng.state)
+    cli_utils.set_game_state(eng.state, eng)
+    cli_utils.set_undo_journal(journal)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for n in range(3):
+                journal.mark(n)
+                eng.play_card(eng.draw_card(), human_decider=None)
+            played = list(eng.state["played_cards"])
+            with pytest.raises(UndoException):
+                cli_utils._handle_meta_command("undo 2")
+            assert eng.state["played_cards"] == played[:1]
+            with pytest.raises(UndoException):
+                cli_utils._handle_meta_command("redo")
+            assert eng.state["played_cards"] == played[:2]
+    finally:
+        cli_utils.set_undo_journal(None)
+        cli_utils.set_game_state(None)
@@ -39,6 +39,26 @@ def _base_state():
     }
 
 
+# ---- Card 1: Waxhaws ----
+
+def test_card1_unshaded_removes_continentals_and_shifts_support():
+    """Card 1 unshaded: in the British space with Continentals, remove 2,
+    shift 1 toward Active Support and place 2 Propaganda."""
+    state = _base_state()
+    state["spaces"] = {
+        "South_Carolina": {REGULAR_BRI: 2, REGULAR_PAT: 3},
+        "Virginia": {REGULAR_BRI: 1},
+    }
+    state["markers"] = {PROPAGANDA: {"pool": 10, "on_map": {}}}
+
+    late_war.evt_001_waxhaws(state, shaded=False)
+
+    assert state["spaces"]["South_Carolina"][REGULAR_PAT] == 1
+    assert state["casualties"].get(REGULAR_PAT, 0) == 2
+    assert state["support"]["South_Carolina"] == 1
+    assert state["markers"][PROPAGANDA]["on_map"] == {"South_Carolina": 2}
+
+
 # ---- Card 23: Francis Marion ----
 
 def test_card23_unshaded_moves_patriot_units_from_nc():
@@ -0,0 +1,225 @@
+"""Legal-action enumerator (lod_ai.legal_actions), cross-checked by really
+executing the Commands and Special Activities on sandboxed positions."""
+
+import time
+
+import pytest
+
+from lod_ai import legal_actions as LA
+from lod_ai import rules_consts as C
+from lod_ai.commands import (
+    battle, french_agent_mobilization, garrison, gather, hortelez, march,
+    muster, rabble_rousing, raid, rally, scout,
+)
+from lod_ai.engine import Engine
+from lod_ai.special_activities import (
+    common_cause, naval_pressure, partisans, persuasion, plunder, preparer,
+    skirmish, trade, war_path,
+)
+from lod_ai.state import snapshot
+from lod_ai.state.sandbox import SandboxState
+from lod_ai.state.setup_state import build_state
+from lod_ai.tools.checkpoints import play_cards
+
+FACTIONS = (C.BRITISH, C.PATRIOTS, C.INDIANS, C.FRENCH)
+
+
+@pytest.fixture(scope="module")
+def positions():
+    """Scenario setups and bot-played positions every few cards."""
+    out = []
+    for scenario in ("1775", "1776", "1778"):
+        eng = Engine(initial_state=build_state(scenario, seed=1), use_cli=False)
+        eng.set_human_factions([])
+        out.append(snapshot.decode(snapshot.encode(eng.state)))
+        card = 0
+        for _ in range(4):
+            card = play_cards(eng, 3, start=card)
+            out.append(snapshot.decode(snapshot.encode(eng.state)))
+    return out
+
+
+def _trial(state):
+    st = SandboxState(state)
+    st["_turn_affected_spaces"] = set()
+    st["_turn_battle_spaces"] = set()
+    st.pop("_turn_command", None)
+    return st
+
+
+def _lead_piece(state, faction, src):
+    sp = state["spaces"][src]
+    for tag in {
+        C.BRITISH: (C.REGULAR_BRI,),
+        C.PATRIOTS: (C.REGULAR_PAT, C.MILITIA_U, C.MILITIA_A),
+        C.INDIANS: (C.WARPARTY_U, C.WARPARTY_A),
+        C.FRENCH: (C.REGULAR_FRE,),
+    }[faction]:
+        if sp.get(tag, 0):
+            return {tag: 1}
+    raise AssertionError(f"no {faction} piece to March from {src}")
+
+
+def _run_command(state, faction, cmd, sid):
+    """Perform *cmd* in *sid* alone, with the smallest plan that does so."""
+    st = _trial(state)
+    if cmd == battle.COMMAND_NAME:
+        battle.execute(st, faction, {}, [sid])
+    elif cmd == march.COMMAND_NAME:
+        src = LA.march_origins(state, faction, sid)[0]
+        march.execute(st, faction, {}, [src], [sid], limited=True,
+                      move_plan=[{"src": src, "dst": sid,
+                                  "pieces": _lead_piece(state, faction, src)}])
+    elif cmd == muster.COMMAND_NAME and faction == C.BRITISH:
+        if muster._is_legal_regular_dest(state, sid):
+            muster.execute(st, faction, {}, [sid],
+                           regular_plan={"space": sid, "n": 1})
+        else:
+            muster.execute(st, faction, {}, [sid], tory_plan={sid: 1})
+    elif cmd == muster.COMMAND_NAME:
+        muster.execute(st, faction, {}, [sid])
+    elif cmd == garrison.COMMAND_NAME:
+        src = next(s for s, sp in sorted(state["spaces"].items())
+                   if s != sid and sp.get(C.REGULAR_BRI, 0)
+                   and not garrison._is_blockaded(s, state))
+        garrison.execute(st, faction, {}, {src: {sid: 1}}, limited=True)
+    elif cmd == rally.COMMAND_NAME:
+        rally.execute(st, faction, {}, [sid], limited=True)
+    elif cmd == rabble_rousing.COMMAND_NAME:
+        rabble_rousing.execute(st, faction, {}, [sid], limited=True)
+    elif cmd == gather.COMMAND_NAME:
+        gather.execute(st, faction, {}, [sid], limited=True)
+    elif cmd == scout.COMMAND_NAME:
+        src = LA.scout_origins(state, sid)[0]
+        scout.execute(st, faction, {}, src, sid, n_warparties=1, n_regulars=1)
+    elif cmd == raid.COMMAND_NAME:
+        plan = None
+        if not state["spaces"][sid].get(C.WARPARTY_U, 0):
+            plan = [(LA.raid_sources(state, sid)[0], sid)]
+        raid.execute(st, faction, {}, [sid], move_plan=plan)
+    elif cmd == french_agent_mobilization.COMMAND_NAME:
+        french_agent_mobilization.execute(st, faction, {}, sid)
+    else:
+        raise AssertionError(cmd)
+    return st
+
+
+def test_every_enumerated_space_executes(positions):
+    checked = 0
+    for state in positions:
+        for faction in FACTIONS:
+            for cmd in LA.commands_for(state, faction):
+                if cmd == hortelez.COMMAND_NAME:
+                    continue
+                for sid in LA.command_spaces(state, faction, cmd):
+                    st = _run_command(state, faction, cmd, sid)
+                    assert st["_turn_affected_spaces"] == {sid}, (faction, cmd, sid)
+                    checked += 1
+    assert checked > 500
+
+
+def _raises(fn):
+    try:
+        fn()
+    except ValueError:
+        return True
+    return False
+
+
+@pytest.mark.parametrize("faction,cmd,run", [
+    (C.PATRIOTS, rally.COMMAND_NAME,
+     lambda st, sid: rally.execute(st, C.PATRIOTS, {}, [sid])),
+    (C.PATRIOTS, rabble_rousing.COMMAND_NAME,
+     lambda st, sid: rabble_rousing.execute(st, C.PATRIOTS, {}, [sid])),
+    (C.FRENCH, french_agent_mobilization.COMMAND_NAME,
+     lambda st, sid: french_agent_mobilization.execute(st, C.FRENCH, {}, sid)),
+])
+def test_spaces_left_out_are_refused(positions, faction, cmd, run):
+    for state in positions:
+        if cmd not in LA.commands_for(state, faction):
+            continue
+        legal = set(LA.command_spaces(state, faction, cmd))
+        for sid in state["spaces"]:
+            if sid not in legal:
+                assert _raises(lambda: run(_trial(state), sid)), (cmd, sid)
+
+
+_SPACE_SA = {
+    skirmish.SA_NAME: lambda st, f, sid, opt: skirmish.execute(st, f, {}, sid, option=opt),
+    partisans.SA_NAME: lambda st, f, sid, opt: partisans.execute(st, f, {}, sid, option=opt),
+    war_path.SA_NAME: lambda st, f, sid, opt: war_path.execute(st, f, {}, sid, option=opt),
+    persuasion.SA_NAME: lambda st, f, sid, opt: persuasion.execute(st, f, {}, spaces=[sid]),
+    common_cause.SA_NAME: lambda st, f, sid, opt: common_cause.execute(st, f, {}, [sid]),
+    trade.SA_NAME: lambda st, f, sid, opt: trade.execute(st, f, {}, sid),
+    plunder.SA_NAME: lambda st, f, sid, opt: plunder.execute(
+        st, f, {"raid_active": True}, sid),
+}
+
+
+def test_special_targets_match_execution(positions):
+    for state in positions:
+        for faction in FACTIONS:
+            for sa in LA.specials_for(faction):
+                got = LA.special_targets(state, faction, sa)
+                if sa in _SPACE_SA:
+                    run = _SPACE_SA[sa]
+                    want = tuple(
+                        sid for sid in sorted(state["spaces"])
+                        if any(not _raises(lambda: run(_trial(state), faction,
+                                                       sid, opt))
+                               for opt in (1, 2, 3)))
+                    assert (got or ()) == want, (faction, sa)
+                elif sa == preparer.SA_NAME:
+                    want = tuple(c for c in ("BLOCKADE", "REGULARS", "RESOURCES")
+                                 if not _raises(lambda: preparer.execute(
+                                     _trial(state), faction, {}, choice=c)))
+                    assert got == want
+                else:
+                    for city in got or ():
+                        naval_pressure.execute(_trial(state), faction, {},
+                                               city_choice=city)
+
+
+def test_slot_options_shape_the_menu(positions):
+    state = positions[-1]
+    full = LA.legal_actions(state, C.PATRIOTS)
+    kinds = {a.kind for a in full}
+    assert kinds == {LA.PASS, LA.EVENT, LA.COMMAND}
+    assert any(a.special for a in full)
+
+    second = {"actions": {"pass", "command"}, "limited_only": True,
+              "special_allowed": False, "event_allowed": False}
+    lim = LA.legal_actions(state, C.PATRIOTS, second)
+    assert {a.kind for a in lim} == {LA.PASS, LA.COMMAND}
+    assert all(a.limited and a.special is None for a in lim if a.kind == LA.COMMAND)
+    assert [a.name for a in lim if a.kind == LA.COMMAND] == \
+        [a.name for a in full if a.kind == LA.COMMAND and a.special is None]
+
+    for a in full:
+        if a.special == plunder.SA_NAME:
+            assert a.name == raid.COMMAND_NAME
+        if a.special == common_cause.SA_NAME:
+            assert a.name in (march.COMMAND_NAME, battle.COMMAND_NAME)
+
+
+def test_broke_faction_can_only_pass_or_take_free_actions(positions):
+    state = snapshot.decode(snapshot.encode(positions[0]))
+    state["resources"][C.PATRIOTS] = 0
+    acts = LA.legal_actions(state, C.PATRIOTS)
+    assert not any(a.kind == LA.COMMAND for a in acts)
+    state["bs_free"] = True
+    assert any(a.kind == LA.COMMAND for a in LA.legal_actions(state, C.PATRIOTS))
+
+
+def test_enumeration_is_fast_and_pure(positions):
+    frozen = [snapshot.encode(st) for st in positions]
+    start = time.perf_counter()
+    calls = 0
+    for _ in range(5):
+        for state in positions:
+            for faction in FACTIONS:
+                LA.legal_actions(state, faction)
+                calls += 1
+    per_call = (time.perf_counter() - start) / calls
+    assert per_call < 0.005, f"{per_call * 1e3:.2f} ms per enumeration"
+    assert [snapshot.encode(st) for st in positions] == frozen
@@ -0,0 +1,133 @@
+"""Async batched LLM policy: response cache, concurrency limit, transports
+and concurrent harness games (against the local stand-in server)."""
+import asyncio
+import time
+
+from lod_ai.llm.batch import (
+    AsyncPolicy, GameSpec, ResponseCache, SyncPolicy, run_games,
+)
+from lod_ai.llm.harness import run_game
+from lod_ai.llm.transport import (
+    HTTPTransport, StandInServer, Transport, TransportError, standin_answer,
+)
+
+_SELECT = {"kind": "select", "prompt": "Pick", "options": ["a", "b", "c"],
+           "allow_back": False}
+
+
+class _FakeTransport(Transport):
+    """Answers "2" after *delay* seconds; fails when told to."""
+
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.bodies = []
+
+    async def send(self, body):
+        self.bodies.append(body)
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise TransportError("down")
+        return {"content": [{"type": "text", "text": "I pick 2"}]}
+
+
+def test_cache_key_covers_model_and_faction(tmp_path):
+    k = ResponseCache.key("board", "Select:", _SELECT, "PATRIOTS", "m1")
+    assert k == ResponseCache.key("board", "Select:", dict(_SELECT),
+                                  "PATRIOTS", "m1")
+    assert k != ResponseCache.key("board", "Select:", _SELECT, "PATRIOTS", "m2")
+    assert k != ResponseCache.key("board", "Select:", _SELECT, "FRENCH", "m1")
+    assert k != ResponseCache.key("board2", "Select:", _SELECT, "PATRIOTS", "m1")
+
+    ResponseCache(tmp_path).put(k, "3")
+    fresh = ResponseCache(tmp_path)
+    assert fresh.get(k) == "3" and fresh.hits == 1
+    assert fresh.get("0" * 64) is None and fresh.misses == 1
+
+
+def test_requests_overlap_up_to_the_limit():
+    transport = _FakeTransport(delay=0.1)
+    policy = AsyncPolicy(transport, concurrency=5)
+
+    async def many():
+        return await asyncio.gather(*(
+            policy.achoose(f"board {i}", "Select:", _SELECT, "PATRIOTS")
+            for i in range(20)))
+
+    start = time.perf_counter()
+    answers = asyncio.run(many())
+    elapsed = time.perf_counter() - start
+    assert answers == ["2"] * 20
+    assert policy.requests == 20 and policy.max_in_flight == 5
+    assert elapsed < 20 * 0.1 / 2          # serial would take 2 s
+
+
+def test_identical_prompts_share_one_request_then_hit_cache():
+    transport = _FakeTransport(delay=0.05)
+    policy = AsyncPolicy(transport)
+
+    async def twice():
+        first = await asyncio.gather(*(
+            policy.achoose("board", "Select:", _SELECT, "PATRIOTS")
+            for _ in range(4)))
+        again = await policy.achoose("board", "Select:", _SELECT, "PATRIOTS")
+        return first, again
+
+    first, again = asyncio.run(twice())
+    assert first == ["2"] * 4 and again == "2"
+    assert len(transport.bodies) == 1
+    assert policy.shared == 3 and policy.cache.hits == 1
+    body = transport.bodies[0]
+    assert body["model"] == policy.model
+    assert "  2. b" in body["messages"][0]["content"]
+
+
+def test_failed_request_falls_back_and_is_not_cached():
+    policy = AsyncPolicy(_FakeTransport(fail=True))
+    ans = asyncio.run(policy.achoose("board", "Select:", _SELECT, "FRENCH"))
+    assert ans == "1" and policy.errors == 1
+    asyncio.run(policy.achoose("board", "Select:", _SELECT, "FRENCH"))
+    assert policy.requests == 2
+
+
+def test_standin_server_over_http():
+    prompt = "DECISION: Pick\n  1. a\n  2. b\n  3. c\nReply with the option number."
+    assert standin_answer(prompt) == standin_answer(prompt)
+    assert standin_answer(prompt) in {"1", "2", "3"}
+    count = "Reply with an integer from 2 to 4."
+    assert 2 <= int(standin_answer(count)) <= 4
+
+    with StandInServer() as server:
+        policy = SyncPolicy(AsyncPolicy(HTTPTransport(server.url,
+                                                      api_key="test")))
+        try:
+            assert policy.choose("board", "Select:", _SELECT,
+                                 "PATRIOTS") in {"1", "2", "3"}
+            result = run_game("1778", seed=2, llm_factions=["PATRIOTS"],
+                              policy=policy, max_cards=3)
+        finally:
+            policy.close()
+        assert server.requests >= 1
+    assert result["cards_played"] == 3
+
+
+def test_unreachable_server_falls_back():
+    with StandInServer() as server:
+        url = server.url
+    policy = AsyncPolicy(HTTPTransport(url, timeout=2))
+    ans = asyncio.run(policy.achoose("board", "Select:", _SELECT, "PATRIOTS"))
+    assert ans == "1" and policy.errors == 1
+
+
+def test_run_games_in_workers_matches_order_and_finishes():
+    specs = [GameSpec("1778", seed=s, max_cards=3) for s in (1, 2, 3)]
+    with StandInServer(latency=0.01) as server:
+        policy = AsyncPolicy(HTTPTransport(server.url, api_key="test"),
+                             concurrency=3)
+        results = run_games(specs, policy)
+    assert [(r["scenario"], r["seed"]) for r in results] == \
+        [("1778", 1), ("1778", 2), ("1778", 3)]
+    for r in results:
+        assert "error" not in r, r.get("error")
+        assert r["cards_played"] == 3 and "state" not in r
+    assert policy.requests == server.requests
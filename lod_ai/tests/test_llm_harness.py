@@ -9,6 +9,7 @@ import lod_ai.cli_utils as U
 import lod_ai.commands.battle as battle_cmd
 from lod_ai import rules_consts as C
 from lod_ai.state.setup_state import build_state
+from lod_ai.util.history import VICTORY, WINNER, push_history
 from lod_ai.llm import run_game, serialize_state
 from lod_ai.llm.policy import (
     Policy, RandomPolicy, ScriptedPolicy, FirstChoicePolicy, _valid_choices,
@@ -58,6 +59,42 @@ def test_serialize_state_contains_key_sections():
     assert "Boston" in text  # a real space appears in the board dump
 
 
+def test_observation_is_typed_and_renders_lazily():
+    from lod_ai.llm import build_observation
+
+    st = build_state("1775", seed=1)
+    obs = build_observation(st, C.PATRIOTS)
+    assert "text" not in obs.__dict__          # nothing rendered yet
+    assert obs.faction == C.PATRIOTS
+    assert set(obs.spaces) == set(st["spaces"])
+    boston = obs.spaces["Boston"]
+    assert boston.support == st["support"].get("Boston", 0)
+    assert boston.crown == st["spaces"]["Boston"].get(C.REGULAR_BRI, 0) + \
+        st["spaces"]["Boston"].get(C.TORY, 0) + \
+        st["spaces"]["Boston"].get(C.FORT_BRI, 0)
+    assert obs.margins is not None and set(obs.margins) == {
+        C.BRITISH, C.PATRIOTS, C.FRENCH, C.INDIANS}
+    assert str(obs) == serialize_state(st, C.PATRIOTS)
+    assert "text" in obs.__dict__
+
+
+def test_heuristic_reads_observation_like_parsed_text():
+    """The typed board and the regex-parsed text agree on every space the
+    text lists, so HeuristicPolicy scores the same from either."""
+    from lod_ai.llm import build_observation
+    from lod_ai.llm.heuristic import _board
+
+    st = build_state("1776", seed=2)
+    obs = build_observation(st, C.BRITISH)
+    parsed = _board(str(obs))
+    assert set(parsed) == set(obs.occupied)
+    for sid, sp in parsed.items():
+        typed = obs.spaces[sid]
+        assert (sp.support, sp.control, dict(sp.pieces), sp.rebel, sp.crown) \
+            == (typed.support, typed.control, dict(typed.pieces),
+                typed.rebel, typed.crown)
+
+
 # --------------------------------------------------------------------------- #
 # Provider
 # --------------------------------------------------------------------------- #
@@ -94,7 +131,7 @@ def test_full_short_game_with_random_policy_completes():
     assert r["winner"] is not None
     # Globals restored so we don't leak into other tests.
     assert isinstance(U.get_input_provider(), U.StdinInputProvider)
-    assert battle_cmd._DEFENDER_ACTIVATION_HOOK is None
+    assert battle_cmd.get_defender_activation_hook() is None
 
 
 def test_capped_game_makes_decisions_and_seats_llm():
@@ -125,8 +162,8 @@ def test_detect_winner_resolves_wq_victory_to_faction():
     from lod_ai.llm.harness import _detect_winner
 
     st = build_state("1778", seed=1)
-    st.setdefault("history", []).append(
-        {"msg": "Victory achieved at Winter-Quarters (6.1)"})
+    push_history(st, "Victory achieved at Winter-Quarters (6.1)",
+                 kind=VICTORY)
     w = _detect_winner(st)
     assert w in (C.BRITISH, C.PATRIOTS, C.FRENCH, C.INDIANS, "UNKNOWN")
     assert "Victory achieved" not in (w or "")
@@ -135,7 +172,9 @@ def test_detect_winner_resolves_wq_victory_to_faction():
 def test_detect_winner_parses_explicit_winner_message():
     from lod_ai.llm.harness import _detect_winner
 
-    st = {"history": [{"msg": "Winner: PATRIOTS (Rule 7.3)"}]}
+    st = {"history": []}
+    push_history(st, "Winner: PATRIOTS (Rule 7.3)", kind=WINNER,
+                 data={"faction": C.PATRIOTS})
     assert _detect_winner(st) == "PATRIOTS"
 
 
@@ -176,6 +215,93 @@ def test_heuristic_parse_board_roundtrip():
     assert {"support", "control", "pieces", "rebel", "crown"} <= set(sample)
 
 
+# --------------------------------------------------------------------------- #
+# Rollout search policy
+# --------------------------------------------------------------------------- #
+def _rollout_game(workers=1, max_cards=4):
+    from lod_ai.llm.search import RolloutPolicy
+
+    class _Recording(RolloutPolicy):
+        def rank(self, options):
+            ranking = super().rank(options)
+            self.seen.append((options, ranking, dict(self.last_scores)))
+            return ranking
+
+    pol = _Recording(rollouts=2, horizon=1, workers=workers)
+    pol.seen = []
+    try:
+        r = run_game("1778", seed=1, llm_factions=["BRITISH"], policy=pol,
+                     max_cards=max_cards)
+    finally:
+        pol.close()
+    return r, pol
+
+
+def test_rollout_policy_scores_every_action_option():
+    r, pol = _rollout_game()
+    assert pol.engine is not None                   # bound by the provider
+    assert pol.seen and r["cards_played"] == 4
+    for options, ranking, scores in pol.seen:
+        assert sorted(ranking) == sorted(options)
+        assert set(scores) == set(options)
+    assert _rollout_game()[1].seen == pol.seen      # deterministic
+
+
+def test_rollout_pool_matches_serial():
+    _, serial = _rollout_game(max_cards=2)
+    _, pooled = _rollout_game(workers=2, max_cards=2)
+    assert serial.seen and pooled.seen == serial.seen
+
+
+def test_worker_engine_is_built_like_a_fork():
+    import contextlib
+    import io
+    from lod_ai.engine import Engine
+    from lod_ai.llm import search
+
+    eng = Engine(initial_state=build_state("1776", seed=2))
+    eng.set_human_factions(set())
+    card = eng.draw_card()
+    with contextlib.redirect_stdout(io.StringIO()):
+        eng._prepare_card(card)
+    eng.dispatcher._last_action[C.BRITISH] = "command"
+    allowed = {"actions": {"pass", "event", "command"}, "limited_only": False,
+               "special_allowed": True, "event_allowed": True}
+    job = ("k", search._position(eng), C.BRITISH, card, allowed,
+           "command_special", 3, 1)
+    assert search._worker_rollout(job) == search.rollout(
+        eng, C.BRITISH, card, allowed, "command_special", 3, 1)
+    worker = search._worker_engine[1]
+    assert worker.dispatcher._last_action == eng.dispatcher._last_action
+
+
+def test_rollout_leaves_the_engine_untouched():
+    import contextlib
+    import io
+    from lod_ai import victory
+    from lod_ai.engine import Engine
+    from lod_ai.llm.search import rollout, score
+
+    eng = Engine(initial_state=build_state("1776", seed=2))
+    eng.set_human_factions(set())
+    card = eng.draw_card()
+    with contextlib.redirect_stdout(io.StringIO()):
+        eng._prepare_card(card)
+
+    def position():
+        return repr(sorted(eng.state["spaces"].items())), len(eng.state["history"])
+
+    before = position()
+    allowed = {"actions": {"pass", "event", "command"}, "limited_only": False,
+               "special_allowed": True, "event_allowed": True}
+    for kind in ("pass", "event", "command_special"):
+        assert isinstance(rollout(eng, C.BRITISH, card, allowed, kind,
+                                  seed=1, horizon=1), int)
+    assert position() == before
+    t = victory._summarize_board(eng.state)
+    assert score(eng.state, C.BRITISH) == sum(victory._british_margin(t))
+
+
 # --------------------------------------------------------------------------- #
 # Fixes from the four-human-seat external playtest report
 # --------------------------------------------------------------------------- #
@@ -1,5 +1,6 @@
 import pytest
 
+from lod_ai.map import adjacency as map_adj
 from lod_ai.map.adjacency import is_adjacent, space_type
 from lod_ai.map.control import refresh_control
 
@@ -9,6 +10,30 @@ def test_is_adjacent_lookup():
     assert not is_adjacent("Boston", "New_York")
 
 
+def test_adjacency_index_is_symmetric_and_sorted():
+    for sid in map_adj.SPACE_IDS:
+        nbrs = map_adj.adjacent_spaces(sid)
+        assert list(nbrs) == sorted(nbrs)
+        for n in nbrs:
+            assert sid in map_adj.adjacent_spaces(n)
+            assert map_adj.neighbor_mask(sid) >> map_adj.space_index(n) & 1
+    assert map_adj.adjacent_spaces("Atlantis") == ()
+    assert not is_adjacent("Atlantis", "Boston")
+
+
+def test_distance_matrix_matches_shortest_path():
+    for a in map_adj.SPACE_IDS:
+        for b in map_adj.SPACE_IDS:
+            path = map_adj.shortest_path(a, b)
+            dist = map_adj.distance(a, b)
+            if path:
+                assert dist == len(path) - 1
+                assert all(is_adjacent(x, y) for x, y in zip(path, path[1:]))
+            else:
+                assert dist is None
+    assert map_adj.distance("Boston", "Atlantis") is None
+
+
 def test_space_type_lookup():
     assert space_type("Boston") == "City"
     assert space_type("Northwest") == "Reserve"
@@ -0,0 +1,58 @@
+"""Shared finished-game result store (lod_ai.tools.result_cache)."""
+
+from lod_ai.tools import parallel
+from lod_ai.tools.result_cache import ENV_VAR, ResultCache, open_cache
+
+
+def test_fetch_stores_and_keys_on_inputs(tmp_path):
+    cache = ResultCache("demo", deps=("lod_ai.tools.parallel",), root=tmp_path)
+    calls = []
+
+    def play():
+        calls.append(1)
+        return {"winner": "BRITISH", "margins": (1, -2), "seen": {3}}
+
+    first = cache.fetch("1776", 4, play, detailed=False)
+    again = ResultCache("demo", deps=("lod_ai.tools.parallel",),
+                        root=tmp_path).fetch("1776", 4, play, detailed=False)
+    assert again == first and len(calls) == 1
+    assert type(again["margins"]) is tuple
+    cache.fetch("1776", 4, play, detailed=True)
+    cache.fetch("1776", 5, play, detailed=False)
+    cache.fetch("1776", 4, play, setup_method="period", detailed=False)
+    ResultCache("other", root=tmp_path).fetch("1776", 4, play, detailed=False)
+    assert len(calls) == 5
+    assert (cache.hits, cache.misses) == (0, 4)
+
+
+def test_open_cache_needs_a_pinned_hash_seed(monkeypatch, tmp_path):
+    monkeypatch.setenv(ENV_VAR, str(tmp_path))
+    monkeypatch.delenv("PYTHONHASHSEED", raising=False)
+    assert open_cache("demo") is None
+    monkeypatch.setenv("PYTHONHASHSEED", "0")
+    assert open_cache("demo").root == tmp_path
+    assert open_cache("demo", enabled=False) is None
+    monkeypatch.setenv(ENV_VAR, "off")
+    assert open_cache("demo") is None
+
+
+def test_run_games_replays_only_missing_games(monkeypatch, tmp_path):
+    played = []
+
+    def fake_play(job):
+        idx, scen, seed, kwargs = job
+        played.append(idx)
+        return idx, {"scenario": scen, "seed": seed, **kwargs}
+
+    monkeypatch.setattr(parallel, "_play", fake_play)
+    schedule = [("1775", 1), ("1776", 1), ("1778", 1)]
+    cache = ResultCache("games", root=tmp_path)
+    cache.put("1776", 1, {"scenario": "1776", "seed": 1, "cached": True},
+              check_invariants=False)
+    out = list(parallel.run_games(schedule, cache=cache,
+                                  check_invariants=False))
+    assert [idx for idx, _ in out] == [0, 1, 2]
+    assert out[1][1]["cached"] and played == [0, 2]
+    assert (cache.hits, cache.misses) == (1, 2)
+    list(parallel.run_games(schedule, cache=cache, check_invariants=False))
+    assert played == [0, 2] and cache.hits == 4
@@ -0,0 +1,61 @@
+"""Bounded die-roll log (lod_ai.util.rng_log)."""
+
+import contextlib
+import copy
+import io
+import pickle
+
+import pytest
+
+from lod_ai.state import snapshot
+from lod_ai.state.sandbox import detached_copy, fork_state
+from lod_ai.state.setup_state import build_state
+from lod_ai.tools.rng_replay import ReplayMismatch, replay
+from lod_ai.util.rng_log import (
+    RECENT, RngLog, as_rng_log, checksum_of,
+)
+
+
+def test_log_keeps_recent_rolls_count_and_checksum():
+    rolls = [("D3", i % 3 + 1) for i in range(RECENT + 40)]
+    log = RngLog()
+    for roll in rolls:
+        log.append(roll)
+    assert list(log) == rolls[-RECENT:]
+    assert log.count == len(rolls)
+    assert log.checksum == checksum_of(rolls)
+    assert as_rng_log(list(rolls)).checksum == log.checksum
+
+    for twin in (log.copy(), copy.deepcopy(log), pickle.loads(pickle.dumps(log)),
+                 snapshot.decode(snapshot.encode(log)),
+                 as_rng_log(log.summary())):
+        assert type(twin) is RngLog and twin == log
+        assert (twin.count, twin.checksum) == (log.count, log.checksum)
+
+
+def test_sandboxes_and_copies_keep_the_log_type():
+    st = build_state("1776", seed=2)
+    st["rng_log"].append(("D3", 2))
+    box = fork_state(st)
+    box.setdefault("rng_log", []).append(("D6", 5))
+    assert st["rng_log"].count == 1
+    box.commit_into(st)
+    assert type(st["rng_log"]) is RngLog and st["rng_log"].count == 2
+    twin = detached_copy(st)["rng_log"]
+    assert type(twin) is RngLog and twin.checksum == st["rng_log"].checksum
+
+
+def test_replay_regenerates_the_full_sequence():
+    from lod_ai.engine import Engine
+
+    eng = Engine(initial_state=build_state("1778", seed=4), use_cli=False)
+    eng.set_human_factions([])
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(10):
+            eng.play_card(eng.draw_card(), human_decider=None)
+    log = eng.state["rng_log"]
+    assert log.count > 0
+    rolls = replay("1778", 4, count=log.count, checksum=log.checksum)
+    assert len(rolls) == log.count and rolls[-len(log):] == list(log)
+    with pytest.raises(ReplayMismatch):
+        replay("1778", 5, count=log.count, checksum=log.checksum)
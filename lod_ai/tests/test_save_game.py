@@ -12,6 +12,8 @@ import pytest
 
 from lod_ai.save_game import (
     SAVE_DIR,
+    Autosave,
+    BackgroundWriter,
     _convert_sets,
     _deserialize_state,
     _serialize_state,
@@ -19,7 +21,9 @@ from lod_ai.save_game import (
     load_game,
     save_game,
 )
+from lod_ai.state import snapshot
 from lod_ai.state.setup_state import build_state
+from lod_ai.tools.invariants import _canonical
 
 
 @pytest.fixture
@@ -75,6 +79,20 @@ class TestSerializeDeserialize:
         assert isinstance(restored["ineligible_next"], set)
         assert hf == {"BRITISH"}
 
+    def test_loaded_victory_totals_keep_running(self):
+        from lod_ai.board import totals
+        from lod_ai.cards.effects.shared import shift_support
+        from lod_ai.util.normalize_state import normalize_state
+
+        state = build_state("1775", seed=1)
+        normalize_state(state)
+        assert totals.KEY in state
+        data = json.loads(json.dumps(_serialize_state(state, set()),
+                                     default=str))
+        restored, _ = _deserialize_state(data)
+        shift_support(restored, "Boston", 1)
+        assert totals.current(restored) == totals.recompute(restored)
+
     def test_human_factions_stored(self):
         state = {"rng": random.Random(1)}
         serialized = _serialize_state(state, {"PATRIOTS", "INDIANS"})
@@ -142,6 +160,104 @@ class TestSaveLoad:
         assert data.get("seed") == 2
 
 
+class TestBinarySaves:
+    def test_binary_round_trip_keeps_types(self, tmp_save_dir):
+        state = build_state("1775", seed=42)
+        state["rng"].random()
+        filepath = save_game(state, {"BRITISH"}, binary=True)
+        assert filepath.endswith(".lods")
+        loaded, human = load_game(filepath)
+        assert human == {"BRITISH"}
+        assert _canonical(loaded) == _canonical(state)
+        assert loaded["rng"].getstate() == state["rng"].getstate()
+        assert type(loaded["history"]) is type(state["history"])
+        assert loaded["rng_log"] == state["rng_log"]        # tuples kept
+
+    def test_codec_values(self):
+        from lod_ai.util.history import HistoryLog
+        value = {"n": [0, 63, 64, 300, -1, -2 ** 70], "f": float("-inf"),
+                 "t": ("a", None, True, False), "s": {1, 2}, "b": b"\x00",
+                 "h": HistoryLog([{"seq": 1}]), "fn": build_state}
+        back = snapshot.decode(snapshot.encode(value))
+        assert back == value
+        assert type(back["h"]) is HistoryLog and back["fn"] is build_state
+
+    def test_only_lod_ai_functions_are_decoded(self):
+        assert snapshot.decode(snapshot.encode(json.dumps)) == str(json.dumps)
+        for ref in ("os:system", "builtins:eval", "lod_ai.state.snapshot:_Reader",
+                    "lod_ai.state.snapshot:MAGIC", "lod_ai.nope:f"):
+            forged = b"f" + snapshot.encode(ref)
+            with pytest.raises(ValueError):
+                snapshot.decode(forged)
+
+    def test_autosave_appends_deltas_and_replays(self, tmp_save_dir):
+        from lod_ai.util.history import push_history
+        state = build_state("1775", seed=7)
+        auto = Autosave({"PATRIOTS"}, rebase_every=10)
+        seen = []
+        for turn in range(4):
+            auto.save(state)
+            seen.append(_canonical(state))
+            push_history(state, f"turn {turn}")
+            state["deck"].pop(0)
+            state["spaces"]["Boston"]["British_Regular"] = turn
+            state["resources"]["PATRIOTS"] += 1
+        first = os.path.getsize(auto.filepath)
+        auto.save(state)
+        seen.append(_canonical(state))
+        assert os.path.getsize(auto.filepath) - first < first // 4
+        replayed = [_canonical(st) for st, _meta in
+                    snapshot.read_snapshots(auto.filepath)]
+        assert replayed == seen
+        loaded, human = load_game(auto.filepath)
+        assert human == {"PATRIOTS"} and _canonical(loaded) == seen[-1]
+
+    def test_background_autosave_coalesces_and_flushes(self, tmp_save_dir):
+        import threading
+        state = build_state("1776", seed=3)
+        gate = threading.Event()
+        writer = BackgroundWriter()
+        try:
+            writer.submit("hold", gate.wait)      # keep the thread busy
+            auto = Autosave({"BRITISH"}, background=writer)
+            for n in range(5):
+                state["resources"]["BRITISH"] = n
+                auto.save(state)
+            state["resources"]["BRITISH"] = 99    # after the last save
+            assert not os.path.exists(auto.filepath)
+            gate.set()
+            assert writer.flush(timeout=10)
+        finally:
+            writer.close()
+        assert writer.errors == [] and writer.coalesced == 4
+        assert len(list(snapshot.read_snapshots(auto.filepath))) == 1
+        loaded, human = load_game(auto.filepath)
+        assert human == {"BRITISH"} and loaded["resources"]["BRITISH"] == 4
+
+    def test_torn_last_delta_is_ignored(self, tmp_save_dir):
+        state = build_state("1776", seed=3)
+        auto = Autosave(set())
+        auto.save(state)
+        state["resources"]["BRITISH"] += 1
+        auto.save(state)
+        with open(auto.filepath, "rb") as fh:
+            data = fh.read()
+        with open(auto.filepath, "wb") as fh:
+            fh.write(data[:-3])
+        loaded, _ = load_game(auto.filepath)
+        assert loaded["resources"]["BRITISH"] == state["resources"]["BRITISH"] - 1
+
+    def test_json_export_still_loads(self, tmp_save_dir):
+        state = build_state("1776", seed=3)
+        fp_json = save_game(state, set(), filename="export.json")
+        fp_bin = save_game(state, set(), filename="export.lods")
+        from_json, _ = load_game(fp_json)
+        from_bin, _ = load_game(fp_bin)
+        assert _canonical(from_json) == _canonical(from_bin)
+        names = {s["filename"] for s in list_saves()}
+        assert names == {"export.json", "export.lods"}
+
+
 class TestListSaves:
     def test_list_empty(self, tmp_save_dir):
         saves = list_saves()
@@ -0,0 +1,129 @@
+"""Copy-on-write sandbox state (lod_ai.state.sandbox)."""
+
+import random
+from copy import deepcopy
+
+from lod_ai import rules_consts as C
+from lod_ai.engine import Engine
+from lod_ai.state.sandbox import ABSENT, SandboxState
+from lod_ai.state.setup_state import build_state
+from lod_ai.util.history import push_history
+
+
+def _state():
+    return {
+        "spaces": {"Boston": {C.REGULAR_BRI: 2}, "New_York": {C.TORY: 1}},
+        "resources": {C.BRITISH: 5},
+        "history": [{"seq": 1, "msg": "start", "stamp": ""}],
+        "rng": random.Random(7),
+        "fni_level": 0,
+    }
+
+
+def test_sandbox_shares_until_touched_and_isolates_writes():
+    live = _state()
+    sb = SandboxState(live)
+    assert sb == live
+    sb["spaces"]["Boston"][C.REGULAR_BRI] = 9
+    sb["resources"][C.BRITISH] -= 1
+    push_history(sb, "trial")
+    sb["fni_level"] = 2
+    assert live["spaces"]["Boston"][C.REGULAR_BRI] == 2
+    assert live["resources"][C.BRITISH] == 5
+    assert len(live["history"]) == 1
+    assert live["fni_level"] == 0
+    # Untouched spaces are never copied.
+    assert dict.__getitem__(sb["spaces"], "New_York") is live["spaces"]["New_York"]
+
+
+def test_sandbox_rng_is_independent_copy():
+    live = _state()
+    expected = random.Random(7).random()
+    sb = SandboxState(live)
+    assert sb["rng"].random() == expected
+    assert live["rng"].random() == expected
+
+
+def test_commit_merges_only_changed_spaces():
+    live = _state()
+    spaces_obj = live["spaces"]
+    ny = live["spaces"]["New_York"]
+    sb = SandboxState(live)
+    sb["spaces"]["Boston"][C.REGULAR_BRI] = 3
+    _ = sb["spaces"]["New_York"][C.TORY]          # read-only touch
+    sb.pop("fni_level")
+    changed = sb.commit_into(live)
+    assert changed == {"Boston"}
+    assert live["spaces"] is spaces_obj
+    assert live["spaces"]["New_York"] is ny
+    assert live["spaces"]["Boston"][C.REGULAR_BRI] == 3
+    assert "fni_level" not in live
+
+
+def test_deepcopy_and_plain_copies_do_not_alias_parent():
+    live = _state()
+    sb = SandboxState(live)
+    clone = deepcopy(sb)
+    assert type(clone) is dict and type(clone["spaces"]) is dict
+    flat = dict(sb)
+    flat["spaces"]["Boston"][C.REGULAR_BRI] = 0
+    assert live["spaces"]["Boston"][C.REGULAR_BRI] == 2
+
+
+def test_nested_sandbox_commits_through_parent():
+    live = _state()
+    outer = SandboxState(live)
+    inner = SandboxState(outer)
+    inner["spaces"]["Boston"][C.TORY] = 1
+    inner.commit_into(outer)
+    assert live["spaces"]["Boston"].get(C.TORY) is None
+    outer.commit_into(live)
+    assert live["spaces"]["Boston"][C.TORY] == 1
+
+
+def test_changes_reports_only_real_differences():
+    live = _state()
+    live["available"] = {C.TORY: 4}
+    sb = SandboxState(live)
+    sb["spaces"]["Boston"][C.REGULAR_BRI] = 1
+    sb["spaces"]["Boston"][C.TORY] = 1
+    _ = sb["spaces"]["New_York"]                 # touched, unchanged
+    sb["available"][C.TORY] -= 1
+    sb["resources"][C.BRITISH] += 0              # touched, unchanged
+    sb["fni_level"] = 0                          # rewritten, same value
+    sb["new_flag"] = True
+    ch = sb.changes()
+    assert ch.keys == {"spaces", "available", "new_flag"}
+    assert ch.spaces == {"Boston": {C.REGULAR_BRI: (2, 1),
+                                    C.TORY: (ABSENT, 1)}}
+    assert ch.dict_diff("available") == {C.TORY: (4, 3)}
+    assert ch.dict_diff("resources") == {}
+
+
+class _DeepCopySandbox:
+    """Stand-in for the pre-copy-on-write sandbox: a full deepcopy,
+    committed by the engine's wholesale clear/update fallback."""
+
+    def __new__(cls, parent):
+        return deepcopy(parent)
+
+
+def test_engine_game_matches_deepcopy_sandbox(monkeypatch):
+    """A short bot-only game is identical under the copy-on-write sandbox
+    and the old full-deepcopy sandbox."""
+    def play(use_cow):
+        if not use_cow:
+            monkeypatch.setattr("lod_ai.engine.SandboxState",
+                                _DeepCopySandbox)
+        eng = Engine(initial_state=build_state("1778", seed=2))
+        eng.set_human_factions(set())
+        for _ in range(8):
+            card = eng.draw_card()
+            if card is None:
+                break
+            eng.play_card(card)
+        monkeypatch.undo()
+        st = dict(eng.state)
+        return ([h["msg"] for h in st.pop("history")],
+                st["spaces"], st["resources"], st["support"])
+    assert play(True) == play(False)
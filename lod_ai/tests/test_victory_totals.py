@@ -0,0 +1,67 @@
+"""Running victory totals (lod_ai.board.totals)."""
+
+import contextlib
+import io
+
+import pytest
+
+from lod_ai import rules_consts as C
+from lod_ai.board import totals
+from lod_ai.board.pieces import place_piece, remove_piece
+from lod_ai.cards.effects.shared import shift_support
+from lod_ai.state.setup_state import build_state
+from lod_ai.tools.invariants import victory_drift
+from lod_ai.util.normalize_state import normalize_state
+from lod_ai.victory import _summarize_board
+
+
+def _state():
+    st = build_state("1776", seed=3)
+    normalize_state(st)
+    return st
+
+
+def test_totals_follow_support_pieces_and_blockades():
+    st = _state()
+    assert totals.KEY in st
+    shift_support(st, "Boston", +2)
+    shift_support(st, "Virginia", -1)
+    st["available"][C.FORT_PAT] = 2
+    place_piece(st, C.FORT_PAT, "Georgia", 1)
+    remove_piece(st, C.VILLAGE, None, 1, to="available")
+    st["markers"][C.BLOCKADE]["on_map"].add("Boston")
+    assert totals.current(st) == totals.recompute(st)
+    assert victory_drift(st) == {}
+    st["markers"][C.BLOCKADE]["on_map"].discard("Boston")
+    assert totals.current(st) == totals.recompute(st)
+
+    plain = {k: v for k, v in st.items() if k != totals.KEY}
+    assert _summarize_board(st) == _summarize_board(plain)
+
+
+def test_direct_edits_show_as_drift_until_resynced(monkeypatch):
+    st = _state()
+    st["support"]["Boston"] = -2
+    st["spaces"]["Georgia"][C.FORT_PAT] = 1
+    assert set(victory_drift(st)) >= {"forts"}
+    monkeypatch.setattr(totals, "AUDIT", True)
+    with pytest.raises(totals.TotalsDrift):
+        totals.current(st)
+    totals.sync_support(st)
+    totals.refresh_rows(st, ["Georgia"])
+    assert victory_drift(st) == {}
+
+
+def test_engine_games_keep_totals_current(monkeypatch):
+    from lod_ai.engine import Engine
+
+    monkeypatch.setattr(totals, "AUDIT", True)      # every read cross-checks
+    eng = Engine(initial_state=build_state("1775", seed=5))
+    eng.set_human_factions(set())
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(25):
+            card = eng.draw_card()
+            if card is None:
+                break
+            eng.play_card(card)
+            assert victory_drift(eng.state) == {}
@@ -633,3 +633,26 @@ def test_british_bot_supply_pay_only_in_qualifying_spaces():
     assert state.get("support", {}).get("Virginia", 0) == sup_before.get("Virginia", 0)
     # Qualifying space paid and kept.
     assert state["spaces"]["Pennsylvania"].get(C.REGULAR_BRI, 0) == 2
+
+
+def test_patriot_supply_sees_control_left_by_british_supply():
+    """§1.7: Control changes as soon as pieces are removed, so a Colony
+    British Supply strips of cubes is already Rebellion-Controlled when
+    the Patriots check supply (6.2.1) and their Militia stay."""
+    from lod_ai.board.control import refresh_control
+    from lod_ai.state.setup_state import build_state
+
+    state = build_state("1776", seed=1)
+    state["spaces"]["Virginia"] = {k: 0 for k in state["spaces"]["Virginia"]}
+    state["spaces"]["Virginia"][C.REGULAR_BRI] = 3
+    state["spaces"]["Virginia"][C.MILITIA_U] = 2
+    state["support"]["Virginia"] = C.ACTIVE_OPPOSITION     # no shift to pay
+    state["resources"][C.BRITISH] = state["resources"][C.PATRIOTS] = 0
+    refresh_control(state)
+    assert state["control"]["Virginia"] == C.BRITISH
+
+    year_end._supply_phase(state, human_factions=set())
+
+    assert state["spaces"]["Virginia"].get(C.REGULAR_BRI, 0) == 0
+    assert state["control"]["Virginia"] == "REBELLION"
+    assert state["spaces"]["Virginia"][C.MILITIA_U] == 2
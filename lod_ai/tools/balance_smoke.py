@@ -10,6 +10,9 @@ scenario.  After an *intended* rules change, refresh with ``--update``.
     python -m lod_ai.tools.balance_smoke --update         # rebaseline
     python -m lod_ai.tools.balance_smoke --seeds 1-5      # quicker spot check
 
+Finished games are reused from `lod_ai.tools.result_cache` until the
+engine (or this tool) changes; ``--no-cache`` replays them all.
+
 Background: the Q13 supply bug (see QUESTIONS.md) shifted bot-only 1775 from
 Patriots 16/20 to Indians 9/20 without failing any of the 1,189 unit tests.
 Win-rate tables are the instrument that caught it; this tool automates them.
@@ -35,17 +38,21 @@ if os.environ.get("PYTHONHASHSEED") != _HASHSEED and __name__ == "__main__":
     os.execv(sys.executable, [sys.executable, "-m",
                               "lod_ai.tools.balance_smoke"] + sys.argv[1:])
 
+from lod_ai.tools.result_cache import open_cache
+
 BASELINE_PATH = Path(__file__).resolve().parent / "balance_baseline.json"
 SCENARIOS = ("1775", "1776", "1778")
 FACTIONS = ("PATRIOTS", "BRITISH", "FRENCH", "INDIANS")
 MAX_CARDS = 200
+# Tool modules whose source decides a cached result (see result_cache).
+_CACHE_DEPS = ("lod_ai.tools.balance_smoke", "lod_ai.tools.batch_smoke")
 
 
 def play_bot_game(scenario: str, seed: int) -> dict:
     """Play one bot-only game; return {'winner': ..., 'cards': ...}."""
     from lod_ai.state.setup_state import build_state
     from lod_ai.engine import Engine
-    from lod_ai.tools.batch_smoke import _check_game_over
+    from lod_ai.victory import check_game_over
 
     state = build_state(scenario, seed=seed)
     engine = Engine(initial_state=state)
@@ -58,7 +65,7 @@ def play_bot_game(scenario: str, seed: int) -> dict:
                 break
             engine.play_card(card)
             cards += 1
-            winner = _check_game_over(engine.state)
+            winner = check_game_over(engine.state)
             if winner:
                 break
     return {"winner": winner or "none", "cards": cards}
@@ -85,6 +92,8 @@ def main(argv=None) -> int:
     ap.add_argument("--update", action="store_true",
                     help="Merge current results into the baseline instead of checking")
     ap.add_argument("--baseline", default=str(BASELINE_PATH))
+    ap.add_argument("--no-cache", action="store_true",
+                    help="Replay every game instead of reusing stored results")
     args = ap.parse_args(argv)
 
     scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
@@ -92,13 +101,21 @@ def main(argv=None) -> int:
     bpath = Path(args.baseline)
     baseline = json.loads(bpath.read_text()) if bpath.exists() else {"games": {}}
 
+    cache = open_cache("balance_smoke", deps=_CACHE_DEPS,
+                       enabled=not args.no_cache)
     current: dict = {}
     for scen in scenarios:
         for seed in seeds:
             key = f"{scen}:{seed}"
-            r = play_bot_game(scen, seed)
+            if cache is None:
+                r = play_bot_game(scen, seed)
+            else:
+                r = cache.fetch(scen, seed,
+                                lambda: play_bot_game(scen, seed))
             current[key] = r
             print(f"[{scen} seed={seed:2d}] winner={r['winner']} ({r['cards']} cards)")
+    if cache is not None:
+        print(cache.summary())
 
     if args.update:
         baseline["games"].update(current)
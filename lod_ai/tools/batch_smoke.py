@@ -6,6 +6,12 @@ Modes:
     python -m lod_ai.tools.batch_smoke          # default 60-game batch (20/scenario)
     python -m lod_ai.tools.batch_smoke --single  # single game sanity check
     python -m lod_ai.tools.batch_smoke --large   # 150-game batch (50/scenario) with rich stats
+    python -m lod_ai.tools.batch_smoke --workers 8   # either batch over 8 processes
+    python -m lod_ai.tools.batch_smoke --profile     # either batch + engine phase timings
+    python -m lod_ai.tools.batch_smoke --no-cache    # replay games already in the result cache
+    python -m lod_ai.tools.batch_smoke --checkpoints 10         # checkpoint every 10 cards
+    python -m lod_ai.tools.batch_smoke --arrays      # board tallies via a NumPy view
+    python -m lod_ai.tools.batch_smoke --repro 1778:7 --from-card 43  # resume near card 43
 
 Writes:
   default mode  → batch_results.json / batch_results_diagnostic.json
@@ -14,28 +20,28 @@ Writes:
 
 from __future__ import annotations
 
+import functools
 import json
 import math
-import os
-import re
 import sys
 import traceback
 from collections import Counter, defaultdict
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
-# Redirect stdin to /dev/null so any accidental interactive prompt
-# raises EOFError instead of blocking.
-_DEVNULL = open(os.devnull, "r")
-sys.stdin = _DEVNULL
-
+from lod_ai.board.control import array_view
+from lod_ai.cli_utils import NoInputProvider, game_session
 from lod_ai.engine import Engine
 from lod_ai.state.setup_state import build_state
 from lod_ai.victory import (
     _summarize_board, _british_margin, _patriot_margin,
-    _french_margin, _indian_margin,
+    _french_margin, _indian_margin, check_game_over,
 )
 from lod_ai import rules_consts as C
+from lod_ai.util.history import (
+    BATTLE, BATTLE_RESULT, FINAL_SCORING, SPECIAL_ACTIVITY, TREATY,
+    VICTORY_CHECK, events, last_event,
+)
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -61,7 +67,7 @@ FACTION_PIECE_TAGS = {
 
 PASS_REASON_KEYS = ['resource_gate', 'no_valid_command', 'illegal_action', 'bot_error', 'other']
 
-# SA names as they appear in history messages → canonical key
+# Special-activity event names (history "activity" field) → canonical key
 SA_HISTORY_NAMES = {
     "SKIRMISH": "skirmish",
     "NAVAL_PRESSURE": "naval_pressure",
@@ -74,21 +80,6 @@ SA_HISTORY_NAMES = {
     "PLUNDER": "plunder",
 }
 
-# Regex patterns for history parsing
-_VICTORY_CHECK_RE = re.compile(
-    r'Victory Check\s+[–—-]\s+'
-    r'BRI\((-?\d+),(-?\d+)\)\s+'
-    r'PAT\((-?\d+),(-?\d+)\)\s+'
-    r'FRE\((-?\d+),(-?\d+)\)\s+'
-    r'IND\((-?\d+),(-?\d+)\)'
-)
-_BATTLE_ANNOUNCE_RE = re.compile(r'^(\w+) BATTLE in (.+)$')
-_BATTLE_RESULT_RE = re.compile(
-    r'BATTLE (\S+): (\w+)-loss=(\d+), (\w+)-loss=(\d+), winner=(\w+|NONE)'
-)
-_FINAL_SCORING_RE = re.compile(r'Final Scoring')
-_FINAL_SCORE_PAIR_RE = re.compile(r'(\w+):(-?[\dinf.]+)')
-
 
 # ---------------------------------------------------------------------------
 # Shared helpers
@@ -96,6 +87,9 @@ _FINAL_SCORE_PAIR_RE = re.compile(r'(\w+):(-?[\dinf.]+)')
 
 def _count_pieces_on_map(state: dict) -> Dict[str, int]:
     """Count total pieces on map per faction."""
+    view = array_view(state)
+    if view is not None:
+        return view.faction_totals()
     counts = {}
     for faction, tags in FACTION_PIECE_TAGS.items():
         total = 0
@@ -120,16 +114,8 @@ def _count_controlled_spaces(state: dict) -> Dict[str, int]:
 
 def _support_opposition_totals(state: dict) -> Tuple[int, int]:
     """Return (total_support, total_opposition) population-weighted per §1.6.2-1.6.3."""
-    from lod_ai.map.adjacency import population as _map_population
-    from lod_ai.util.naval import effective_population
-    sup = 0
-    opp = 0
-    for sid, lvl in state.get("support", {}).items():
-        pop = effective_population(state, sid, _map_population(sid))
-        if lvl > 0:
-            sup += lvl * pop
-        elif lvl < 0:
-            opp += abs(lvl) * pop
+    from lod_ai.board import totals
+    sup, opp, _forts, _villages = totals.current(state)
     return sup, opp
 
 
@@ -154,51 +140,11 @@ def _compute_margins(state: dict) -> Dict[str, Tuple[int, int]]:
     }
 
 
-def _determine_winner_from_margins(state: dict) -> str:
-    """Use the victory margin functions to determine which faction won."""
-    tallies = _summarize_board(state)
-    brit1, brit2 = _british_margin(tallies)
-    pat1, pat2 = _patriot_margin(tallies)
-    fre1, fre2 = _french_margin(tallies)
-    ind1, ind2 = _indian_margin(tallies)
-
-    if brit1 > 0 and brit2 > 0:
-        return C.BRITISH
-    if pat1 > 0 and pat2 > 0:
-        return C.PATRIOTS
-    if tallies["treaty_of_alliance"] and fre1 > 0 and fre2 > 0:
-        return C.FRENCH
-    if ind1 > 0 and ind2 > 0:
-        return C.INDIANS
-    return "UNKNOWN"
-
-
-def _check_game_over(state: dict) -> str | None:
-    """Scan history for a winner or victory message. Return winner or None."""
-    history = state.get("history", [])
-    for entry in reversed(history[-40:]):
-        msg = entry.get("msg", "") if isinstance(entry, dict) else str(entry)
-        if "Winner:" in msg:
-            parts = msg.split("Winner:")
-            if len(parts) >= 2:
-                faction = parts[1].strip().split()[0].strip("()")
-                return faction
-        if "Victory achieved" in msg:
-            return _determine_winner_from_margins(state)
-    return None
-
-
-def _parse_victory_margins(msg: str) -> Dict[str, tuple] | None:
-    """Parse 'Victory Check – BRI(x,y) PAT(x,y) FRE(x,y) IND(x,y)' into a dict."""
-    m = _VICTORY_CHECK_RE.search(msg)
-    if not m:
-        return None
-    return {
-        'BRI': (int(m.group(1)), int(m.group(2))),
-        'PAT': (int(m.group(3)), int(m.group(4))),
-        'FRE': (int(m.group(5)), int(m.group(6))),
-        'IND': (int(m.group(7)), int(m.group(8))),
-    }
+def _victory_margins(entry: dict) -> Dict[str, tuple]:
+    """A Victory Check event's margins as {'BRI': (x, y), 'PAT': …}."""
+    margins = entry["data"]["margins"]
+    return {FACTION_ABBREV[f]: tuple(margins[f])
+            for f in (C.BRITISH, C.PATRIOTS, C.FRENCH, C.INDIANS)}
 
 
 # ---------------------------------------------------------------------------
@@ -274,13 +220,10 @@ def _process_card_turn_log(diag: Dict, state: dict) -> None:
 
 def _scan_history_for_events(diag: Dict, history: list, history_offset: int,
                              cards_played: int) -> int:
-    for entry in history[history_offset:]:
-        msg = entry.get('msg', '') if isinstance(entry, dict) else str(entry)
-        if msg.startswith('Victory Check'):
-            margins = _parse_victory_margins(msg)
-            if margins:
-                diag['wq_margins'].append(margins)
-        if 'Treaty of Alliance' in msg and not diag['treaty_played']:
+    for entry in events(history, VICTORY_CHECK, TREATY, since=history_offset):
+        if entry["kind"] == VICTORY_CHECK:
+            diag['wq_margins'].append(_victory_margins(entry))
+        elif not diag['treaty_played']:
             diag['treaty_played'] = True
             diag['treaty_card_number'] = cards_played
     return len(history)
@@ -406,60 +349,36 @@ def _process_turn_log_large(data: Dict, state: dict, card_id: int | None) -> Non
 
 def _scan_history_large(data: Dict, history: list, offset: int,
                         cards_played: int) -> int:
-    """Scan new history entries for battles, SAs, treaty, and victory checks."""
-    for entry in history[offset:]:
-        msg = entry.get('msg', '') if isinstance(entry, dict) else str(entry)
-
-        # Victory check margins (WQ)
-        if msg.startswith('Victory Check'):
-            margins = _parse_victory_margins(msg)
-            if margins:
-                # Stored in wq_snapshots instead; keep for quick access
-                pass
+    """Tally new battle, SA, treaty and final-scoring events."""
+    for entry in events(history, BATTLE, BATTLE_RESULT, SPECIAL_ACTIVITY,
+                        TREATY, FINAL_SCORING, since=offset):
+        kind, info = entry["kind"], entry["data"]
 
-        # Battle announcements: "{FACTION} BATTLE in {spaces}"
-        m = _BATTLE_ANNOUNCE_RE.match(msg)
-        if m:
-            att_faction = m.group(1).upper()
+        if kind == BATTLE:
             data["battles_total"] += 1
-            if att_faction in data["battles_as_attacker"]:
-                data["battles_as_attacker"][att_faction] += 1
-
-        # Battle results: "BATTLE {sid}: {side}-loss={n}, {side}-loss={n}, winner={w}"
-        m = _BATTLE_RESULT_RE.search(msg)
-        if m:
-            side1, loss1 = m.group(2), int(m.group(3))
-            side2, loss2 = m.group(4), int(m.group(5))
-            if side1 in data["battle_losses"]:
-                data["battle_losses"][side1] += loss1
-            if side2 in data["battle_losses"]:
-                data["battle_losses"][side2] += loss2
-
-        # Special activities: "{FACTION} {SA_NAME} ..."
-        for sa_name, sa_key in SA_HISTORY_NAMES.items():
-            if sa_name in msg:
-                # Determine which faction used it
-                for f in FACTIONS:
-                    if msg.startswith(f"{f} {sa_name}"):
-                        fa = data["faction_actions"][f]
-                        fa["special_activities"][sa_key] = (
-                            fa["special_activities"].get(sa_key, 0) + 1
-                        )
-                        break
+            if info["faction"] in data["battles_as_attacker"]:
+                data["battles_as_attacker"][info["faction"]] += 1
+
+        elif kind == BATTLE_RESULT:
+            for side, lost in info["losses"].items():
+                if side in data["battle_losses"]:
+                    data["battle_losses"][side] += lost
+
+        elif kind == SPECIAL_ACTIVITY:
+            sa_key = SA_HISTORY_NAMES.get(info["activity"])
+            if sa_key and info["faction"] in data["faction_actions"]:
+                fa = data["faction_actions"][info["faction"]]
+                fa["special_activities"][sa_key] = (
+                    fa["special_activities"].get(sa_key, 0) + 1
+                )
 
         # Treaty of Alliance detection (for timing)
-        if 'Treaty of Alliance played' in msg:
+        elif kind == TREATY:
             data.setdefault("_treaty_card_number", cards_played)
 
-        # Final Scoring: parse faction scores
-        if _FINAL_SCORING_RE.search(msg):
-            pairs = _FINAL_SCORE_PAIR_RE.findall(msg)
-            for faction_str, score_str in pairs:
-                try:
-                    score = float(score_str)
-                except ValueError:
-                    score = float('-inf')
-                data["final_scores"][faction_str] = score
+        elif kind == FINAL_SCORING:
+            for faction_str, score in info["scores"].items():
+                data["final_scores"][faction_str] = float(score)
 
     return len(history)
 
@@ -482,13 +401,8 @@ def _determine_victory_detail(data: Dict, state: dict,
 
     if end_reason == "WINNER" and winner:
         # Was it a mid-game victory condition or final scoring?
-        history = state.get("history", [])
-        is_final_scoring = False
-        for entry in reversed(history[-40:]):
-            msg = entry.get("msg", "") if isinstance(entry, dict) else str(entry)
-            if "Final Scoring" in msg:
-                is_final_scoring = True
-                break
+        is_final_scoring = last_event(state.get("history", []),
+                                      FINAL_SCORING, within=40) is not None
 
         if is_final_scoring:
             data["victory_type"] = "final_scoring"
@@ -506,12 +420,36 @@ def _determine_victory_detail(data: Dict, state: dict,
 # Game runner (supports both default and detailed modes)
 # ---------------------------------------------------------------------------
 
+def _no_input(fn):
+    """Run *fn* with `NoInputProvider` installed, so any accidental
+    interactive prompt raises EOFError instead of blocking.  Scoped to the
+    calling thread, unlike rebinding ``sys.stdin``."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with game_session(NoInputProvider()):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+@_no_input
 def run_one_game(scenario: str, seed: int, *, detailed: bool = False,
                  check_invariants: bool = False,
-                 dump_dir: str = "crash_dumps") -> Dict[str, Any]:
+                 dump_dir: str = "crash_dumps",
+                 profile: bool = False,
+                 checkpoint_every: int = 0,
+                 from_card: int = 0,
+                 arrays: bool = False) -> Dict[str, Any]:
     """Run a single zero-player game.
 
     If *detailed* is True, collects the comprehensive data for --large mode.
+    If *profile* is True, ``result["profile"]`` holds the engine's
+    per-phase timings (`lod_ai.tools.profiling.PhaseProfiler.to_json`).
+    With *checkpoint_every* K, the game's state is checkpointed every K
+    cards (`lod_ai.tools.checkpoints`).  With *from_card* N, play resumes
+    from the nearest checkpoint before card N (``result["resumed_from"]``;
+    diagnostics then cover only the cards played here).  With *arrays*,
+    a `lod_ai.board.arrays` view is attached to the game's state, so
+    board-wide tallies run as matrix reductions (needs NumPy).
     """
     result: Dict[str, Any] = {
         "scenario": scenario,
@@ -525,16 +463,38 @@ def run_one_game(scenario: str, seed: int, *, detailed: bool = False,
     }
     diag = _empty_diagnostics()
     large_data = _empty_large_data() if detailed else None
+    profiler = None
 
     try:
         state = build_state(scenario, seed=seed)
-        engine = Engine(initial_state=state, use_cli=False)
-        engine.set_human_factions([])  # all bots
         if check_invariants:
             from lod_ai.tools import invariants as _inv
-            _census_baseline = _inv.capture_baseline(engine.state)
-
+            _census_baseline = _inv.capture_baseline(state)
         cards_played = 0
+        found = None
+        if from_card or checkpoint_every:
+            from lod_ai.tools import checkpoints as _ckpt
+            ckpt_path = _ckpt.checkpoint_path(scenario, seed)
+        if from_card:
+            found = _ckpt.nearest(ckpt_path, from_card - 1)
+        if found is not None:
+            engine = _ckpt.resume(*found)
+            cards_played = result["resumed_from"] = found[1]["card"]
+        else:
+            engine = Engine(initial_state=state, use_cli=False)
+            engine.set_human_factions([])  # all bots
+        recorder = None
+        if checkpoint_every and found is None:
+            recorder = _ckpt.CheckpointRecorder(
+                ckpt_path, scenario=scenario, seed=seed,
+                every=checkpoint_every)
+        if profile:
+            profiler = engine.enable_profiling()
+        if arrays:
+            from lod_ai.board import arrays as _arrays
+            # The registry holds views weakly: keep this one for the game.
+            board_view = _arrays.attach(engine.state)  # noqa: F841
+
         history_offset = len(engine.state.get('history', []))
         wq_count = 0
         current_campaign_cards = 0
@@ -553,6 +513,8 @@ def run_one_game(scenario: str, seed: int, *, detailed: bool = False,
             engine.play_card(card, human_decider=None)
             cards_played += 1
             current_campaign_cards += 1
+            if recorder is not None:
+                recorder.after_card(engine, cards_played)
 
             if check_invariants:
                 from lod_ai.tools import invariants
@@ -591,7 +553,7 @@ def run_one_game(scenario: str, seed: int, *, detailed: bool = False,
                 current_campaign_cards = 0
 
             # Check game over
-            winner = _check_game_over(engine.state)
+            winner = check_game_over(engine.state)
             if winner:
                 result["winner"] = winner
                 result["end_reason"] = "WINNER"
@@ -626,25 +588,32 @@ def run_one_game(scenario: str, seed: int, *, detailed: bool = False,
         eng = locals().get("engine")
         st = getattr(eng, "state", None) if eng is not None else None
         card_no = locals().get("cards_played", 0)
+        # With checkpoints the repro resumes just before the failing card
+        # (an invariant is checked after its card, a crash is inside it).
+        resume_at = 0
+        if checkpoint_every or from_card:
+            resume_at = card_no if is_invariant else card_no + 1
         if st is not None and not is_invariant:
             try:
                 _, repro = invariants.dump_repro(
                     st, scenario=scenario, seed=seed, card_number=card_no,
                     kind="crash", detail=result["error"],
                     traceback_str=result["traceback"], human_factions=set(),
-                    dump_dir=dump_dir,
+                    dump_dir=dump_dir, from_card=resume_at,
                 )
                 result["repro_command"] = repro
             except Exception:
                 pass
         elif is_invariant:
-            result["repro_command"] = (
-                f"python -m lod_ai.tools.batch_smoke --repro {scenario}:{seed}"
-            )
+            result["repro_command"] = invariants.repro_command(
+                scenario, seed, from_card=resume_at)
 
     result["diagnostics"] = diag
     if detailed:
         result["large_data"] = large_data
+    if profiler is not None:
+        profiler.finish_game()
+        result["profile"] = profiler.to_json()
     return result
 
 
@@ -1340,6 +1309,26 @@ def _serialize_large_results(all_results: List[Dict]) -> List[Dict]:
 # Main
 # ===========================================================================
 
+def _parse_checkpoints(argv) -> int:
+    """Parse ``--checkpoints K`` (0 when absent)."""
+    for i, a in enumerate(argv):
+        if a == "--checkpoints" and i + 1 < len(argv):
+            return max(0, int(argv[i + 1]))
+        if a.startswith("--checkpoints="):
+            return max(0, int(a.split("=", 1)[1]))
+    return 0
+
+
+def _parse_from_card(argv) -> int:
+    """Parse ``--from-card N`` (0 when absent)."""
+    for i, a in enumerate(argv):
+        if a == "--from-card" and i + 1 < len(argv):
+            return int(argv[i + 1])
+        if a.startswith("--from-card="):
+            return int(a.split("=", 1)[1])
+    return 0
+
+
 def _parse_repro(argv) -> tuple[str, int] | None:
     """Parse ``--repro SCEN:SEED`` from argv."""
     for i, a in enumerate(argv):
@@ -1354,20 +1343,51 @@ def _parse_repro(argv) -> tuple[str, int] | None:
     return None
 
 
+def _print_profile(all_results: List[Dict[str, Any]]) -> None:
+    """Merge and print the per-game engine profiles (``--profile``)."""
+    from lod_ai.tools.profiling import PhaseProfiler, report
+    merged = PhaseProfiler()
+    for r in all_results:
+        if r.get("profile"):
+            merged.merge(PhaseProfiler.from_json(r["profile"]))
+    if merged.games:
+        print()
+        print(report(merged))
+
+
 def main() -> None:
+    from lod_ai.tools.parallel import open_game_cache, parse_workers, run_games
+
     single_mode = "--single" in sys.argv
     large_mode = "--large" in sys.argv
     invariants_mode = "--invariants" in sys.argv
+    profile_mode = "--profile" in sys.argv
+    arrays_mode = "--arrays" in sys.argv
+    workers = parse_workers(sys.argv)
+    checkpoint_every = _parse_checkpoints(sys.argv)
+    # Per-game timings are not reproducible: --profile replays everything.
+    cache = open_game_cache(enabled="--no-cache" not in sys.argv
+                            and not profile_mode)
 
     # ------------------------------------------------------------------
     # Repro mode: replay one game with invariants on, dump on failure.
     #   python -m lod_ai.tools.batch_smoke --repro 1778:7
+    # --from-card N resumes from the nearest checkpoint before card N
+    # (lod_ai.tools.checkpoints); --checkpoints K records them every K.
     # ------------------------------------------------------------------
     repro = _parse_repro(sys.argv)
     if repro is not None:
         scen, seed = repro
+        from_card = _parse_from_card(sys.argv)
         print(f"Repro: scenario={scen}, seed={seed} (invariants ON) ...")
-        result = run_one_game(scen, seed, detailed=True, check_invariants=True)
+        result = run_one_game(scen, seed, detailed=True, check_invariants=True,
+                              checkpoint_every=checkpoint_every,
+                              from_card=from_card)
+        if result.get("resumed_from"):
+            print(f"  resumed from the checkpoint after card "
+                  f"{result['resumed_from']}")
+        elif from_card:
+            print("  (no usable checkpoint: replayed from card 1)")
         print(f"  end_reason={result['end_reason']}, winner={result['winner']}, "
               f"cards_played={result['cards_played']}")
         if result["error"]:
@@ -1425,27 +1445,31 @@ def main() -> None:
         all_results: List[Dict[str, Any]] = []
         by_scenario: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
 
-        for scenario in SCENARIOS:
-            for seed in range(1, seeds + 1):
-                tag = f"[{scenario} seed={seed:>2}]"
-                sys.stdout.write(f"  {tag} ... ")
-                sys.stdout.flush()
-
-                result = run_one_game(scenario, seed, detailed=True)
-                all_results.append(result)
-                by_scenario[scenario].append(result)
-
-                status = result["end_reason"] or "?"
-                extra = ""
-                if result["winner"]:
-                    extra = f" -> {result['winner']}"
-                ld = result.get("large_data", {})
-                vt = ld.get("victory_type", "")
-                if vt:
-                    extra += f" ({vt})"
-                if result["error"]:
-                    extra += f"  ERR: {result['error'][:60]}"
-                print(f"{status} ({result['cards_played']} cards){extra}")
+        schedule = [(scenario, seed) for scenario in SCENARIOS
+                    for seed in range(1, seeds + 1)]
+        for idx, result in run_games(schedule, workers=workers, cache=cache,
+                                     detailed=True, profile=profile_mode,
+                                     checkpoint_every=checkpoint_every,
+                                     arrays=arrays_mode):
+            scenario, seed = schedule[idx]
+            tag = f"[{scenario} seed={seed:>2}]"
+            sys.stdout.write(f"  {tag} ... ")
+            sys.stdout.flush()
+
+            all_results.append(result)
+            by_scenario[scenario].append(result)
+
+            status = result["end_reason"] or "?"
+            extra = ""
+            if result["winner"]:
+                extra = f" -> {result['winner']}"
+            ld = result.get("large_data", {})
+            vt = ld.get("victory_type", "")
+            if vt:
+                extra += f" ({vt})"
+            if result["error"]:
+                extra += f"  ERR: {result['error'][:60]}"
+            print(f"{status} ({result['cards_played']} cards){extra}")
 
         # --- Print legacy per-scenario summaries ---
         for scenario in SCENARIOS:
@@ -1458,6 +1482,9 @@ def main() -> None:
         _print_faction_performance(all_results, by_scenario)
         _print_game_dynamics(all_results, by_scenario)
         _print_balance_indicators(all_results, by_scenario)
+        _print_profile(all_results)
+        if cache is not None:
+            print(cache.summary())
 
         # --- Write JSON ---
         serialisable = _serialize_large_results(all_results)
@@ -1479,28 +1506,36 @@ def main() -> None:
     all_results: List[Dict[str, Any]] = []
     by_scenario: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
 
-    for scenario in SCENARIOS:
-        for seed in range(1, seeds + 1):
-            tag = f"[{scenario} seed={seed:>2}]"
-            sys.stdout.write(f"  {tag} ... ")
-            sys.stdout.flush()
-
-            result = run_one_game(scenario, seed, check_invariants=invariants_mode)
-            all_results.append(result)
-            by_scenario[scenario].append(result)
-
-            status = result["end_reason"] or "?"
-            extra = ""
-            if result["winner"]:
-                extra = f" -> {result['winner']}"
-            if result["error"]:
-                extra += f"  ERR: {result['error'][:60]}"
-            print(f"{status} ({result['cards_played']} cards){extra}")
+    schedule = [(scenario, seed) for scenario in SCENARIOS
+                for seed in range(1, seeds + 1)]
+    for idx, result in run_games(schedule, workers=workers, cache=cache,
+                                 check_invariants=invariants_mode,
+                                 profile=profile_mode,
+                                 checkpoint_every=checkpoint_every,
+                                 arrays=arrays_mode):
+        scenario, seed = schedule[idx]
+        tag = f"[{scenario} seed={seed:>2}]"
+        sys.stdout.write(f"  {tag} ... ")
+        sys.stdout.flush()
+
+        all_results.append(result)
+        by_scenario[scenario].append(result)
+
+        status = result["end_reason"] or "?"
+        extra = ""
+        if result["winner"]:
+            extra = f" -> {result['winner']}"
+        if result["error"]:
+            extra += f"  ERR: {result['error'][:60]}"
+        print(f"{status} ({result['cards_played']} cards){extra}")
 
     for scenario in SCENARIOS:
         _print_summary(by_scenario[scenario], f"Scenario {scenario}")
     _print_summary(all_results, "Overall")
     _print_all_diagnostics(all_results, by_scenario)
+    _print_profile(all_results)
+    if cache is not None:
+        print(cache.summary())
 
     # Write legacy JSON
     serialisable = []
@@ -1509,6 +1544,7 @@ def main() -> None:
         if entry.get("traceback"):
             entry["traceback"] = entry["traceback"][:2000]
         entry.pop("diagnostics", None)
+        entry.pop("profile", None)
         serialisable.append(entry)
     RESULTS_PATH.write_text(json.dumps(serialisable, indent=2), encoding="utf-8")
     print(f"\nLegacy results written to {RESULTS_PATH}")
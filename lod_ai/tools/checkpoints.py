@@ -0,0 +1,254 @@
+"""
+Mid-game checkpoints for bot-only games: resume near card N instead of
+replaying from card 1.
+
+A checkpoint file holds one game's state every *K* cards, written with
+`lod_ai.state.snapshot.SnapshotWriter` (a base, then a delta per
+checkpoint), so a 200-card game at K=10 costs little more than one full
+snapshot.  Each record's meta names the card it follows and the engine
+fingerprint (`result_cache.engine_fingerprint`); a file recorded by
+another engine is ignored, never resumed.
+
+    # record while playing (batch_smoke / soak: --checkpoints 10)
+    python -m lod_ai.tools.checkpoints record 1778 7 --every 10
+    # prove resumed play matches play from card 1, checkpoint by checkpoint
+    python -m lod_ai.tools.checkpoints verify 1778 7
+    # repro from the nearest checkpoint before card 43
+    python -m lod_ai.tools.batch_smoke --repro 1778:7 --from-card 43
+
+Tests reach a mid-game position with `engine_at`, which records the
+file on first use.  Files live in ``.lod_cache/checkpoints`` at the
+repository root (``LOD_CHECKPOINT_DIR`` overrides).
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+if os.environ.get("PYTHONHASHSEED") != "0" and __name__ == "__main__":
+    os.environ["PYTHONHASHSEED"] = "0"
+    os.execv(sys.executable, [sys.executable, "-m",
+                              "lod_ai.tools.checkpoints"] + sys.argv[1:])
+
+from lod_ai.engine import Engine
+from lod_ai.state import snapshot
+from lod_ai.state.sandbox import detached_copy
+from lod_ai.state.setup_state import build_state
+from lod_ai.tools.result_cache import engine_fingerprint
+
+DEFAULT_DIR = Path(__file__).resolve().parents[2] / ".lod_cache" / "checkpoints"
+ENV_VAR = "LOD_CHECKPOINT_DIR"
+DEFAULT_EVERY = 10
+
+
+def checkpoint_path(scenario: str, seed: int, *, setup_method: str = "standard",
+                    root: str | os.PathLike | None = None) -> Path:
+    base = Path(root or os.environ.get(ENV_VAR) or DEFAULT_DIR)
+    return base / f"{scenario}_{setup_method}_seed{seed}.lods"
+
+
+class CheckpointRecorder:
+    """Writes a checkpoint of *engine*'s game after every *every*-th card.
+
+    Call `after_card` once per card played, with the running count.
+    """
+
+    def __init__(self, path: str | os.PathLike, *, scenario: str, seed: int,
+                 setup_method: str = "standard",
+                 every: int = DEFAULT_EVERY) -> None:
+        self.path = Path(path)
+        self.every = every
+        self._meta = {"scenario": scenario, "seed": seed,
+                      "setup_method": setup_method, "every": every,
+                      "engine": engine_fingerprint()}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer = snapshot.SnapshotWriter(str(self.path),
+                                               rebase_every=1 << 30)
+
+    def after_card(self, engine: Engine, card: int) -> bool:
+        if card <= 0 or card % self.every:
+            return False
+        meta = dict(self._meta, card=card,
+                    last_action=dict(engine.dispatcher._last_action))
+        self._writer.write(engine.state, meta)
+        return True
+
+
+def nearest(path: str | os.PathLike,
+            card: int) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """``(state, meta)`` of the last checkpoint at or before *card*, or None
+    (no file, or recorded by a different engine)."""
+    try:
+        data = Path(path).read_bytes()
+    except OSError:
+        return None
+    fingerprint = engine_fingerprint()
+    cards = [meta.get("card", 0) for _, meta in snapshot.iter_snapshots(data)]
+    if not cards:
+        return None
+    wanted = max((i for i, n in enumerate(cards) if n <= card), default=None)
+    if wanted is None:
+        return None
+    for i, (state, meta) in enumerate(snapshot.iter_snapshots(data)):
+        if i == wanted:
+            if meta.get("engine") != fingerprint:
+                return None
+            return state, meta
+    return None
+
+
+def resume(state: Dict[str, Any], meta: Dict[str, Any]) -> Engine:
+    """A bot-only engine continuing from a checkpoint's state."""
+    engine = Engine(initial_state=state, use_cli=False)
+    engine.set_human_factions([])
+    engine.dispatcher._last_action = dict(meta.get("last_action") or {})
+    return engine
+
+
+def play_cards(engine: Engine, count: int, *,
+               recorder: CheckpointRecorder | None = None,
+               start: int = 0) -> int:
+    """Play up to *count* more cards (quietly, stopping at a winner or an
+    empty deck); returns the card number reached."""
+    from lod_ai.victory import check_game_over
+
+    card_no = start
+    with contextlib.redirect_stdout(io.StringIO()):
+        while card_no < start + count:
+            card = engine.draw_card()
+            if card is None:
+                break
+            engine.play_card(card, human_decider=None)
+            card_no += 1
+            if recorder is not None:
+                recorder.after_card(engine, card_no)
+            if check_game_over(engine.state):
+                break
+    return card_no
+
+
+def record(scenario: str, seed: int, *, every: int = DEFAULT_EVERY,
+           cards: int | None = None, setup_method: str = "standard",
+           root: str | os.PathLike | None = None) -> Path:
+    """Play a bot-only game from card 1, checkpointing every *every*
+    cards (the whole game unless *cards* caps it)."""
+    from lod_ai.tools.batch_smoke import CARD_SAFETY_LIMIT
+
+    path = checkpoint_path(scenario, seed, setup_method=setup_method,
+                           root=root)
+    engine = Engine(initial_state=build_state(scenario, seed=seed,
+                                              setup_method=setup_method),
+                    use_cli=False)
+    engine.set_human_factions([])
+    recorder = CheckpointRecorder(path, scenario=scenario, seed=seed,
+                                  setup_method=setup_method, every=every)
+    play_cards(engine, CARD_SAFETY_LIMIT if cards is None else cards,
+               recorder=recorder)
+    return path
+
+
+def engine_at(scenario: str, seed: int, card: int, *,
+              every: int = DEFAULT_EVERY, setup_method: str = "standard",
+              root: str | os.PathLike | None = None) -> Engine:
+    """A bot-only engine just after *card* cards of ``(scenario, seed)``:
+    resumed from the nearest checkpoint and played forward.  Records the
+    checkpoint file first if it is missing or stale."""
+    path = checkpoint_path(scenario, seed, setup_method=setup_method,
+                           root=root)
+    found = nearest(path, card)
+    if found is None and card >= every:
+        record(scenario, seed, every=every, cards=card,
+               setup_method=setup_method, root=root)
+        found = nearest(path, card)
+    if found is None:
+        engine = Engine(initial_state=build_state(
+            scenario, seed=seed, setup_method=setup_method), use_cli=False)
+        engine.set_human_factions([])
+        start = 0
+    else:
+        engine, start = resume(*found), found[1]["card"]
+    play_cards(engine, card - start, start=start)
+    return engine
+
+
+def fingerprint_of(state: Dict[str, Any]) -> Tuple[Any, ...]:
+    """What two runs must agree on: the canonical state (history entries
+    without their wall-clock stamps), the RNG's internal state and the
+    roll log's count and checksum."""
+    from lod_ai.tools.invariants import _canonical
+
+    canon = _canonical(state)
+    canon["history"] = [
+        {k: v for k, v in entry.items() if k != "stamp"}
+        if isinstance(entry, dict) else entry
+        for entry in canon.get("history", [])]
+    rng = state.get("rng")
+    rolls = state.get("rng_log")
+    return (canon, rng.getstate() if rng is not None else None,
+            getattr(rolls, "count", None), getattr(rolls, "checksum", None))
+
+
+def verify(path: str | os.PathLike) -> list[str]:
+    """Resume from each checkpoint and play to the next; the result must
+    match the next checkpoint (written by the from-card-1 run) exactly.
+    Returns the mismatches (empty: every resumed run matches)."""
+    problems: list[str] = []
+    data = Path(path).read_bytes()
+    prev: Tuple[Dict[str, Any], Dict[str, Any]] | None = None
+    for state, meta in snapshot.iter_snapshots(data):
+        if meta.get("engine") != engine_fingerprint():
+            return [f"{path}: recorded by a different engine; re-record it"]
+        if prev is not None:
+            engine = resume(*prev)
+            start = prev[1]["card"]
+            reached = play_cards(engine, meta["card"] - start, start=start)
+            if reached != meta["card"]:
+                problems.append(f"resumed at card {start}: game ended at "
+                                f"card {reached}, not {meta['card']}")
+            elif fingerprint_of(engine.state) != fingerprint_of(state):
+                problems.append(f"resumed at card {start}: state after card "
+                                f"{meta['card']} differs from the full run")
+            elif engine.dispatcher._last_action != meta.get("last_action"):
+                problems.append(f"resumed at card {start}: last actions "
+                                f"differ after card {meta['card']}")
+        prev = (detached_copy(state), meta)
+    return problems
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m lod_ai.tools.checkpoints")
+    ap.add_argument("action", choices=("record", "verify"))
+    ap.add_argument("scenario")
+    ap.add_argument("seed", type=int)
+    ap.add_argument("--every", type=int, default=DEFAULT_EVERY)
+    ap.add_argument("--setup-method", default="standard")
+    ap.add_argument("--dir", default=None, help="checkpoint directory")
+    args = ap.parse_args(argv)
+    if args.action == "record":
+        path = record(args.scenario, args.seed, every=args.every,
+                      setup_method=args.setup_method, root=args.dir)
+        count = sum(1 for _ in snapshot.read_snapshots(str(path)))
+        print(f"{count} checkpoint(s) written to {path}")
+        return 0
+    path = checkpoint_path(args.scenario, args.seed,
+                           setup_method=args.setup_method, root=args.dir)
+    if not path.exists():
+        print(f"no checkpoints at {path}; record them first")
+        return 2
+    problems = verify(path)
+    for line in problems:
+        print(f"MISMATCH: {line}")
+    if problems:
+        return 1
+    print(f"OK: every resumed segment matches the full run ({path})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,6 +6,9 @@ validation + save/load round-trip). Companion to balance_smoke (which
 guards WHO wins; this guards HOW the games run).
 
     python -m lod_ai.tools.clean_sweep_gate --seeds 1-20
+
+Finished games are reused from `lod_ai.tools.result_cache` until the
+engine (or the invariant checks) change; ``--no-cache`` replays them all.
 """
 from __future__ import annotations
 
@@ -25,8 +28,12 @@ if os.environ.get("PYTHONHASHSEED") != "0" and __name__ == "__main__":
 from lod_ai.state.setup_state import build_state
 from lod_ai.engine import Engine
 from lod_ai.tools import invariants
+from lod_ai.tools.result_cache import open_cache
 
 SCENARIOS = ("1775", "1776", "1778")
+# Tool modules whose source decides a cached result (see result_cache).
+_CACHE_DEPS = ("lod_ai.tools.clean_sweep_gate", "lod_ai.tools.invariants",
+               "lod_ai.tools.state_serializer")
 
 
 def play(scenario: str, seed: int, *, check_invariants: bool = True):
@@ -68,13 +75,22 @@ def main(argv=None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--seeds", default="1-20")
     ap.add_argument("--scenarios", default=",".join(SCENARIOS))
+    ap.add_argument("--no-cache", action="store_true",
+                    help="replay every game instead of reusing stored results")
     args = ap.parse_args(argv)
+    cache = open_cache("clean_sweep_gate", deps=_CACHE_DEPS,
+                       enabled=not args.no_cache)
     lo, _, hi = args.seeds.partition("-")
     dirty = 0
     skip_games = 0
     for scen in [s for s in args.scenarios.split(",") if s]:
         for seed in range(int(lo), int(hi or lo) + 1):
-            errs, illegal, free_skips, inv_fail, cards = play(scen, seed)
+            if cache is None:
+                outcome = play(scen, seed)
+            else:
+                outcome = cache.fetch(scen, seed, lambda: play(scen, seed),
+                                      check_invariants=True)
+            errs, illegal, free_skips, inv_fail, cards = outcome
             tag = f"[{scen} seed={seed:2d}] {cards} cards"
             if inv_fail:
                 dirty += 1
@@ -96,6 +112,8 @@ def main(argv=None) -> int:
                     print(f"    {h[:100]}")
             else:
                 print(f"{tag}  clean")
+    if cache is not None:
+        print(cache.summary())
     if dirty:
         print(f"\nFAIL: {dirty} game(s) trapped bot errors or illegal actions.")
         return 1
@@ -34,8 +34,6 @@ import os
 import random
 import sys
 import traceback
-from copy import deepcopy
-
 if os.environ.get("PYTHONHASHSEED") != "0" and __name__ == "__main__":
     os.environ["PYTHONHASHSEED"] = "0"
     os.execv(sys.executable, [sys.executable, "-m",
@@ -46,9 +44,10 @@ from lod_ai.engine import Engine
 from lod_ai import interactive_cli as cli
 from lod_ai import cli_display
 from lod_ai.cli_utils import (set_input_provider, set_game_state,
-                              set_undo_checkpoint)
+                              set_undo_journal)
 from lod_ai.commands import battle as battle_cmd
 from lod_ai.save_game import save_game, load_game
+from lod_ai.state.journal import Journal
 from lod_ai.util.validate import validate_state
 from lod_ai.tools import invariants
 
@@ -272,11 +271,13 @@ def run_resume(scenario, seed, human_factions, *, dump_dir="crash_dumps",
     try:
         with contextlib.redirect_stdout(io.StringIO()):
             played = 0
+            journal = Journal(engine.state)
+            set_undo_journal(journal)
             while played < stop_after:
+                journal.mark(played)
                 card = engine.draw_card()
                 if card is None:
                     break
-                set_undo_checkpoint(deepcopy(engine.state))
                 engine.play_card(card, human_decider=cli._human_decider)
                 played += 1
             # Save mid-game.
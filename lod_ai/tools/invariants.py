@@ -12,8 +12,9 @@ Two invariants:
 
   * ``check_save_load_roundtrip`` -- serializing the live state to the
     on-disk JSON form and loading it back reproduces the same canonical
-    state *and* the same RNG internal state.  Catches fields that do not
-    survive persistence and silent state drift.
+    state *and* the same RNG internal state; so does the binary save form
+    (`lod_ai.state.snapshot`).  Catches fields that do not survive
+    persistence and silent state drift.
 
 On failure each helper writes a crash-repro dump (scenario + seed + card
 number + traceback + full serialized state) next to the other diagnostic
@@ -31,7 +32,9 @@ from pathlib import Path
 from typing import Any, Dict
 
 from lod_ai.util.validate import validate_state
+from lod_ai.board.control import array_view
 from lod_ai.save_game import _serialize_state, _deserialize_state
+from lod_ai.state import snapshot
 from lod_ai.tools.state_serializer import serialize_state, save_report
 
 
@@ -69,10 +72,28 @@ def _roundtrip(state: Dict[str, Any], human_factions: set) -> tuple[dict, set]:
     return _deserialize_state(disk)
 
 
+def _roundtrip_binary(state: Dict[str, Any], human_factions: set) -> tuple[dict, set]:
+    """Serialize to the binary save form and reload."""
+    reloaded, meta = snapshot.loads(
+        snapshot.dumps(state, {"human_factions": sorted(human_factions)}))
+    return reloaded, set(meta["human_factions"])
+
+
+# Save forms checked in order; JSON is the export format and the invariant.
+_ROUNDTRIPS = (("JSON", _roundtrip), ("binary", _roundtrip_binary))
+
+
 # ---------------------------------------------------------------------------
 # Crash-repro dumps
 # ---------------------------------------------------------------------------
 
+def repro_command(scenario: str, seed: int, *, from_card: int = 0) -> str:
+    """The one command that replays a failing game (with *from_card*, from
+    the nearest `lod_ai.tools.checkpoints` checkpoint before that card)."""
+    cmd = f"python -m lod_ai.tools.batch_smoke --repro {scenario}:{seed}"
+    return f"{cmd} --from-card {from_card}" if from_card else cmd
+
+
 def dump_repro(
     state: Dict[str, Any],
     *,
@@ -85,16 +106,18 @@ def dump_repro(
     human_factions: set | None = None,
     setup_method: str | None = None,
     dump_dir: str = DEFAULT_DUMP_DIR,
+    from_card: int = 0,
 ) -> tuple[str, str]:
     """Write a crash-repro dump and return ``(path, repro_command)``.
 
     The dump embeds scenario + seed + card so the failure is reproducible
-    with a single command.
+    with a single command (resuming from a checkpoint before *from_card*
+    when given; see `repro_command`).
     """
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
     fname = f"{kind}_{scenario}_seed{seed}_card{card_number}_{ts}.json"
     path = Path(dump_dir) / fname
-    repro_cmd = f"python -m lod_ai.tools.batch_smoke --repro {scenario}:{seed}"
+    repro_cmd = repro_command(scenario, seed, from_card=from_card)
     report = {
         "report_type": kind,
         "timestamp": datetime.now().isoformat(),
@@ -153,7 +176,8 @@ def check_save_load_roundtrip(
     setup_method: str | None = None,
     dump_dir: str = DEFAULT_DUMP_DIR,
 ) -> None:
-    """Assert save -> load reproduces the same canonical state + RNG.
+    """Assert save -> load reproduces the same canonical state + RNG, for
+    the JSON save form and then the binary one.
 
     Dumps a repro and raises :class:`InvariantError` on any divergence.
     """
@@ -161,47 +185,48 @@ def check_save_load_roundtrip(
     before = _canonical(state)
     rng_before = state["rng"].getstate() if "rng" in state else None
 
-    try:
-        reloaded, _hf2 = _roundtrip(state, set(hf))
-    except Exception as exc:  # noqa: BLE001
-        import traceback as _tb
-        path, repro = dump_repro(
-            state, scenario=scenario, seed=seed, card_number=card_number,
-            kind="invariant_roundtrip", detail=f"serialize/deserialize raised: {exc}",
-            traceback_str=_tb.format_exc(), human_factions=set(hf),
-            setup_method=setup_method, dump_dir=dump_dir,
-        )
-        raise InvariantError(
-            f"save/load raised at {scenario} seed={seed} card={card_number}: "
-            f"{type(exc).__name__}: {exc}\n  dump: {path}\n  repro: {repro}"
-        ) from exc
-
-    after = _canonical(reloaded)
-    rng_after = reloaded["rng"].getstate() if "rng" in reloaded else None
-
-    diffs = []
-    if before != after:
-        for key in sorted(set(before) | set(after)):
-            if before.get(key) != after.get(key):
-                diffs.append(key)
-    rng_ok = (rng_before == rng_after)
-
-    if diffs or not rng_ok:
-        detail_parts = []
-        if diffs:
-            detail_parts.append(f"non-round-tripping keys: {diffs}")
-        if not rng_ok:
-            detail_parts.append("RNG internal state not preserved")
-        detail = "; ".join(detail_parts)
-        path, repro = dump_repro(
-            state, scenario=scenario, seed=seed, card_number=card_number,
-            kind="invariant_roundtrip", detail=detail,
-            human_factions=set(hf), setup_method=setup_method, dump_dir=dump_dir,
-        )
-        raise InvariantError(
-            f"save/load round-trip diverged at {scenario} seed={seed} "
-            f"card={card_number}: {detail}\n  dump: {path}\n  repro: {repro}"
-        )
+    for form, roundtrip in _ROUNDTRIPS:
+        try:
+            reloaded, _hf2 = roundtrip(state, set(hf))
+        except Exception as exc:  # noqa: BLE001
+            import traceback as _tb
+            path, repro = dump_repro(
+                state, scenario=scenario, seed=seed, card_number=card_number,
+                kind="invariant_roundtrip", detail=f"{form} serialize/deserialize raised: {exc}",
+                traceback_str=_tb.format_exc(), human_factions=set(hf),
+                setup_method=setup_method, dump_dir=dump_dir,
+            )
+            raise InvariantError(
+                f"{form} save/load raised at {scenario} seed={seed} card={card_number}: "
+                f"{type(exc).__name__}: {exc}\n  dump: {path}\n  repro: {repro}"
+            ) from exc
+
+        after = _canonical(reloaded)
+        rng_after = reloaded["rng"].getstate() if "rng" in reloaded else None
+
+        diffs = []
+        if before != after:
+            for key in sorted(set(before) | set(after)):
+                if before.get(key) != after.get(key):
+                    diffs.append(key)
+        rng_ok = (rng_before == rng_after)
+
+        if diffs or not rng_ok:
+            detail_parts = []
+            if diffs:
+                detail_parts.append(f"non-round-tripping keys: {diffs}")
+            if not rng_ok:
+                detail_parts.append("RNG internal state not preserved")
+            detail = f"{form}: " + "; ".join(detail_parts)
+            path, repro = dump_repro(
+                state, scenario=scenario, seed=seed, card_number=card_number,
+                kind="invariant_roundtrip", detail=detail,
+                human_factions=set(hf), setup_method=setup_method, dump_dir=dump_dir,
+            )
+            raise InvariantError(
+                f"{form} save/load round-trip diverged at {scenario} seed={seed} "
+                f"card={card_number}: {detail}\n  dump: {path}\n  repro: {repro}"
+            )
 
 
 def check_all(
@@ -256,6 +281,7 @@ def check_all(
 from lod_ai import rules_consts as C
 from lod_ai.map import adjacency as _adj
 from lod_ai.board import control as _control_mod
+from lod_ai.board import totals as _totals_mod
 
 _FAMILY_TAGS = {
     "British_Regular":     ((C.REGULAR_BRI, C.BRIT_UNAVAIL), C.MAX_REGULAR_BRI),
@@ -274,6 +300,9 @@ _POOL_KEYS = ("available", "unavailable", "casualties", "out_of_play")
 
 def piece_census(state: Dict[str, Any]) -> Dict[str, int]:
     """Sum every piece family across the map and all holding boxes."""
+    view = array_view(state)
+    if view is not None:
+        return view.census(_FAMILY_TAGS)
     counts = {fam: 0 for fam in _FAMILY_TAGS}
     for sp in (state.get("spaces") or {}).values():
         if not isinstance(sp, dict):
@@ -316,8 +345,10 @@ def capture_baseline(state: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def _expected_control(state: Dict[str, Any]) -> Dict[str, Any]:
-    """Recompute control exactly as board.control.refresh_control does,
-    without mutating the state."""
+    """Full-sweep recomputation of every space's controller, without
+    mutating the state.  The engine keeps control incrementally
+    (board.control); this independent sweep is the reference it is
+    checked against."""
     expected: Dict[str, Any] = {}
     for sid, sp in (state.get("spaces") or {}).items():
         if not isinstance(sp, dict):
@@ -335,6 +366,24 @@ def _expected_control(state: Dict[str, Any]) -> Dict[str, Any]:
     return expected
 
 
+def control_drift(state: Dict[str, Any]) -> list[str]:
+    """Spaces whose stored control (state["control"] or the per-space
+    mirror) differs from the full-sweep recomputation."""
+    expected = _expected_control(state)
+    stored = state.get("control") or {}
+    spaces = state.get("spaces") or {}
+    return sorted(
+        sid for sid in set(expected) | set(stored)
+        if stored.get(sid) != expected.get(sid)
+        or spaces.get(sid, {}).get("control", expected.get(sid)) != expected.get(sid))
+
+
+def victory_drift(state: Dict[str, Any]) -> Dict[str, tuple]:
+    """Running victory totals that differ from the full board scan,
+    as ``{total: (tracked, recomputed)}``."""
+    return _totals_mod.drift(state)
+
+
 _ROYALIST = (C.BRITISH, C.INDIANS)
 _REBEL = (C.PATRIOTS, C.FRENCH)
 
@@ -383,13 +432,13 @@ def _rules_property_violations(state: Dict[str, Any],
         problems.append(f"FNI (S1.9): fni_level {fni!r} outside [0, {C.MAX_FNI}]")
 
     # Control is derived state (§1.7): stored map == recomputation
-    expected_ctrl = _expected_control(state)
-    stored_ctrl = state.get("control") or {}
-    if stored_ctrl != expected_ctrl:
-        stale = sorted(
-            sid for sid in set(expected_ctrl) | set(stored_ctrl)
-            if stored_ctrl.get(sid) != expected_ctrl.get(sid))
+    stale = control_drift(state)
+    if stale:
         problems.append(f"control staleness: recomputation differs at {stale}")
+    # ... and so are the running victory totals (§7.2 margins).
+    drifted = victory_drift(state)
+    if drifted:
+        problems.append(f"victory totals staleness: (tracked, recomputed) {drifted}")
 
     # §8.3.3 post-hoc: bot-chosen Events must not net-shift the
     # Support-Opposition difference in favor of the enemy side.
@@ -0,0 +1,127 @@
+"""
+Process-pool runner for bot-only game schedules (batch_smoke, soak).
+
+A schedule is a list of ``(scenario, seed)`` pairs.  `run_games` plays
+them through `batch_smoke.run_one_game` and yields ``(index, result)``
+strictly in schedule order, so callers can stream results to a
+resumable JSONL file exactly as the serial loop did.
+
+Workers are *spawned* (not forked) with ``PYTHONHASHSEED=0``: set/dict
+iteration order still reaches a few tie-breaks, so every game must run
+under the same hash seed the serial tools pin, or the same seed could
+produce a different game depending on the worker count.  With
+``workers <= 1`` games run in-process, unchanged.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from contextlib import contextmanager
+from typing import (Any, Dict, Iterable, Iterator, List, Optional, Sequence,
+                    Tuple)
+
+from lod_ai.tools.result_cache import ResultCache, open_cache
+
+_HASHSEED = "0"
+# Tool modules whose source decides a `run_one_game` result.
+GAME_CACHE_DEPS = ("lod_ai.tools.batch_smoke", "lod_ai.tools.invariants",
+                   "lod_ai.tools.state_serializer")
+
+
+def open_game_cache(*, enabled: bool = True) -> Optional[ResultCache]:
+    """The store `run_games` shares between batch_smoke and soak (None
+    when caching is off; see `result_cache.open_cache`)."""
+    return open_cache("batch_smoke.run_one_game", deps=GAME_CACHE_DEPS,
+                      enabled=enabled)
+
+
+def _play(job: Tuple[int, str, int, Dict[str, Any]]) -> Tuple[int, Dict[str, Any]]:
+    idx, scenario, seed, kwargs = job
+    from lod_ai.tools.batch_smoke import run_one_game
+    return idx, run_one_game(scenario, seed, **kwargs)
+
+
+@contextmanager
+def pinned_hashseed():
+    """Pin ``PYTHONHASHSEED`` for processes spawned inside the block (the
+    children inherit os.environ at start-up)."""
+    old = os.environ.get("PYTHONHASHSEED")
+    os.environ["PYTHONHASHSEED"] = _HASHSEED
+    try:
+        yield
+    finally:
+        if old is None:
+            os.environ.pop("PYTHONHASHSEED", None)
+        else:
+            os.environ["PYTHONHASHSEED"] = old
+
+
+def run_games(schedule: Sequence[Tuple[str, int]], *, workers: int = 1,
+              start: int = 0, cache: Optional[ResultCache] = None,
+              **kwargs: Any) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Play ``schedule[start:]``; yield ``(index, run_one_game result)`` in
+    index order.  *kwargs* are passed through to ``run_one_game``.
+
+    With a *cache* (`lod_ai.tools.result_cache`), games already in it are
+    not replayed; only the others go to the workers, and their results
+    are stored as they arrive.
+
+    Closing the generator early (e.g. a ``--max-seconds`` budget) stops
+    the pool; games still in flight are discarded.
+    """
+    jobs = [(i, scen, seed, kwargs)
+            for i, (scen, seed) in enumerate(schedule) if i >= start]
+    if cache is None:
+        yield from _run_jobs(jobs, workers)
+        return
+    cached: Dict[int, Dict[str, Any]] = {}
+    for idx, scen, seed, _ in jobs:
+        hit = cache.get(scen, seed, **kwargs)
+        if hit is not None:
+            cached[idx] = hit
+    played = _run_jobs([job for job in jobs if job[0] not in cached], workers)
+    try:
+        for idx, scen, seed, _ in jobs:
+            if idx in cached:
+                cache.hits += 1
+                yield idx, cached.pop(idx)
+                continue
+            idx, result = next(played)
+            cache.misses += 1
+            cache.put(scen, seed, result, **kwargs)
+            yield idx, result
+    finally:
+        played.close()
+
+
+def _run_jobs(jobs: List[Tuple[int, str, int, Dict[str, Any]]],
+              workers: int) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    if workers <= 1:
+        for job in jobs:
+            yield _play(job)
+        return
+    ctx = multiprocessing.get_context("spawn")
+    with pinned_hashseed():
+        pool = ctx.Pool(processes=min(workers, max(1, len(jobs))))
+    try:
+        # imap preserves submission order; chunksize 1 keeps the
+        # in-order stream moving when game lengths vary.
+        for item in pool.imap(_play, jobs, chunksize=1):
+            yield item
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def parse_workers(argv: Iterable[str], default: int = 1) -> int:
+    """Parse ``--workers N`` / ``--workers=N`` from a raw argv list
+    (batch_smoke does its own argv handling)."""
+    args: List[str] = list(argv)
+    for i, a in enumerate(args):
+        if a == "--workers" and i + 1 < len(args):
+            return max(1, int(args[i + 1]))
+        if a.startswith("--workers="):
+            return max(1, int(a.split("=", 1)[1]))
+    return default
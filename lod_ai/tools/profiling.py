@@ -0,0 +1,194 @@
+"""Per-phase Engine profiling.
+
+Where does a game's wall time go?  `PhaseProfiler.attach(engine)` (or
+``engine.enable_profiling()``) wraps the engine's phase methods *on that
+instance* and records, per phase x card x faction, the call count, the
+inclusive time and the self time (inclusive minus nested phases):
+
+    card           Engine.play_card
+    turn           Engine.play_turn (sets the faction for nested phases)
+    bot            the faction bot's take_turn (flowchart + event trial)
+    simulate       Engine._simulate_action (sandbox + runner + legality)
+    legality       Engine._is_action_legal
+    commit         Engine._commit_state (merge + normalize_state)
+    free_ops       Engine._drain_free_ops
+    year_end       Engine._resolve_year_end
+
+An engine that was never attached runs the plain class methods, so the
+feature costs nothing when disabled.  Self times of all phases add up to
+the ``card`` total.
+
+Usage (one profiler per game; batch_smoke/soak merge them):
+
+    python -m lod_ai.tools.soak --games 60 --out soak.jsonl --profile prof.json
+    python -m lod_ai.tools.batch_smoke --profile
+    python -m lod_ai.tools.profiling --report prof.json
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# (phase, engine attribute) in report order.
+PHASES: Tuple[Tuple[str, str], ...] = (
+    ("card", "play_card"),
+    ("turn", "play_turn"),
+    ("simulate", "_simulate_action"),
+    ("legality", "_is_action_legal"),
+    ("commit", "_commit_state"),
+    ("free_ops", "_drain_free_ops"),
+    ("year_end", "_resolve_year_end"),
+)
+BOT_PHASE = "bot"
+
+Key = Tuple[str, Any, Any]          # (phase, card_id, faction)
+
+
+class PhaseProfiler:
+    def __init__(self) -> None:
+        # key -> [calls, inclusive seconds, self seconds]
+        self.stats: Dict[Key, List[float]] = defaultdict(lambda: [0, 0.0, 0.0])
+        self.games = 0
+        self._card = None
+        self._faction = None
+        self._children: List[float] = []    # nested-phase time per open frame
+
+    # -- instrumentation ---------------------------------------------------
+    def attach(self, engine: Any) -> "PhaseProfiler":
+        """Instrument *engine* (its instance only) and return self."""
+        for phase, attr in PHASES:
+            setattr(engine, attr, self._timed(phase, getattr(engine, attr)))
+        for faction, bot in getattr(engine, "bots", {}).items():
+            bot.take_turn = self._timed(BOT_PHASE, bot.take_turn,
+                                        faction=faction)
+        return self
+
+    def _timed(self, phase: str, fn, *, faction: Any = None):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            prev_card, prev_faction = self._card, self._faction
+            if phase == "card":
+                card = args[0] if args else kwargs.get("card")
+                self._card = card.get("id") if isinstance(card, dict) else None
+            elif phase in ("turn", "simulate"):
+                self._faction = args[0] if args else kwargs.get("faction")
+            elif phase == "year_end":
+                self._faction = None
+            elif faction is not None:
+                self._faction = faction
+            key = (phase, self._card, self._faction)
+            self._children.append(0.0)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                nested = self._children.pop()
+                if self._children:
+                    self._children[-1] += elapsed
+                row = self.stats[key]
+                row[0] += 1
+                row[1] += elapsed
+                row[2] += elapsed - nested
+                self._card, self._faction = prev_card, prev_faction
+        return wrapper
+
+    def finish_game(self) -> None:
+        self.games += 1
+
+    # -- persistence -------------------------------------------------------
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "games": self.games,
+            "stats": [[list(k), v] for k, v in
+                      sorted(self.stats.items(), key=lambda kv: repr(kv[0]))],
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "PhaseProfiler":
+        prof = cls()
+        prof.games = data.get("games", 0)
+        for key, row in data.get("stats", []):
+            prof.stats[tuple(key)] = list(row)
+        return prof
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.to_json(), indent=1))
+
+    @classmethod
+    def load(cls, path: str | Path) -> "PhaseProfiler":
+        return cls.from_json(json.loads(Path(path).read_text()))
+
+    def merge(self, other: "PhaseProfiler") -> None:
+        self.games += other.games
+        for key, row in other.stats.items():
+            mine = self.stats[key]
+            for i, value in enumerate(row):
+                mine[i] += value
+
+    # -- roll-ups ------------------------------------------------------------
+    def totals(self, by: str = "phase") -> Dict[Any, List[float]]:
+        """Stats summed over everything but *by* ("phase", "faction" →
+        (phase, faction), or "card")."""
+        out: Dict[Any, List[float]] = defaultdict(lambda: [0, 0.0, 0.0])
+        for (phase, card, faction), row in self.stats.items():
+            group = {"phase": phase, "faction": (phase, faction),
+                     "card": card}[by]
+            if by == "card" and phase != "card":
+                continue
+            acc = out[group]
+            for i, value in enumerate(row):
+                acc[i] += value
+        return dict(out)
+
+
+def report(prof: PhaseProfiler, *, top_cards: int = 10) -> str:
+    phases = prof.totals("phase")
+    wall = phases.get("card", [0, 0.0, 0.0])[1] or 1e-12
+    lines = [f"# Engine phase profile — {prof.games} game(s), "
+             f"{wall:.2f}s in play_card", ""]
+    lines.append(f"  {'phase':10s} {'calls':>8s} {'incl s':>9s} "
+                 f"{'self s':>9s} {'self %':>7s}")
+    order = [p for p, _ in PHASES] + [BOT_PHASE]
+    for phase in sorted(phases, key=lambda p: order.index(p)
+                        if p in order else len(order)):
+        calls, incl, own = phases[phase]
+        lines.append(f"  {phase:10s} {int(calls):8d} {incl:9.3f} "
+                     f"{own:9.3f} {100 * own / wall:6.1f}%")
+    lines.append("")
+
+    lines.append("## By faction (self seconds)")
+    by_fac = prof.totals("faction")
+    factions = sorted({f for (_p, f) in by_fac if f is not None})
+    for faction in factions:
+        parts = [f"{phase}={by_fac[(phase, faction)][2]:.3f}"
+                 for phase in order if (phase, faction) in by_fac]
+        lines.append(f"  {faction:8s} " + "  ".join(parts))
+    lines.append("")
+
+    lines.append(f"## Slowest cards (top {top_cards}, mean ms per play)")
+    cards = prof.totals("card")
+    ranked = sorted(cards.items(), key=lambda kv: -kv[1][1] / max(kv[1][0], 1))
+    for card, (calls, incl, _own) in ranked[:top_cards]:
+        lines.append(f"  card {str(card):>4s} {int(calls):6d} plays "
+                     f"{1000 * incl / max(calls, 1):8.2f} ms")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    import argparse
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--report", required=True, help="profile json to report on")
+    ap.add_argument("--top", type=int, default=10, help="slowest cards to list")
+    args = ap.parse_args(argv)
+    print(report(PhaseProfiler.load(args.report), top_cards=args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,151 @@
+"""
+Content-addressed store of finished bot-only game results.
+
+A bot-only game is deterministic for its ``(scenario, seed, setup
+method)`` under a pinned hash seed, so its result only goes stale when
+the code that plays it changes.  balance_smoke, clean_sweep_gate, soak
+and batch_smoke all replay the same games; with a `ResultCache` they
+look each one up first and only play the games whose inputs changed.
+
+A result is keyed on:
+
+* the tool's *kind* (e.g. ``"balance_smoke"``) and its keyword options;
+* ``(scenario, seed, setup_method)`` and ``PYTHONHASHSEED``;
+* the engine fingerprint: every file under ``lod_ai/`` except
+  ``tools/``, ``tests/`` and ``reports/``, plus the scenario files in
+  ``data/`` (names and bytes);
+* the source of the tool modules that produce the result (*deps*).
+
+So a docs-only change, or a change to a tool that does not produce the
+result, keeps every entry.  Entries are one file each, named by the
+SHA-256 of the key and written with `lod_ai.state.snapshot` (tuples,
+sets … come back as themselves) through a rename, so parallel workers
+can share a store.
+
+The store lives in ``.lod_cache/results`` at the repository root;
+``LOD_RESULT_CACHE`` names another directory, or disables caching with
+``off``.  Nothing is cached when the hash seed is not pinned.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence
+
+from lod_ai.state import snapshot
+
+_PACKAGE = Path(__file__).resolve().parents[1]
+_REPO = _PACKAGE.parent
+DEFAULT_ROOT = _REPO / ".lod_cache" / "results"
+ENV_VAR = "LOD_RESULT_CACHE"
+
+# Sub-trees of lod_ai that never change how a game plays.
+_NOT_ENGINE = frozenset({"tools", "tests", "reports", "__pycache__"})
+
+
+def _hash_files(h: Any, base: Path, paths: Iterable[Path]) -> None:
+    for path in sorted(paths):
+        h.update(path.relative_to(base).as_posix().encode() + b"\0")
+        h.update(path.read_bytes() + b"\0")
+
+
+@lru_cache(maxsize=None)
+def engine_fingerprint() -> str:
+    """SHA-256 over the engine's source and data files (see module doc)."""
+    h = hashlib.sha256()
+    files = [p for p in _PACKAGE.rglob("*")
+             if p.is_file() and p.suffix not in (".pyc", ".pyo")
+             and not (_NOT_ENGINE & set(p.relative_to(_PACKAGE).parts[:-1]))]
+    _hash_files(h, _REPO, files)
+    data = _REPO / "data"
+    if data.is_dir():
+        _hash_files(h, _REPO, [p for p in data.iterdir() if p.is_file()])
+    return h.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _module_digest(name: str) -> str:
+    spec = importlib.util.find_spec(name)
+    if spec is None or not spec.origin:
+        raise ImportError(f"cannot fingerprint module {name!r}")
+    return hashlib.sha256(Path(spec.origin).read_bytes()).hexdigest()
+
+
+class ResultCache:
+    """Finished-game results of one tool (*kind*), produced by the tool
+    modules named in *deps*.  `fetch` is the usual entry point."""
+
+    def __init__(self, kind: str, *, deps: Sequence[str] = (),
+                 root: str | os.PathLike | None = None) -> None:
+        self.kind = kind
+        self.root = Path(root) if root is not None else DEFAULT_ROOT
+        self.hits = 0
+        self.misses = 0
+        self._base = {
+            "kind": kind,
+            "engine": engine_fingerprint(),
+            "deps": {name: _module_digest(name) for name in sorted(deps)},
+            "hashseed": os.environ.get("PYTHONHASHSEED"),
+        }
+
+    def key(self, scenario: str, seed: int, *,
+            setup_method: str = "standard", **params: Any) -> Dict[str, Any]:
+        return dict(self._base, scenario=str(scenario), seed=seed,
+                    setup_method=setup_method,
+                    params={k: params[k] for k in sorted(params)})
+
+    def _path(self, key: Dict[str, Any]) -> Path:
+        digest = hashlib.sha256(snapshot.encode(key)).hexdigest()
+        return self.root / digest[:2] / f"{digest}.lodr"
+
+    def get(self, scenario: str, seed: int, **params: Any) -> Optional[Any]:
+        """The stored result, or None.  Unreadable entries are misses."""
+        key = self.key(scenario, seed, **params)
+        try:
+            entry = snapshot.decode(self._path(key).read_bytes())
+        except (OSError, ValueError, IndexError, KeyError):
+            return None
+        if not isinstance(entry, dict) or entry.get("key") != key:
+            return None
+        return entry["result"]
+
+    def put(self, scenario: str, seed: int, result: Any, **params: Any) -> None:
+        key = self.key(scenario, seed, **params)
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(snapshot.encode({"key": key, "result": result}))
+        os.replace(tmp, path)
+
+    def fetch(self, scenario: str, seed: int, compute: Callable[[], Any],
+              **params: Any) -> Any:
+        """The stored result, or ``compute()`` stored for next time."""
+        result = self.get(scenario, seed, **params)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = compute()
+        self.put(scenario, seed, result, **params)
+        return result
+
+    def summary(self) -> str:
+        return (f"result cache: {self.hits} hit(s), {self.misses} game(s) "
+                f"played ({self.root})")
+
+
+def open_cache(kind: str, *, deps: Sequence[str] = (),
+               enabled: bool = True) -> Optional[ResultCache]:
+    """A `ResultCache`, or None when caching is off: *enabled* is false,
+    ``LOD_RESULT_CACHE=off``, or the hash seed is not pinned (games are
+    then not reproducible)."""
+    setting = os.environ.get(ENV_VAR, "")
+    if not enabled or setting.lower() in ("off", "0", "no", "false"):
+        return None
+    if os.environ.get("PYTHONHASHSEED") in (None, "", "random"):
+        return None
+    return ResultCache(kind, deps=deps, root=setting or None)
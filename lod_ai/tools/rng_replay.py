@@ -0,0 +1,81 @@
+"""
+Replay a zero-player game's full die-roll sequence.
+
+``state["rng_log"]`` (`lod_ai.util.rng_log.RngLog`) keeps only the most
+recent rolls plus a count and a chained checksum of all of them.  When a
+diagnostic needs the whole sequence, `replay` plays the game again from
+its scenario and seed with an unbounded log and returns the first
+``count`` rolls, checking them against the live log's checksum
+(`ReplayMismatch` if the replayed game went another way — a human seat,
+a different ``PYTHONHASHSEED``).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+from typing import Any, List, Optional
+
+from lod_ai.engine import Engine
+from lod_ai.state.setup_state import build_state
+from lod_ai.tools.batch_smoke import CARD_SAFETY_LIMIT
+from lod_ai.util.rng_log import RngLog, as_rng_log, checksum_of
+from lod_ai.victory import check_game_over
+
+
+class ReplayMismatch(ValueError):
+    """The replayed game's rolls do not match the live log's checksum."""
+
+
+def replay(scenario: str, seed: int, *, count: Optional[int] = None,
+           checksum: Optional[int] = None,
+           setup_method: str = "standard") -> List[Any]:
+    """Every roll of the zero-player game *scenario*/*seed*, in order.
+
+    Plays the game with all four seats on their bots, the way
+    `tools.batch_smoke.run_one_game` does, until *count* rolls are logged
+    (the whole game if None).  With *checksum* (a live log's), the
+    replayed rolls must reproduce it or `ReplayMismatch` is raised.
+    """
+    engine = Engine(initial_state=build_state(scenario, seed=seed,
+                                              setup_method=setup_method),
+                    use_cli=False)
+    engine.set_human_factions([])
+    # An unbounded log.  Sandbox commits swap in their copy of it, so it
+    # is read back from the state below.
+    engine.state["rng_log"] = RngLog(limit=None)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(CARD_SAFETY_LIMIT):
+            if count is not None and engine.state["rng_log"].count >= count:
+                break
+            card = engine.draw_card()
+            if card is None:
+                break
+            engine.play_card(card, human_decider=None)
+            if check_game_over(engine.state):
+                break
+    log = engine.state["rng_log"]
+    rolls = list(log if count is None else log[:count])
+    if count is not None and len(rolls) < count:
+        raise ReplayMismatch(
+            f"replay of {scenario}:{seed} logged {len(rolls)} rolls, "
+            f"expected {count}")
+    if checksum is not None and checksum_of(rolls) != checksum:
+        raise ReplayMismatch(
+            f"replay of {scenario}:{seed} diverged within {len(rolls)} rolls")
+    return rolls
+
+
+def replay_state(state: dict, scenario: Optional[str] = None) -> List[Any]:
+    """`replay` the game *state* came from, checked against its log.
+
+    The scenario alias comes from *scenario* or ``state["_scenario"]``.
+    """
+    scenario = scenario or state.get("_scenario")
+    if not scenario:
+        raise ValueError("state does not record its scenario alias")
+    log = as_rng_log(state.get("rng_log"))
+    return replay(scenario, state.get("_seed", state.get("seed", 1)),
+                  count=log.count, checksum=log.checksum,
+                  setup_method=state.get("_setup_method",
+                                         state.get("setup_method", "standard")))
@@ -0,0 +1,105 @@
+"""
+Per-turn sandbox cost as a game grows: full ``deepcopy`` vs the
+copy-on-write `lod_ai.state.sandbox.SandboxState` the engine now uses.
+
+Plays one bot-only game and, every ``--every`` cards, times a typical
+turn's sandbox round trip on the live state: fork, touch what a turn
+touches (history, resources, the spaces it acts in, the rng), then
+commit.  The deepcopy column grows with history/played_cards;
+the copy-on-write column should stay flat.
+
+    python -m lod_ai.tools.sandbox_benchmark --scenario 1775 --seed 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from copy import deepcopy
+
+if os.environ.get("PYTHONHASHSEED") != "0" and __name__ == "__main__":
+    os.environ["PYTHONHASHSEED"] = "0"
+    os.execv(sys.executable, [sys.executable, "-m",
+                              "lod_ai.tools.sandbox_benchmark"] + sys.argv[1:])
+
+from lod_ai.state.setup_state import build_state
+from lod_ai.engine import Engine
+from lod_ai.state.sandbox import SandboxState
+from lod_ai.util.history import push_history
+
+
+def _typical_turn(sb: dict, touched_spaces) -> None:
+    """The writes an ordinary Command turn makes on its sandbox."""
+    push_history(sb, "benchmark turn")
+    sb["resources"]["BRITISH"] = sb["resources"].get("BRITISH", 0)
+    for sid in touched_spaces:
+        sb["spaces"][sid]["_bench"] = 0
+        del sb["spaces"][sid]["_bench"]
+    sb["rng"].random()
+
+
+def _time_round_trip(state: dict, *, cow: bool, reps: int) -> float:
+    """Mean milliseconds for fork + typical turn + commit on *state*."""
+    touched = sorted(state["spaces"])[:3]
+    target = deepcopy(state)
+    start = time.perf_counter()
+    for _ in range(reps):
+        if cow:
+            sb = SandboxState(target)
+            _typical_turn(sb, touched)
+            sb.commit_into(target)
+        else:
+            sb = deepcopy(target)
+            _typical_turn(sb, touched)
+            target.clear()
+            target.update(sb)
+    return (time.perf_counter() - start) * 1000.0 / reps
+
+
+def run(scenario: str, seed: int, every: int, reps: int, max_cards: int):
+    """Return rows of (cards, history_len, deepcopy_ms, cow_ms)."""
+    engine = Engine(initial_state=build_state(scenario, seed=seed))
+    engine.set_human_factions(set())
+    rows = []
+    cards = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        while cards < max_cards:
+            if cards % every == 0:
+                st = engine.state
+                rows.append((cards, len(st.get("history", [])),
+                             _time_round_trip(st, cow=False, reps=reps),
+                             _time_round_trip(st, cow=True, reps=reps)))
+            card = engine.draw_card()
+            if card is None:
+                break
+            engine.play_card(card)
+            cards += 1
+    return rows
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--scenario", default="1775")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--every", type=int, default=10,
+                    help="sample the sandbox cost every N cards")
+    ap.add_argument("--reps", type=int, default=50)
+    ap.add_argument("--max-cards", type=int, default=200)
+    args = ap.parse_args(argv)
+
+    rows = run(args.scenario, args.seed, args.every, args.reps,
+               args.max_cards)
+    print(f"Sandbox round trip per turn, scenario {args.scenario} "
+          f"seed {args.seed} ({args.reps} reps per sample)")
+    print(f"{'cards':>6} {'history':>8} {'deepcopy ms':>12} {'cow ms':>8}")
+    for cards, hist, dc, cow in rows:
+        print(f"{cards:>6} {hist:>8} {dc:>12.3f} {cow:>8.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -15,6 +15,19 @@ run_one_game, each naming the one command that reproduces it.
 
     # full per-card invariants (slower):
     python -m lod_ai.tools.soak --games 200 --out soak_inv.jsonl --invariants
+
+    # spread the schedule over 8 worker processes (same records, in order):
+    python -m lod_ai.tools.soak --games 1000 --out soak.jsonl --workers 8
+
+    # board tallies through the NumPy view (lod_ai.board.arrays):
+    python -m lod_ai.tools.soak --games 60 --out soak.jsonl --arrays
+
+    # aggregate engine phase timings (resumes like --coverage):
+    python -m lod_ai.tools.soak --games 60 --out soak.jsonl --profile prof.json
+
+Games already played by this engine (here or by batch_smoke) are reused
+from `lod_ai.tools.result_cache`; ``--no-cache`` replays them, and
+``--coverage`` / ``--profile`` always play every game.
 """
 
 from __future__ import annotations
@@ -30,7 +43,7 @@ if os.environ.get("PYTHONHASHSEED") != "0" and __name__ == "__main__":
     os.execv(sys.executable, [sys.executable, "-m",
                               "lod_ai.tools.soak"] + sys.argv[1:])
 
-from lod_ai.tools.batch_smoke import run_one_game
+from lod_ai.tools.parallel import open_game_cache, run_games
 
 SCENARIOS = ("1775", "1776", "1778")
 
@@ -59,7 +72,21 @@ def main(argv=None) -> int:
                     help="assert per-card invariants (save/load + validate)")
     ap.add_argument("--coverage", default=None,
                     help="aggregate decision coverage into this json (Piece 5)")
+    ap.add_argument("--profile", default=None,
+                    help="aggregate engine phase timings into this json")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="play games in N spawned processes (PYTHONHASHSEED=0)")
+    ap.add_argument("--checkpoints", type=int, default=0, metavar="K",
+                    help="checkpoint each game every K cards, so repro "
+                         "commands resume near the failing card")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="replay every game instead of reusing stored results")
+    ap.add_argument("--arrays", action="store_true",
+                    help="attach a NumPy board view to every game "
+                         "(lod_ai.board.arrays)")
     args = ap.parse_args(argv)
+    if args.coverage and args.workers > 1:
+        ap.error("--coverage aggregates in-process; use --workers 1")
 
     schedule = list(_plan(args.games, args.seed_base))
     done = _completed(args.out)
@@ -70,39 +97,61 @@ def main(argv=None) -> int:
         if _os.path.exists(args.coverage):
             _coll.merge(_cov.Collector.load(args.coverage))
             _coll.games = _coll.games  # resumed totals carry forward
+    if args.profile:
+        from lod_ai.tools import profiling as _prof
+        _profiler = _prof.PhaseProfiler()
+        if os.path.exists(args.profile):
+            _profiler.merge(_prof.PhaseProfiler.load(args.profile))
     start = time.time()
     ran = 0
     failures = 0
 
+    cache = open_game_cache(enabled=not (args.no_cache or args.coverage
+                                          or args.profile))
     with open(args.out, "a") as f:
-        for idx in range(done, len(schedule)):
-            if args.max_seconds and (time.time() - start) >= args.max_seconds:
-                break
-            scen, seed = schedule[idx]
-            result = run_one_game(scen, seed, check_invariants=args.invariants)
-            bad = result["end_reason"] in ("CRASH", "INVARIANT",
-                                           "INTERACTIVE_PROMPT")
-            rec = {
-                "i": idx, "scenario": scen, "seed": seed,
-                "end_reason": result["end_reason"],
-                "winner": result["winner"],
-                "cards": result["cards_played"],
-                "error": result["error"],
-                "repro": result.get("repro_command"),
-            }
-            f.write(json.dumps(rec) + "\n")
-            f.flush()
-            ran += 1
-            if args.coverage:
-                _coll.finish_game()
-            if bad:
-                failures += 1
-                print(f"  FAIL [{scen} seed={seed}] {result['end_reason']}: "
-                      f"{result['error']}  repro: {result.get('repro_command')}")
+        games = run_games(schedule, workers=args.workers, start=done,
+                          cache=cache, check_invariants=args.invariants,
+                          profile=bool(args.profile),
+                          checkpoint_every=args.checkpoints,
+                          arrays=args.arrays)
+        try:
+            for idx, result in games:
+                scen, seed = schedule[idx]
+                bad = result["end_reason"] in ("CRASH", "INVARIANT",
+                                               "INTERACTIVE_PROMPT")
+                rec = {
+                    "i": idx, "scenario": scen, "seed": seed,
+                    "end_reason": result["end_reason"],
+                    "winner": result["winner"],
+                    "cards": result["cards_played"],
+                    "error": result["error"],
+                    "repro": result.get("repro_command"),
+                }
+                f.write(json.dumps(rec) + "\n")
+                f.flush()
+                ran += 1
+                if args.coverage:
+                    _coll.finish_game()
+                if args.profile and result.get("profile"):
+                    _profiler.merge(_prof.PhaseProfiler.from_json(result["profile"]))
+                if bad:
+                    failures += 1
+                    print(f"  FAIL [{scen} seed={seed}] {result['end_reason']}: "
+                          f"{result['error']}  repro: {result.get('repro_command')}")
+                if args.max_seconds and \
+                        (time.time() - start) >= args.max_seconds:
+                    break
+        finally:
+            games.close()
 
     if args.coverage:
         _coll.save(args.coverage)
+    if args.profile:
+        _profiler.save(args.profile)
+        print(_prof.report(_profiler))
 
+    if cache is not None:
+        print(cache.summary())
     now_done = _completed(args.out)
     elapsed = time.time() - start
     print(f"ran {ran} game(s) this invocation in {elapsed:.1f}s "
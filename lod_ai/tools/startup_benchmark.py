@@ -0,0 +1,92 @@
+"""
+Cold-start cost of a worker: import-to-first-card time in a fresh
+interpreter.
+
+Every batch worker pays this once per process.  Each run starts a new
+``python`` (so nothing is warm except the OS file cache) and times
+three phases: ``import lod_ai.engine``, ``build_state`` for the
+scenario, and drawing + playing the first card bot-only.  It also
+reports how many of the per-era card-effect modules the run imported;
+`lod_ai.cards` imports them lazily, so a first card loads at most one.
+
+    python -m lod_ai.tools.startup_benchmark --scenario 1775 --runs 7
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+if os.environ.get("PYTHONHASHSEED") != "0" and __name__ == "__main__":
+    os.environ["PYTHONHASHSEED"] = "0"
+    os.execv(sys.executable, [sys.executable, "-m",
+                              "lod_ai.tools.startup_benchmark"] + sys.argv[1:])
+
+_REPO = Path(__file__).resolve().parents[2]
+
+# Runs in the child interpreter; prints one JSON line of timings.
+_PROBE = """
+import contextlib, io, json, sys, time
+t0 = time.perf_counter()
+from lod_ai.engine import Engine
+from lod_ai.state.setup_state import build_state
+t1 = time.perf_counter()
+engine = Engine(initial_state=build_state({scenario!r}, seed={seed}),
+                use_cli=False)
+engine.set_human_factions([])
+t2 = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    engine.play_card(engine.draw_card(), human_decider=None)
+t3 = time.perf_counter()
+eras = sorted(m.rsplit(".", 1)[1] for m in sys.modules
+              if m.startswith("lod_ai.cards.effects.")
+              and m != "lod_ai.cards.effects.shared")
+print(json.dumps({{"import": t1 - t0, "setup": t2 - t1, "first_card": t3 - t2,
+                  "eras": eras}}))
+"""
+
+PHASES = ("import", "setup", "first_card")
+
+
+def measure(scenario: str, seed: int) -> dict:
+    """One fresh-interpreter run: seconds per phase and the era modules
+    it imported."""
+    env = dict(os.environ, PYTHONHASHSEED="0", PYTHONDONTWRITEBYTECODE="1")
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(scenario=scenario, seed=seed)],
+        cwd=_REPO, env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def run(scenario: str, seed: int, runs: int) -> list[dict]:
+    measure(scenario, seed)     # warm the OS file cache and bytecode
+    return [measure(scenario, seed) for _ in range(runs)]
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--scenario", default="1775")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--runs", type=int, default=7)
+    args = ap.parse_args(argv)
+
+    rows = run(args.scenario, args.seed, args.runs)
+    print(f"Import-to-first-card, scenario {args.scenario} seed {args.seed} "
+          f"(median of {args.runs} fresh interpreters)")
+    for phase in PHASES:
+        ms = statistics.median(r[phase] for r in rows) * 1000.0
+        print(f"{phase:>12} {ms:8.1f} ms")
+    total = statistics.median(sum(r[p] for p in PHASES) for r in rows) * 1000.0
+    print(f"{'total':>12} {total:8.1f} ms")
+    eras = sorted({e for r in rows for e in r["eras"]})
+    print(f"card-effect modules imported: {', '.join(eras) or 'none'}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
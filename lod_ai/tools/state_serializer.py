@@ -6,12 +6,14 @@ Safely converts game state to JSON-serializable dict, handling:
 - frozensets → sorted lists
 - defaultdicts → plain dicts
 - Random objects → seed string
+- the roll log (RngLog) → its count, checksum and recent rolls
 - Any other non-serializable types → string repr
 """
 
 from __future__ import annotations
 
 import json
+import os
 import random
 import traceback
 from collections import defaultdict
@@ -20,6 +22,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List
 
+from lod_ai.util.rng_log import RngLog
+
 
 def _make_serializable(obj: Any) -> Any:
     """Recursively convert non-JSON-serializable types."""
@@ -31,6 +35,8 @@ def _make_serializable(obj: Any) -> Any:
         return {_make_serializable(k): _make_serializable(v) for k, v in obj.items()}
     if isinstance(obj, dict):
         return {str(k): _make_serializable(v) for k, v in obj.items()}
+    if isinstance(obj, RngLog):
+        return _make_serializable(obj.summary())
     if isinstance(obj, (list, tuple)):
         return [_make_serializable(item) for item in obj]
     if isinstance(obj, random.Random):
@@ -168,13 +174,18 @@ def build_game_report(
 
 
 def save_report(report: Dict[str, Any], filepath: str | Path) -> str:
-    """Write a report dict to a JSON file. Returns the path string."""
+    """Write a report dict to a JSON file. Returns the path string.
+
+    The file is written beside its target and renamed into place, so a
+    reader (or a crash mid-write) never sees half a report."""
     path = Path(filepath)
     path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
     try:
-        path.write_text(json.dumps(report, indent=2, default=str), encoding="utf-8")
+        tmp.write_text(json.dumps(report, indent=2, default=str), encoding="utf-8")
     except Exception as exc:
         # Last resort: try writing with all values as strings
         fallback = json.dumps(report, indent=2, default=repr)
-        path.write_text(fallback, encoding="utf-8")
+        tmp.write_text(fallback, encoding="utf-8")
+    os.replace(tmp, path)
     return str(path)
@@ -2,18 +2,233 @@
 lod_ai.util.history
 ===================
 
-Lightweight, in-state history stack.
+Append-only game log.
 
 • Every mutation helper should call `push_history(state, msg)`.
-• Each entry now stores:
+• Each entry stores:
       {"seq": 1, "msg": "Patriots Resources +3", "stamp": "2025-05-10 21:04"}
   (stamp is ISO datetime; feel free to ignore it in tests).
+• Entries that other code reacts to are *typed*: they also carry
+  ``"kind"`` (one of the event kinds below) and a ``"data"`` dict, e.g.
+      {"seq": 7, "msg": "BRITISH PASS", "kind": "pass",
+       "data": {"faction": "BRITISH"}, "stamp": "…"}
+  Consumers read these fields (`events`, `last_event`) instead of
+  parsing the human-readable ``msg``.
 
-Undo/redo is still a stub—only the log itself is maintained.
+``state["history"]`` is a `HistoryLog` once a state has gone through
+`normalize_state` (plain lists keep working for hand-built test states).
+The log is a ``list`` of entry dicts with extras:
+
+* ``cursor`` / ``since(n)`` — "entries appended after position n";
+* ``subscribe(callback, kinds)`` — called with each entry as it lands;
+* ``open_sink(path)`` — stream every entry to a JSONL file.
+
+Engine sandboxes never copy the log: `fork()` returns a `HistoryFork`
+that records the parent's length and keeps only its own tail.  Committing
+the sandbox appends that tail to the parent, which is the point where
+subscribers and the sink see the new entries; a discarded sandbox leaves
+no trace.  Entries are never edited after they are appended, so copies
+of a log share them.
+
+Undo/redo of the game lives in `lod_ai.state.journal`: a journal step
+keeps the log's new tail, and undoing it truncates the log in place
+(subscribers and the sink are not told; they saw the entries as played).
 """
 
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+# --------------------------------------------------------------------------- #
+# Event kinds (entry["kind"]) and their entry["data"] fields
+# --------------------------------------------------------------------------- #
+PASS = "pass"                        # faction
+BATTLE = "battle"                    # faction, spaces
+BATTLE_RESULT = "battle_result"      # space, losses {side: n}, winner
+SPECIAL_ACTIVITY = "special_activity"  # faction, activity
+TREATY = "treaty_of_alliance"        # —
+VICTORY_CHECK = "victory_check"      # margins {faction: [m1, m2]}
+VICTORY = "victory"                  # — (Winter-Quarters victory, §6.1)
+FINAL_SCORING = "final_scoring"      # scores {faction: total}
+WINNER = "winner"                    # faction
+
+Entry = Dict[str, Any]
+
+
+# --------------------------------------------------------------------------- #
+# Log objects
+# --------------------------------------------------------------------------- #
+class HistoryLog(list):
+    """The live game log (see module docstring)."""
+
+    __slots__ = ("_subscribers", "_sink")
+
+    def __init__(self, entries: Iterable[Entry] = ()) -> None:
+        super().__init__(entries)
+        self._subscribers: List[tuple] = []
+        self._sink: Optional[TextIO] = None
+
+    # -- appends -----------------------------------------------------------
+    def append(self, entry: Entry) -> None:
+        list.append(self, entry)
+        if self._subscribers or self._sink is not None:
+            self._publish(entry)
+
+    def extend(self, entries: Iterable[Entry]) -> None:
+        if not self._subscribers and self._sink is None:
+            list.extend(self, entries)
+            return
+        for entry in entries:
+            self.append(entry)
+
+    def _publish(self, entry: Entry) -> None:
+        if self._sink is not None:
+            self._sink.write(json.dumps(entry, default=str) + "\n")
+        kind = entry.get("kind") if isinstance(entry, dict) else None
+        for kinds, callback in list(self._subscribers):
+            if kinds is None or kind in kinds:
+                callback(entry)
+
+    # -- cursor ---------------------------------------------------------------
+    @property
+    def cursor(self) -> int:
+        """Position of the next entry; pass it to `since` later."""
+        return len(self)
+
+    def since(self, cursor: int) -> List[Entry]:
+        """Entries appended after *cursor*."""
+        return list.__getitem__(self, slice(cursor, None))
+
+    # -- consumers ------------------------------------------------------------
+    def subscribe(self, callback: Callable[[Entry], Any],
+                  kinds: Iterable[str] | None = None) -> Callable[[], None]:
+        """Call *callback(entry)* for every entry appended from now on
+        (only typed entries of *kinds*, if given).  Returns an
+        unsubscribe function."""
+        record = (frozenset(kinds) if kinds is not None else None, callback)
+        self._subscribers.append(record)
+
+        def unsubscribe() -> None:
+            if record in self._subscribers:
+                self._subscribers.remove(record)
+        return unsubscribe
+
+    def open_sink(self, path: str) -> None:
+        """Stream every entry appended from now on to *path* as JSONL."""
+        self.close_sink()
+        self._sink = open(path, "a", encoding="utf-8", buffering=1)
+
+    def close_sink(self) -> None:
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+    # -- forks and copies -------------------------------------------------------
+    def fork(self) -> "HistoryFork":
+        return HistoryFork(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "HistoryLog":
+        # Entries are immutable once appended; a copy shares them and
+        # drops the subscribers and sink.
+        twin = HistoryLog(self)
+        memo[id(self)] = twin
+        return twin
+
+    def __reduce__(self):
+        return (HistoryLog, (list(self),))
+
+
+class HistoryFork(Sequence):
+    """A sandbox's view of a log: the parent's first *n* entries (read
+    through, never copied) plus the entries appended in the sandbox."""
+
+    __slots__ = ("parent", "base", "tail")
+
+    def __init__(self, parent: Sequence) -> None:
+        self.parent = parent
+        self.base = len(parent)
+        self.tail: List[Entry] = []
+
+    def __len__(self) -> int:
+        return self.base + len(self.tail)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("history index out of range")
+        if index < self.base:
+            return self.parent[index]
+        return self.tail[index - self.base]
+
+    def __iter__(self) -> Iterator[Entry]:
+        for i in range(self.base):
+            yield self.parent[i]
+        yield from self.tail
+
+    def __eq__(self, other: Any) -> bool:
+        if other is self.parent:
+            return not self.tail and len(other) == self.base
+        if isinstance(other, (list, HistoryFork)):
+            return len(self) == len(other) and \
+                all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"HistoryFork(base={self.base}, tail={self.tail!r})"
+
+    def append(self, entry: Entry) -> None:
+        self.tail.append(entry)
+
+    def extend(self, entries: Iterable[Entry]) -> None:
+        self.tail.extend(entries)
+
+    def pop(self, index: int = -1) -> Entry:
+        """Remove an entry appended in this sandbox."""
+        if not self.tail:
+            raise IndexError("cannot pop entries the sandbox did not append")
+        return self.tail.pop(index)
+
+    @property
+    def cursor(self) -> int:
+        return len(self)
+
+    def since(self, cursor: int) -> List[Entry]:
+        return self[cursor:]
+
+    def fork(self) -> "HistoryFork":
+        return HistoryFork(self)
+
+    def commit_into(self, target: Any) -> None:
+        """Append this sandbox's entries to *target* (the parent's log)."""
+        target.extend(self.tail)
+
+    def materialize(self) -> HistoryLog:
+        return HistoryLog(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> HistoryLog:
+        twin = self.materialize()
+        memo[id(self)] = twin
+        return twin
+
+    def __reduce__(self):
+        return (HistoryLog, (list(self),))
+
+
+def as_history_log(history: Any) -> Any:
+    """*history* as a `HistoryLog` (a plain list is wrapped once; logs and
+    forks are returned unchanged)."""
+    if isinstance(history, (HistoryLog, HistoryFork)):
+        return history
+    return HistoryLog(history or ())
+
 
 # --------------------------------------------------------------------------- #
 # Core helpers
@@ -21,24 +236,28 @@ from typing import Any, Dict, List
 
 def _ensure_stack(state: Dict[str, Any]) -> List[Dict[str, Any]]:
     if "history" not in state:
-        state["history"] = []
+        state["history"] = HistoryLog()
     return state["history"]
 
 
-def push_history(state: Dict[str, Any], message: str | None = None) -> None:
+def push_history(state: Dict[str, Any], message: str | None = None, *,
+                 kind: str | None = None,
+                 data: Dict[str, Any] | None = None) -> None:
     """
     Append *message* to the history list with an auto-incremented sequence
     number and a timestamp (string).  Existing code that only looks at
-    ["msg"] remains unaffected.
+    ["msg"] remains unaffected.  *kind* / *data* make it a typed event.
     """
     stack = _ensure_stack(state)
     seq = stack[-1]["seq"] + 1 if stack else 1
     stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     if message is None:                # allow call sites that pass no msg
         message = "—"
-    stack.append(
-        {"seq": seq, "msg": message, "stamp": stamp}
-    )
+    entry = {"seq": seq, "msg": message, "stamp": stamp}
+    if kind is not None:
+        entry["kind"] = kind
+        entry["data"] = dict(data or {})
+    stack.append(entry)
 
 def last_entry(state: Dict[str, Any]) -> str | None:
     """
@@ -49,19 +268,46 @@ def last_entry(state: Dict[str, Any]) -> str | None:
     return stack[-1]["msg"] if stack else None
 
 
+def entries_since(history: Sequence, cursor: int) -> List[Entry]:
+    """Entries of *history* (log, fork or plain list) after *cursor*."""
+    return list(history[cursor:])
+
+
+def events(history: Sequence, *kinds: str, since: int = 0) -> Iterator[Entry]:
+    """Typed entries of the given *kinds* (any kind, if none) appended
+    after *since*."""
+    for entry in entries_since(history, since):
+        if isinstance(entry, dict) and "kind" in entry and \
+                (not kinds or entry["kind"] in kinds):
+            yield entry
+
+
+def last_event(history: Sequence, *kinds: str,
+               within: int | None = None) -> Entry | None:
+    """Most recent typed entry of *kinds*, looking back at most *within*
+    entries."""
+    n = len(history)
+    stop = max(0, n - within) if within is not None else 0
+    for i in range(n - 1, stop - 1, -1):
+        entry = history[i]
+        if isinstance(entry, dict) and entry.get("kind") in kinds:
+            return entry
+    return None
+
+
 # --------------------------------------------------------------------------- #
 # Optional convenience helpers
 # --------------------------------------------------------------------------- #
 
 def reset_history(state: Dict[str, Any]) -> None:
     """Erase the history stack (handy in test fixtures)."""
-    state["history"] = []
+    state["history"] = HistoryLog()
 
 
 def undo(state: Dict[str, Any]) -> None:
     """
     Remove the last history entry.
-    NOTE: This still does *not* roll back game state—only the log entry.
+    The game state is not rolled back (`lod_ai.state.journal` does that).
     """
     stack = _ensure_stack(state)
     if stack:
@@ -32,3 +32,12 @@ def pop_loss_mod(state: Dict[str, Any], space: str) -> tuple[int, int]:
             q.pop(idx)
             return att, defe
     return 0, 0
+
+
+def peek_loss_mod(state: Dict[str, Any], space: str) -> tuple[int, int]:
+    """The (att_delta, def_delta) `pop_loss_mod` would return, without
+    consuming it."""
+    for sp, att, defe in state.get("loss_mod_queue", []):
+        if sp is None or sp == space:
+            return att, defe
+    return 0, 0
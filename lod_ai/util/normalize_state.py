@@ -7,12 +7,15 @@ State normalisation helpers.
 shape, refreshes control, and enforces caps.  Call after any mutation.
 """
 
-from typing import Dict, Iterable
+from typing import Dict, Iterable, Optional
 
 from lod_ai import rules_consts as C
+from lod_ai.board import totals
 from lod_ai.board.control import refresh_control
 from lod_ai.map import adjacency as map_adj
 from lod_ai.util.caps import enforce_global_caps
+from lod_ai.util.history import as_history_log
+from lod_ai.util.rng_log import as_rng_log
 from lod_ai.economy import resources
 from lod_ai.leaders import leader_location
 
@@ -33,8 +36,14 @@ def _ensure_core(state: Dict) -> None:
     state.setdefault("available", {})
     state.setdefault("unavailable", {})
     state.setdefault("casualties", {})
-    state.setdefault("history", [])
-    state.setdefault("rng_log", [])
+    history = state.get("history")
+    log = as_history_log(history)
+    if log is not history:
+        state["history"] = log
+    rolls = state.get("rng_log")
+    log = as_rng_log(rolls)
+    if log is not rolls:
+        state["rng_log"] = log
     state.setdefault("eligible", {})
     state.setdefault("fni_level", 0)
 
@@ -147,13 +156,16 @@ def _normalize_markers(state: Dict) -> None:
     state["markers"] = normalized
 
 
-def _sanitize_spaces(state: Dict, valid_spaces: Iterable[str]) -> None:
+def _sanitize_spaces(state: Dict, valid_spaces: Iterable[str],
+                     touched: Optional[Iterable[str]] = None) -> None:
     valid_set = set(valid_spaces)
     for sid in list(state["spaces"].keys()):
         if sid not in valid_set:
             state["spaces"].pop(sid)
+    for sid in (state["spaces"] if touched is None else touched):
+        sp = state["spaces"].get(sid)
+        if sp is None:
             continue
-        sp = state["spaces"][sid]
         for tag, qty in list(sp.items()):
             if not isinstance(qty, int):
                 sp.pop(tag)
@@ -257,16 +269,29 @@ def _enforce_leader_orphan(state: Dict) -> None:
                          per_faction_best[faction] or "Available")
 
 
-def normalize_state(state: Dict) -> None:
-    """Coerce *state* into canonical shape and enforce invariants."""
+def normalize_state(state: Dict,
+                    touched: Optional[Iterable[str]] = None) -> None:
+    """Coerce *state* into canonical shape and enforce invariants.
+
+    *touched*: ids of the only spaces that changed since the state was
+    last normalized (e.g. the spaces a sandbox commit wrote); space
+    sanitizing and Control are then limited to them.  None means any
+    space may have changed.
+    """
     _ensure_core(state)
     _sync_treaty_flags(state)
     valid_spaces = list(map_adj.all_space_ids())
-    _sanitize_spaces(state, valid_spaces)
+    if touched is not None:
+        touched = [sid for sid in touched if sid in state["spaces"]]
+    _sanitize_spaces(state, valid_spaces, touched)
     _normalize_support(state, valid_spaces)
     _normalize_markers(state)
     _sanitize_pools(state)
     resources.clamp_all(state)
-    refresh_control(state)
+    refresh_control(state, touched)
+    if totals.KEY in state:
+        totals.sync_support(state)
+    else:
+        totals.track(state)
     _enforce_leader_orphan(state)  # §1.10 (C5)
     enforce_global_caps(state)
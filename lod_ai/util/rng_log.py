@@ -0,0 +1,104 @@
+"""
+lod_ai.util.rng_log
+===================
+
+Bounded die-roll log.
+
+Every logged roll appends a ``(label, value, ...)`` tuple to
+``state["rng_log"]`` (e.g. ``battle._roll_d3``).  A game-long list grew
+with every roll and was copied with every sandbox and trial, so the log
+is an `RngLog`: a ``list`` holding only the most recent `RECENT` rolls,
+plus
+
+* ``count``    — rolls logged since the game began;
+* ``checksum`` — a CRC-32 chained over every roll's ``repr``.
+
+Reads that look at recent rolls (``[e for e in state["rng_log"] ...]``)
+work unchanged.  When a diagnostic needs the whole sequence,
+`lod_ai.tools.rng_replay` plays the game again and checks the rolls
+against ``count`` and ``checksum``.
+
+``state["rng_log"]`` is an `RngLog` once a state has gone through
+`normalize_state`; a plain list (hand-built test states, old saves) is
+wrapped by `as_rng_log`, which counts and checksums its entries.
+"""
+
+from __future__ import annotations
+
+import zlib
+from typing import Any, Iterable, Optional
+
+# Rolls kept in ``state["rng_log"]``.
+RECENT = 256
+
+
+def _chain(checksum: int, entry: Any) -> int:
+    return zlib.crc32(repr(entry).encode("utf-8"), checksum)
+
+
+def checksum_of(entries: Iterable[Any], checksum: int = 0) -> int:
+    """The `RngLog.checksum` of *entries* (continuing from *checksum*)."""
+    for entry in entries:
+        checksum = _chain(checksum, entry)
+    return checksum
+
+
+class RngLog(list):
+    """``state["rng_log"]`` (see module docstring).
+
+    *limit* None keeps every roll (`tools.rng_replay` uses that).
+    """
+
+    __slots__ = ("count", "checksum", "limit")
+    count: int  # type: ignore[assignment]  # shadows list.count
+    checksum: int
+    limit: Optional[int]
+
+    def __init__(self, entries: Iterable[Any] = (), count: Optional[int] = None,
+                 checksum: Optional[int] = None,
+                 limit: Optional[int] = RECENT) -> None:
+        entries = list(entries)
+        if count is None:
+            count, checksum = len(entries), checksum_of(entries)
+        if limit is not None and len(entries) > limit:
+            entries = entries[len(entries) - limit:]
+        super().__init__(entries)
+        self.count = count
+        self.checksum = checksum or 0
+        self.limit = limit
+
+    def append(self, entry: Any) -> None:
+        list.append(self, entry)
+        self.count += 1
+        self.checksum = _chain(self.checksum, entry)
+        if self.limit is not None and len(self) > self.limit:
+            del self[0]
+
+    def extend(self, entries: Iterable[Any]) -> None:
+        for entry in entries:
+            self.append(entry)
+
+    def copy(self) -> "RngLog":
+        return RngLog(self, self.count, self.checksum, self.limit)
+
+    def __reduce__(self):
+        return RngLog, (list(self), self.count, self.checksum, self.limit)
+
+    def summary(self) -> dict:
+        """``{"count", "checksum", "recent"}`` (JSON-ready)."""
+        return {"count": self.count, "checksum": self.checksum,
+                "recent": [list(e) if isinstance(e, tuple) else e
+                           for e in self]}
+
+
+def as_rng_log(value: Any) -> RngLog:
+    """*value* as an `RngLog`: logs are returned unchanged, a list is
+    wrapped, and a `RngLog.summary` dict (JSON saves) is restored."""
+    if isinstance(value, RngLog):
+        return value
+    if isinstance(value, dict):
+        recent = [tuple(e) if isinstance(e, list) else e
+                  for e in value.get("recent", ())]
+        return RngLog(recent, value.get("count", len(recent)),
+                      value.get("checksum", 0))
+    return RngLog(value or ())
@@ -26,12 +26,13 @@ Every step logs a concise message via ``util.history.push_history``.
 # ────────────────────────────────────────────────────────────────
 from typing import List, Tuple, Dict
 
-from lod_ai.util.history import push_history
+from lod_ai.util.history import VICTORY, push_history
 from lod_ai.board.pieces import (
     remove_piece, place_with_caps, return_leaders, lift_casualties, flip_pieces
 )
 import lod_ai.board.pieces as bp
 from lod_ai.board import control as board_control
+from lod_ai.board.totals import set_support
 from lod_ai.map import adjacency as map_adj
 from lod_ai.util import caps as caps_util
 from lod_ai.economy import resources
@@ -81,16 +82,10 @@ def _supply_phase(state, *, bots=None, human_factions=None):
 
     def _control_after(sid, removals):
         """Space control after hypothetically removing *removals*
-        ({tag: n}) from *sid* — simulate, refresh, read (8.5.5/8.6.7/
-        8.7.5 all key the pay decision on an actual control change)."""
-        import copy
-        st2 = {"spaces": copy.deepcopy(state["spaces"]),
-               "control": dict(state.get("control", {}))}
-        sp2 = st2["spaces"].get(sid, {})
-        for tag, n in removals.items():
-            sp2[tag] = max(0, sp2.get(tag, 0) - n)
-        board_control.refresh_control(st2)
-        return st2.get("control", {}).get(sid)
+        ({tag: n}) from *sid* (8.5.5/8.6.7/8.7.5 all key the pay
+        decision on an actual control change)."""
+        return board_control.control_after(
+            state, sid, board_control.removal(removals))
 
     def _rl_would_be_possible(sid, post_control):
         """6.4.1: Reward Loyalty needs British Control, a Regular AND a
@@ -613,7 +608,7 @@ def _support_phase(state):
         while steps_remaining > 0 and resources.can_afford(state, BRITISH, 1) and level < ACTIVE_SUPPORT:
             resources.spend(state, BRITISH, 1)
             level += 1
-            state["support"][sid] = level
+            set_support(state, sid, level)
             spent += 1
             rl_shifted[sid] += 1
             steps_remaining -= 1
@@ -701,7 +696,7 @@ def _support_phase(state):
         while steps_remaining > 0 and resources.can_afford(state, PATRIOTS, 1) and level > ACTIVE_OPPOSITION:
             resources.spend(state, PATRIOTS, 1)
             level -= 1
-            state["support"][sid] = level
+            set_support(state, sid, level)
             spent += 1
             coc_shifted[sid] += 1
             steps_remaining -= 1
@@ -1142,7 +1137,8 @@ def resolve(state, *, bots=None, human_factions=None):
 
     # 6.1  Victory Check Phase
     if victory_check(state):
-        push_history(state, "Victory achieved at Winter-Quarters (6.1)")
+        push_history(state, "Victory achieved at Winter-Quarters (6.1)",
+                     kind=VICTORY)
         return  # game ends immediately
 
     # Return all Leaders to Available before redeploy (Rule 6.1)
@@ -14,9 +14,9 @@ state["treaty_of_alliance"] : bool  # Treaty of Alliance Event resolved?
 If your project uses different keys, adjust the look-ups below.
 """
 
-from lod_ai.rules_consts import BRITISH, PATRIOTS, FRENCH, INDIANS, FORT_PAT, VILLAGE
-from lod_ai.map.adjacency import population as _map_population
-from lod_ai.util.naval import effective_population as _effective_population
+from lod_ai.rules_consts import BRITISH, PATRIOTS, FRENCH, INDIANS
+from lod_ai.board import totals as _totals
+from lod_ai.board.control import array_view as _board_view
 
 # --------------------------------------------------------------------------- #
 #  Board summarizer – converts the live map into the tallies used below       #
@@ -30,24 +30,16 @@ def _summarize_board(state) -> dict:
     Per Rules §1.6.2-1.6.3:
       Total Support    = sum(level × population) for spaces at Support
       Total Opposition = sum(|level| × population) for spaces at Opposition
+
+    A normalized state keeps these as running sums (`board.totals`), so
+    this is a lookup; other states get the full board scan.
     """
-    support_total     = 0
-    opposition_total  = 0
-    patriot_forts     = 0
-    villages          = 0
-
-    for sid, sp in state["spaces"].items():
-        lvl = state["support"].get(sid, 0)
-        # §1.9: a Blockaded City's population counts 0 for Support
-        # (Session 46, C1).
-        pop = _effective_population(state, sid, _map_population(sid))
-        if lvl > 0:
-            support_total += lvl * pop
-        elif lvl < 0:
-            opposition_total += abs(lvl) * pop
-
-        patriot_forts += sp.get(FORT_PAT, 0)
-        villages      += sp.get(VILLAGE, 0)
+    view = _board_view(state)
+    if view is not None:
+        return view.board_totals()
+
+    support_total, opposition_total, patriot_forts, villages = \
+        _totals.current(state)
 
     # Casualties boxes—assumes these counters exist in state
     cbc = state.get("cbc", 0)   # cumulative British casualties
@@ -64,7 +56,9 @@ def _summarize_board(state) -> dict:
         "treaty_of_alliance": bool(toa),
     }
 
-from lod_ai.util.history import push_history
+from lod_ai.util.history import (
+    FINAL_SCORING, VICTORY, VICTORY_CHECK, WINNER, last_event, push_history,
+)
 
 # --------------------------------------------------------------------------- #
 # Helper functions                                                            #
@@ -129,7 +123,8 @@ def final_scoring(state) -> None:
     winner = max(order, key=_tie_key)
 
     log = "Final Scoring – " + "  ".join(f"{f}:{totals[f]}" for f in order)
-    push_history(state, log)
+    push_history(state, log, kind=FINAL_SCORING,
+                 data={"scores": {f: totals[f] for f in order}})
 
     # §7.1 placements: rank all four by the same key; "if the Treaty of
     # Alliance Event was not played, the French come in last place
@@ -137,7 +132,8 @@ def final_scoring(state) -> None:
     # already forced by the -inf total above.
     placement = sorted(order, key=_tie_key, reverse=True)
     push_history(state, "Placements (7.1): " + " > ".join(placement))
-    push_history(state, f"Winner: {winner} (Rule 7.3)")
+    push_history(state, f"Winner: {winner} (Rule 7.3)", kind=WINNER,
+                 data={"faction": winner})
 
 # --------------------------------------------------------------------------- #
 # Public API                                                                  #
@@ -161,7 +157,10 @@ def check(state) -> bool:
         f"BRI({brit1},{brit2})  PAT({pat1},{pat2})  "
         f"FRE({fre1},{fre2})  IND({ind1},{ind2})"
     )
-    push_history(state, log)
+    push_history(state, log, kind=VICTORY_CHECK, data={"margins": {
+        BRITISH: [brit1, brit2], PATRIOTS: [pat1, pat2],
+        FRENCH: [fre1, fre2], INDIANS: [ind1, ind2],
+    }})
 
     british_win = (brit1 > 0 and brit2 > 0)
     patriot_win = (pat1 > 0 and pat2 > 0)
@@ -188,3 +187,34 @@ def check(state) -> bool:
                          "Non-player victory — all players lose equally (7.1)")
 
     return british_win or patriot_win or french_win or indian_win
+
+
+def winner_from_margins(state) -> str:
+    """The faction whose two victory margins (§7.2) are both positive on
+    *state*, in §7.1 check order, or ``"UNKNOWN"``."""
+    tallies = _summarize_board(state)
+    brit1, brit2 = _british_margin(tallies)
+    pat1, pat2 = _patriot_margin(tallies)
+    fre1, fre2 = _french_margin(tallies)
+    ind1, ind2 = _indian_margin(tallies)
+
+    if brit1 > 0 and brit2 > 0:
+        return BRITISH
+    if pat1 > 0 and pat2 > 0:
+        return PATRIOTS
+    if tallies["treaty_of_alliance"] and fre1 > 0 and fre2 > 0:
+        return FRENCH
+    if ind1 > 0 and ind2 > 0:
+        return INDIANS
+    return "UNKNOWN"
+
+
+def check_game_over(state) -> str | None:
+    """The winner if the game has ended (a recent Winner or Victory event
+    in the history), else None."""
+    entry = last_event(state.get("history", []), WINNER, VICTORY, within=40)
+    if entry is None:
+        return None
+    if entry["kind"] == WINNER:
+        return entry["data"]["faction"]
+    return winner_from_margins(state)
@@ -76,7 +76,7 @@ def test_roundtrip_failure_raises_and_dumps(tmp_path):
     # keyed by a tuple becomes a string key on reload, so before != after.
     eng.state["control"][("X", "Y")] = "BRITISH"
 
-    with pytest.raises(invariants.InvariantError):
+    with pytest.raises(invariants.InvariantError, match="JSON"):
         invariants.check_save_load_roundtrip(
             eng.state, scenario="1775", seed=2, card_number=4,
             human_factions=set(), dump_dir=str(tmp_path),
@@ -85,6 +85,24 @@ def test_roundtrip_failure_raises_and_dumps(tmp_path):
     assert dumps, "expected a roundtrip dump to be written"
 
 
+def test_binary_roundtrip_failure_raises(tmp_path, monkeypatch):
+    """The binary save form is checked too, after the JSON one."""
+    eng = _play("1775", 2, 4)
+    loads = invariants.snapshot.loads
+
+    def lossy_loads(data):
+        state, meta = loads(data)
+        state["control"].pop(next(iter(state["control"])))
+        return state, meta
+
+    monkeypatch.setattr(invariants.snapshot, "loads", lossy_loads)
+    with pytest.raises(invariants.InvariantError, match="binary"):
+        invariants.check_save_load_roundtrip(
+            eng.state, scenario="1775", seed=2, card_number=4,
+            human_factions=set(), dump_dir=str(tmp_path),
+        )
+
+
 def test_dump_repro_embeds_one_command(tmp_path):
     eng = _play("1776", 3, 3)
     path, repro = invariants.dump_repro(
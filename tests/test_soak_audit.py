@@ -1,5 +1,6 @@
 """Regression tests for the soak runner and the free-Gather decline audit."""
 
+import json
 import os
 import sys
 
@@ -40,3 +41,21 @@ def test_soak_runs_and_is_resumable(tmp_path):
     soak.main(["--games", "6", "--seed-base", "9000", "--out", str(out)])
     lines2 = [l for l in out.read_text().splitlines() if l.strip()]
     assert len(lines2) == 6
+
+
+def test_soak_workers_give_identical_records(tmp_path):
+    """--workers spreads the schedule over spawned, hash-seed-pinned
+    processes; the JSONL must not depend on the worker count and must
+    stay resumable.  (Both runs use the pool: this pytest process is not
+    itself pinned to PYTHONHASHSEED=0 the way `python -m ...soak` is.)"""
+    wide = tmp_path / "wide.jsonl"
+    resumed = tmp_path / "resumed.jsonl"
+    soak.main(["--games", "4", "--seed-base", "9100", "--out", str(wide),
+               "--workers", "3"])
+    lines = wide.read_text().splitlines(keepends=True)
+    assert [json.loads(l)["i"] for l in lines] == [0, 1, 2, 3]
+    # Resume a partially written file with a different worker count.
+    resumed.write_text(lines[0])
+    assert soak.main(["--games", "4", "--seed-base", "9100",
+                      "--out", str(resumed), "--workers", "2"]) == 0
+    assert resumed.read_text() == wide.read_text()